@@ -0,0 +1,177 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Performance benchmarks for IMPROVER, run using airspeed velocity (asv).
+
+Benchmarks of the core plugins are run on synthetic inputs with the size of
+production grids, built using the functions in
+improver.synthetic_data.set_up_test_cubes. Results are written by asv as JSON
+to the results directory given in asv.conf.json, and can be compared between
+commits or releases with "asv compare" or published with "asv publish".
+"""
+
+from typing import List, Optional, Tuple
+
+import numpy as np
+from iris.cube import Cube
+
+from improver.synthetic_data.set_up_test_cubes import (
+    set_up_percentile_cube,
+    set_up_probability_cube,
+    set_up_variable_cube,
+)
+
+#: Shapes (y, x) and grid spacings (m) of the synthetic production domains.
+#: Both are on equal area grids, so that all plugins can be applied to them.
+DOMAINS = {
+    "uk_2km": {"shape": (970, 1042), "grid_spacing": 2000.0},
+    "global_10km": {"shape": (1920, 2560), "grid_spacing": 10000.0},
+}
+
+#: Number of ensemble members used for realization inputs.
+N_REALIZATIONS = 12
+
+
+def grid_kwargs(domain: str) -> dict:
+    """Keyword arguments to the cube set up functions defining the grid of a
+    domain.
+
+    Args:
+        domain:
+            Name of the domain in DOMAINS.
+
+    Returns:
+        Keyword arguments for set_up_variable_cube.
+    """
+    spacing = DOMAINS[domain]["grid_spacing"]
+    return {
+        "spatial_grid": "equalarea",
+        "x_grid_spacing": spacing,
+        "y_grid_spacing": spacing,
+    }
+
+
+def random_field(
+    domain: str,
+    leading_shape: Tuple[int, ...] = (),
+    low: float = 0.0,
+    high: float = 1.0,
+    seed: int = 0,
+) -> np.ndarray:
+    """Generate a float32 field of uniformly distributed values on a domain.
+
+    Args:
+        domain:
+            Name of the domain in DOMAINS.
+        leading_shape:
+            Shape of any leading dimensions, e.g. realizations.
+        low:
+            Lower limit of the values.
+        high:
+            Upper limit of the values.
+        seed:
+            Seed for the random number generator.
+
+    Returns:
+        Array with shape leading_shape + the domain shape.
+    """
+    rng = np.random.default_rng(seed)
+    shape = (*leading_shape, *DOMAINS[domain]["shape"])
+    return rng.uniform(low, high, shape).astype(np.float32)
+
+
+def realization_cube(
+    domain: str,
+    n_realizations: Optional[int] = N_REALIZATIONS,
+    low: float = 270.0,
+    high: float = 290.0,
+    seed: int = 0,
+    **kwargs,
+) -> Cube:
+    """Set up a cube of realizations, by default of air temperature.
+
+    Args:
+        domain:
+            Name of the domain in DOMAINS.
+        n_realizations:
+            Number of realizations, or None for a cube without a realization
+            dimension.
+        low:
+            Lower limit of the values.
+        high:
+            Upper limit of the values.
+        seed:
+            Seed for the random number generator.
+        **kwargs:
+            Additional keyword arguments to set_up_variable_cube.
+
+    Returns:
+        Cube of realizations.
+    """
+    leading_shape = () if n_realizations is None else (n_realizations,)
+    data = random_field(domain, leading_shape, low, high, seed)
+    return set_up_variable_cube(data, **grid_kwargs(domain), **kwargs)
+
+
+def probability_cube(
+    domain: str, thresholds: List[float], seed: int = 0, **kwargs
+) -> Cube:
+    """Set up a cube of probabilities of exceeding thresholds, by default of air
+    temperature, which decrease monotonically with threshold.
+
+    Args:
+        domain:
+            Name of the domain in DOMAINS.
+        thresholds:
+            Threshold values.
+        seed:
+            Seed for the random number generator.
+        **kwargs:
+            Additional keyword arguments to set_up_probability_cube.
+
+    Returns:
+        Cube of probabilities.
+    """
+    data = random_field(domain, (len(thresholds),), seed=seed)
+    data = np.sort(data, axis=0)[::-1]
+    return set_up_probability_cube(
+        np.ascontiguousarray(data),
+        np.array(thresholds, dtype=np.float32),
+        **grid_kwargs(domain),
+        **kwargs,
+    )
+
+
+def percentile_cube(
+    domain: str,
+    percentiles: List[float],
+    low: float = 270.0,
+    high: float = 290.0,
+    seed: int = 0,
+    **kwargs,
+) -> Cube:
+    """Set up a cube of percentiles, by default of air temperature, which
+    increase monotonically with percentile.
+
+    Args:
+        domain:
+            Name of the domain in DOMAINS.
+        percentiles:
+            Percentile values.
+        low:
+            Lower limit of the values.
+        high:
+            Upper limit of the values.
+        seed:
+            Seed for the random number generator.
+        **kwargs:
+            Additional keyword arguments to set_up_percentile_cube.
+
+    Returns:
+        Cube of percentiles.
+    """
+    data = np.sort(random_field(domain, (len(percentiles),), low, high, seed), axis=0)
+    return set_up_percentile_cube(
+        data, np.array(percentiles, dtype=np.float32), **grid_kwargs(domain), **kwargs
+    )
@@ -0,0 +1,111 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Benchmarks for weighted blending."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+from iris.cube import CubeList
+
+from improver.blending.calculate_weights_and_blend import WeightAndBlend
+
+from . import DOMAINS, probability_cube
+
+THRESHOLDS = [0.03, 0.1, 0.5, 1.0, 4.0]
+PRECIPITATION = {"variable_name": "lwe_precipitation_rate", "threshold_units": "mm h-1"}
+VALIDITY_TIME = datetime(2024, 6, 1, 12)
+CYCLETIME = "20240601T0600Z"
+
+MODEL_WEIGHTS = {
+    "nc_det": {"forecast_period": [0, 4, 8], "weights": [1, 0, 0], "units": "hours"},
+    "uk_ens": {"forecast_period": [0, 4, 8], "weights": [0, 1, 1], "units": "hours"},
+}
+
+
+class CycleBlending:
+    """Time the blending of probabilities from four forecast cycles using
+    linear weights."""
+
+    params = list(DOMAINS)
+    param_names = ["domain"]
+    timeout = 600
+
+    def setup(self, domain):
+        self.cubes = CubeList(
+            probability_cube(
+                domain,
+                THRESHOLDS,
+                seed=hours,
+                time=VALIDITY_TIME,
+                frt=VALIDITY_TIME - timedelta(hours=hours),
+                standard_grid_metadata="uk_ens",
+                **PRECIPITATION,
+            )
+            for hours in range(6, 10)
+        )
+
+    def time_process(self, domain):
+        WeightAndBlend("forecast_reference_time", "linear", y0val=1, ynval=1)(
+            self.cubes.copy(), cycletime=CYCLETIME
+        )
+
+    def peakmem_process(self, domain):
+        WeightAndBlend("forecast_reference_time", "linear", y0val=1, ynval=1)(
+            self.cubes.copy(), cycletime=CYCLETIME
+        )
+
+
+class ModelBlendingSpatialWeights:
+    """Time the blending of ensemble probabilities with nowcast probabilities
+    that are masked outside of the radar coverage, using spatial weights."""
+
+    params = list(DOMAINS)
+    param_names = ["domain"]
+    timeout = 600
+
+    def setup(self, domain):
+        ensemble = probability_cube(
+            domain,
+            THRESHOLDS,
+            time=VALIDITY_TIME,
+            frt=VALIDITY_TIME - timedelta(hours=6),
+            standard_grid_metadata="uk_ens",
+            **PRECIPITATION,
+        )
+        nowcast = probability_cube(
+            domain,
+            THRESHOLDS,
+            seed=1,
+            time=VALIDITY_TIME,
+            frt=VALIDITY_TIME - timedelta(hours=2),
+            attributes={"mosg__model_configuration": "nc_det"},
+            **PRECIPITATION,
+        )
+        n_columns = DOMAINS[domain]["shape"][1]
+        mask = np.broadcast_to(np.arange(n_columns) > n_columns // 2, nowcast.shape)
+        nowcast.data = np.ma.masked_where(mask, nowcast.data)
+        self.cubes = CubeList([ensemble, nowcast])
+        self.plugin = WeightAndBlend(
+            "model_id",
+            "dict",
+            weighting_coord="forecast_period",
+            wts_dict=MODEL_WEIGHTS,
+        )
+
+    def time_process(self, domain):
+        self.plugin(
+            self.cubes.copy(),
+            cycletime=CYCLETIME,
+            model_id_attr="mosg__model_configuration",
+            spatial_weights=True,
+        )
+
+    def peakmem_process(self, domain):
+        self.plugin(
+            self.cubes.copy(),
+            cycletime=CYCLETIME,
+            model_id_attr="mosg__model_configuration",
+            spatial_weights=True,
+        )
@@ -0,0 +1,157 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Benchmarks for calibration."""
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+from iris.coords import AuxCoord, DimCoord
+from iris.cube import Cube, CubeList
+
+from improver.calibration.emos_calibration import ApplyEMOS
+from improver.calibration.rainforest_calibration import (
+    ApplyRainForestsCalibrationLightGBM,
+    tree_model_registry_clear,
+)
+
+from . import DOMAINS, realization_cube
+
+ATTRIBUTES = {
+    "title": "MOGREPS-UK Forecast",
+    "source": "Met Office Unified Model",
+    "institution": "Met Office",
+}
+
+
+def _emos_coefficients(forecast: Cube) -> CubeList:
+    """Set up EMOS coefficients for a normal distribution, with the mean of the
+    realizations as the predictor, that apply to the whole domain.
+
+    Args:
+        forecast:
+            Forecast to which the coefficients apply.
+
+    Returns:
+        Coefficients alpha, beta, gamma and delta.
+    """
+    scalar_coords = [
+        forecast.coord("forecast_period").copy(),
+        forecast.coord("forecast_reference_time").copy(),
+    ]
+    for coord in [forecast.coord(axis="x"), forecast.coord(axis="y")]:
+        spacing = np.diff(coord.points[:2])[0]
+        bounds = [coord.points[0] - spacing / 2, coord.points[-1] + spacing / 2]
+        scalar_coords.append(coord.copy(points=[np.mean(bounds)], bounds=[bounds]))
+    attributes = {
+        "diagnostic_standard_name": forecast.name(),
+        "distribution": "norm",
+        "title": "Ensemble Model Output Statistics coefficients",
+    }
+    values = {"alpha": 0.5, "beta": 0.95, "gamma": 0.2, "delta": 0.6}
+    coefficients = CubeList()
+    for name, value in values.items():
+        cube = Cube(
+            np.array([value] if name == "beta" else value, dtype=np.float32),
+            long_name=f"emos_coefficient_{name}",
+            units=forecast.units if name in ["alpha", "gamma"] else "1",
+            aux_coords_and_dims=[(coord, None) for coord in scalar_coords],
+            attributes=attributes,
+        )
+        if name == "beta":
+            cube.add_dim_coord(
+                DimCoord(np.array([0], dtype=np.int32), long_name="predictor_index"), 0
+            )
+            cube.add_aux_coord(
+                AuxCoord([forecast.name()], long_name="predictor_name"), 0
+            )
+        coefficients.append(cube)
+    return coefficients
+
+
+class ApplyEMOSRealizations:
+    """Time the calibration of realizations using EMOS coefficients, with
+    calibrated realizations generated from percentiles of the calibrated
+    distribution using ensemble copula coupling."""
+
+    params = list(DOMAINS)
+    param_names = ["domain"]
+    # Each call takes minutes on the global domain, so only time one call.
+    number = 1
+    repeat = 1
+    timeout = 1800
+
+    def setup(self, domain):
+        self.forecast = realization_cube(domain, attributes=ATTRIBUTES)
+        self.coefficients = _emos_coefficients(self.forecast)
+
+    def time_process(self, domain):
+        ApplyEMOS()(self.forecast, self.coefficients, random_seed=0)
+
+    def peakmem_process(self, domain):
+        ApplyEMOS()(self.forecast, self.coefficients, random_seed=0)
+
+
+class RainForestsEvaluateProbabilities:
+    """Time the evaluation of the RainForests tree models for each threshold,
+    in turn or concurrently, with and without binning the inputs, and record
+    the throughput in rows of input data per second."""
+
+    params = ([1, 4], [False, True])
+    param_names = ["threshold_workers", "bin_data"]
+    timeout = 600
+
+    n_rows = 10**6
+    n_features = 6
+    thresholds = np.linspace(0, 0.03, 30, dtype=np.float32)
+
+    def setup(self, threshold_workers, bin_data):
+        try:
+            import lightgbm
+        except ModuleNotFoundError:
+            raise NotImplementedError("LightGBM is not available")
+        rng = np.random.default_rng(0)
+        # Features take a limited number of values, as do the inputs derived from
+        # forecasts, so that many rows fall into the same bins.
+        training_data = rng.integers(0, 40, (10**4, self.n_features)) / 10
+        error = training_data @ rng.normal(0, 0.002, self.n_features)
+        self.directory = tempfile.mkdtemp()
+        model_config = {"24": {}}
+        for threshold in self.thresholds:
+            dataset = lightgbm.Dataset(training_data, label=error >= threshold)
+            booster = lightgbm.train(
+                {"objective": "binary", "num_leaves": 31, "verbose": -1},
+                dataset,
+                num_boost_round=20,
+            )
+            model_file = os.path.join(self.directory, f"model_{threshold:.4f}.txt")
+            booster.save_model(model_file)
+            model_config["24"][f"{threshold:.4f}"] = {"lightgbm_model": model_file}
+        tree_model_registry_clear()
+        self.plugin = ApplyRainForestsCalibrationLightGBM(
+            model_config, bin_data=bin_data, threshold_workers=threshold_workers
+        )
+        self.input_data = rng.integers(0, 40, (self.n_rows, self.n_features)) / 10
+        self.output_data = np.empty(
+            (len(self.thresholds), self.n_rows), dtype=np.float32
+        )
+
+    def teardown(self, threshold_workers, bin_data):
+        shutil.rmtree(self.directory)
+
+    def _evaluate(self):
+        self.plugin._evaluate_probabilities(self.input_data, 24, self.output_data)
+
+    def time_evaluate_probabilities(self, threshold_workers, bin_data):
+        self._evaluate()
+
+    def track_throughput(self, threshold_workers, bin_data):
+        start = time.perf_counter()
+        self._evaluate()
+        return self.n_rows / (time.perf_counter() - start)
+
+    track_throughput.unit = "rows/s"
@@ -0,0 +1,92 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Benchmarks for categorical diagnostics."""
+
+from copy import deepcopy
+
+from iris.cube import CubeList
+
+from improver.categorical.decision_tree import ApplyDecisionTree
+
+from . import DOMAINS, probability_cube
+
+PRECIPITATION_PROBABILITY = "probability_of_lwe_precipitation_rate_above_threshold"
+CLOUD_PROBABILITY = (
+    "probability_of_low_and_medium_type_cloud_area_fraction_above_threshold"
+)
+
+#: A decision tree for precipitation type and intensity, in which each query
+#: compares probabilities at a threshold of one diagnostic.
+DECISION_TREE = {
+    "meta": {"name": "precipitation_code"},
+    "precipitation": {
+        "if_true": "heavy_precipitation",
+        "if_false": "cloud",
+        "probability_thresholds": [0.5],
+        "threshold_condition": ">=",
+        "condition_combination": "",
+        "diagnostic_fields": [PRECIPITATION_PROBABILITY],
+        "diagnostic_thresholds": [[0.1, "mm hr-1"]],
+        "diagnostic_conditions": ["above"],
+    },
+    "heavy_precipitation": {
+        "if_true": "heavy_rain",
+        "if_false": "light_rain",
+        "probability_thresholds": [0.5],
+        "threshold_condition": ">=",
+        "condition_combination": "",
+        "diagnostic_fields": [PRECIPITATION_PROBABILITY],
+        "diagnostic_thresholds": [[1.0, "mm hr-1"]],
+        "diagnostic_conditions": ["above"],
+    },
+    "cloud": {
+        "if_true": "cloudy",
+        "if_false": "clear",
+        "probability_thresholds": [0.5],
+        "threshold_condition": ">=",
+        "condition_combination": "",
+        "diagnostic_fields": [CLOUD_PROBABILITY],
+        "diagnostic_thresholds": [[0.8125, 1]],
+        "diagnostic_conditions": ["above"],
+    },
+    "clear": {"leaf": 0},
+    "cloudy": {"leaf": 1},
+    "light_rain": {"leaf": 2},
+    "heavy_rain": {"leaf": 3},
+}
+
+
+class ApplyDecisionTreeProbabilities:
+    """Time the application of a decision tree to probabilities."""
+
+    params = list(DOMAINS)
+    param_names = ["domain"]
+    timeout = 600
+
+    def setup(self, domain):
+        self.cubes = CubeList(
+            [
+                probability_cube(
+                    domain,
+                    [0.03, 0.1, 0.5, 1.0, 4.0],
+                    variable_name="lwe_precipitation_rate",
+                    threshold_units="mm h-1",
+                ),
+                probability_cube(
+                    domain,
+                    [0.1875, 0.8125],
+                    seed=1,
+                    variable_name="low_and_medium_type_cloud_area_fraction",
+                    threshold_units="1",
+                ),
+            ]
+        )
+        self.plugin = ApplyDecisionTree(decision_tree=deepcopy(DECISION_TREE))
+
+    def time_process(self, domain):
+        self.plugin(self.cubes)
+
+    def peakmem_process(self, domain):
+        self.plugin(self.cubes)
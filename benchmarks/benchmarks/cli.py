@@ -0,0 +1,39 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Benchmarks for the start up time of the improver command line interface."""
+
+import re
+import subprocess  # nosec
+import sys
+
+
+class CLIStartup:
+    """Time the start up of the improver command line interface in a fresh
+    interpreter, which is paid by every invocation of an improver command."""
+
+    def timeraw_import_cli(self):
+        return "import improver.cli"
+
+    def timeraw_dispatch_subcommand(self):
+        # Dispatching an unknown option fails during argument parsing, after
+        # the subcommand has been resolved but before any processing.
+        return """
+        from clize.errors import ArgumentError
+        from improver import cli
+        try:
+            cli.dispatch_subcommand("improver", "nbhood", "--not-an-option")
+        except ArgumentError:
+            pass
+        """
+
+    def track_import_cli_importtime(self):
+        """Cumulative import time of improver.cli reported by python -X importtime,
+        which excludes interpreter start up."""
+        command = [sys.executable, "-X", "importtime", "-c", "import improver.cli"]
+        result = subprocess.run(command, capture_output=True, text=True)  # noqa: S603
+        (cumulative,) = re.findall(r"\|\s*(\d+) \| improver\.cli$", result.stderr, re.M)
+        return int(cumulative)
+
+    track_import_cli_importtime.unit = "us"
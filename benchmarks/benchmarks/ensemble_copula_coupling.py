@@ -0,0 +1,63 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Benchmarks for ensemble copula coupling."""
+
+import numpy as np
+
+from improver.ensemble_copula_coupling.ensemble_copula_coupling import (
+    ConvertProbabilitiesToPercentiles,
+    EnsembleReordering,
+)
+
+from . import (
+    DOMAINS,
+    N_REALIZATIONS,
+    percentile_cube,
+    probability_cube,
+    realization_cube,
+)
+
+THRESHOLDS = list(np.arange(263.15, 303.15, 2.0))
+
+
+class ProbabilitiesToPercentiles:
+    """Time the conversion of probabilities at 20 thresholds to percentiles."""
+
+    params = (list(DOMAINS), [N_REALIZATIONS, 33])
+    param_names = ["domain", "no_of_percentiles"]
+    timeout = 600
+
+    def setup(self, domain, no_of_percentiles):
+        self.cube = probability_cube(domain, THRESHOLDS)
+
+    def time_process(self, domain, no_of_percentiles):
+        ConvertProbabilitiesToPercentiles()(
+            self.cube, no_of_percentiles=no_of_percentiles
+        )
+
+    def peakmem_process(self, domain, no_of_percentiles):
+        ConvertProbabilitiesToPercentiles()(
+            self.cube, no_of_percentiles=no_of_percentiles
+        )
+
+
+class ReorderPercentilesAsRealizations:
+    """Time the reordering of calibrated percentiles to match the ordering of
+    the raw realizations."""
+
+    params = list(DOMAINS)
+    param_names = ["domain"]
+    timeout = 600
+
+    def setup(self, domain):
+        percentiles = np.linspace(100 / 13, 1200 / 13, N_REALIZATIONS)
+        self.post_processed = percentile_cube(domain, percentiles, seed=1)
+        self.raw = realization_cube(domain)
+
+    def time_process(self, domain):
+        EnsembleReordering()(self.post_processed, self.raw, random_seed=0)
+
+    def peakmem_process(self, domain):
+        EnsembleReordering()(self.post_processed, self.raw, random_seed=0)
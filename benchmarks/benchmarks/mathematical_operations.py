@@ -0,0 +1,36 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Benchmarks for mathematical operations."""
+
+import numpy as np
+
+from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
+from improver.utilities.mathematical_operations import Integration
+
+
+class VerticalIntegration:
+    """Time the integration of multi-level data along the height coordinate, as
+    used for the wet bulb temperature integral."""
+
+    params = [10, 33, 70]
+    param_names = ["n_levels"]
+
+    def setup(self, n_levels):
+        rng = np.random.default_rng(0)
+        data = rng.uniform(-5.0, 10.0, (n_levels, 300, 300)).astype(np.float32)
+        heights = np.linspace(5.0, 6000.0, n_levels, dtype=np.float32)
+        self.cube = set_up_variable_cube(
+            data,
+            name="wet_bulb_temperature",
+            units="degC",
+            vertical_levels=heights,
+            height=True,
+        )
+
+    def time_process(self, n_levels):
+        Integration("height", positive_integration=False)(self.cube)
+
+    def peakmem_process(self, n_levels):
+        Integration("height", positive_integration=False)(self.cube)
@@ -0,0 +1,65 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Benchmarks for neighbourhood processing and the recursive filter."""
+
+import numpy as np
+from iris.cube import CubeList
+
+from improver.nbhood.nbhood import NeighbourhoodProcessing
+from improver.nbhood.recursive_filter import RecursiveFilter
+
+from . import DOMAINS, probability_cube
+
+THRESHOLDS = [273.15, 278.15, 283.15]
+
+
+class NeighbourhoodProcessingProbabilities:
+    """Time neighbourhood processing of probabilities at several thresholds,
+    with a radius of 10 grid squares."""
+
+    params = (list(DOMAINS), ["square", "circular"])
+    param_names = ["domain", "neighbourhood_method"]
+    timeout = 600
+
+    def setup(self, domain, neighbourhood_method):
+        self.cube = probability_cube(domain, THRESHOLDS)
+        self.radius = 10 * DOMAINS[domain]["grid_spacing"]
+
+    def time_process(self, domain, neighbourhood_method):
+        NeighbourhoodProcessing(neighbourhood_method, self.radius)(self.cube)
+
+    def peakmem_process(self, domain, neighbourhood_method):
+        NeighbourhoodProcessing(neighbourhood_method, self.radius)(self.cube)
+
+
+class RecursiveFilterProbabilities:
+    """Time the recursive filter applied to probabilities at several
+    thresholds."""
+
+    params = list(DOMAINS)
+    param_names = ["domain"]
+    timeout = 600
+
+    def setup(self, domain):
+        self.cube = probability_cube(domain, THRESHOLDS)
+        template = next(self.cube.slices_over("air_temperature"))
+        template.remove_coord("air_temperature")
+        coefficients = CubeList()
+        for axis, index in [("x", np.s_[:, :-1]), ("y", np.s_[:-1, :])]:
+            coefficient = template[index].copy(
+                data=np.full(template[index].shape, 0.4, dtype=np.float32)
+            )
+            coefficient.rename(f"smoothing_coefficient_{axis}")
+            coefficient.units = "1"
+            points = template.coord(axis=axis).points
+            coefficient.coord(axis=axis).points = (points[1:] + points[:-1]) / 2
+            coefficients.append(coefficient)
+        self.coefficients = coefficients
+
+    def time_process(self, domain):
+        RecursiveFilter(iterations=2)(self.cube, self.coefficients)
+
+    def peakmem_process(self, domain):
+        RecursiveFilter(iterations=2)(self.cube, self.coefficients)
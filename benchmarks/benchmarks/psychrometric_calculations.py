@@ -0,0 +1,121 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Benchmarks for psychrometric calculations."""
+
+import numpy as np
+from iris.cube import CubeList
+
+from improver.psychrometric_calculations.psychrometric_calculations import (
+    calculate_svp_derivative_in_air,
+    calculate_svp_in_air,
+    preload_svp_tables,
+)
+from improver.psychrometric_calculations.wet_bulb_temperature import (
+    WetBulbTemperature,
+)
+from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
+
+N_LEVELS = 33
+GRID_SHAPE = (300, 300)
+
+
+def _multi_level_inputs():
+    """Return arrays of temperature (K), relative humidity (1) and pressure (Pa)
+    on height levels spanning the range of the saturated vapour pressure table."""
+    rng = np.random.default_rng(0)
+    shape = (N_LEVELS, *GRID_SHAPE)
+    temperature = rng.uniform(185.0, 335.0, shape).astype(np.float32)
+    relative_humidity = rng.uniform(0.05, 1.0, shape).astype(np.float32)
+    pressure = rng.uniform(2.0e4, 1.05e5, shape).astype(np.float32)
+    return temperature, relative_humidity, pressure
+
+
+class SaturatedVapourPressure:
+    """Time the per-call cost of saturated vapour pressure calculations with the
+    shared, preloaded lookup tables, using the compiled kernels and the array
+    lookup used for masked inputs."""
+
+    params = ["compiled", "array"]
+    param_names = ["kernel"]
+
+    def setup(self, kernel):
+        self.temperature, _, self.pressure = _multi_level_inputs()
+        if kernel == "array":
+            self.temperature = np.ma.masked_array(self.temperature)
+        preload_svp_tables()
+        # Compile the kernels outside of the timed region.
+        calculate_svp_in_air(self.temperature[:1], self.pressure[:1])
+        calculate_svp_derivative_in_air(self.temperature[:1], self.pressure[:1])
+
+    def time_calculate_svp_in_air(self, kernel):
+        calculate_svp_in_air(self.temperature, self.pressure)
+
+    def peakmem_calculate_svp_in_air(self, kernel):
+        calculate_svp_in_air(self.temperature, self.pressure)
+
+    def time_calculate_svp_derivative_in_air(self, kernel):
+        calculate_svp_derivative_in_air(self.temperature, self.pressure)
+
+
+class WetBulbTemperatureIteration:
+    """Time the Newton iteration for wet bulb temperature on multi-level data,
+    using the compiled kernel and the array iteration used for masked inputs."""
+
+    params = ["compiled", "array"]
+    param_names = ["kernel"]
+
+    def setup(self, kernel):
+        self.temperature, self.relative_humidity, self.pressure = _multi_level_inputs()
+        if kernel == "array":
+            self.pressure = np.ma.masked_array(self.pressure)
+        self.plugin = WetBulbTemperature()
+        # Compile the kernel outside of the timed region.
+        self.plugin._calculate_wet_bulb_temperature(
+            self.pressure[:1], self.relative_humidity[:1], self.temperature[:1]
+        )
+
+    def time_calculate_wet_bulb_temperature(self, kernel):
+        self.plugin._calculate_wet_bulb_temperature(
+            self.pressure, self.relative_humidity, self.temperature
+        )
+
+    def peakmem_calculate_wet_bulb_temperature(self, kernel):
+        self.plugin._calculate_wet_bulb_temperature(
+            self.pressure, self.relative_humidity, self.temperature
+        )
+
+
+class WetBulbTemperatureProcess:
+    """Time the WetBulbTemperature plugin on multi-level cubes."""
+
+    def setup(self):
+        temperature, relative_humidity, pressure = _multi_level_inputs()
+        heights = np.linspace(5.0, 6000.0, N_LEVELS)
+        self.cubes = CubeList(
+            [
+                set_up_variable_cube(temperature, vertical_levels=heights, height=True),
+                set_up_variable_cube(
+                    relative_humidity,
+                    name="relative_humidity",
+                    units="1",
+                    vertical_levels=heights,
+                    height=True,
+                ),
+                set_up_variable_cube(
+                    pressure,
+                    name="air_pressure",
+                    units="Pa",
+                    vertical_levels=heights,
+                    height=True,
+                ),
+            ]
+        )
+        WetBulbTemperature()(*[cube[:1] for cube in self.cubes])
+
+    def time_process(self):
+        WetBulbTemperature()(self.cubes)
+
+    def peakmem_process(self):
+        WetBulbTemperature()(self.cubes)
@@ -0,0 +1,76 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Benchmarks for regridding."""
+
+import numpy as np
+
+from improver.regrid.landsea import RegridLandSea
+from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
+from improver.utilities.spatial import transform_grid_to_lat_lon
+
+from . import DOMAINS, N_REALIZATIONS, grid_kwargs, random_field
+
+#: Global grid with the shape of the global_10km domain, which must be on a
+#: latitude-longitude grid to be regridded by all of the regrid modes.
+GLOBAL_GRID = {
+    "spatial_grid": "latlon",
+    "x_grid_spacing": 360 / DOMAINS["global_10km"]["shape"][1],
+    "y_grid_spacing": 180 / DOMAINS["global_10km"]["shape"][0],
+    "domain_corner": (-90 + 90 / DOMAINS["global_10km"]["shape"][0], -180),
+}
+
+
+def _land(latitude: np.ndarray, longitude: np.ndarray) -> np.ndarray:
+    """Define irregular coastlines that are the same on any grid.
+
+    Args:
+        latitude:
+            Latitudes of the grid points.
+        longitude:
+            Longitudes of the grid points.
+
+    Returns:
+        Land sea mask, with land points set to one.
+    """
+    land = np.sin(np.radians(longitude) * 20) + np.cos(np.radians(latitude) * 30) > 0.5
+    return land.astype(np.int8)
+
+
+class RegridGlobalToUK:
+    """Time the regridding of global realizations on to the UK domain."""
+
+    params = ["bilinear", "nearest-with-mask", "bilinear-2", "nearest-with-mask-2"]
+    param_names = ["regrid_mode"]
+    timeout = 600
+
+    def setup(self, regrid_mode):
+        data = random_field("global_10km", (N_REALIZATIONS,), 270.0, 290.0)
+        self.cube = set_up_variable_cube(data, **GLOBAL_GRID)
+
+        source_mask = set_up_variable_cube(
+            data[0], name="land_binary_mask", units="1", **GLOBAL_GRID
+        )
+        source_mask.data = _land(
+            *np.meshgrid(
+                source_mask.coord("latitude").points,
+                source_mask.coord("longitude").points,
+                indexing="ij",
+            )
+        )
+        target_grid = set_up_variable_cube(
+            np.zeros(DOMAINS["uk_2km"]["shape"], dtype=np.float32),
+            name="land_binary_mask",
+            units="1",
+            **grid_kwargs("uk_2km"),
+        )
+        target_grid.data = _land(*transform_grid_to_lat_lon(target_grid))
+        self.target_grid = target_grid
+        self.plugin = RegridLandSea(regrid_mode=regrid_mode, landmask=source_mask)
+
+    def time_process(self, regrid_mode):
+        self.plugin(self.cube, self.target_grid)
+
+    def peakmem_process(self, regrid_mode):
+        self.plugin(self.cube, self.target_grid)
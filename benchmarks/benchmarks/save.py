@@ -0,0 +1,84 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Benchmarks for writing netCDF files."""
+
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from improver.utilities.save import save_netcdf
+
+from . import DOMAINS, probability_cube
+
+THRESHOLDS = [0.03, 0.1, 0.5, 1.0, 4.0, 10.0, 25.0, 50.0]
+
+
+def _smooth_probabilities(domain: str, n_thresholds: int) -> np.ndarray:
+    """Generate probabilities that vary smoothly in space and decrease with
+    threshold, with large areas of zero and one, which compress like
+    forecast probabilities rather than like random noise.
+
+    Args:
+        domain:
+            Name of the domain in DOMAINS.
+        n_thresholds:
+            Number of thresholds.
+
+    Returns:
+        Array of probabilities with shape (n_thresholds, ny, nx).
+    """
+    ny, nx = DOMAINS[domain]["shape"]
+    y, x = np.ogrid[:ny, :nx]
+    field = np.sin(x / 53.0) * np.cos(y / 71.0) + np.sin((x + y) / 127.0)
+    offsets = np.linspace(-1.0, 1.5, n_thresholds)[:, np.newaxis, np.newaxis]
+    return np.clip(0.5 + field - offsets, 0.0, 1.0).astype(np.float32)
+
+
+class SaveProbabilities:
+    """Time the writing of probabilities at eight thresholds with each
+    compression codec and chunking strategy, and record the write throughput
+    and the size of the file."""
+
+    params = (["zlib", "zstd", "blosc_lz4"], ["slices", "blocks", "tiles"])
+    param_names = ["compression", "chunking"]
+    timeout = 600
+
+    def setup(self, compression, chunking):
+        self.cube = probability_cube(
+            "uk_2km",
+            THRESHOLDS,
+            variable_name="lwe_precipitation_rate",
+            threshold_units="mm h-1",
+        )
+        self.cube.data = _smooth_probabilities("uk_2km", len(THRESHOLDS))
+        self.directory = tempfile.mkdtemp()
+        self.filepath = os.path.join(self.directory, "output.nc")
+
+    def teardown(self, compression, chunking):
+        shutil.rmtree(self.directory)
+
+    def _save(self, compression, chunking):
+        save_netcdf(
+            self.cube.copy(), self.filepath, compression=compression, chunking=chunking
+        )
+
+    def time_save(self, compression, chunking):
+        self._save(compression, chunking)
+
+    def track_throughput(self, compression, chunking):
+        start = time.perf_counter()
+        self._save(compression, chunking)
+        return self.cube.data.nbytes / 2**20 / (time.perf_counter() - start)
+
+    track_throughput.unit = "MB/s"
+
+    def track_file_size(self, compression, chunking):
+        self._save(compression, chunking)
+        return os.path.getsize(self.filepath)
+
+    track_file_size.unit = "bytes"
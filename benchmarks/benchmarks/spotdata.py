@@ -0,0 +1,55 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Benchmarks for spot data extraction."""
+
+import numpy as np
+
+from improver.metadata.utilities import create_coordinate_hash
+from improver.spotdata.build_spotdata_cube import build_spotdata_cube
+from improver.spotdata.spot_extraction import SpotExtraction
+
+from . import DOMAINS, realization_cube
+
+N_SITES = 20000
+
+
+class SpotExtractionRealizations:
+    """Time the extraction of realizations at spot sites."""
+
+    params = list(DOMAINS)
+    param_names = ["domain"]
+    timeout = 600
+
+    def setup(self, domain):
+        self.cube = realization_cube(domain)
+        rng = np.random.default_rng(0)
+        n_y, n_x = DOMAINS[domain]["shape"]
+        neighbours = np.stack(
+            [
+                rng.integers(0, n_x, N_SITES),
+                rng.integers(0, n_y, N_SITES),
+                rng.uniform(-50, 50, N_SITES),
+            ]
+        ).astype(np.float32)
+        self.neighbour_cube = build_spotdata_cube(
+            neighbours[np.newaxis],
+            "grid_neighbours",
+            1,
+            rng.uniform(0, 1000, N_SITES).astype(np.float32),
+            rng.uniform(-60, 60, N_SITES).astype(np.float32),
+            rng.uniform(-180, 180, N_SITES).astype(np.float32),
+            [f"{site:05d}" for site in range(N_SITES)],
+            neighbour_methods=["nearest"],
+            grid_attributes=["x_index", "y_index", "vertical_displacement"],
+        )
+        self.neighbour_cube.attributes["model_grid_hash"] = create_coordinate_hash(
+            self.cube
+        )
+
+    def time_process(self, domain):
+        SpotExtraction()(self.neighbour_cube, self.cube)
+
+    def peakmem_process(self, domain):
+        SpotExtraction()(self.neighbour_cube, self.cube)
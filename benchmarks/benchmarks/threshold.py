@@ -0,0 +1,40 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Benchmarks for thresholding."""
+
+from improver.threshold import Threshold
+
+from . import DOMAINS, realization_cube
+
+THRESHOLDS = [273.15, 278.15, 283.15, 288.15]
+
+OPTIONS = {
+    "sharp": {},
+    "fuzzy": {"fuzzy_factor": 0.9},
+    "vicinity": {"vicinity": [20000.0]},
+}
+
+
+class ThresholdRealizations:
+    """Time the thresholding of realizations, collapsing the realization
+    coordinate to give probabilities."""
+
+    params = (list(DOMAINS), list(OPTIONS))
+    param_names = ["domain", "options"]
+    timeout = 600
+
+    def setup(self, domain, options):
+        self.cube = realization_cube(domain)
+        self.plugin = Threshold(
+            threshold_values=THRESHOLDS,
+            collapse_coord="realization",
+            **OPTIONS[options],
+        )
+
+    def time_process(self, domain, options):
+        self.plugin(self.cube.copy())
+
+    def peakmem_process(self, domain, options):
+        self.plugin(self.cube.copy())
@@ -7,7 +7,9 @@
 from abc import ABC, abstractmethod
 from collections.abc import Iterable
 from importlib.metadata import PackageNotFoundError, version
-from typing import Any
+from typing import Any, Tuple
+
+from improver import chunking, instrumentation
 
 try:
     __version__ = version("improver")
@@ -37,13 +39,27 @@ class BasePlugin(ABC):
         Returns:
             Output of self.process()
         """
-        return self.process(*args, **kwargs)
+        process = self.process
+        if chunking.chunked_execution_enabled():
+            process = chunking.chunked_process(self)
+        if instrumentation.plugin_trace_enabled():
+            return instrumentation.traced_call(self, process, *args, **kwargs)
+        return process(*args, **kwargs)
 
     @abstractmethod
     def process(self, *args, **kwargs) -> Any:
         """Abstract class for rest to implement."""
         pass
 
+    def chunkable_coords(self) -> Tuple[str, ...]:
+        """Axes or names of the coordinates along which the input cubes can
+        be split into blocks, with the plugin applied to each block giving
+        the same result as applying it to the whole cubes, when chunked
+        execution is enabled (see improver.chunking). An empty tuple by
+        default.
+        """
+        return ()
+
 
 class PostProcessingPlugin(BasePlugin):
     """An abstract class for IMPROVER post-processing plugins.
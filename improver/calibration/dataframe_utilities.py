@@ -17,8 +17,8 @@ from typing import List, Optional, Sequence, Tuple
 
 import numpy as np
 import pandas as pd
-from iris.coords import AuxCoord, DimCoord
-from iris.cube import Cube, CubeList
+from iris.coords import AuxCoord, Coord, DimCoord
+from iris.cube import Cube
 from pandas.core.frame import DataFrame
 from pandas.core.indexes.datetimes import DatetimeIndex
 
@@ -81,31 +81,6 @@ def _dataframe_column_check(df: DataFrame, compulsory_columns: Sequence) -> None
         raise ValueError(msg)
 
 
-def _preprocess_temporal_columns(df: DataFrame) -> DataFrame:
-    """Pre-process the columns with temporal dtype to convert
-    from numpy datetime objects to pandas datetime objects.
-    Casting the dtype of the columns to object type results
-    in columns of dtype "object" with the contents of the
-    columns being pandas datetime objects, rather than numpy
-    datetime objects.
-
-    Args:
-        df:
-            A DataFrame with temporal columns with numpy
-            datetime dtypes.
-
-    Returns:
-        A DataFrame without numpy datetime dtypes. The
-        content of the columns with temporal dtypes are
-        accessible as pandas datetime objects.
-    """
-    for col in df.select_dtypes(include=["datetime64[ns, UTC]"]):
-        df = df.astype({col: "O"})
-    for col in df.select_dtypes(include="timedelta64[ns]"):
-        df = df.astype({col: "O"})
-    return df
-
-
 def _unique_check(df: DataFrame, column: str) -> None:
     """Check whether the values in the column are unique.
 
@@ -150,49 +125,6 @@ def quantile_check(df: DataFrame) -> None:
         raise ValueError(msg)
 
 
-def _fill_missing_entries(df, combi_cols, static_cols, site_id_col):
-    """Fill the input DataFrame with rows that correspond to missing entries. The
-    expected entries are computed using all combinations of the values within the
-    combi_cols. In practice, this will allow support for creating entries for times
-    that are missing when a new site with an ID is added. If the DataFrame provided
-    is completely empty, then the empty DataFrame is returned.
-
-    Args:
-        df: DataFrame to be filled with rows corresponding to missing entries.
-        combi_cols: The key columns within the DataFrame. All combinations of the
-            values within these columns are expected to exist, otherwise, an
-            entry will be created.
-        static_cols: The names of the columns that are considered "static" and
-            therefore can be reliably filled using other entries for the given WMO ID.
-        site_id_col: Name of the column used to identify the sites within the DataFrame.
-
-    Returns:
-        DataFrame where any missing combination of the combi_cols will have been
-        created.
-    """
-    if df.empty:
-        return df
-
-    # Create a DataFrame with rows for all possible combinations of combi_cols.
-    # This results in rows with NaNs being created in the DataFrame.
-    unique_vals_from_combi_cols = [df[c].unique() for c in combi_cols]
-    new_index = pd.MultiIndex.from_product(
-        unique_vals_from_combi_cols, names=combi_cols
-    )
-    df = df.set_index(combi_cols).reindex(new_index).reset_index(level=combi_cols)
-
-    # Fill the NaNs within the static columns for each wmo_id.
-    filled_df = df.groupby(site_id_col)[combi_cols + static_cols].ffill().bfill()
-    df = df.drop(columns=static_cols)
-    df = df.merge(filled_df, on=combi_cols)
-
-    # Fill the blend_time and forecast_reference_time columns.
-    if "forecast_period" in df.columns:
-        for col in ["blend_time", "forecast_reference_time"]:
-            df[col] = df["time"] - df["forecast_period"]
-    return df
-
-
 def _ensure_consistent_static_cols(
     forecast_df: DataFrame, static_cols: List[str], site_id_col: str
 ) -> DataFrame:
@@ -227,38 +159,7 @@ def _ensure_consistent_static_cols(
     return forecast_df
 
 
-def _define_time_coord(
-    adate: pd.Timestamp, time_bounds: Optional[Sequence[pd.Timestamp]] = None
-) -> DimCoord:
-    """Define a time coordinate. The coordinate will have bounds,
-    if bounds are provided.
-
-    Args:
-        adate:
-            The point for the time coordinate.
-        time_bounds:
-            The values defining the bounds for the time coordinate.
-
-    Returns:
-        A time coordinate. This coordinate will have bounds, if bounds
-        are provided.
-    """
-    return DimCoord(
-        np.array(adate.timestamp(), dtype=TIME_COORDS["time"].dtype),
-        "time",
-        bounds=(
-            time_bounds
-            if time_bounds is None
-            else [
-                np.array(t.timestamp(), dtype=TIME_COORDS["time"].dtype)
-                for t in time_bounds
-            ]
-        ),
-        units=TIME_COORDS["time"].units,
-    )
-
-
-def _define_height_coord(height) -> AuxCoord:
+def _define_height_coord(height) -> DimCoord:
     """Define a height coordinate. A unit of metres is assumed.
 
     Args:
@@ -268,7 +169,7 @@ def _define_height_coord(height) -> AuxCoord:
     Returns:
         The height coordinate.
     """
-    return AuxCoord(np.array(height, dtype=np.float32), "height", units="m")
+    return DimCoord(np.array(height, dtype=np.float32), "height", units="m")
 
 
 def _training_dates_for_calibration(
@@ -528,36 +429,10 @@ def _prepare_dataframes(
     # Ensure time in truths is present in forecasts.
     truth_df = truth_df[truth_df["time"].isin(forecast_df["time"].unique())]
 
-    # Fill in any missing instances where every combination of the columns
-    # specified is expected to exist. This allows support for the
-    # introduction of new sites within the forecast_df and truth_df.
+    # Entries that are missing, e.g. for times before a new site was
+    # introduced, are not filled in here, as they are set to NaN when the
+    # DataFrames are converted to cubes.
     site_id_col = "station_id" if include_station_id else "wmo_id"
-    combi_cols = [site_id_col, "time", representation_type]
-    static_cols = [
-        "latitude",
-        "longitude",
-        "altitude",
-        "diagnostic",
-        "period",
-        "height",
-        "cf_name",
-        "units",
-        "experiment",
-        "forecast_period",
-    ]
-    if include_station_id:
-        # Add wmo_id as a static column, if station ID is present in both the
-        # forecast and truth DataFrames.
-        static_cols.append("wmo_id")
-    elif "station_id" in forecast_df.columns:
-        # Add station_id as a static column, if it is only present in the
-        # forecast DataFrame.
-        static_cols.append("station_id")
-
-    forecast_df = _fill_missing_entries(
-        forecast_df, combi_cols, static_cols, site_id_col
-    )
-
     forecast_df = _ensure_consistent_static_cols(
         forecast_df, ["altitude", "latitude", "longitude"], site_id_col
     )
@@ -569,15 +444,7 @@ def _prepare_dataframes(
     if adjacent_range > 0:
         forecast_df["forecast_period"] = fp_point
 
-    combi_cols = [site_id_col, "time"]
-    static_cols = ["latitude", "longitude", "altitude", "diagnostic"]
-    if include_station_id:
-        static_cols.append("wmo_id")
-    elif "station_id" in truth_df.columns:
-        static_cols.append("station_id")
-    truth_df = _fill_missing_entries(truth_df, combi_cols, static_cols, site_id_col)
-
-    # Sort to ensure a consistent ordering after filling in missing entries.
+    # Sort to ensure a consistent ordering.
     forecast_df = forecast_df.sort_values(by=forecast_cols, ignore_index=True)
     truth_df = truth_df.sort_values(by=truth_cols, ignore_index=True)
 
@@ -610,12 +477,182 @@ def _prepare_dataframes(
     return forecast_df, truth_df
 
 
+def _seconds_since_epoch(values: Sequence, dtype: np.dtype) -> np.ndarray:
+    """Convert datetimes to seconds since 1970-01-01 00:00:00 UTC.
+
+    Args:
+        values:
+            Datetimes, which may be timezone-aware or naive UTC datetimes.
+        dtype:
+            Data type of the returned array.
+
+    Returns:
+        Seconds since the epoch.
+    """
+    values = pd.DatetimeIndex(pd.to_datetime(values, utc=True))
+    seconds = (values - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(1, unit="seconds")
+    return np.asarray(seconds, dtype=dtype)
+
+
+def _factorize_sites(df: DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Assign an integer code to each site in a DataFrame, with the sites
+    ordered by wmo_id and then station_id, such that the order does not
+    depend on which sites are present at the first time. Sites are
+    identified by station_id, if present, or otherwise by wmo_id.
+
+    Args:
+        df:
+            DataFrame containing a wmo_id column and optionally a station_id
+            column.
+
+    Returns:
+        - The code of the site for each row of the DataFrame.
+        - The index of the first row for each site, in order of the codes.
+    """
+    site_cols = ["wmo_id", "station_id"] if "station_id" in df.columns else ["wmo_id"]
+    site_codes, _ = pd.factorize(df[site_cols[-1]])
+    _, first_rows = np.unique(site_codes, return_index=True)
+    # np.lexsort sorts by the last key first.
+    order = np.lexsort(
+        [df[col].to_numpy()[first_rows].astype(str) for col in reversed(site_cols)]
+    )
+    sorted_codes = np.empty_like(order)
+    sorted_codes[order] = np.arange(len(order))
+    return sorted_codes[site_codes], first_rows[order]
+
+
+def _spot_cube_from_codes(
+    df: DataFrame,
+    value_col: str,
+    codes: List[np.ndarray],
+    dim_coords: List[Tuple[DimCoord, List[Coord]]],
+    scalar_coords: List[DimCoord],
+) -> Cube:
+    """Build a spot data cube by scattering the values in a DataFrame into
+    an array with a dimension for each of the coordinates provided, followed
+    by the site dimension. Entries that are absent from the DataFrame are
+    set to NaN. Coordinates of length one are added as scalar coordinates.
+
+    Args:
+        df:
+            DataFrame containing the values, the site coordinates (altitude,
+            latitude, longitude, wmo_id and optionally station_id) and the
+            name and units of the diagnostic in the cf_name and units columns.
+        value_col:
+            Name of the column containing the values.
+        codes:
+            Integer codes for each row of the DataFrame along each of the
+            dimensions described by dim_coords.
+        dim_coords:
+            The dimension coordinate for each dimension preceding the site
+            dimension, with the auxiliary coordinates describing the same
+            dimension.
+        scalar_coords:
+            Coordinates to add as scalar coordinates.
+
+    Returns:
+        Spot data cube.
+
+    Raises:
+        ValueError: If the DataFrame contains more than one row for a site
+            at the same entry along the other dimensions.
+    """
+    site_codes, first_rows = _factorize_sites(df)
+    shape = tuple(len(coord.points) for coord, _ in dim_coords) + (len(first_rows),)
+    flat_index = np.ravel_multi_index((*codes, site_codes), shape)
+    if len(np.unique(flat_index)) < len(flat_index):
+        raise ValueError(
+            f"The DataFrame contains more than one {value_col} value for the "
+            "same site for at least one entry along the dimensions "
+            f"{[coord.name() for coord, _ in dim_coords]}."
+        )
+    data = np.full(shape, np.nan, dtype=np.float32)
+    data.flat[flat_index] = df[value_col].to_numpy(dtype=np.float32)
+
+    additional_dims = []
+    additional_dims_aux = []
+    scalar_coords = list(scalar_coords)
+    index = []
+    for coord, aux_coords in dim_coords:
+        if len(coord.points) > 1:
+            additional_dims.append(coord)
+            additional_dims_aux.append(aux_coords)
+            index.append(slice(None))
+        else:
+            scalar_coords.extend([coord, *aux_coords])
+            index.append(0)
+
+    sites = df.iloc[first_rows]
+    if "station_id" in sites.columns:
+        unique_site_id = sites["station_id"].values.astype("<U8")
+        unique_site_id_key = "station_id"
+    else:
+        unique_site_id = None
+        unique_site_id_key = None
+
+    cube = build_spotdata_cube(
+        data[tuple(index)],
+        df["cf_name"].values[0],
+        df["units"].values[0],
+        sites["altitude"].to_numpy(dtype=np.float32),
+        sites["latitude"].to_numpy(dtype=np.float32),
+        sites["longitude"].to_numpy(dtype=np.float32),
+        sites["wmo_id"].values.astype("U5"),
+        unique_site_id,
+        unique_site_id_key,
+        scalar_coords=scalar_coords,
+        additional_dims=additional_dims or None,
+        additional_dims_aux=additional_dims_aux or None,
+    )
+    return cube
+
+
+def _time_coords(
+    df: DataFrame, time_codes: np.ndarray, times: DatetimeIndex
+) -> Tuple[DimCoord, np.ndarray]:
+    """Define the time coordinate for the validity times within a DataFrame.
+    The time coordinate has bounds if the period column is populated, using
+    the period from the first row for each validity time.
+
+    Args:
+        df:
+            DataFrame containing time and period columns.
+        time_codes:
+            The index of the validity time of each row of the DataFrame.
+        times:
+            The validity times, sorted in ascending order.
+
+    Returns:
+        - The time coordinate.
+        - The index of the first row of the DataFrame for each validity time.
+    """
+    _, first_rows = np.unique(time_codes, return_index=True)
+    periods = df["period"].iloc[first_rows]
+    dtype = TIME_COORDS["time"].dtype
+    points = _seconds_since_epoch(times, dtype)
+    bounds = None
+    if not periods.isna().all():
+        starts = pd.DatetimeIndex(pd.to_datetime(times, utc=True)) - pd.to_timedelta(
+            periods.values
+        )
+        bounds = np.stack([_seconds_since_epoch(starts, dtype), points], axis=-1)
+    time_coord = DimCoord(
+        points, "time", bounds=bounds, units=TIME_COORDS["time"].units
+    )
+    return time_coord, first_rows
+
+
 def forecast_dataframe_to_cube(
     df: DataFrame, training_dates: DatetimeIndex, forecast_period: int
 ) -> Cube:
     """Convert a forecast DataFrame into an iris Cube. The percentiles
     within the forecast DataFrame are rebadged as realizations.
 
+    The forecasts are scattered into an array with dimensions of percentile
+    or realization, time and site, using the integer codes of the values in
+    each row along each dimension, and the cube is built once from this
+    array. Entries that are absent from the DataFrame are set to NaN.
+
     Args:
         df:
             DataFrame expected to contain the following columns: forecast,
@@ -635,99 +672,72 @@ def forecast_dataframe_to_cube(
 
     representation_type = get_forecast_representation(df)
     fp_point = pd.Timedelta(int(forecast_period), unit="seconds")
-    cubelist = CubeList()
+    df = df.loc[df["time"].isin(training_dates) & (df["forecast_period"] == fp_point)]
+    if df.empty:
+        return
 
-    for adate in training_dates:
-        time_df = df.loc[(df["time"] == adate) & (df["forecast_period"] == fp_point)]
+    # The following columns are expected to contain one unique value
+    # per column.
+    for col in ["period", "height", "cf_name", "units", "diagnostic"]:
+        _unique_check(df, col)
 
-        if time_df.empty:
-            continue
-        time_df = _preprocess_temporal_columns(time_df)
+    time_codes, times = pd.factorize(df["time"], sort=True)
+    time_coord, first_rows = _time_coords(df, time_codes, times)
+    frt_points = _seconds_since_epoch(
+        df["forecast_reference_time"].iloc[first_rows],
+        TIME_COORDS["forecast_reference_time"].dtype,
+    )
+    # The forecast reference time is a scalar coordinate if it is the same
+    # for all validity times, as when using adjacent validity times from a
+    # single forecast.
+    frt_is_scalar = len(np.unique(frt_points)) == 1
+    # As on a cube merged from cubes for each validity time, the forecast
+    # reference time is an AuxCoord if it is repeated, as when using adjacent
+    # validity times from several forecasts, and otherwise a DimCoord.
+    frt_coord_type = (
+        DimCoord if frt_is_scalar or np.all(np.diff(frt_points) > 0) else AuxCoord
+    )
+    frt_coord = frt_coord_type(
+        frt_points[:1] if frt_is_scalar else frt_points,
+        "forecast_reference_time",
+        units=TIME_COORDS["forecast_reference_time"].units,
+    )
 
-        # The following columns are expected to contain one unique value
-        # per column.
-        for col in ["period", "height", "cf_name", "units", "diagnostic"]:
-            _unique_check(time_df, col)
+    fp_dtype = TIME_COORDS["forecast_period"].dtype
+    fp_bounds = None
+    if not df["period"].isna().all():
+        period = pd.Timedelta(df["period"].values[0])
+        fp_bounds = np.array(
+            [(fp_point - period).total_seconds(), fp_point.total_seconds()],
+            dtype=fp_dtype,
+        )
+    fp_coord = DimCoord(
+        np.array(fp_point.total_seconds(), dtype=fp_dtype),
+        "forecast_period",
+        bounds=fp_bounds,
+        units=TIME_COORDS["forecast_period"].units,
+    )
+    height_coord = _define_height_coord(df["height"].values[0])
 
-        if time_df["period"].isna().all():
-            time_bounds = None
-            fp_bounds = None
-        else:
-            period = time_df["period"].values[0]
-            time_bounds = [adate - period, adate]
-            fp_bounds = [fp_point - period, fp_point]
-
-        time_coord = _define_time_coord(adate, time_bounds)
-        height_coord = _define_height_coord(time_df["height"].values[0])
-
-        fp_coord = AuxCoord(
-            np.array(
-                fp_point.total_seconds(), dtype=TIME_COORDS["forecast_period"].dtype
-            ),
-            "forecast_period",
-            bounds=(
-                fp_bounds
-                if fp_bounds is None
-                else [
-                    np.array(
-                        f.total_seconds(), dtype=TIME_COORDS["forecast_period"].dtype
-                    )
-                    for f in fp_bounds
-                ]
-            ),
-            units=TIME_COORDS["forecast_period"].units,
+    var_codes, var_values = pd.factorize(df[representation_type], sort=True)
+    if representation_type == "percentile":
+        var_coord = DimCoord(
+            np.asarray(var_values, dtype=np.float32), long_name="percentile", units="%"
         )
-        frt_coord = AuxCoord(
-            np.array(
-                time_df["forecast_reference_time"].values[0].timestamp(),
-                dtype=TIME_COORDS["forecast_reference_time"].dtype,
-            ),
-            "forecast_reference_time",
-            units=TIME_COORDS["forecast_reference_time"].units,
+    elif representation_type == "realization":
+        var_coord = DimCoord(
+            np.asarray(var_values, dtype=np.int32),
+            standard_name="realization",
+            units="1",
         )
 
-        for var_val in sorted(time_df[representation_type].unique()):
-            var_df = time_df.loc[time_df[representation_type] == var_val]
-            cf_name = var_df["cf_name"].values[0]
-            if representation_type == "percentile":
-                var_coord = DimCoord(
-                    np.float32(var_val), long_name="percentile", units="%"
-                )
-            elif representation_type == "realization":
-                var_coord = DimCoord(
-                    np.int32(var_val), standard_name="realization", units="1"
-                )
-
-            if "station_id" in var_df.columns:
-                unique_site_id = var_df["station_id"].values.astype("<U8")
-                unique_site_id_key = "station_id"
-            else:
-                unique_site_id = None
-                unique_site_id_key = None
-
-            cube = build_spotdata_cube(
-                var_df["forecast"].astype(np.float32),
-                cf_name,
-                var_df["units"].values[0],
-                var_df["altitude"].astype(np.float32),
-                var_df["latitude"].astype(np.float32),
-                var_df["longitude"].astype(np.float32),
-                var_df["wmo_id"].values.astype("U5"),
-                unique_site_id,
-                unique_site_id_key,
-                scalar_coords=[
-                    time_coord,
-                    frt_coord,
-                    fp_coord,
-                    var_coord,
-                    height_coord,
-                ],
-            )
-            cubelist.append(cube)
-
-    if not cubelist:
-        return
-    cube = cubelist.merge_cube()
+    cube = _spot_cube_from_codes(
+        df,
+        "forecast",
+        [var_codes, time_codes],
+        [(var_coord, []), (time_coord, [] if frt_is_scalar else [frt_coord])],
+        [fp_coord, height_coord] + ([frt_coord] if frt_is_scalar else []),
+    )
 
     if representation_type == "percentile":
         return RebadgePercentilesAsRealizations()(cube)
@@ -737,6 +747,11 @@ def forecast_dataframe_to_cube(
 def truth_dataframe_to_cube(df: DataFrame, training_dates: DatetimeIndex) -> Cube:
     """Convert a truth DataFrame into an iris Cube.
 
+    The truths are scattered into an array with dimensions of time and site,
+    using the integer codes of the values in each row along each dimension,
+    and the cube is built once from this array. Entries that are absent from
+    the DataFrame are set to NaN.
+
     Args:
         df:
             DataFrame expected to contain the following columns: ob_value,
@@ -748,54 +763,21 @@ def truth_dataframe_to_cube(df: DataFrame, training_dates: DatetimeIndex) -> Cub
     Returns:
         Cube containing the truths from the training period.
     """
+    df = df.loc[df["time"].isin(training_dates)]
+    if df.empty:
+        return
 
-    cubelist = CubeList()
-    for adate in training_dates:
-        time_df = df.loc[(df["time"] == adate)]
-
-        time_df = _preprocess_temporal_columns(time_df)
-
-        if time_df.empty:
-            continue
-
-        # The following columns are expected to contain one unique value
-        # per column.
-        _unique_check(time_df, "diagnostic")
-
-        if time_df["period"].isna().all():
-            time_bounds = None
-        else:
-            period = time_df["period"].values[0]
-            time_bounds = [adate - period, adate]
-
-        time_coord = _define_time_coord(adate, time_bounds)
-        height_coord = _define_height_coord(time_df["height"].values[0])
+    # The following columns are expected to contain one unique value
+    # per column.
+    _unique_check(df, "diagnostic")
 
-        if "station_id" in time_df.columns:
-            unique_site_id = time_df["station_id"].values.astype("<U8")
-            unique_site_id_key = "station_id"
-        else:
-            unique_site_id = None
-            unique_site_id_key = None
-
-        cube = build_spotdata_cube(
-            time_df["ob_value"].astype(np.float32),
-            time_df["cf_name"].values[0],
-            time_df["units"].values[0],
-            time_df["altitude"].astype(np.float32),
-            time_df["latitude"].astype(np.float32),
-            time_df["longitude"].astype(np.float32),
-            time_df["wmo_id"].values.astype("U5"),
-            unique_site_id,
-            unique_site_id_key,
-            scalar_coords=[time_coord, height_coord],
-        )
-        cubelist.append(cube)
+    time_codes, times = pd.factorize(df["time"], sort=True)
+    time_coord, _ = _time_coords(df, time_codes, times)
+    height_coord = _define_height_coord(df["height"].values[0])
 
-    if not cubelist:
-        return
-
-    return cubelist.merge_cube()
+    return _spot_cube_from_codes(
+        df, "ob_value", [time_codes], [(time_coord, [])], [height_coord]
+    )
 
 
 def forecast_and_truth_dataframes_to_cubes(
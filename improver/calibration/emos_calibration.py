@@ -27,6 +27,7 @@ from scipy.stats import norm
 
 from improver import BasePlugin, PostProcessingPlugin
 from improver.calibration.utilities import (
+    _ceiling_fp,
     broadcast_data_to_time_coord,
     check_data_sufficiency,
     check_forecast_consistency,
@@ -1698,6 +1699,48 @@ class ApplyEMOS(PostProcessingPlugin):
     Class to calibrate an input forecast given EMOS coefficients
     """
 
+    @staticmethod
+    def _coefficients_for_forecast_period(
+        forecast: Cube, coefficients: CubeList
+    ) -> CubeList:
+        """Extract the coefficients for the forecast period of the forecast
+        from coefficients estimated for several forecast periods, which have
+        a forecast_period dimension. As in forecast_coords_match, the forecast
+        periods are compared after rounding up to the next hour.
+
+        Args:
+            forecast:
+                Forecast to be calibrated.
+            coefficients:
+                EMOS coefficients, which may have a forecast_period dimension.
+
+        Returns:
+            The coefficients for the forecast period of the forecast.
+
+        Raises:
+            ValueError: If the coefficients have a forecast_period dimension
+                that does not include the forecast period of the forecast.
+        """
+        (forecast_period,) = _ceiling_fp(forecast)
+        extracted = CubeList()
+        for cube in coefficients:
+            dims = cube.coord_dims("forecast_period")
+            if not dims:
+                extracted.append(cube)
+                continue
+            matches = np.flatnonzero(_ceiling_fp(cube) == forecast_period)
+            if not matches.size:
+                available = ", ".join(f"{fp:g}" for fp in _ceiling_fp(cube))
+                raise ValueError(
+                    "The coefficients do not include the forecast period of "
+                    f"the forecast, {forecast_period:g} hours. Coefficients are "
+                    f"available for forecast periods of {available} hours."
+                )
+            index = [slice(None)] * cube.ndim
+            index[dims[0]] = matches[0]
+            extracted.append(cube[tuple(index)])
+        return extracted
+
     def __init__(self, percentiles: Optional[Sequence] = None):
         """Initialise class.
 
@@ -1768,7 +1811,9 @@ class ApplyEMOS(PostProcessingPlugin):
                 Uncalibrated forecast as probabilities, percentiles or
                 realizations
             coefficients:
-                EMOS coefficients
+                EMOS coefficients. If the coefficients have a forecast_period
+                dimension, the coefficients for the forecast period of the
+                forecast are used.
             additional_fields:
                 Additional fields to be used as forecast predictors.
             land_sea_mask:
@@ -1809,6 +1854,7 @@ class ApplyEMOS(PostProcessingPlugin):
             scale parameters of the calibrated forecast distribution if
             return_parameters is True.
         """
+        coefficients = self._coefficients_for_forecast_period(forecast, coefficients)
         self.input_forecast_type = get_forecast_type(forecast)
         self.output_forecast_type = (
             "probabilities" if prob_template else self.input_forecast_type
@@ -13,10 +13,9 @@ import iris
 import numpy as np
 import pandas as pd
 from iris.cube import Cube, CubeList
-from iris.pandas import as_data_frame
 
 from improver import PostProcessingPlugin
-from improver.calibration import add_static_feature_from_cube_to_df, add_warning_comment
+from improver.calibration import add_warning_comment
 from improver.calibration.quantile_regression_random_forest import (
     ApplyQuantileRegressionRandomForests,
     quantile_forest_package_available,
@@ -33,9 +32,6 @@ except ModuleNotFoundError:
         pass
 
 
-iris.FUTURE.pandas_ndim = True
-
-
 class PrepareAndApplyQRF(PostProcessingPlugin):
     """Prepare the input forecast for application of a trained Quantile Regression
     Random Forest (QRF) model and apply the QRF model."""
@@ -47,6 +43,8 @@ class PrepareAndApplyQRF(PostProcessingPlugin):
         unique_site_id_keys: list[str] = ["wmo_id"],
         cycletime: Optional[str] = None,
         forecast_period: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        n_workers: int = 1,
     ):
         """Initialise the plugin.
 
@@ -83,12 +81,19 @@ class PrepareAndApplyQRF(PostProcessingPlugin):
                 The forecast period of the forecast to be calibrated in seconds. If not
                 provided, the forecast period found in the first forecast cube
                 will be used.
+            chunk_size (int):
+                Maximum number of points predicted by each call of the QRF model.
+                If None, the points are divided equally between the workers.
+            n_workers (int):
+                Number of threads predicting chunks of points concurrently.
         """
         self.feature_config = feature_config
         self.target_cf_name = target_cf_name
         self.unique_site_id_keys = unique_site_id_keys
         self.cycletime = cycletime
         self.forecast_period = forecast_period
+        self.chunk_size = chunk_size
+        self.n_workers = n_workers
         self.quantile_forest_installed = quantile_forest_package_available()
 
     def _get_inputs(
@@ -230,40 +235,30 @@ class PrepareAndApplyQRF(PostProcessingPlugin):
                     )
         return cube_inputs
 
-    def _cube_to_dataframe(self, cube_inputs: CubeList) -> pd.DataFrame:
-        """Convert cube inputs to a pandas DataFrame.
+    @staticmethod
+    def _restore_dimensions(
+        calibrated_forecast: np.ndarray, template: Cube
+    ) -> np.ndarray:
+        """Arrange the calibrated forecast, which has the points of the template
+        along the first dimension and the quantiles along the second dimension,
+        in the dimensions of the template.
 
         Args:
-            cube_inputs: List of cubes containing the features and the forecast to be
-                calibrated.
+            calibrated_forecast: Calibrated forecast at each point.
+            template: Forecast cube with a percentile or realization coordinate.
+
         Returns:
-            DataFrame containing the data from the cubes, with auxiliary coordinates
-            included as columns.
+            Calibrated forecast with the shape of the template.
         """
-        # Convert the first cube to a DataFrame.
-        df = as_data_frame(cube_inputs[0], add_aux_coords=True).reset_index()
-
-        possible_columns = [
-            *self.unique_site_id_keys,
-            "time",
-            "forecast_reference_time",
-            "forecast_period",
-            "percentile",
-            "realization",
-        ]
-
-        # Iteratively convert remaining cubes to DataFrame and merge.
-        for cube in cube_inputs[1:]:
-            df = add_static_feature_from_cube_to_df(
-                df,
-                cube,
-                cube.name(),
-                possible_columns,
-            )
-
-        for column in ["forecast_reference_time", "time"]:
-            df[column] = df[column].apply(lambda x: x._to_real_datetime())
-        return df
+        representation_name = [
+            n for n in ["percentile", "realization"] if template.coords(n)
+        ][0]
+        if not template.coord_dims(representation_name):
+            return calibrated_forecast.reshape(template.shape)
+        (dim,) = template.coord_dims(representation_name)
+        other_shape = template.shape[:dim] + template.shape[dim + 1 :]
+        calibrated_forecast = calibrated_forecast.reshape(*other_shape, -1)
+        return np.moveaxis(calibrated_forecast, -1, dim)
 
     def process(
         self,
@@ -287,7 +282,9 @@ class PrepareAndApplyQRF(PostProcessingPlugin):
 
         Returns:
             iris.cube.Cube:
-                The calibrated forecast cube.
+                The calibrated forecast cube, at the sites of the forecast to be
+                calibrated and in the same order. The features from the other
+                cubes are matched to these sites using the unique site ID keys.
         """
         if qrf_descriptors is None:
             # If no descriptors are provided, return the input forecast with a warning.
@@ -318,9 +315,13 @@ class PrepareAndApplyQRF(PostProcessingPlugin):
         elif forecast_cube.coords("percentile"):
             quantile_list = (forecast_cube.coord("percentile").points / 100.0).tolist()
 
-        cube_inputs = self._update_forecast_reference_time_and_period(cube_inputs)
-
-        df = self._cube_to_dataframe(cube_inputs)
+        # The features are constructed at the points of the first cube, with the
+        # points of the other cubes matched to these by site and time, so a copy of
+        # the forecast is placed first to give the calibrated forecast at the points
+        # of the template, in the same order.
+        cube_inputs = self._update_forecast_reference_time_and_period(
+            CubeList([template_forecast_cube.copy(), *cube_inputs])
+        )
 
         calibrated_forecast = ApplyQuantileRegressionRandomForests(
             target_name=self.target_cf_name,
@@ -329,9 +330,11 @@ class PrepareAndApplyQRF(PostProcessingPlugin):
             transformation=transformation,
             pre_transform_addition=pre_transform_addition,
             unique_site_id_keys=self.unique_site_id_keys,
-        )(qrf_model, df)
+            chunk_size=self.chunk_size,
+            n_workers=self.n_workers,
+        )(qrf_model, cube_inputs)
         calibrated_forecast_cube = template_forecast_cube.copy(
-            data=np.broadcast_to(calibrated_forecast.T, template_forecast_cube.shape)
+            data=self._restore_dimensions(calibrated_forecast, template_forecast_cube)
         )
 
         return calibrated_forecast_cube
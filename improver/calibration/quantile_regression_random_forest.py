@@ -4,10 +4,14 @@
 # See LICENSE in the root of the repository for full licensing details.
 """Plugins to perform quantile regression using random forests."""
 
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Union
 
 import numpy as np
 import pandas as pd
+from iris.cube import Cube, CubeList
+from iris.util import broadcast_to_shape
 
 from improver import BasePlugin, PostProcessingPlugin
 from improver.calibration.dataframe_utilities import quantile_check
@@ -335,6 +339,371 @@ def prep_features_from_config(
     return df, feature_column_names
 
 
+def _is_collapsed_feature(feature_name: str) -> bool:
+    """Return True if a feature is computed over the percentiles or realizations
+    of a variable e.g. the mean."""
+    return (
+        feature_name in ["mean", "std", "min", "max"]
+        or feature_name.startswith("percentile_")
+        or feature_name.startswith("members_below")
+        or feature_name.startswith("members_above")
+    )
+
+
+def _members_by_point(cube: Cube, representation_name: Optional[str]) -> np.ndarray:
+    """Return the data of a cube as a 2d array with the percentiles or
+    realizations along the first dimension and all other points along the
+    second dimension. Masked points are filled with NaN.
+
+    Args:
+        cube: Cube with the percentile or realization dimension, if any, and
+            the other dimensions in the order of the other input cubes.
+        representation_name: Name of the percentile or realization coordinate.
+
+    Returns:
+        Array of shape (members, points), where cubes without a percentile or
+        realization dimension have one member.
+    """
+    data = cube.data
+    if np.ma.isMaskedArray(data):
+        data = np.ma.filled(data.astype(np.result_type(data.dtype, np.float32)), np.nan)
+    if representation_name and cube.coords(representation_name, dim_coords=True):
+        (dim,) = cube.coord_dims(representation_name)
+        data = np.moveaxis(data, dim, 0)
+        return data.reshape(data.shape[0], -1)
+    return data.reshape(1, -1)
+
+
+def _coord_by_point(
+    cube: Cube, coord_name: str, representation_name: Optional[str]
+) -> np.ndarray:
+    """Return the points of a coordinate of a cube at each point of the cube,
+    excluding the percentile or realization dimension.
+
+    Args:
+        cube: Cube with the coordinate.
+        coord_name: Name of the coordinate.
+        representation_name: Name of the percentile or realization coordinate.
+
+    Returns:
+        1d array of coordinate points.
+    """
+    coord = cube.coord(coord_name)
+    points = coord.points
+    if coord.units.is_time_reference():
+        points = np.array(coord.units.num2pydate(points))
+    dims = cube.coord_dims(coord)
+    if dims:
+        points = broadcast_to_shape(points, cube.shape, dims)
+    else:
+        points = np.broadcast_to(points[0], cube.shape)
+    return _members_by_point(cube.copy(data=points), representation_name)[0]
+
+
+def _point_index(
+    cube: Cube,
+    reference_cube: Cube,
+    merge_keys: list[str],
+    representation_name: Optional[str],
+    float_decimals: int = 4,
+) -> Optional[np.ndarray]:
+    """Return the index of the point of a cube matching each point of the
+    reference cube, as the left merge of add_feature_from_df_to_df does, using
+    the coordinates in merge_keys that are present on both cubes. Float
+    coordinates are rounded to float_decimals decimal places before matching.
+
+    Args:
+        cube: Cube containing a feature.
+        reference_cube: Cube defining the points of the features.
+        merge_keys: Names of the coordinates that can be used to match points,
+            e.g. the coordinates identifying each site and the time.
+        representation_name: Name of the percentile or realization coordinate.
+        float_decimals: Number of decimal places to round float coordinates to
+            before matching.
+
+    Returns:
+        Array with the index of the matching point of the cube for each point of
+        the reference cube, or -1 where there is no matching point. None if the
+        points of both cubes match in order.
+
+    Raises:
+        ValueError: If the cubes share none of the merge_keys coordinates and
+            have different numbers of points.
+        ValueError: If points of the cube are not uniquely identified by the
+            merge_keys coordinates.
+    """
+    keys = [
+        key for key in merge_keys if cube.coords(key) and reference_cube.coords(key)
+    ]
+    n_points = _members_by_point(cube, representation_name).shape[1]
+    n_reference = _members_by_point(reference_cube, representation_name).shape[1]
+    if not keys:
+        if n_points != n_reference:
+            msg = (
+                f"The cube '{cube.name()}' has {n_points} points, but the "
+                f"cube '{reference_cube.name()}' has {n_reference} points."
+            )
+            raise ValueError(msg)
+        return None
+
+    def key_values(source: Cube) -> list[np.ndarray]:
+        values = []
+        for key in keys:
+            points = _coord_by_point(source, key, representation_name)
+            if np.issubdtype(points.dtype, np.floating):
+                points = np.round(points * 10**float_decimals)
+            values.append(points)
+        return values
+
+    cube_keys = key_values(cube)
+    reference_keys = key_values(reference_cube)
+    if n_points == n_reference and all(
+        np.array_equal(a, b, equal_nan=a.dtype.kind == "f")
+        for a, b in zip(cube_keys, reference_keys)
+    ):
+        return None
+    cube_index = pd.MultiIndex.from_arrays(cube_keys, names=keys)
+    if not cube_index.is_unique:
+        msg = (
+            f"The points of the cube '{cube.name()}' are not uniquely identified "
+            f"by the coordinates {keys}."
+        )
+        raise ValueError(msg)
+    return cube_index.get_indexer(pd.MultiIndex.from_arrays(reference_keys, names=keys))
+
+
+def _collapsed_feature(
+    values: np.ndarray,
+    feature_name: str,
+    transformation: Optional[str],
+    pre_transform_addition: np.float32,
+) -> np.ndarray:
+    """Compute a feature over the percentiles or realizations at each point,
+    ignoring NaNs.
+
+    Args:
+        values: Array of shape (members, points).
+        feature_name: Feature to be computed, which is one of "mean", "std", "min",
+            "max", "percentile_<perc>", "members_below_<threshold>" or
+            "members_above_<threshold>".
+        transformation: Transformation applied to the thresholds of the
+            members_below and members_above features.
+        pre_transform_addition: Value added to the thresholds before
+            transformation.
+
+    Returns:
+        1d array of the feature at each point, with the dtype of the values.
+    """
+    dtype = values.dtype
+    if feature_name.startswith(("members_below", "members_above")):
+        threshold = float(feature_name.split("_")[2])
+        if transformation is not None:
+            threshold = apply_transformation(
+                threshold, transformation, pre_transform_addition
+            )
+        if feature_name.startswith("members_below"):
+            result = np.sum(values < threshold, axis=0)
+        else:
+            result = np.sum(values > threshold, axis=0)
+        return result.astype(dtype)
+
+    if feature_name == "mean":
+        # Compensated summation in the precision of the values, as used by
+        # pandas, so that the features match those used in training.
+        total = np.zeros(values.shape[1], dtype=dtype)
+        compensation = np.zeros_like(total)
+        for member in values:
+            valid = ~np.isnan(member)
+            increment = np.where(valid, member - compensation, 0)
+            new_total = total + increment
+            compensation = np.where(
+                valid, (new_total - total) - increment, compensation
+            )
+            total = new_total
+        with np.errstate(invalid="ignore", divide="ignore"):
+            count = np.sum(~np.isnan(values), axis=0).astype(dtype)
+            return np.where(count > 0, total / count, np.nan).astype(dtype)
+
+    # Other statistics are computed in double precision, as by pandas.
+    values = values.astype(np.float64)
+    with warnings.catch_warnings():
+        # Points at which all values are NaN give NaN with a warning.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        if feature_name == "std":
+            # The sample standard deviation is zero for a single value.
+            result = np.nanstd(values, axis=0, ddof=1)
+            result[np.sum(np.isfinite(values), axis=0) < 2] = 0
+        elif feature_name == "min":
+            result = np.nanmin(values, axis=0)
+        elif feature_name == "max":
+            result = np.nanmax(values, axis=0)
+        else:
+            perc = float(feature_name.split("_")[1])
+            result = np.nanpercentile(values, perc, axis=0)
+    return result.astype(dtype)
+
+
+def prep_features_from_cubes(
+    cube_inputs: CubeList,
+    feature_config: dict[str, list[str]],
+    transformation: Optional[str] = None,
+    pre_transform_addition: np.float32 = 0,
+    unique_site_id_keys: Union[list[str], str] = "wmo_id",
+) -> tuple[np.ndarray, list[str]]:
+    """Construct the features defined by the feature_config directly from aligned
+    cubes, giving the same features as prep_features_from_config and
+    sanitise_forecast_dataframe do for the DataFrame of the cubes.
+
+    The points of the first cube, excluding its percentile or realization
+    dimension, define the rows of the feature array. The points of the other cubes
+    are matched to these using the coordinates identifying each site and, where
+    present, the time, forecast_reference_time and forecast_period coordinates,
+    as when merging the DataFrames of the cubes. Features are NaN at points with
+    no match. The percentile or realization dimension of the cubes, if present,
+    must have the same length. Features computed over the percentiles or
+    realizations, such as the mean, are NaN at points where any coordinate
+    identifying the site is NaN.
+
+    Args:
+        cube_inputs: Cubes containing the variables and static features, with
+            the cube defining the points first.
+        feature_config: Feature configuration defining the features to be used for
+            QRF.
+        transformation: Transformation applied to the thresholds of the
+            members_below and members_above features.
+        pre_transform_addition: Value added to the thresholds before
+            transformation.
+        unique_site_id_keys: The names of the coordinates that uniquely identify
+            each site, e.g. "wmo_id" or ["latitude", "longitude"].
+
+    Returns:
+        Float32 array of features with shape (points, features) and a list of the
+        names of the features, as returned by prep_features_from_config.
+
+    Raises:
+        ValueError: If a variable expected in the feature_config is not present in
+            the cubes e.g. "surface temperature".
+        ValueError: If a feature expected for a specific variable in the
+            feature_config is not supported e.g. "interquartile_range".
+        ValueError: If all computed values for a feature are NaN.
+        ValueError: If a cube shares no coordinates identifying the points with
+            the first cube and has a different number of points.
+        ValueError: If the points of a cube are not uniquely identified by these
+            coordinates.
+    """
+    if isinstance(unique_site_id_keys, str):
+        unique_site_id_keys = [unique_site_id_keys]
+    reference_cube = cube_inputs[0]
+    cubes = {cube.name(): cube for cube in reversed(cube_inputs)}
+    representation_name = next(
+        (n for n in ["percentile", "realization"] if reference_cube.coords(n)), None
+    )
+    if representation_name == "percentile":
+        quantile_check(
+            pd.DataFrame({"percentile": reference_cube.coord("percentile").points})
+        )
+    n_points = _members_by_point(reference_cube, representation_name).shape[1]
+
+    # Points at which the site can not be identified are excluded from the
+    # computation of features over the percentiles or realizations.
+    invalid_site = np.zeros(n_points, dtype=bool)
+    for key in unique_site_id_keys:
+        if reference_cube.coords(key):
+            site_ids = _coord_by_point(reference_cube, key, representation_name)
+            if np.issubdtype(site_ids.dtype, np.floating):
+                invalid_site |= np.isnan(site_ids)
+
+    members = {}
+
+    merge_keys = [
+        *unique_site_id_keys,
+        "time",
+        "forecast_reference_time",
+        "forecast_period",
+    ]
+
+    def values_of(name: str) -> np.ndarray:
+        if name not in members:
+            cube = cubes[name]
+            values = _members_by_point(cube, representation_name)
+            if cube is not reference_cube:
+                index = _point_index(
+                    cube, reference_cube, merge_keys, representation_name
+                )
+                if index is not None:
+                    values = values.astype(np.result_type(values.dtype, np.float32))
+                    values = np.where(index >= 0, values[:, index], np.nan)
+            members[name] = values
+        return members[name]
+
+    feature_columns = []
+    feature_column_names = []
+    for variable_name, feature_names in feature_config.items():
+        if variable_name not in cubes:
+            msg = f"Feature '{variable_name}' is not present in the forecast cubes."
+            raise ValueError(msg)
+        for feature_name in feature_names:
+            if _is_collapsed_feature(feature_name):
+                values = _collapsed_feature(
+                    values_of(variable_name),
+                    feature_name,
+                    transformation,
+                    pre_transform_addition,
+                )
+                values[invalid_site] = np.nan
+                if np.isnan(values).all():
+                    msg = (
+                        f"All computed values for feature '{feature_name}' "
+                        f"and variable '{variable_name}' are NaN."
+                    )
+                    raise ValueError(msg)
+                feature_column_names.append(f"{variable_name}_{feature_name}")
+            elif feature_name.startswith(("day_of_year", "hour_of_day")):
+                time = _coord_by_point(reference_cube, "time", representation_name)
+                if feature_name.startswith("day_of_year"):
+                    values = np.array([t.timetuple().tm_yday for t in time], np.int32)
+                    period = DAYS_IN_YEAR + 1
+                else:
+                    values = np.array([t.hour for t in time], np.int32)
+                    period = HOURS_IN_DAY
+                if feature_name.endswith("_sin"):
+                    values = np.sin(2 * np.pi * values / period).astype(np.float32)
+                elif feature_name.endswith("_cos"):
+                    values = np.cos(2 * np.pi * values / period).astype(np.float32)
+                elif feature_name not in ["day_of_year", "hour_of_day"]:
+                    msg = (
+                        f"Feature '{feature_name}' for variable "
+                        f"'{variable_name}' is not supported."
+                    )
+                    raise ValueError(msg)
+                feature_column_names.append(feature_name)
+            elif feature_name == "static":
+                values = values_of(variable_name)[0]
+                feature_column_names.append(variable_name)
+            elif reference_cube.coords(feature_name):
+                # For example, latitude, longitude and altitude, which are not
+                # tied to a specific variable.
+                values = _coord_by_point(
+                    reference_cube, feature_name, representation_name
+                )
+                feature_column_names.append(feature_name)
+            elif feature_name in cubes:
+                values = values_of(feature_name)[0]
+                feature_column_names.append(feature_name)
+            else:
+                msg = (
+                    f"Feature '{feature_name}' for variable "
+                    f"'{variable_name}' is not supported."
+                )
+                raise ValueError(msg)
+            feature_columns.append(values)
+
+    feature_values = np.empty((n_points, len(feature_columns)), dtype=np.float32)
+    for index, values in enumerate(feature_columns):
+        feature_values[:, index] = values
+    return feature_values, feature_column_names
+
+
 def _check_valid_transformation(transformation: str):
     """Check if the transformation is one of the supported types.
     Args:
@@ -545,6 +914,8 @@ class ApplyQuantileRegressionRandomForests(PostProcessingPlugin):
         transformation: str = None,
         pre_transform_addition: np.float32 = 0,
         unique_site_id_keys: list[str] = ["wmo_id"],
+        chunk_size: Optional[int] = None,
+        n_workers: int = 1,
     ) -> None:
         """Initialise the plugin.
 
@@ -575,6 +946,12 @@ class ApplyQuantileRegressionRandomForests(PostProcessingPlugin):
                 Value to be added before transformation.
             unique_site_id_keys: The names of the coordinates that uniquely identify
                 each site, e.g. "wmo_id" or ["latitude", "longitude"].
+            chunk_size (int):
+                Maximum number of points predicted by each call of the QRF model,
+                which bounds the memory used by the prediction. If None, the
+                points are divided equally between the workers.
+            n_workers (int):
+                Number of threads predicting chunks of points concurrently.
 
         """
         self.target_name = target_name
@@ -584,6 +961,8 @@ class ApplyQuantileRegressionRandomForests(PostProcessingPlugin):
         _check_valid_transformation(self.transformation)
         self.pre_transform_addition = pre_transform_addition
         self.unique_site_id_keys = unique_site_id_keys
+        self.chunk_size = chunk_size
+        self.n_workers = n_workers
 
     def _reverse_transformation(self, forecast: np.ndarray) -> np.ndarray:
         """Reverse the transformation applied to the data prior to fitting the QRF.
@@ -604,23 +983,69 @@ class ApplyQuantileRegressionRandomForests(PostProcessingPlugin):
                 forecast = forecast**3 - self.pre_transform_addition
         return forecast
 
-    def process(
-        self,
-        qrf_model: RandomForestQuantileRegressor,
-        forecast_df: pd.DataFrame,
+    def _predict(
+        self, qrf_model: RandomForestQuantileRegressor, feature_values: np.ndarray
     ) -> np.ndarray:
-        """Apply a quantile regression random forests model.
+        """Predict the quantiles at each point, in chunks of points that are
+        predicted concurrently by n_workers threads.
 
         Args:
             qrf_model: A trained QRF model.
-            forecast_df: DataFrame containing the forecast information and features.
+            feature_values: Array of features with shape (points, features).
 
         Returns:
-            Calibrated forecast as a numpy array.
+            Array of the predicted quantiles at each point.
+        """
+        n_points = len(feature_values)
+        chunk_size = self.chunk_size or -(-n_points // self.n_workers)
+        starts = range(0, n_points, max(chunk_size, 1))
+        if len(starts) <= 1:
+            return qrf_model.predict(feature_values, quantiles=self.quantiles)
+
+        def predict(start: int) -> np.ndarray:
+            return qrf_model.predict(
+                feature_values[start : start + chunk_size], quantiles=self.quantiles
+            )
+
+        with ThreadPoolExecutor(max_workers=self.n_workers) as executor:
+            return np.concatenate(list(executor.map(predict, starts)))
+
+    def _transform_target_cube(self, cube_inputs: CubeList) -> CubeList:
+        """Transform the data of the target cube, if a transformation is specified
+        and the mean or standard deviation of a variable is a feature.
+
+        Args:
+            cube_inputs: Cubes containing the features.
 
+        Returns:
+            Cubes containing the features, with a transformed copy of the target
+            cube.
         """
-        feature_values = []
+        if not self.transformation or not any(
+            set(["mean", "std"]).intersection(features)
+            for features in self.feature_config.values()
+        ):
+            return cube_inputs
+        transformed = CubeList()
+        for cube in cube_inputs:
+            if cube.name() == self.target_name:
+                cube = cube.copy(
+                    data=apply_transformation(
+                        cube.data, self.transformation, self.pre_transform_addition
+                    )
+                )
+            transformed.append(cube)
+        return transformed
+
+    def _prep_features_from_dataframe(self, forecast_df: pd.DataFrame) -> np.ndarray:
+        """Prepare the array of features from a DataFrame.
+
+        Args:
+            forecast_df: DataFrame containing the forecast information and features.
 
+        Returns:
+            Array of features with shape (points, features).
+        """
         for variable_name in self.feature_config.keys():
             # Transform the feature cube data if a transformation is specified.
             if (
@@ -645,11 +1070,38 @@ class ApplyQuantileRegressionRandomForests(PostProcessingPlugin):
             unique_site_id_keys=self.unique_site_id_keys,
         )
         forecast_df = sanitise_forecast_dataframe(forecast_df, self.feature_config)
+        return np.array(forecast_df[feature_column_names])
 
-        feature_values = np.array(forecast_df[feature_column_names])
-        calibrated_forecast = qrf_model.predict(
-            feature_values, quantiles=self.quantiles
-        )
+    def process(
+        self,
+        qrf_model: RandomForestQuantileRegressor,
+        forecast: Union[pd.DataFrame, CubeList],
+    ) -> np.ndarray:
+        """Apply a quantile regression random forests model.
+
+        Args:
+            qrf_model: A trained QRF model.
+            forecast: DataFrame containing the forecast information and features,
+                or aligned cubes containing the features, from which the feature
+                array is constructed directly (see prep_features_from_cubes).
+
+        Returns:
+            Calibrated forecast as a numpy array, with the points of the
+            DataFrame or the first cube along the first dimension.
+
+        """
+        if isinstance(forecast, CubeList):
+            feature_values, _ = prep_features_from_cubes(
+                self._transform_target_cube(forecast),
+                self.feature_config,
+                transformation=self.transformation,
+                pre_transform_addition=self.pre_transform_addition,
+                unique_site_id_keys=self.unique_site_id_keys,
+            )
+        else:
+            feature_values = self._prep_features_from_dataframe(forecast)
+
+        calibrated_forecast = self._predict(qrf_model, feature_values)
         calibrated_forecast = self._reverse_transformation(calibrated_forecast)
         calibrated_forecast = np.float32(calibrated_forecast)
 
@@ -10,12 +10,17 @@
 
 """
 
+import copy
+import hashlib
+import json
 import os
+import threading
 import typing
 import warnings
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Literal
+from typing import Any, Callable, Literal, NamedTuple
 
 import numpy as np
 from cf_units import Unit
@@ -64,6 +69,242 @@ class ModelFileNotFoundError(Exception):
     pass
 
 
+class TreeModelRegistryInfo(NamedTuple):
+    """Statistics of the registry of tree models."""
+
+    hits: int
+    misses: int
+    entries: int
+
+
+class _TreeModelRegistry:
+    """Registry of the tree models loaded by this process, so that each model
+    file is only loaded once however many plugins use it.
+
+    Models are identified by the type of model, the path, size and
+    modification time of the model file, and the options with which the model
+    is loaded, so that a file that has been changed is loaded again. The
+    models are shared between the plugins using them, and must not be
+    modified.
+    """
+
+    def __init__(self) -> None:
+        self._models = {}
+        self._loading = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self,
+        kind: str,
+        path: str | Path,
+        loader: Callable[[str], Any],
+        options: tuple = (),
+    ) -> Any:
+        """Return the model loaded from a file, loading it if it is not in
+        the registry.
+
+        Args:
+            kind:
+                Type of model, e.g. "lightgbm_model".
+            path:
+                Path of the model file.
+            loader:
+                Function loading the model from the path.
+            options:
+                Options, other than the path, with which the loader loads the
+                model.
+
+        Returns:
+            The model.
+        """
+        try:
+            status = os.stat(path)
+        except OSError:
+            # Leave the loader to report the missing file.
+            return loader(str(path))
+        identity = (kind, os.path.realpath(path), options)
+        key = (*identity, status.st_size, status.st_mtime_ns)
+        with self._lock:
+            if key in self._models:
+                self.hits += 1
+                return self._models[key]
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        # Threads loading the same model wait for the first to load it,
+        # while different models are loaded concurrently.
+        with key_lock:
+            with self._lock:
+                if key in self._models:
+                    self.hits += 1
+                    return self._models[key]
+            try:
+                model = loader(str(path))
+            except Exception:
+                with self._lock:
+                    self._loading.pop(key, None)
+                raise
+            with self._lock:
+                # Discard models loaded from earlier versions of the file.
+                for stale in [k for k in self._models if k[:3] == identity]:
+                    del self._models[stale]
+                self._models[key] = model
+                self._loading.pop(key, None)
+                self.misses += 1
+        return model
+
+    def clear(self) -> None:
+        """Discard all the models in the registry."""
+        with self._lock:
+            self._models.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> TreeModelRegistryInfo:
+        """Return the statistics of the registry."""
+        with self._lock:
+            return TreeModelRegistryInfo(self.hits, self.misses, len(self._models))
+
+
+_tree_model_registry = _TreeModelRegistry()
+
+
+def tree_model_registry_info() -> TreeModelRegistryInfo:
+    """Return the hit and miss counts and the number of models in the registry
+    of tree models loaded by this process."""
+    return _tree_model_registry.info()
+
+
+def tree_model_registry_clear() -> None:
+    """Discard the tree models loaded by this process."""
+    _tree_model_registry.clear()
+
+
+def preload_tree_models(
+    model_config_dict: dict[str, dict[str, dict[str, str]]],
+    threads: int | None = None,
+    bin_data: bool = False,
+) -> None:
+    """Load all the tree models of a model configuration into the registry of
+    tree models, for use by a persistent worker that applies the calibration
+    several times. Plugins subsequently initialised with the same arguments
+    use the loaded models rather than reading the model files again. Models
+    loaded before worker processes are forked are shared with the workers.
+
+    Args:
+        model_config_dict:
+            Dictionary containing Rainforests model configuration variables, of
+            the format expected by ApplyRainForestsCalibration.
+        threads:
+            Number of threads to use during prediction with tree-model objects.
+        bin_data:
+            Whether the feature splits used to bin the data are also loaded.
+    """
+    ApplyRainForestsCalibration(model_config_dict, threads=threads, bin_data=bin_data)
+
+
+def compile_treelite_models(
+    model_config_dict: dict[str, dict[str, dict[str, str]]],
+    cache_dir: str | Path,
+    toolchain: str = "gcc",
+    params: dict | None = None,
+) -> dict[str, dict[str, dict[str, str]]]:
+    """Compile the LightGBM models of a model configuration into treelite
+    shared libraries, ahead of time, in a cache directory.
+
+    Each library is named after a checksum of the LightGBM model file and the
+    compilation options, so libraries are only compiled for new or changed
+    models and can be shared between configurations. Libraries are written to
+    a temporary file and then renamed, so concurrent workers can compile into
+    the same directory.
+
+    Args:
+        model_config_dict:
+            Dictionary containing Rainforests model configuration variables,
+            which must include the path to the LightGBM model for each lead time
+            and threshold.
+        cache_dir:
+            Directory in which the shared libraries are stored.
+        toolchain:
+            Compiler used to build the shared libraries.
+        params:
+            Parameters for the generation of the model code by tl2cgen, such as
+            {"parallel_comp": 8}.
+
+    Returns:
+        Copy of the model configuration in which the path to the treelite model
+        for each lead time and threshold is the compiled shared library.
+    """
+    import tl2cgen
+    import treelite
+    from lightgbm import Booster
+
+    ApplyRainForestsCalibration.check_filenames("lightgbm_model", model_config_dict)
+    params = params or {}
+    options = json.dumps({"toolchain": toolchain, "params": params}, sort_keys=True)
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    compiled_config = copy.deepcopy(model_config_dict)
+    for lead_time_dict in compiled_config.values():
+        for model_paths in lead_time_dict.values():
+            model_filename = Path(
+                os.path.expandvars(model_paths["lightgbm_model"])
+            ).expanduser()
+            digest = hashlib.sha256(options.encode())
+            with open(model_filename, "rb") as model_file:
+                digest.update(hashlib.file_digest(model_file, "sha256").digest())
+            libpath = cache_dir / f"{digest.hexdigest()}.so"
+            if not libpath.exists():
+                tmp_libpath = cache_dir / f".{libpath.stem}.{os.getpid()}.so"
+                treelite_model = treelite.frontend.from_lightgbm(
+                    Booster(model_file=str(model_filename))
+                )
+                tl2cgen.export_lib(
+                    treelite_model,
+                    toolchain=toolchain,
+                    libpath=str(tmp_libpath),
+                    params=params,
+                    verbose=False,
+                )
+                os.replace(tmp_libpath, libpath)
+            model_paths["treelite_model"] = str(libpath)
+    return compiled_config
+
+
+def _read_feature_splits(model_filename: str) -> dict[int, frozenset[float]]:
+    """Read the thresholds at which the trees of a LightGBM model split each
+    feature from the model file.
+
+    Args:
+        model_filename: Path of the LightGBM model file.
+
+    Returns:
+        dict where keys are the indices of the features and the values are the
+        thresholds at which that feature is split.
+    """
+    # These string patterns are defined by LightGBM and are used for finding the feature and
+    # threshold information in the model .txt files.
+    split_feature_string = "split_feature="
+    feature_threshold_string = "threshold="
+    feature_splits = {}
+    with open(model_filename, "r") as f:
+        for line in f:
+            if line.startswith(split_feature_string):
+                line = line[len(split_feature_string) : -1]
+                if len(line) == 0:
+                    # This deals with the situation where the tree has no splits
+                    continue
+                features = [int(x) for x in line.split(" ")]
+            elif line.startswith(feature_threshold_string):
+                line = line[len(feature_threshold_string) : -1]
+                if len(line) == 0:
+                    continue
+                splits = [float(x) for x in line.split(" ")]
+                for feature_ind, threshold in zip(features, splits):
+                    feature_splits.setdefault(feature_ind, set()).add(threshold)
+    return {key: frozenset(value) for key, value in feature_splits.items()}
+
+
 class ApplyRainForestsCalibration(PostProcessingPlugin):
     """Generic class to calibrate input forecast via RainForests.
 
@@ -77,6 +318,7 @@ class ApplyRainForestsCalibration(PostProcessingPlugin):
         model_config_dict: dict[str, dict[str, dict[str, str]]],
         threads: int | None = None,
         bin_data: bool = False,
+        threshold_workers: int = 1,
     ):
         """Initialise class object based on package and model file availability.
 
@@ -92,6 +334,9 @@ class ApplyRainForestsCalibration(PostProcessingPlugin):
                 if there are many data points which fall into the same bins for all threshold
                 models. Limits the calculation of common feature values by only calculating
                 them once. Defaults to False.
+            threshold_workers:
+                Number of threads evaluating the models for different thresholds
+                concurrently. Defaults to 1, evaluating the models in turn.
 
         Dictionary is of format::
 
@@ -184,10 +429,6 @@ class ApplyRainForestsCalibration(PostProcessingPlugin):
             The outer list has length equal to the number of model features, and it contains
             the lists of feature splits for each feature. Each feature's list of splits is ordered.
         """
-        # These string patterns are defined by LightGBM and are used for finding the feature and
-        # threshold information in the model .txt files.
-        split_feature_string = "split_feature="
-        feature_threshold_string = "threshold="
         combined_feature_splits = {}
         for lead_time in model_config_dict.keys():
             all_splits = [set() for i in range(self._get_num_features())]
@@ -199,21 +440,11 @@ class ApplyRainForestsCalibration(PostProcessingPlugin):
                         )
                     )
                 ).expanduser()
-                with open(lgb_model_filename, "r") as f:
-                    for line in f:
-                        if line.startswith(split_feature_string):
-                            line = line[len(split_feature_string) : -1]
-                            if len(line) == 0:
-                                # This deals with the situation where the tree has no splits
-                                continue
-                            features = [int(x) for x in line.split(" ")]
-                        elif line.startswith(feature_threshold_string):
-                            line = line[len(feature_threshold_string) : -1]
-                            if len(line) == 0:
-                                continue
-                            splits = [float(x) for x in line.split(" ")]
-                            for feature_ind, threshold in zip(features, splits):
-                                all_splits[feature_ind].add(threshold)
+                feature_splits = _tree_model_registry.get(
+                    "lightgbm_feature_splits", lgb_model_filename, _read_feature_splits
+                )
+                for feature_ind, splits in feature_splits.items():
+                    all_splits[feature_ind].update(splits)
             combined_feature_splits[np.float32(lead_time)] = [
                 np.sort(list(x)) for x in all_splits
             ]
@@ -302,6 +533,7 @@ class ApplyRainForestsCalibrationLightGBM(ApplyRainForestsCalibration):
         model_config_dict: dict[str, dict[str, dict[str, str]]],
         threads: int | None = None,
         bin_data: bool = False,
+        threshold_workers: int = 1,
     ):
         """Check all model files are available before initialising."""
         ApplyRainForestsCalibration.check_filenames("lightgbm_model", model_config_dict)
@@ -312,6 +544,7 @@ class ApplyRainForestsCalibrationLightGBM(ApplyRainForestsCalibration):
         model_config_dict: dict[str, dict[str, dict[str, str]]],
         threads: int | None = None,
         bin_data: bool = False,
+        threshold_workers: int = 1,
     ):
         """Initialise the tree model variables used in the application of RainForests
         Calibration. LightGBM Boosters are used for tree model predictors.
@@ -328,6 +561,11 @@ class ApplyRainForestsCalibrationLightGBM(ApplyRainForestsCalibration):
                 if there are many data points which fall into the same bins for all threshold
                 models. Limits the calculation of common feature values by only calculating
                 them once.
+            threshold_workers:
+                Number of threads evaluating the models for different thresholds
+                concurrently. Each model may also use several threads, so the
+                total number of threads should not exceed the number of available
+                cores.
 
         Dictionary is of format::
 
@@ -376,7 +614,11 @@ class ApplyRainForestsCalibrationLightGBM(ApplyRainForestsCalibration):
                         )
                     )
                 ).expanduser()
-                booster = Booster(model_file=str(model_filename))
+                booster = _tree_model_registry.get(
+                    "lightgbm_model",
+                    model_filename,
+                    lambda path: Booster(model_file=path),
+                )
                 if threads is not None:
                     # Workaround to avoid segfault issue in LightGBM
                     raise RuntimeError(
@@ -384,6 +626,7 @@ class ApplyRainForestsCalibrationLightGBM(ApplyRainForestsCalibration):
                     )
                 self.tree_models[lead_time, threshold] = booster
         self.bin_data = bin_data
+        self.threshold_workers = threshold_workers
         if self.bin_data:
             self.combined_feature_splits = self._get_feature_splits(model_config_dict)
 
@@ -602,46 +845,42 @@ class ApplyRainForestsCalibrationLightGBM(ApplyRainForestsCalibration):
             # sort so rows in the same bins are grouped
             sort_ind = np.lexsort(tuple([binned_data[:, i] for i in range(n_features)]))
             sorted_data = binned_data[sort_ind]
-            reverse_sort_ind = np.argsort(sort_ind)
             # we only need to predict for rows which are different from the previous row
             diff = np.any(np.diff(sorted_data, axis=0) != 0, axis=1)
             predict_rows = np.concatenate([[0], np.nonzero(diff)[0] + 1])
-            data_for_prediction = input_data[sort_ind][predict_rows]
-            full_prediction = np.empty((input_data.shape[0],))
-            # forward fill code inspired by this: https://stackoverflow.com/a/41191127
-            fill_inds = np.zeros(len(full_prediction), dtype=np.int32)
-            fill_inds[predict_rows] = predict_rows
-            fill_inds = np.maximum.accumulate(fill_inds)
-            dataset_for_prediction = self.model_input_converter(data_for_prediction)
-
-            for threshold_index, threshold in enumerate(self.model_thresholds):
-                model = self.tree_models[model_lead_time, threshold]
-                prediction = model.predict(dataset_for_prediction)
-                prediction = np.clip(prediction, 0, 1)
-                if type(self) is ApplyRainForestsCalibrationTreelite:
-                    # treelite 4.x.x changed output dimensions, so must flatten here
-                    # See https://treelite.readthedocs.io/en/latest/treelite-gtil-api.html#treelite.gtil.predict
-                    prediction = prediction.flatten()
-                full_prediction[predict_rows] = prediction
-                full_prediction = full_prediction[fill_inds]
-                # restore original order
-                full_prediction = full_prediction[reverse_sort_ind]
-                output_data[threshold_index, :] = np.reshape(
-                    full_prediction, output_data.shape[1:]
-                )
+            data_for_prediction = input_data[sort_ind[predict_rows]]
+            # index of the predicted row in the same bins as each input row, which
+            # is shared by the models for all thresholds
+            unique_row_index = np.empty(len(sort_ind), dtype=np.intp)
+            unique_row_index[sort_ind] = np.concatenate([[0], np.cumsum(diff)])
         else:
-            dataset_for_prediction = self.model_input_converter(input_data)
-            for threshold_index, threshold in enumerate(self.model_thresholds):
-                model = self.tree_models[model_lead_time, threshold]
-                prediction = model.predict(dataset_for_prediction)
-                prediction = np.clip(prediction, 0, 1)
-                if type(self) is ApplyRainForestsCalibrationTreelite:
-                    # treelite 4.x.x changed output dimensions, so must flatten here
-                    # See https://treelite.readthedocs.io/en/latest/treelite-gtil-api.html#treelite.gtil.predict
-                    prediction = prediction.flatten()
-                output_data[threshold_index, :] = np.reshape(
-                    prediction, output_data.shape[1:]
-                )
+            data_for_prediction = input_data
+            unique_row_index = None
+        dataset_for_prediction = self.model_input_converter(data_for_prediction)
+
+        def evaluate(threshold_index: int) -> None:
+            threshold = self.model_thresholds[threshold_index]
+            model = self.tree_models[model_lead_time, threshold]
+            prediction = model.predict(dataset_for_prediction)
+            prediction = np.clip(prediction, 0, 1)
+            if type(self) is ApplyRainForestsCalibrationTreelite:
+                # treelite 4.x.x changed output dimensions, so must flatten here
+                # See https://treelite.readthedocs.io/en/latest/treelite-gtil-api.html#treelite.gtil.predict
+                prediction = prediction.flatten()
+            if unique_row_index is not None:
+                prediction = prediction[unique_row_index]
+            output_data[threshold_index, :] = np.reshape(
+                prediction, output_data.shape[1:]
+            )
+
+        threshold_indices = range(len(self.model_thresholds))
+        if self.threshold_workers > 1:
+            # Each thread writes to a separate threshold of the output.
+            with ThreadPoolExecutor(max_workers=self.threshold_workers) as executor:
+                list(executor.map(evaluate, threshold_indices))
+        else:
+            for threshold_index in threshold_indices:
+                evaluate(threshold_index)
 
     def _calculate_threshold_probabilities(
         self, forecast_cube: Cube, feature_cubes: CubeList
@@ -850,6 +1089,7 @@ class ApplyRainForestsCalibrationTreelite(ApplyRainForestsCalibrationLightGBM):
         model_config_dict: dict[str, dict[str, dict[str, str]]],
         threads: int | None = None,
         bin_data: bool = False,
+        threshold_workers: int = 1,
     ):
         """Check required dependencies and all model files are available
         before initialising."""
@@ -866,6 +1106,7 @@ class ApplyRainForestsCalibrationTreelite(ApplyRainForestsCalibrationLightGBM):
         model_config_dict: dict[str, dict[str, dict[str, str]]],
         threads: int | None = None,
         bin_data: bool = False,
+        threshold_workers: int = 1,
     ):
         """Initialise the tree model variables used in the application of RainForests
         Calibration. Treelite Predictors are used for tree model predictors.
@@ -881,6 +1122,11 @@ class ApplyRainForestsCalibrationTreelite(ApplyRainForestsCalibrationLightGBM):
                 if there are many data points which fall into the same bins for all threshold
                 models. Limits the calculation of common feature values by only calculating
                 them once.
+            threshold_workers:
+                Number of threads evaluating the models for different thresholds
+                concurrently. Each model may also use several threads, so the
+                total number of threads should not exceed the number of available
+                cores.
 
         Dictionary is of format::
 
@@ -924,14 +1170,18 @@ class ApplyRainForestsCalibrationTreelite(ApplyRainForestsCalibrationLightGBM):
                         )
                     )
                 ).expanduser()
-                self.tree_models[lead_time, threshold] = Predictor(
+                self.tree_models[lead_time, threshold] = _tree_model_registry.get(
+                    "treelite_model",
+                    model_filename,
                     # OK for Predictor nthreads to be None here
-                    libpath=str(model_filename),
-                    verbose=False,
-                    nthread=threads,
+                    lambda path: Predictor(
+                        libpath=path, verbose=False, nthread=threads
+                    ),
+                    options=(threads,),
                 )
 
         self.bin_data = bin_data
+        self.threshold_workers = threshold_workers
         if self.bin_data:
             self.combined_feature_splits = self._get_feature_splits(model_config_dict)
 
@@ -23,6 +23,7 @@ from improver.calibration.utilities import (
     create_unified_frt_coord,
     filter_non_matching_cubes,
 )
+from improver.constants import HOURS_IN_DAY, SECONDS_IN_HOUR
 from improver.metadata.probabilistic import (
     find_threshold_coordinate,
     probability_is_above_or_below,
@@ -171,7 +172,7 @@ class ConstructReliabilityCalibrationTables(BasePlugin):
         are observation_count, sum_of_forecast_probabilities, and
         forecast_count. The order used here is the order in which the table
         data is populated, so these must remain consistent with the
-        _populate_reliability_bins function.
+        _accumulate_reliability_bins function.
 
         Returns:
             - A numerical index dimension coordinate.
@@ -289,151 +290,150 @@ class ConstructReliabilityCalibrationTables(BasePlugin):
 
         return reliability_cube
 
-    def _populate_reliability_bins(
-        self, forecast: Union[MaskedArray, ndarray], truth: Union[MaskedArray, ndarray]
-    ) -> MaskedArray:
+    @staticmethod
+    def _threshold_time_point_data(
+        cube: Cube, threshold_coord: DimCoord
+    ) -> Union[MaskedArray, ndarray]:
         """
-        For a spatial slice at a single validity time and threshold, populate
-        a reliability table using the provided truth.
+        Arrange the data of a forecast or truth cube with leading threshold
+        and time dimensions, followed by a single dimension containing all
+        the points of the spatial dimensions in the order of the cube.
 
         Args:
-            forecast:
-                An array containing data over a spatial slice for a single validity
-                time and threshold.
-            truth:
-                An array containing a thresholded gridded truth at an
-                equivalent validity time to the forecast array.
+            cube:
+                The forecast or truth cube.
+            threshold_coord:
+                The threshold coordinate.
 
         Returns:
-            An array containing reliability table data for a single time
-            and threshold. The leading dimension corresponds to the rows
-            of a calibration table, the second dimension to the number of
-            probability bins, and the trailing dimension(s) are the spatial
-            dimension(s) of the forecast and truth cubes (which are
-            equivalent).
+            An array with shape (thresholds, times, points).
         """
-
-        bin_edges = np.concatenate(
-            [
-                np.array(self.probability_bins[:, 0]),
-                np.array([self.probability_bins[-1, 1] + self.single_value_tolerance]),
-            ]
-        ).astype(self.probability_bins.dtype)
-        bin_index = np.searchsorted(bin_edges, forecast, side="right") - 1
-        # nan values have index len(bin_edges) - 1, which is one more than the number of bins.
-        # Therefore, to make put_along_axis work, we also make the first dimension of the new shape
-        # one more than the number of bins, and discard the last slice of the first dimension later.
-        new_shape = (len(bin_edges),) + forecast.shape
-        forecast_mask = np.broadcast_to(
-            np.expand_dims(np.ma.getmask(forecast), 0), new_shape
-        )
-        forecast_probabilities = np.zeros(new_shape, dtype=forecast.dtype)
-        np.put_along_axis(
-            forecast_probabilities, np.expand_dims(bin_index, 0), forecast, axis=0
-        )
-        forecast_probabilities = np.ma.array(
-            forecast_probabilities, mask=forecast_mask, copy=False
-        )
-        forecast_counts = np.zeros_like(forecast_probabilities)
-        np.put_along_axis(forecast_counts, np.expand_dims(bin_index, 0), 1, axis=0)
-        forecast_counts = np.ma.array(forecast_counts, mask=forecast_mask, copy=False)
-        observation_counts = (
-            np.expand_dims(np.isclose(truth, 1), 0) & forecast_counts.astype(bool)
-        ).astype(int)
-
-        # discard last index in first dimension because it contains data from forecast nans
-        reliability_table = np.ma.stack(
-            [
-                observation_counts[:-1, :],
-                forecast_probabilities[:-1, :],
-                forecast_counts[:-1, :],
-            ]
-        )
-
-        return reliability_table.astype(np.float32)
-
-    def _populate_masked_reliability_bins(
-        self, forecast: ndarray, truth: MaskedArray
+        data = cube.data
+        ndim = data.ndim
+        order = []
+        for coord in [threshold_coord, "time"]:
+            dims = cube.coord_dims(coord)
+            if not dims:
+                data = np.expand_dims(data, -1)
+                dims = (data.ndim - 1,)
+            order.append(dims[0])
+        order.extend(dim for dim in range(ndim) if dim not in order)
+        data = data.transpose(order)
+        return data.reshape(data.shape[:2] + (-1,))
+
+    def _accumulate_reliability_bins(
+        self,
+        forecast: Union[MaskedArray, ndarray],
+        truth: Union[MaskedArray, ndarray],
+        masked_truth: bool,
+        reliability_table: Optional[Union[MaskedArray, ndarray]] = None,
     ) -> MaskedArray:
         """
-        Support populating the reliability table bins with a masked truth. If a
-        masked truth is provided, a masked reliability table is returned.
+        Populate the reliability tables of all thresholds and points, adding
+        the contributions of each validity time in turn. The position of each
+        forecast within the tables is encoded from its threshold, probability
+        bin and point, so that the observation counts, forecast probability
+        sums and forecast counts of every threshold and point are added for a
+        validity time in a single operation. Nan forecasts, and forecasts
+        outside the probability bins, are not counted.
+
+        The presence of a masked truth is handled separately at each validity
+        time to ensure support for a mask that changes with validity time.
+        Where the truth at a validity time is masked, forecasts at masked
+        truth or forecast points do not contribute, and a point is only kept
+        masked if it is masked in both the existing and new contributions.
+        Otherwise the mask of the forecast is added to the existing mask.
 
         Args:
             forecast:
-                An array containing data over an xy slice for a single validity
-                time and threshold.
+                An array of forecast probabilities with shape (thresholds,
+                times, points).
             truth:
-                An array containing a thresholded gridded truth at an
-                equivalent validity time to the forecast array.
+                An array containing the thresholded truths at equivalent
+                validity times to the forecasts, with the same shape.
+            masked_truth:
+                Whether the truths are masked at any time. If so, and no
+                existing reliability tables are provided, the first validity
+                time is handled as having a masked truth.
+            reliability_table:
+                Existing reliability tables, with shape (thresholds, rows,
+                bins, points), to which the contributions are added, such
+                that tables can be updated as new forecasts become available.
 
         Returns:
-            An array containing reliability table data for a single time
-            and threshold. The leading dimension corresponds to the rows
-            of a calibration table, the second dimension to the number of
-            probability bins, and the trailing dimensions are the spatial
-            dimensions of the forecast and truth cubes (which are
-            equivalent).
-        """
-        forecast = np.ma.masked_where(np.ma.getmask(truth), forecast)
-        table = self._populate_reliability_bins(forecast, truth)
-        # Zero data underneath mask to support bitwise addition of masks.
-        table.data[table.mask] = 0
-        return table
-
-    def _add_reliability_tables(
-        self, forecast: Cube, truth: Cube, threshold_reliability: MaskedArray
-    ) -> Union[MaskedArray, ndarray]:
+            An array containing the reliability table data with shape
+            (thresholds, rows, bins, points). The second dimension corresponds
+            to the rows of a calibration table and the third dimension to the
+            probability bins.
         """
-        Add reliability tables. The presence of a masked truth is handled
-        separately to ensure support for a mask that changes with validity time.
-
-        Args:
-            forecast:
-                An array containing data over an xy slice for a single validity
-                time and threshold.
-            truth:
-                An array containing a thresholded gridded truth at an
-                equivalent validity time to the forecast array.
-            threshold_reliability:
-                The current reliability table that will be added to.
+        n_thresholds, n_times, n_points = forecast.shape
+        n_rows, n_bins = self.expected_table_shape
+        bin_edges = np.concatenate(
+            [
+                np.array(self.probability_bins[:, 0]),
+                np.array([self.probability_bins[-1, 1] + self.single_value_tolerance]),
+            ]
+        ).astype(self.probability_bins.dtype)
 
-        Returns:
-            An array containing reliability table data for a single time
-            and threshold. The leading dimension corresponds to the rows
-            of a calibration table, the second dimension to the number of
-            probability bins, and the trailing dimensions are the spatial
-            dimensions of the forecast and truth cubes (which are
-            equivalent).
-        """
-        if np.ma.is_masked(truth.data):
-            table = self._populate_masked_reliability_bins(forecast.data, truth.data)
-            # Bitwise addition of masks. This ensures that only points that are
-            # masked in both the existing and new reliability tables are kept
-            # as being masked within the resulting reliability table.
-            mask = threshold_reliability.mask & table.mask
-            threshold_reliability = np.ma.array(
-                threshold_reliability.data + table.data, mask=mask, dtype=np.float32
-            )
+        if reliability_table is None:
+            table = np.zeros((n_rows, n_thresholds * n_bins * n_points), np.float32)
+            mask = None
         else:
-            np.add(
-                threshold_reliability,
-                self._populate_reliability_bins(forecast.data, truth.data),
-                out=threshold_reliability,
-                dtype=np.float32,
+            table = np.ma.getdata(reliability_table).astype(np.float32)
+            table = np.moveaxis(table, 1, 0).reshape(n_rows, -1)
+            mask = np.ma.getmaskarray(reliability_table)[:, 0, 0]
+
+        # Index of the first bin of each threshold and point in the table.
+        offsets = (
+            np.arange(n_thresholds)[:, np.newaxis] * n_bins * n_points
+            + np.arange(n_points)[np.newaxis, :]
+        )
+        for time_index in range(n_times):
+            forecast_slice = forecast[:, time_index]
+            truth_slice = truth[:, time_index]
+            truth_mask = np.ma.getmaskarray(truth_slice)
+            if mask is None:
+                masked_slice = np.full((n_thresholds, 1), masked_truth)
+            else:
+                masked_slice = truth_mask.any(axis=1, keepdims=True)
+            slice_mask = np.ma.getmaskarray(forecast_slice) | (
+                truth_mask & masked_slice
+            )
+
+            values = np.ma.getdata(forecast_slice)
+            bin_index = np.searchsorted(bin_edges, values, side="right") - 1
+            valid = (
+                (bin_index >= 0) & (bin_index < n_bins) & ~(slice_mask & masked_slice)
             )
-        return threshold_reliability
+            index = (offsets + bin_index * n_points)[valid]
+            # Each threshold and point contributes to a single bin, so the
+            # indices are unique and the contributions can be added directly.
+            table[0, index] += np.isclose(np.ma.getdata(truth_slice), 1)[valid]
+            table[1, index] += values[valid].astype(np.float32)
+            table[2, index] += 1
+
+            if mask is None:
+                mask = slice_mask
+            else:
+                mask = np.where(masked_slice, mask & slice_mask, mask | slice_mask)
+
+        table = table.reshape(n_rows, n_thresholds, n_bins, n_points)
+        table = np.ascontiguousarray(np.moveaxis(table, 0, 1))
+        mask = np.broadcast_to(mask[:, np.newaxis, np.newaxis, :], table.shape)
+        return np.ma.array(table, mask=mask.copy(), copy=False)
 
     def process(
         self,
         historic_forecasts: Cube,
         truths: Cube,
         aggregate_coords: Optional[List[str]] = None,
+        reliability_table: Optional[Cube] = None,
     ) -> Cube:
         """
-        Slice data over threshold and time coordinates to construct reliability
-        tables. These are summed over time to give a single table for each
-        threshold, constructed from all the provided historic forecasts and
+        Populate reliability tables for each threshold from the historic
+        forecasts and truths at all validity times. The contributions of each
+        validity time are summed to give a single table for each threshold,
+        constructed from all the provided historic forecasts and
         truths. If a masked truth is provided, a masked reliability table is
         returned. If the mask within the truth varies at different timesteps,
         any point that is unmasked for at least one timestep will have
@@ -466,6 +466,16 @@ class ConstructReliabilityCalibrationTables(BasePlugin):
                 :class:`improver.calibration.reliability_calibration.AggregateReliabilityCalibrationTables`
                 but with reduced memory usage due to avoiding large intermediate
                 data.
+            reliability_table:
+                Existing reliability tables, constructed from earlier historic
+                forecasts with the same thresholds and aggregated over the
+                same coordinates, to be updated with the contributions of the
+                provided historic forecasts, e.g. as each new day of forecasts
+                becomes available. Without masked data, the returned tables
+                are identical to those constructed from all the forecasts at
+                once or, if aggregate_coords is provided, equal to within
+                float32 rounding, as the sums are accumulated in a different
+                order.
 
         Returns:
             A cubelist of reliability table cubes, one for each threshold
@@ -474,6 +484,8 @@ class ConstructReliabilityCalibrationTables(BasePlugin):
         Raises:
             ValueError: If the forecast and truth cubes have differing
                         threshold coordinates.
+            ValueError: If the existing reliability tables have differing
+                        threshold coordinates or spatial dimensions.
         """
         historic_forecasts, truths = filter_non_matching_cubes(
             historic_forecasts, truths
@@ -485,43 +497,62 @@ class ConstructReliabilityCalibrationTables(BasePlugin):
             msg = "Threshold coordinates differ between forecasts and truths."
             raise ValueError(msg)
 
-        time_coord = historic_forecasts.coord("time")
-
         check_forecast_consistency(historic_forecasts)
         reliability_cube = self._create_reliability_table_cube(
             historic_forecasts, threshold_coord
         )
 
-        populate_bins_func = self._populate_reliability_bins
-        if np.ma.is_masked(truths.data):
-            populate_bins_func = self._populate_masked_reliability_bins
-
-        reliability_tables = iris.cube.CubeList()
-        threshold_slices = zip(
-            historic_forecasts.slices_over(threshold_coord),
-            truths.slices_over(threshold_coord),
-        )
-        for forecast_slice, truth_slice in threshold_slices:
-            time_slices = zip(
-                forecast_slice.slices_over(time_coord),
-                truth_slice.slices_over(time_coord),
+        existing_table = None
+        if reliability_table is not None:
+            AggregateReliabilityCalibrationTables._check_frt_coord(
+                [reliability_table, reliability_cube]
             )
-            forecast, truth = next(time_slices)
-            threshold_reliability = populate_bins_func(forecast.data, truth.data)
-
-            for forecast, truth in time_slices:
-                threshold_reliability = self._add_reliability_tables(
-                    forecast, truth, threshold_reliability
+            existing_threshold = reliability_table.coord(threshold_coord.name())
+            if not np.array_equal(existing_threshold.points, threshold_coord.points):
+                msg = (
+                    "Threshold coordinates differ between the reliability "
+                    "tables and forecasts."
+                )
+                raise ValueError(msg)
+            if not aggregate_coords:
+                if reliability_table.shape[-reliability_cube.ndim :] != (
+                    reliability_cube.shape
+                ):
+                    msg = (
+                        "Spatial dimensions differ between the reliability "
+                        "tables and forecasts."
+                    )
+                    raise ValueError(msg)
+                existing_table = reliability_table.data.reshape(
+                    (len(threshold_coord.points),) + self.expected_table_shape + (-1,)
                 )
+                existing_frt = reliability_table.coord("forecast_reference_time")
+                frt = reliability_cube.coord("forecast_reference_time")
+                frt.bounds = [[existing_frt.bounds.min(), frt.bounds.max()]]
+
+        tables = self._accumulate_reliability_bins(
+            self._threshold_time_point_data(historic_forecasts, threshold_coord),
+            self._threshold_time_point_data(truths, truth_threshold_coord),
+            np.ma.is_masked(truths.data),
+            existing_table,
+        )
 
-            reliability_entry = reliability_cube.copy(data=threshold_reliability)
-            reliability_entry.replace_coord(forecast_slice.coord(threshold_coord))
+        reliability_tables = iris.cube.CubeList()
+        for index, threshold_reliability in enumerate(tables):
+            reliability_entry = reliability_cube.copy(
+                data=threshold_reliability.reshape(reliability_cube.shape)
+            )
+            reliability_entry.replace_coord(threshold_coord[index])
             if aggregate_coords:
                 reliability_entry = AggregateReliabilityCalibrationTables().process(
                     [reliability_entry], aggregate_coords
                 )
             reliability_tables.append(reliability_entry)
 
+        if aggregate_coords and reliability_table is not None:
+            return AggregateReliabilityCalibrationTables().process(
+                [reliability_table, MergeCubes(copy=False)(reliability_tables)]
+            )
         return MergeCubes(copy=False)(reliability_tables)
 
 
@@ -604,6 +635,260 @@ class AggregateReliabilityCalibrationTables(BasePlugin):
         return result
 
 
+class RollingAggregateReliabilityCalibrationTables(BasePlugin):
+    """This plugin aggregates reliability calibration tables over a rolling
+    window of forecast reference times. The state of the aggregation holds
+    the running sum of the tables within the window, and the forecast
+    reference times of these tables, while the tables themselves are stored
+    separately by the caller. Each new table is added to the running sum and
+    the tables that leave the window, which are provided by the caller, are
+    subtracted from it. Neither the arithmetic nor the size of the tables
+    that are read and written for each update depends on the length of the
+    window."""
+
+    running_sum_name = "reliability_calibration_table_running_sum"
+    compensation_name = "reliability_calibration_table_running_sum_compensation"
+    unmasked_count_name = "reliability_calibration_table_unmasked_count"
+    window_name = "reliability_calibration_table_window"
+
+    def __init__(self, window_length: int) -> None:
+        """
+        Initialise the plugin.
+
+        Args:
+            window_length:
+                The length of the rolling window in days. Tables with
+                forecast reference times less than this many days before
+                that of the newest table are aggregated.
+
+        Raises:
+            ValueError: If the window length is not positive.
+        """
+        if window_length < 1:
+            raise ValueError(
+                f"The window length must be a positive number of days, not "
+                f"{window_length}."
+            )
+        self.window_length = window_length
+
+    def __repr__(self) -> str:
+        """Represent the configured plugin instance as a string."""
+        return (
+            "<RollingAggregateReliabilityCalibrationTables: "
+            f"window_length: {self.window_length}>"
+        )
+
+    @staticmethod
+    def _compensated_add(
+        running_sum: ndarray, compensation: ndarray, values: ndarray
+    ) -> None:
+        """
+        Add values to a running sum in place, accumulating the rounding error
+        of the addition in a compensation term, so that repeatedly adding
+        and subtracting tables does not cause the single precision running
+        sum to drift.
+
+        Args:
+            running_sum:
+                The running sum, which is modified in place.
+            compensation:
+                The accumulated rounding error of the running sum, which is
+                modified in place.
+            values:
+                The values to add to the running sum.
+        """
+        total = running_sum + values
+        rounded = total - running_sum
+        compensation += (running_sum - (total - rounded)) + (values - rounded)
+        running_sum[...] = total
+
+    def _state_cube(
+        self, reliability_table: Cube, data: ndarray, name: str, frt: DimCoord
+    ) -> Cube:
+        """Create a cube of the state with the metadata of the reliability
+        table, the forecast reference time coordinate of the window and the
+        given name."""
+        cube = reliability_table.copy(data=data)
+        cube.rename(name)
+        cube.replace_coord(frt)
+        return cube
+
+    @staticmethod
+    def _state_data(cube: Cube, dim_order: List[str], dtype: type) -> ndarray:
+        """Return the data of a cube of the state, with its dimensions in the
+        given order, as these may be reordered when the state is loaded."""
+        cube = cube.copy()
+        enforce_coordinate_ordering(cube, dim_order)
+        return np.array(cube.data, dtype=dtype)
+
+    def _window_cube(self, frt: DimCoord) -> Cube:
+        """Create a cube of the state recording the forecast reference time
+        of each table within the window. The coordinate is given its own
+        variable name, as otherwise a window of one table would be saved as
+        the scalar forecast reference time of the running sum."""
+        frt.var_name = f"{self.window_name}_forecast_reference_time"
+        return Cube(
+            np.ones(len(frt.points), dtype=np.int8),
+            long_name=self.window_name,
+            var_name=self.window_name,
+            units="1",
+            dim_coords_and_dims=[(frt, 0)],
+        )
+
+    def expired_forecast_reference_times(
+        self, reliability_table: Cube, state: Optional[CubeList] = None
+    ) -> ndarray:
+        """
+        Find the tables that leave the window when a reliability table is
+        added to the rolling aggregation.
+
+        Args:
+            reliability_table:
+                The newest reliability table.
+            state:
+                The state of the rolling aggregation, or None if a new
+                rolling aggregation is to be started.
+
+        Returns:
+            The forecast reference time points, in seconds since the epoch,
+            of the tables within the state that leave the window, which must
+            be provided when adding the reliability table.
+        """
+        if state is None:
+            return np.array([], dtype=np.int64)
+        frt_name = "forecast_reference_time"
+        window_points = state.extract_cube(self.window_name).coord(frt_name).points
+        window_start = reliability_table.coord(frt_name).points.max() - (
+            self.window_length * HOURS_IN_DAY * SECONDS_IN_HOUR
+        )
+        return window_points[window_points <= window_start]
+
+    def process(
+        self,
+        reliability_table: Cube,
+        state: Optional[CubeList] = None,
+        expired_tables: Optional[Union[CubeList, List[Cube]]] = None,
+    ) -> Tuple[Cube, CubeList]:
+        """
+        Add a reliability table to the rolling aggregation, removing the
+        tables that leave the window, and return the aggregated table and
+        the updated state. The aggregated table is equivalent to aggregating
+        the tables within the window using
+        :class:`improver.calibration.reliability_calibration.AggregateReliabilityCalibrationTables`.
+
+        Args:
+            reliability_table:
+                The newest reliability table, constructed from forecasts with
+                reference times after those of the tables in the state.
+            state:
+                The state returned when aggregating the previous table. If
+                None, a new rolling aggregation is started from the table.
+            expired_tables:
+                The tables that leave the window, as given by
+                expired_forecast_reference_times. Only these earlier tables
+                need to be kept available for the rolling aggregation.
+
+        Returns:
+            - The reliability table aggregated over the tables within the
+              window.
+            - The updated state of the rolling aggregation.
+
+        Raises:
+            ValueError: If the reliability table has a different shape to the
+                tables in the state.
+            ValueError: If the forecast reference time bounds of the
+                reliability table overlap those of the tables in the state.
+            ValueError: If the tables that leave the window are not provided.
+        """
+        frt_name = "forecast_reference_time"
+        expired_tables = [] if expired_tables is None else expired_tables
+        new_window = self._window_cube(reliability_table.coord(frt_name).copy())
+        if state is None:
+            window = new_window
+            running_sum = np.zeros(reliability_table.shape, dtype=np.float32)
+            compensation = np.zeros(reliability_table.shape, dtype=np.float32)
+            unmasked_count = np.zeros(reliability_table.shape, dtype=np.int32)
+        else:
+            window = state.extract_cube(self.window_name)
+            AggregateReliabilityCalibrationTables._check_frt_coord(
+                [window[-1], reliability_table]
+            )
+            dim_order = [coord.name() for coord in reliability_table.dim_coords]
+            running_sum = self._state_data(
+                state.extract_cube(self.running_sum_name), dim_order, np.float32
+            )
+            if running_sum.shape != reliability_table.shape:
+                raise ValueError(
+                    "The reliability table has a different shape to the "
+                    "tables in the rolling aggregation state."
+                )
+            compensation = self._state_data(
+                state.extract_cube(self.compensation_name), dim_order, np.float32
+            )
+            unmasked_count = self._state_data(
+                state.extract_cube(self.unmasked_count_name), dim_order, np.int32
+            )
+
+            expired_points = self.expired_forecast_reference_times(
+                reliability_table, state
+            )
+            provided_points = sorted(
+                point
+                for table in expired_tables
+                for point in table.coord(frt_name).points
+            )
+            if not np.array_equal(provided_points, expired_points):
+                raise ValueError(
+                    "The tables that leave the rolling window, with forecast "
+                    f"reference times {expired_points.tolist()}, must be "
+                    f"provided, not those with {provided_points}."
+                )
+            for table in expired_tables:
+                expired = table.copy()
+                enforce_coordinate_ordering(expired, dim_order)
+                expired = expired.data
+                self._compensated_add(
+                    running_sum, compensation, -np.ma.filled(expired, 0)
+                )
+                unmasked_count -= ~np.ma.getmaskarray(expired)
+            n_expired = len(expired_points)
+            if n_expired < len(window.coord(frt_name).points):
+                cubes = CubeList([window[n_expired:], new_window])
+                # Attributes such as Conventions are added when saving the
+                # state, so may differ from those of the new window.
+                iris.util.equalise_attributes(cubes)
+                window = cubes.concatenate_cube()
+            else:
+                window = new_window
+
+        self._compensated_add(
+            running_sum, compensation, np.ma.filled(reliability_table.data, 0)
+        )
+        unmasked_count += ~np.ma.getmaskarray(reliability_table.data)
+
+        frt = create_unified_frt_coord(window.coord(frt_name))
+        frt.var_name = reliability_table.coord(frt_name).var_name
+        aggregated = reliability_table.copy(
+            data=np.ma.masked_where(unmasked_count == 0, running_sum + compensation)
+        )
+        aggregated.replace_coord(frt)
+        state = CubeList(
+            [
+                self._state_cube(
+                    reliability_table, running_sum, self.running_sum_name, frt
+                ),
+                self._state_cube(
+                    reliability_table, compensation, self.compensation_name, frt
+                ),
+                self._state_cube(
+                    reliability_table, unmasked_count, self.unmasked_count_name, frt
+                ),
+                window,
+            ]
+        )
+        return aggregated, state
+
+
 class ManipulateReliabilityTable(BasePlugin):
     """
     A plugin to manipulate the reliability tables before they are used to
@@ -6,9 +6,11 @@
 (SSFT).
 """
 
+import hashlib
 import os
+import threading
 import warnings
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 from dask import compute, delayed
@@ -17,6 +19,40 @@ from iris.cube import Cube
 from improver import BasePlugin
 from improver.utilities.cube_checker import validate_cube_dimensions
 
+#: Schedulers with which the noise for different realizations can be generated.
+BACKENDS = ("threads", "processes")
+
+# FFT methods used by this process, which hold the FFT plans, by method name
+# and grid shape.
+_fft_methods: Dict[Tuple[str, Tuple[int, ...]], Any] = {}
+_fft_methods_lock = threading.Lock()
+
+
+def _fft_method(method: Any, shape: Tuple[int, ...]) -> Any:
+    """Return the pysteps FFT method for a grid shape, creating it the first
+    time it is used in this process so that it, and any FFT plans it holds,
+    are reused for every field on the grid.
+
+    Args:
+        method:
+            Name of the pysteps FFT method, e.g. "numpy" or "pyfftw", or an FFT
+            method that has already been created, which is returned unchanged.
+        shape:
+            Shape of the fields that are transformed.
+
+    Returns:
+        The FFT method.
+    """
+    if not isinstance(method, str):
+        return method
+    from pysteps import utils
+
+    key = (method, tuple(shape))
+    with _fft_methods_lock:
+        if key not in _fft_methods:
+            _fft_methods[key] = utils.get_method(method, shape=shape)
+        return _fft_methods[key]
+
 
 class StochasticNoise(BasePlugin):
     """Class to apply spatially-structured stochastic noise to non-positive regions of a
@@ -47,6 +83,7 @@ class StochasticNoise(BasePlugin):
         scale_non_positive_noise: bool = False,
         allow_seeded_parallel_processing: bool = False,
         arbitrary_offset: float = 5.0,
+        backend: str = "threads",
     ):
         """
         Initialise the plugin.
@@ -71,7 +108,7 @@ class StochasticNoise(BasePlugin):
             db_threshold_units:
                 Units of the db_threshold value. Default is "mm/hr".
             num_workers:
-                Number of worker threads for parallel FFT computation.
+                Number of worker threads or processes for parallel FFT computation.
                 If not specified, uses the smaller of the plugin's default (number of
                 available CPUs) or the number of realizations in the input cube.
             scale_non_positive_noise:
@@ -94,10 +131,20 @@ class StochasticNoise(BasePlugin):
                 appropriately in the _from_dB method. The default value of 5 was chosen
                 to provide a clear separation from the threshold value in dB space, but
                 can be adjusted if needed.
+            backend:
+                Dask scheduler used to generate the noise for different
+                realizations in parallel, either "threads" or "processes".
+                Threads share the FFT methods and avoid copying the data, while
+                processes are not limited by the parts of the SSFT algorithm that
+                hold the global interpreter lock. Each process has its own random
+                number generator, so seeded runs are reproducible with several
+                processes. Default is "threads".
 
         Raises:
             ValueError:
                 If db_threshold is not a positive value.
+            ValueError:
+                If backend is not one of "threads" or "processes".
 
         Example dictionaries for initializing and generating SSFT filter::
 
@@ -108,6 +155,8 @@ class StochasticNoise(BasePlugin):
         """
         if db_threshold <= 0:
             raise ValueError("db_threshold must be a positive value.")
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, not '{backend}'.")
 
         self.ssft_init_params = ssft_init_params or {}
         self.ssft_generate_params = ssft_generate_params or {}
@@ -117,6 +166,7 @@ class StochasticNoise(BasePlugin):
         self.scale_non_positive_noise = scale_non_positive_noise
         self.allow_seeded_parallel_processing = allow_seeded_parallel_processing
         self.arbitrary_offset = arbitrary_offset
+        self.backend = backend
 
     def _to_dB(self, cube: Cube) -> Cube:
         """Convert cube data to dB scale and apply thresholding using db_threshold
@@ -177,20 +227,71 @@ class StochasticNoise(BasePlugin):
             np.ndarray:
                 2D array of generated stochastic noise.
         """
+        return self._generate_noise(data, 1)[0]
+
+    def _generate_noise(self, data: np.ndarray, num_fields: int) -> np.ndarray:
+        """
+        Generate fields of stochastic noise using SSFT for a 2-D array slice, which
+        may be shared by several realizations. The SSFT filter is initialised once
+        and used to generate each field, and the FFT methods are reused for all
+        fields on the same grid.
+
+        Args:
+            data:
+                2D array for which stochastic noise is to be added.
+            num_fields:
+                Number of fields of noise to generate.
+        Returns:
+            np.ndarray:
+                3D array of generated stochastic noise, with the fields along the
+                leading dimension.
+        """
         from pysteps.noise.fftgenerators import (
             generate_noise_2d_ssft_filter,
             initialize_nonparam_2d_ssft_filter,
         )
 
-        nonparametric_filter = initialize_nonparam_2d_ssft_filter(
-            data,
-            **self.ssft_init_params,
+        init_params = dict(self.ssft_init_params)
+        init_params["fft_method"] = _fft_method(
+            init_params.get("fft_method", "numpy"), data.shape
         )
-        stochastic_noise = generate_noise_2d_ssft_filter(
-            nonparametric_filter, **self.ssft_generate_params
+        generate_params = dict(self.ssft_generate_params)
+        generate_params["fft_method"] = _fft_method(
+            generate_params.get("fft_method", "numpy"), data.shape
         )
 
-        return stochastic_noise
+        nonparametric_filter = initialize_nonparam_2d_ssft_filter(data, **init_params)
+        return np.stack(
+            [
+                generate_noise_2d_ssft_filter(nonparametric_filter, **generate_params)
+                for _ in range(num_fields)
+            ]
+        )
+
+    @staticmethod
+    def _group_identical_slices(slices: List[np.ndarray]) -> List[List[int]]:
+        """Group the indices of slices containing identical data, which share
+        an SSFT filter.
+
+        Args:
+            slices:
+                2D arrays for each realization.
+        Returns:
+            Lists of the indices of identical slices, ordered by their first index.
+        """
+        groups = {}
+        for index, data in enumerate(slices):
+            candidates = groups.setdefault(hashlib.blake2b(data).digest(), [])
+            for group in candidates:
+                if np.array_equal(slices[group[0]], data):
+                    group.append(index)
+                    break
+            else:
+                candidates.append([index])
+        return sorted(
+            (group for candidates in groups.values() for group in candidates),
+            key=lambda group: group[0],
+        )
 
     def process(self, input_cube: Cube) -> Cube:
         """
@@ -242,30 +343,31 @@ class StochasticNoise(BasePlugin):
         # Create a copy of the template in dB scale to use for SSFT processing
         template_dB = self._to_dB(template.copy())
 
-        # Build delayed processing tasks for each realization
-        tasks = []
-        for slice in template_dB.slices_over("realization"):
-            data_slice = slice.data.astype(np.float32)
-            tasks.append(delayed(self.do_fft)(data_slice))
+        # Build delayed processing tasks for each distinct realization, with the
+        # SSFT filter for realizations with identical data initialised once
+        slices = [
+            slice.data.astype(np.float32)
+            for slice in template_dB.slices_over("realization")
+        ]
+        groups = self._group_identical_slices(slices)
+        tasks = [
+            delayed(self._generate_noise)(slices[group[0]], len(group))
+            for group in groups
+        ]
 
         # Set number of workers for parallel processing
-        num_workers = min(
-            self.num_workers,
-            len(template.coord("realization").points),
-        )
+        num_workers = min(self.num_workers, len(tasks))
 
         # pySTEPS uses numpy.random.seed when a seed kwarg is passed. By default,
-        # restrict to a single worker in that case to avoid concurrent global RNG
-        # mutations and preserve reproducibility.
-        if (
-            "seed" in self.ssft_generate_params
-            and not self.allow_seeded_parallel_processing
-        ):
+        # restrict to a single worker thread in that case to avoid concurrent global
+        # RNG mutations and preserve reproducibility. Worker processes each have
+        # their own global RNG, so are not restricted.
+        seeded_threads = (
+            "seed" in self.ssft_generate_params and self.backend == "threads"
+        )
+        if seeded_threads and not self.allow_seeded_parallel_processing:
             num_workers = 1
-        elif (
-            "seed" in self.ssft_generate_params
-            and self.allow_seeded_parallel_processing
-        ):
+        elif seeded_threads:
             warnings.warn(
                 "Using multiple workers with a fixed seed may introduce run-to-run "
                 "variation because pySTEPS uses global RNG seeding.",
@@ -273,7 +375,11 @@ class StochasticNoise(BasePlugin):
             )
 
         # Compute all SSFT noise arrays (in dB scale) in parallel
-        results = compute(*tasks, scheduler="threads", num_workers=num_workers)
+        group_results = compute(*tasks, scheduler=self.backend, num_workers=num_workers)
+        results = [None] * len(slices)
+        for group, group_result in zip(groups, group_results):
+            for k, result_db in zip(group, group_result):
+                results[k] = result_db
 
         # Convert dB to linear scale
         noise_linear = template.copy()
@@ -10,7 +10,7 @@ specific for ensemble calibration.
 
 import warnings
 from pathlib import Path
-from typing import List, Set, Tuple, Union
+from typing import Dict, List, Set, Tuple, Union
 
 import iris
 import numpy as np
@@ -661,3 +661,217 @@ def convert_parquet_to_cube(
         return [None, None]
     else:
         return CubeList([forecast_cube, truth_cube])
+
+
+def _parquet_columns(path: Path, columns: List[str]) -> List[str]:
+    """Select the columns of a Parquet dataset that are among the columns
+    requested, preserving the order of the request.
+
+    Args:
+        path:
+            The path to a Parquet file or a directory of Parquet files.
+        columns:
+            The names of the columns requested.
+
+    Returns:
+        The names of the requested columns that are present in the dataset.
+    """
+    import pyarrow.dataset as ds
+
+    names = ds.dataset(path, format="parquet", partitioning="hive").schema.names
+    return [column for column in columns if column in names]
+
+
+def read_parquet_for_forecast_periods(
+    forecast: Path,
+    truth: Path,
+    forecast_periods: List[int],
+    cycletime: str,
+    training_length: int,
+    diagnostic: str,
+    adjacent_range: int = 0,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Read the forecasts and truths required to calibrate several forecast
+    periods from Parquet files with a single scan of each table. Only the
+    columns used for calibration are read, and the rows are filtered when
+    reading to the diagnostic and to the blend times and validity times of
+    the training periods of all of the forecast periods.
+
+    Args:
+        forecast (pathlib.Path):
+            The path to a Parquet file containing the historical forecasts
+            to be used for calibration.
+        truth (pathlib.Path):
+            The path to a Parquet file containing the truths to be used
+            for calibration.
+        forecast_periods (List[int]):
+            Forecast periods to be calibrated in seconds.
+        cycletime (str):
+            Cycletime of a format similar to 20170109T0000Z.
+        training_length (int):
+            Number of days within the training period.
+        diagnostic (str):
+            The name of the diagnostic to be calibrated within the forecast
+            and truth tables.
+        adjacent_range (int):
+            A period in hours that should be used either side of each
+            forecast period to allow for the inclusion of forecasts and
+            observations that are close to the validity time being calibrated.
+
+    Returns:
+        The forecast and truth DataFrames.
+
+    Raises:
+        IOError: If the truth table contains no truths for the diagnostic.
+    """
+    from improver.calibration import get_training_period_cycles
+    from improver.calibration.dataframe_utilities import (
+        FORECAST_DATAFRAME_COLUMNS,
+        REPRESENTATION_COLUMNS,
+        TRUTH_DATAFRAME_COLUMNS,
+        _training_dates_for_calibration,
+    )
+
+    cycletimes = pd.DatetimeIndex([])
+    training_dates = pd.DatetimeIndex([], tz="UTC")
+    for forecast_period in forecast_periods:
+        cycletimes = cycletimes.union(
+            get_training_period_cycles(cycletime, forecast_period, training_length)
+        )
+        training_dates = training_dates.union(
+            _training_dates_for_calibration(
+                cycletime, forecast_period, training_length, adjacent_range
+            )
+        )
+
+    filters = [[("diagnostic", "==", diagnostic), ("blend_time", "in", cycletimes)]]
+    columns = _parquet_columns(
+        forecast, FORECAST_DATAFRAME_COLUMNS + REPRESENTATION_COLUMNS + ["station_id"]
+    )
+    forecast_df = pd.read_parquet(forecast, columns=columns, filters=filters)
+
+    filters = [
+        [
+            ("diagnostic", "==", diagnostic),
+            ("time", ">=", training_dates.min()),
+            ("time", "<=", training_dates.max()),
+        ]
+    ]
+    columns = _parquet_columns(truth, TRUTH_DATAFRAME_COLUMNS + ["station_id", "units"])
+    truth_df = pd.read_parquet(truth, columns=columns, filters=filters)
+    if truth_df.empty:
+        # Distinguish a diagnostic missing from the table from a training
+        # period without truths, reading only the diagnostic column.
+        filters = [[("diagnostic", "==", diagnostic)]]
+        if pd.read_parquet(truth, columns=["diagnostic"], filters=filters).empty:
+            msg = (
+                f"The requested filepath {truth} does not contain the "
+                f"requested contents: {filters}"
+            )
+            raise IOError(msg)
+    return forecast_df, truth_df
+
+
+def convert_parquet_to_cubes(
+    forecast: Path,
+    truth: Path,
+    forecast_periods: List[int],
+    cycletime: str,
+    training_length: int,
+    diagnostic: str,
+    percentiles: List[float],
+    experiment: str,
+    adjacent_range: int = 0,
+) -> Dict[int, CubeList]:
+    """Function to convert Parquet files containing forecast and truth data
+    into a CubeList for each of several forecast periods for use in
+    calibration. The Parquet files are read once, and the forecasts are
+    grouped by forecast period in memory, rather than reading the files for
+    each forecast period as convert_parquet_to_cube would.
+
+    Args:
+        forecast (pathlib.Path):
+            The path to a Parquet file containing the historical forecasts
+            to be used for calibration. The expected columns within the
+            Parquet file are: forecast, blend_time, forecast_period,
+            forecast_reference_time, time, wmo_id, percentile, diagnostic,
+            latitude, longitude, period, height, cf_name, units.
+        truth (pathlib.Path):
+            The path to a Parquet file containing the truths to be used
+            for calibration. The expected columns within the
+            Parquet file are: ob_value, time, wmo_id, diagnostic, latitude,
+            longitude and altitude.
+        forecast_periods (List[int]):
+            Forecast periods to be calibrated in seconds.
+        cycletime (str):
+            Cycletime of a format similar to 20170109T0000Z.
+        training_length (int):
+            Number of days within the training period.
+        diagnostic (str):
+            The name of the diagnostic to be calibrated within the forecast
+            and truth tables. This name is used to filter the Parquet file
+            when reading from disk.
+        percentiles (List[float]):
+            The set of percentiles to be used for estimating coefficients.
+            These should be a set of equally spaced quantiles.
+        experiment (str):
+            A value within the experiment column to select from the forecast
+            table.
+        adjacent_range (int):
+            A period in hours that should be used either side of each
+            forecast period to allow for the inclusion of forecasts and
+            observations that are close to the validity time being calibrated.
+
+    Returns:
+        A CubeList containing the forecast and truth cubes for each forecast
+        period, keyed by the forecast period in seconds. The CubeList is
+        [None, None] for forecast periods without training data.
+    """
+    from improver.calibration import get_training_period_cycles
+    from improver.calibration.dataframe_utilities import (
+        forecast_and_truth_dataframes_to_cubes,
+    )
+
+    forecast_df, truth_df = read_parquet_for_forecast_periods(
+        forecast,
+        truth,
+        forecast_periods,
+        cycletime,
+        training_length,
+        diagnostic,
+        adjacent_range=adjacent_range,
+    )
+    groups = dict(list(forecast_df.groupby("forecast_period", sort=True)))
+    tolerance = pd.Timedelta(adjacent_range, unit="hours")
+
+    results = {}
+    for forecast_period in forecast_periods:
+        forecast_period_td = pd.Timedelta(int(forecast_period), unit="seconds")
+        cycletimes = get_training_period_cycles(
+            cycletime, forecast_period, training_length
+        )
+        period_dfs = [
+            group
+            for period, group in groups.items()
+            if forecast_period_td - tolerance
+            <= period
+            <= forecast_period_td + tolerance
+        ]
+        period_df = pd.concat(period_dfs) if period_dfs else forecast_df.iloc[:0]
+        period_df = period_df[period_df["blend_time"].isin(cycletimes)]
+
+        forecast_cube, truth_cube = forecast_and_truth_dataframes_to_cubes(
+            period_df,
+            truth_df,
+            cycletime,
+            forecast_period,
+            training_length,
+            percentiles=percentiles,
+            experiment=experiment,
+            adjacent_range=adjacent_range,
+        )
+        if not forecast_cube or not truth_cube:
+            results[int(forecast_period)] = [None, None]
+        else:
+            results[int(forecast_period)] = CubeList([forecast_cube, truth_cube])
+    return results
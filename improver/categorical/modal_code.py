@@ -11,7 +11,6 @@ import numpy as np
 from iris.analysis import Aggregator
 from iris.cube import Cube, CubeList
 from numpy import ndarray
-from scipy import stats
 
 from improver import BasePlugin
 from improver.blending import RECORD_COORD
@@ -23,7 +22,12 @@ from improver.constants import HOURS_IN_DAY
 from improver.utilities.cube_manipulation import MergeCubes
 
 from ..metadata.forecast_times import forecast_period_coord
-from .utilities import day_night_map, dry_map
+from .utilities import (
+    counts_per_category,
+    day_night_map,
+    dry_map,
+    most_common_category,
+)
 
 
 class BaseModalCategory(BasePlugin):
@@ -146,12 +150,11 @@ class BaseModalCategory(BasePlugin):
 
 class ModalCategory(BaseModalCategory):
     """Plugin that returns the modal category over the period spanned by the
-    input data. In cases of a tie in the mode values, scipy returns the smaller
-    value. The opposite is desirable in this case as the significance /
-    importance of the weather code categories generally increases with the value. To
-    achieve this the categories are subtracted from an arbitrarily larger
-    number prior to calculating the mode, and this operation is reversed before the
-    final output is returned.
+    input data. In cases of a tie in the mode values, the larger value is
+    returned as the significance / importance of the weather code categories
+    generally increases with the value. The mode is found by counting the
+    occurrences of each category at every point in a single pass, see
+    counts_per_category.
 
     If there are many different categories for a single point over the time
     spanned by the input cubes it may be that the returned mode is not robust.
@@ -246,8 +249,9 @@ class ModalCategory(BaseModalCategory):
                 default_code = sorted([code for code in data if code in codes])
                 if default_code:
                     data[np.isin(data, codes)] = default_code[0]
-            mode_result, counts = stats.mode(self.code_max - data)
-            modal.data[tuple(point)] = self.code_max - mode_result
+            offset = data.min()
+            counts = counts_per_category(data - offset, data.max() - offset + 1)
+            modal.data[tuple(point)] = most_common_category(counts) + offset
 
     def mode_aggregator(self, data: ndarray, axis: int) -> ndarray:
         """An aggregator for use with iris to calculate the mode along the
@@ -271,13 +275,18 @@ class ModalCategory(BaseModalCategory):
         # Aggregation coordinate is moved to the -1 position in initialisation;
         # move this back to the leading coordinate
         data = np.moveaxis(data, [axis], [0])
-        data = data.astype(self.min_dtype)
         minimum_significant_count = 0.3 * data.shape[0]
-        mode_result, counts = stats.mode(self.code_max - data, axis=0)
-        mode_result[counts < minimum_significant_count] = (
-            self.code_max - self.unset_code_indicator
+        # Offset the categories to start from zero to minimise the number of
+        # bins counted at each point.
+        offset = int(data.min())
+        counts = counts_per_category(data - offset, int(data.max()) - offset + 1)
+        mode_result = most_common_category(counts)
+        mode_counts = np.take_along_axis(counts, mode_result[..., np.newaxis], -1)
+        mode_result = (mode_result + offset).astype(self.min_dtype)
+        mode_result[mode_counts[..., 0] < minimum_significant_count] = (
+            self.unset_code_indicator
         )
-        return (self.code_max - np.squeeze(mode_result)).astype(data.dtype)
+        return mode_result
 
     @staticmethod
     def _set_blended_times(cube: Cube) -> None:
@@ -584,27 +593,6 @@ class ModalFromGroupings(BaseModalCategory):
         )
         return (self.wet_bias * wet_counts) >= dry_counts
 
-    @staticmethod
-    def counts_per_category(data: np.ndarray, bin_max: int) -> np.ndarray:
-        """Implemented following https://stackoverflow.com/questions/46256279/bin-elements-per-row-vectorized-2d-bincount-for-numpy/46256361#46256361  # noqa: E501
-        Use np.bincount to count the number of occurrences within each category, so that
-        the most common occurrence can then be found.
-
-        Args:
-            data: Array where occurrences of each possible integer value between 0
-                and data.max() will be counted.
-            bin_max: Integer defining the number of categories expected.
-
-        Returns:
-            An array of counts for the occurrence of each category within each row.
-        """
-        n_cat = bin_max + 1
-        a_offs = data + np.arange(data.shape[0])[:, None] * n_cat
-        # Use compressed() to avoid counting masked values.
-        return np.bincount(
-            a_offs.ravel().compressed(), minlength=data.shape[0] * n_cat
-        ).reshape(-1, n_cat)
-
     def _find_most_significant_dry_code(
         self, cube: Cube, result: Cube, dry_indices: np.ndarray
     ) -> Cube:
@@ -622,30 +610,18 @@ class ModalFromGroupings(BaseModalCategory):
             weather code is used, assuming higher values for the weather code indicates
             more significant weather.
         """
-        data = cube.data.copy()
         data = np.ma.masked_where(
-            ~np.isin(cube.data.copy(), self.broad_categories["dry"]), data
+            ~np.isin(cube.data, self.broad_categories["dry"]), cube.data
         )
 
-        # If required, reshape a 3D dataset e.g. a gridded dataset to 2D.
-        # 2D datasets e.g. site datasets will be unchanged.
-        reshaped_data = data.T.reshape(-1, len(cube.coord("time").points), order="F")
         bins = [i for v in self.broad_categories.values() for i in v]
         bin_max = np.amax(bins)
 
-        counts = self.counts_per_category(reshaped_data, bin_max=bin_max)
-
-        # Flip counts with the aim that the counts for the higher index weather codes
-        # are on the left, and will therefore be selected by argmax.
-        counts = np.fliplr(counts)
-
-        # Reshape the 2D counts back to a 3D dataset, if required. If the input
-        # data is 2D, this reshape will have no impact.
-        reshaped_counts = counts.reshape(*data.shape[1:], -1)
-
-        result.data[dry_indices] = (bin_max - np.argmax(reshaped_counts, axis=-1))[
-            dry_indices
-        ]
+        # Counts are returned with the time dimension removed, such that the
+        # most common code can be selected at each point. Ties are resolved in
+        # favour of the higher index weather code.
+        counts = counts_per_category(data, bin_max + 1)
+        result.data[dry_indices] = most_common_category(counts)[dry_indices]
         return result
 
     def _find_intensity_indices(self, cube: Cube) -> np.ndarray:
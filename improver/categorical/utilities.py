@@ -595,3 +595,49 @@ def dry_map(decision_tree: Dict[str, Dict[str, Union[str, List]]]) -> Dict:
         for v in decision_tree.values()
         if "dry_equivalent" in v.keys()
     }
+
+
+def counts_per_category(data: np.ndarray, n_categories: int) -> np.ndarray:
+    """Count the occurrences of each category at every point in a single pass.
+    The leading dimension of the data is the one along which categories are
+    counted, e.g. time. Each point is given its own block of n_categories bins
+    by offsetting the categories by the flattened point index, such that a
+    single call to np.bincount produces a histogram for every point.
+
+    Args:
+        data:
+            Integer array of categories with the dimension to be counted
+            along leading. All values must lie within the range
+            [0, n_categories). Masked values are not counted.
+        n_categories:
+            The number of categories to count.
+
+    Returns:
+        Array of counts with the leading dimension of the input data removed
+        and a trailing dimension of length n_categories added, such that
+        counts[..., i] is the number of occurrences of category i at each point.
+    """
+    point_shape = data.shape[1:]
+    n_points = int(np.prod(point_shape, dtype=np.int64))
+    offsets = np.arange(n_points, dtype=np.int64) * n_categories
+    indices = data.reshape(data.shape[0], n_points).astype(np.int64) + offsets
+    if np.ma.isMaskedArray(indices):
+        indices = indices.compressed()
+    counts = np.bincount(indices.ravel(), minlength=n_points * n_categories)
+    return counts.reshape(*point_shape, n_categories)
+
+
+def most_common_category(counts: np.ndarray) -> np.ndarray:
+    """Identify the most common category from counts returned by
+    counts_per_category. In the case of a tie, the highest category is
+    returned, reflecting the increasing significance of higher categories.
+
+    Args:
+        counts:
+            Array of counts with categories on the trailing dimension.
+
+    Returns:
+        Array containing the index of the most common category at each point.
+    """
+    n_categories = counts.shape[-1]
+    return n_categories - 1 - np.argmax(counts[..., ::-1], axis=-1)
@@ -0,0 +1,301 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Module containing opt-in chunked execution of elementwise plugins.
+
+Plugins whose outputs at each point depend only on their inputs at the same
+point declare the coordinates over which they can be applied block by block,
+through BasePlugin.chunkable_coords, and elementwise functions are
+decorated with chunkable. When chunked execution is enabled, the input cubes
+of these plugins and functions are split into blocks along the chunking
+coordinate, the plugin or function is applied to each block, optionally in a
+pool of threads, and the results are concatenated to give the same output as
+applying it to the whole cubes. Lazy inputs are only realised one
+block at a time, so the peak memory of the plugin's array calculations is
+bounded by the size of the blocks rather than the size of the inputs.
+
+Chunked execution is enabled by setting the IMPROVER_CHUNK_SIZE environment
+variable to the number of points of the chunking coordinate in each block,
+or by calling chunked_execution_enable. The chunking coordinate defaults to
+the y axis and can be set to e.g. "realization" with IMPROVER_CHUNK_COORD,
+and the number of threads with IMPROVER_CHUNK_WORKERS.
+"""
+
+import copy
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+#: Environment variable giving the number of points in each block.
+CHUNK_SIZE_ENV_VAR = "IMPROVER_CHUNK_SIZE"
+
+#: Environment variable giving the axis or name of the chunking coordinate.
+CHUNK_COORD_ENV_VAR = "IMPROVER_CHUNK_COORD"
+
+#: Environment variable giving the number of threads processing blocks.
+CHUNK_WORKERS_ENV_VAR = "IMPROVER_CHUNK_WORKERS"
+
+
+class _ChunkSettings(NamedTuple):
+    """Settings of chunked execution."""
+
+    chunk_size: int
+    coord: str
+    max_workers: int
+
+
+_settings: Optional[_ChunkSettings] = None
+_local = threading.local()
+
+
+def chunked_execution_enable(
+    chunk_size: int, coord: str = "y", max_workers: int = 1
+) -> None:
+    """Enable chunked execution of plugins that support it.
+
+    Args:
+        chunk_size:
+            Number of points of the chunking coordinate in each block, which
+            must be at least two, as plugins may demote coordinates of length
+            one to scalar coordinates.
+        coord:
+            Axis ("x" or "y") or name of the coordinate along which inputs are
+            split into blocks.
+        max_workers:
+            Number of threads applying the plugin to blocks concurrently.
+
+    Raises:
+        ValueError: If chunk_size is less than two or max_workers is not
+            positive.
+    """
+    global _settings
+    if chunk_size < 2:
+        raise ValueError(f"chunk_size must be at least 2, not {chunk_size}")
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be a positive integer, not {max_workers}")
+    _settings = _ChunkSettings(chunk_size, coord, max_workers)
+
+
+def chunked_execution_disable() -> None:
+    """Disable chunked execution of plugins."""
+    global _settings
+    _settings = None
+
+
+def chunked_execution_enabled() -> bool:
+    """Return whether chunked execution is enabled, which it is not within a
+    block that is already being processed."""
+    return _settings is not None and not getattr(_local, "in_block", False)
+
+
+def _chunk_dim(cube: Any, coord: str) -> Optional[int]:
+    """Return the dimension of a cube described by the chunking coordinate,
+    or None if the cube does not have this dimension coordinate."""
+    from iris.cube import Cube
+
+    if not isinstance(cube, Cube):
+        return None
+    if coord in ("x", "y"):
+        coords = cube.coords(axis=coord, dim_coords=True)
+    else:
+        coords = cube.coords(coord, dim_coords=True)
+    return cube.coord_dims(coords[0])[0] if coords else None
+
+
+def _block_slices(length: int, chunk_size: int) -> List[slice]:
+    """Divide a dimension into blocks of chunk_size points, adding a final
+    point to the previous block rather than leaving it in a block alone."""
+    starts = list(range(0, length, chunk_size))
+    if len(starts) > 1 and length - starts[-1] == 1:
+        starts.pop()
+    return [slice(start, stop) for start, stop in zip(starts, starts[1:] + [length])]
+
+
+def _slice_args(value: Any, coord: str, block: slice) -> Any:
+    """Slice the cubes in an argument, which may be a cube or a list of cubes,
+    along the chunking coordinate. Other values are returned unchanged."""
+    from iris.cube import CubeList
+
+    if isinstance(value, (list, tuple)):
+        sliced = [_slice_args(item, coord, block) for item in value]
+        return CubeList(sliced) if isinstance(value, CubeList) else type(value)(sliced)
+    dim = _chunk_dim(value, coord)
+    if dim is None:
+        return value
+    return value[(slice(None),) * dim + (block,)]
+
+
+def _chunk_lengths(value: Any, coord: str) -> List[int]:
+    """Lengths along the chunking coordinate of the cubes in an argument."""
+    if isinstance(value, (list, tuple)):
+        return [length for item in value for length in _chunk_lengths(item, coord)]
+    dim = _chunk_dim(value, coord)
+    return [] if dim is None else [value.shape[dim]]
+
+
+def chunked_process(plugin: Any) -> Callable:
+    """Return the process method of a plugin, or a function applying it block
+    by block if chunked execution is enabled and the plugin supports chunking
+    along the chunking coordinate.
+
+    Args:
+        plugin:
+            The plugin instance.
+
+    Returns:
+        Function taking the arguments of the plugin's process method.
+    """
+    settings = _settings
+    if (
+        not chunked_execution_enabled()
+        or settings.coord not in plugin.chunkable_coords()
+    ):
+        return plugin.process
+
+    def process_block(*args, **kwargs):
+        # Plugins may modify their attributes while processing, so each block
+        # is processed by a copy of the plugin.
+        return copy.deepcopy(plugin).process(*args, **kwargs)
+
+    return _blockwise(plugin.process, process_block, settings)
+
+
+def chunkable(*coords: str) -> Callable:
+    """Decorator applying an elementwise function to blocks of its input
+    cubes when chunked execution is enabled.
+
+    Args:
+        coords:
+            Axes or names of the coordinates along which the input cubes can
+            be split into blocks.
+
+    Returns:
+        Decorator for the function.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            settings = _settings
+            if not chunked_execution_enabled() or settings.coord not in coords:
+                return function(*args, **kwargs)
+            return _blockwise(function, function, settings)(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _blockwise(
+    process: Callable, process_block: Callable, settings: _ChunkSettings
+) -> Callable:
+    """Return a function applying process_block to blocks of its inputs and
+    concatenating the results, or applying process to the whole inputs if
+    they are not longer than one block or their lengths along the chunking
+    coordinate differ.
+
+    Args:
+        process:
+            Function applied to the whole inputs.
+        process_block:
+            Function applied to each block of the inputs.
+        settings:
+            Settings of chunked execution.
+
+    Returns:
+        Function taking the same arguments as process.
+    """
+
+    def process_blocks(*args, **kwargs):
+        lengths = _chunk_lengths([*args, *kwargs.values()], settings.coord)
+        if not lengths or len(set(lengths)) > 1 or lengths[0] <= settings.chunk_size:
+            return process(*args, **kwargs)
+        return _process_blocks(process_block, settings, lengths[0], args, kwargs)
+
+    return process_blocks
+
+
+def _process_blocks(
+    process_block: Callable,
+    settings: _ChunkSettings,
+    length: int,
+    args: tuple,
+    kwargs: Dict[str, Any],
+) -> Any:
+    """Apply a function to blocks of its inputs and concatenate the results.
+
+    Args:
+        process_block:
+            Function applied to each block of the inputs.
+        settings:
+            Settings of chunked execution.
+        length:
+            Length of the inputs along the chunking coordinate.
+        args:
+            Positional arguments to the function.
+        kwargs:
+            Keyword arguments to the function.
+
+    Returns:
+        Cube concatenated from the outputs for each block.
+    """
+    from iris.cube import CubeList
+
+    def run(block: slice) -> Any:
+        block_args = _slice_args(args, settings.coord, block)
+        block_kwargs = {
+            key: _slice_args(value, settings.coord, block)
+            for key, value in kwargs.items()
+        }
+        in_block = getattr(_local, "in_block", False)
+        _local.in_block = True
+        try:
+            return process_block(*block_args, **block_kwargs)
+        finally:
+            _local.in_block = in_block
+
+    blocks = _block_slices(length, settings.chunk_size)
+    if settings.max_workers > 1:
+        with ThreadPoolExecutor(max_workers=settings.max_workers) as executor:
+            results = list(executor.map(run, blocks))
+    else:
+        results = [run(block) for block in blocks]
+    return CubeList(results).concatenate_cube()
+
+
+def _enable_from_environment(environ: Optional[Dict] = None) -> None:
+    """Enable chunked execution if the IMPROVER_CHUNK_SIZE environment
+    variable is set.
+
+    Args:
+        environ:
+            Environment variables. Defaults to os.environ.
+
+    Raises:
+        ValueError: If IMPROVER_CHUNK_SIZE is less than two or
+            IMPROVER_CHUNK_WORKERS is not positive.
+    """
+    environ = os.environ if environ is None else environ
+    chunk_size = environ.get(CHUNK_SIZE_ENV_VAR)
+    if chunk_size:
+        max_workers = environ.get(CHUNK_WORKERS_ENV_VAR, "1")
+        if int(chunk_size) < 2:
+            raise ValueError(
+                f"{CHUNK_SIZE_ENV_VAR} must be at least 2, not {chunk_size}"
+            )
+        if int(max_workers) < 1:
+            raise ValueError(
+                f"{CHUNK_WORKERS_ENV_VAR} must be a positive integer, "
+                f"not {max_workers}"
+            )
+        chunked_execution_enable(
+            int(chunk_size),
+            coord=environ.get(CHUNK_COORD_ENV_VAR, "y"),
+            max_workers=int(max_workers),
+        )
+
+
+_enable_from_environment()
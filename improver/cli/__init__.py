@@ -9,7 +9,7 @@ import pathlib
 import shlex
 import time
 from collections import OrderedDict
-from functools import partial
+from functools import lru_cache, partial
 
 import clize
 from clize import parameters
@@ -126,7 +126,8 @@ def inputcube(to_convert):
 
     Args:
         to_convert (string or iris.cube.Cube):
-            File name or Cube object.
+            File name or Cube object. The file may be a netCDF file or a
+            Zarr store.
 
     Returns:
         Loaded cube or passed object.
@@ -313,11 +314,16 @@ def with_output(
     pass_through_output=False,
     compression_level=1,
     least_significant_digit: int = None,
+    compression="zlib",
+    chunking: str = None,
+    zarr=False,
     **kwargs,
 ):
     """Add `output` keyword only argument.
     Add `compression_level` option.
     Add `least_significant_digit` option.
+    Add `compression` and `chunking` options.
+    Add `zarr` option.
 
     This is used to add extra `output`, `compression_level` and `least_significant_digit` CLI
     options. If `output` is provided, it saves the result of calling `wrapped` to file and returns
@@ -344,6 +350,16 @@ def with_output(
             http://www.esrl.noaa.gov/psd/data/gridded/conventions/cdc_netcdf_standard.shtml
             for details. When used with `compression level`, this will result in lossy
             compression.
+        compression (str):
+            Compression codec for the netCDF data variables, e.g. zlib
+            (default), zstd or blosc_lz4.
+        chunking (str):
+            Chunking strategy for the netCDF data variables: slices, blocks,
+            blocks:N for N thresholds per chunk, tiles or tiles:N for N by N
+            spatial tiles. By default each spatial slice is a chunk.
+        zarr (bool):
+            Save the output as a Zarr store rather than a netCDF file. Outputs
+            with the file extension .zarr are always saved as Zarr stores.
     Returns:
         Result of calling `wrapped` or None if `output` is given.
     """
@@ -364,7 +380,15 @@ def with_output(
             or all([isinstance(x, Cube) for x in result])
         )
     ):
-        save_netcdf(result, output, compression_level, least_significant_digit)
+        save_netcdf(
+            result,
+            output,
+            compression_level,
+            least_significant_digit,
+            compression=compression,
+            chunking=chunking,
+            zarr=zarr,
+        )
         if pass_through_output:
             return ObjectAsStr(result, output)
         return
@@ -399,7 +423,7 @@ def improver_help(prog_name: parameters.pass_name, command=None, *, usage=False)
     """Show command help."""
     prog_name = prog_name.split()[0]
     args = filter(None, [command, "--help", usage and "--usage"])
-    result = execute_command(SUBCOMMANDS_DISPATCHER, prog_name, *args)
+    result = execute_command(dispatch_subcommand, prog_name, *args)
     if not command and usage:
         result = "\n".join(
             line
@@ -411,37 +435,97 @@ def improver_help(prog_name: parameters.pass_name, command=None, *, usage=False)
 
 def command_executor(*argv, verbose=False, dry_run=False):
     """Common entry point for straight command execution."""
-    return execute_command(
-        SUBCOMMANDS_DISPATCHER, *argv, verbose=verbose, dry_run=dry_run
-    )
+    return execute_command(dispatch_subcommand, *argv, verbose=verbose, dry_run=dry_run)
 
 
-def _cli_items():
-    """Dynamically discover CLIs."""
-    import importlib
+@lru_cache(maxsize=1)
+def _cli_module_names():
+    """Discover the names of the CLI modules without importing them.
+
+    Returns:
+        dict:
+            The CLI modules keyed by the name of their subcommand.
+    """
     import pkgutil
 
+    from clize.util import name_py2cli
+
     from improver.cli import __path__ as improver_cli_pkg_path
 
+    return {
+        name_py2cli(minfo.name): minfo.name
+        for minfo in pkgutil.iter_modules(improver_cli_pkg_path)
+        if minfo.name != "__main__"
+    }
+
+
+def _cli_items():
+    """Dynamically discover CLIs."""
+    import importlib
+
     yield ("help", improver_help)
-    for minfo in pkgutil.iter_modules(improver_cli_pkg_path):
-        mod_name = minfo.name
-        if mod_name != "__main__":
-            mcli = importlib.import_module("improver.cli." + mod_name)
-            yield (mod_name, clizefy(mcli.process))
+    for mod_name in _cli_module_names().values():
+        mcli = importlib.import_module("improver.cli." + mod_name)
+        yield (mod_name, clizefy(mcli.process))
 
 
-SUBCOMMANDS_TABLE = OrderedDict(sorted(_cli_items()))
+@lru_cache(maxsize=1)
+def _subcommands_table():
+    """Build the table of all subcommands, importing every CLI module."""
+    return OrderedDict(sorted(_cli_items()))
 
 
-# main CLI object with subcommands
+@lru_cache(maxsize=1)
+def _subcommands_dispatcher():
+    """Build the main CLI object with all subcommands, as required to list the
+    available subcommands or suggest alternatives to an unknown subcommand."""
+    return clizefy(
+        _subcommands_table(),
+        description="""IMPROVER NWP post-processing toolbox""",
+        footnotes="""See also improver --help for more information.""",
+    )
+
+
+def dispatch_subcommand(prog_name, *args):
+    """Dispatch the arguments to a subcommand, importing only the CLI module
+    that implements that subcommand. The full table of subcommands is only
+    built if the subcommand is not recognised, e.g. to show the help for all
+    subcommands.
+
+    Args:
+        prog_name (str):
+            The program name.
+        args (str):
+            The subcommand name followed by its arguments.
+
+    Returns:
+        The result of the subcommand.
+    """
+    import importlib
+
+    command = args[0].lower() if args else None
+    if command == "help":
+        subcommand = improver_help
+    elif command in _cli_module_names():
+        mcli = importlib.import_module("improver.cli." + _cli_module_names()[command])
+        subcommand = clizefy(mcli.process)
+    else:
+        return _subcommands_dispatcher()(prog_name, *args)
+    return Clize.get_cli(subcommand)(f"{prog_name} {args[0]}", *args[1:])
+
 
+def __getattr__(name):
+    """Provide the subcommand table and dispatcher, and the CLI modules, on
+    first access rather than on import of improver.cli."""
+    import importlib
 
-SUBCOMMANDS_DISPATCHER = clizefy(
-    SUBCOMMANDS_TABLE,
-    description="""IMPROVER NWP post-processing toolbox""",
-    footnotes="""See also improver --help for more information.""",
-)
+    if name == "SUBCOMMANDS_TABLE":
+        return _subcommands_table()
+    if name == "SUBCOMMANDS_DISPATCHER":
+        return _subcommands_dispatcher()
+    if name in _cli_module_names().values():
+        return importlib.import_module("improver.cli." + name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # IMPROVER top level main
@@ -536,6 +620,7 @@ def main(
     *args,
     profile: value_converter(lambda _: _, name="FILENAME") = None,  # noqa: F821
     memprofile: value_converter(lambda _: _, name="FILENAME") = None,  # noqa: F821
+    plugin_trace: value_converter(lambda _: _, name="FILENAME") = None,  # noqa: F821
     verbose=False,
     dry_run=False,
 ):
@@ -564,6 +649,12 @@ def main(
             of your program (suffixed with _SNAPSHOT)
             and a track of the maximum memory used by your program
             over time (suffixed with _MAX_TRACKER).
+        plugin_trace (str):
+            If given, will record the wall time, CPU time, peak memory
+            increase and input and output shapes of each plugin call to the
+            file given, as JSON lines, or as a Chrome trace if the file name
+            ends in .json. Tracing can also be enabled by setting the
+            IMPROVER_PLUGIN_TRACE environment variable to the file name.
         verbose (bool):
             Print executed commands
         dry_run (bool):
@@ -578,12 +669,16 @@ def main(
         from improver.profile import profile_hook_enable
 
         profile_hook_enable(dump_filename=None if profile == "-" else profile)
+    if plugin_trace is not None:
+        from improver.instrumentation import plugin_trace_enable
+
+        plugin_trace_enable(plugin_trace)
     if memprofile is not None:
         from improver.memprofile import memory_profile_decorator
 
         exec_cmd = memory_profile_decorator(exec_cmd, memprofile)
     result = exec_cmd(
-        SUBCOMMANDS_DISPATCHER,
+        dispatch_subcommand,
         prog_name,
         command,
         *args,
@@ -596,6 +691,10 @@ def main(
 def run_main(argv=None):
     """Overrides argv[0] to be 'improver' then runs main.
 
+    If argv is not provided and the IMPROVER_SERVER_SOCKET environment
+    variable gives the socket of a running improver server, the command is
+    sent to the server rather than being run in this process.
+
     Args:
         argv (list of str):
             Arguments that were from the command line.
@@ -609,6 +708,12 @@ def run_main(argv=None):
     # override argv[0] and pass it explicitly in order to avoid this
     # so that the help command reflects the way that we call improver.
     if argv is None:
+        from improver.server import SOCKET_ENV_VAR, run_on_server
+
+        if os.environ.get(SOCKET_ENV_VAR):
+            returncode = run_on_server(sys.argv[1:])
+            if returncode is not None:
+                sys.exit(returncode)
         argv = sys.argv[:]
         argv[0] = "improver"
     run(main, args=argv)
@@ -10,7 +10,12 @@ from improver import cli
 
 @cli.clizefy
 @cli.with_output
-def process(*cubes: cli.inputcube, coordinates: cli.comma_separated_list = None):
+def process(
+    *cubes: cli.inputcube,
+    coordinates: cli.comma_separated_list = None,
+    rolling_state: str = None,
+    window_length: int = None,
+):
     """Aggregate reliability tables.
 
     Aggregate multiple reliability calibration tables and/or aggregate over
@@ -26,6 +31,19 @@ def process(*cubes: cli.inputcube, coordinates: cli.comma_separated_list = None)
             calibration table using summation. If the list is empty
             and a single cube is provided, this cube will be returned
             unchanged.
+        rolling_state (str):
+            Optional path to a directory holding the state of a rolling
+            aggregation over a window of forecast reference times. A single
+            reliability table must be provided, which is added to the
+            aggregation while the tables that leave the window are removed
+            from it. The directory holds the running sum of the tables in the
+            window and a file for each of these tables, so only the running
+            sum, the new table and the tables that leave the window are read
+            or written. If the directory does not exist a new rolling
+            aggregation is started.
+        window_length (int):
+            The length of the rolling window in days, which must be provided
+            with the rolling state.
     Returns:
         iris.cube.Cube:
             Aggregated reliability table.
@@ -34,4 +52,49 @@ def process(*cubes: cli.inputcube, coordinates: cli.comma_separated_list = None)
         AggregateReliabilityCalibrationTables,
     )
 
-    return AggregateReliabilityCalibrationTables()(cubes, coordinates=coordinates)
+    if rolling_state is None:
+        return AggregateReliabilityCalibrationTables()(cubes, coordinates=coordinates)
+
+    import os
+    from datetime import datetime, timezone
+
+    import iris
+
+    from improver.calibration.reliability_calibration import (
+        RollingAggregateReliabilityCalibrationTables,
+    )
+    from improver.utilities.load import load_cube
+    from improver.utilities.save import save_netcdf
+    from improver.utilities.temporal import datetime_to_cycletime
+
+    if len(cubes) != 1 or window_length is None:
+        raise ValueError(
+            "A single reliability table and the window length must be "
+            "provided for a rolling aggregation."
+        )
+    reliability_table = AggregateReliabilityCalibrationTables()(
+        cubes, coordinates=coordinates
+    )
+
+    def table_path(frt_point):
+        frt = datetime.fromtimestamp(int(frt_point), tz=timezone.utc)
+        return os.path.join(
+            rolling_state, f"reliability_table_{datetime_to_cycletime(frt)}.nc"
+        )
+
+    plugin = RollingAggregateReliabilityCalibrationTables(window_length)
+    state_path = os.path.join(rolling_state, "running_sum.nc")
+    # The state is loaded with iris directly, as it includes a cube without
+    # spatial coordinates, which load_cubelist does not support.
+    state = iris.load(state_path) if os.path.exists(state_path) else None
+    expired_points = plugin.expired_forecast_reference_times(reliability_table, state)
+    expired_tables = [load_cube(table_path(point)) for point in expired_points]
+    result, state = plugin(reliability_table, state, expired_tables)
+
+    os.makedirs(rolling_state, exist_ok=True)
+    (frt_point,) = reliability_table.coord("forecast_reference_time").points
+    save_netcdf(reliability_table, table_path(frt_point))
+    save_netcdf(state, state_path)
+    for point in expired_points:
+        os.remove(table_path(point))
+    return result
@@ -17,6 +17,8 @@ def process(
     unique_site_id_keys: cli.comma_separated_list = "wmo_id",
     cycletime: str = None,
     forecast_period: int = None,
+    chunk_size: int = None,
+    n_workers: int = 1,
 ):
     """Applying the Quantile Regression Random Forest model.
 
@@ -66,6 +68,11 @@ def process(
             The forecast period of the forecast to be calibrated in seconds. If not
             provided, the first forecast period found in the forecast cube
             will be used.
+        chunk_size (int):
+            Maximum number of sites predicted by each call of the QRF model. If not
+            provided, the sites are divided equally between the workers.
+        n_workers (int):
+            Number of threads predicting chunks of sites concurrently.
     Returns:
         iris.cube.Cube:
             The calibrated forecast cube.
@@ -83,5 +90,7 @@ def process(
         unique_site_id_keys=unique_site_id_keys,
         cycletime=cycletime,
         forecast_period=forecast_period,
+        chunk_size=chunk_size,
+        n_workers=n_workers,
     )(cubes, qrf_descriptors=qrf_descriptors)
     return result
@@ -19,7 +19,7 @@ def process(
     *,
     diagnostic,
     cycletime,
-    forecast_period,
+    forecast_period: cli.comma_separated_list,
     training_length,
     distribution,
     point_by_point=False,
@@ -30,6 +30,7 @@ def process(
     max_iterations: int = 1000,
     percentiles: cli.comma_separated_list = None,
     experiment: str = None,
+    num_workers: int = 1,
 ):
     """Estimate coefficients for Ensemble Model Output Statistics.
 
@@ -39,6 +40,15 @@ def process(
     forecasts and historical truth data (to use in calibration).
     The estimated coefficients are output as a cube.
 
+    Coefficients can be estimated for several forecast periods from a single
+    read of the forecast and truth tables by providing a list of forecast
+    periods, in which case the coefficients for each forecast period are
+    estimated independently and the coefficient cubes have a forecast_period
+    dimension. apply-emos-coefficients uses the coefficients for the forecast
+    period of the forecast being calibrated. A warning is raised for any
+    forecast periods without training data, for which no coefficients are
+    estimated.
+
     Args:
         forecast (pathlib.Path):
             The path to a Parquet file containing the historical forecasts
@@ -60,8 +70,9 @@ def process(
             when reading from disk.
         cycletime (str):
             Cycletime of a format similar to 20170109T0000Z.
-        forecast_period (int):
-            Forecast period to be calibrated in seconds.
+        forecast_period (List[int]):
+            Forecast period or comma-separated list of forecast periods to be
+            calibrated in seconds.
         training_length (int):
             Number of days within the training period.
         distribution (str):
@@ -109,22 +120,32 @@ def process(
         experiment (str):
             A value within the experiment column to select from the forecast
             table.
+        num_workers (int):
+            Number of threads estimating the coefficients for different
+            forecast periods concurrently.
 
     Returns:
         iris.cube.CubeList:
             CubeList containing the coefficients estimated using EMOS. Each
-            coefficient is stored in a separate cube.
+            coefficient is stored in a separate cube. If there are several
+            forecast periods, the coefficients for the forecast periods with
+            training data are merged along a forecast_period dimension.
     """
+    import warnings
+
+    from iris.cube import CubeList
+    from joblib import Parallel, delayed
+
     from improver.calibration import get_common_wmo_ids
     from improver.calibration.emos_calibration import (
         EstimateCoefficientsForEnsembleCalibration,
     )
-    from improver.calibration.utilities import convert_parquet_to_cube
+    from improver.calibration.utilities import convert_parquet_to_cubes
 
-    forecast_cube, truth_cube = convert_parquet_to_cube(
+    training_data = convert_parquet_to_cubes(
         forecast,
         truth,
-        forecast_period=forecast_period,
+        forecast_periods=[int(float(fp)) for fp in forecast_period],
         cycletime=cycletime,
         training_length=training_length,
         diagnostic=diagnostic,
@@ -132,21 +153,40 @@ def process(
         experiment=experiment,
     )
 
-    if not forecast_cube or not truth_cube:
-        return
+    def estimate(forecast_cube, truth_cube):
+        # Extract WMO IDs from the additional predictors.
+        forecast_cube, truth_cube, predictors = get_common_wmo_ids(
+            forecast_cube, truth_cube, additional_predictors
+        )
+        plugin = EstimateCoefficientsForEnsembleCalibration(
+            distribution,
+            point_by_point=point_by_point,
+            use_default_initial_guess=use_default_initial_guess,
+            desired_units=units,
+            predictor=predictor,
+            tolerance=tolerance,
+            max_iterations=max_iterations,
+        )
+        return plugin(forecast_cube, truth_cube, additional_fields=predictors)
 
-    # Extract WMO IDs from the additional predictors.
-    forecast_cube, truth_cube, additional_predictors = get_common_wmo_ids(
-        forecast_cube, truth_cube, additional_predictors
-    )
+    inputs = []
+    untrained = []
+    for period, (forecast_cube, truth_cube) in training_data.items():
+        if forecast_cube and truth_cube:
+            inputs.append((forecast_cube, truth_cube))
+        else:
+            untrained.append(str(period))
+    if untrained:
+        warnings.warn(
+            "No coefficients are estimated for forecast periods without "
+            f"training data: {', '.join(untrained)} seconds."
+        )
+    if not inputs:
+        return
 
-    plugin = EstimateCoefficientsForEnsembleCalibration(
-        distribution,
-        point_by_point=point_by_point,
-        use_default_initial_guess=use_default_initial_guess,
-        desired_units=units,
-        predictor=predictor,
-        tolerance=tolerance,
-        max_iterations=max_iterations,
+    coefficients = Parallel(n_jobs=num_workers, prefer="threads")(
+        delayed(estimate)(*cubes) for cubes in inputs
     )
-    return plugin(forecast_cube, truth_cube, additional_fields=additional_predictors)
+    if len(training_data) == 1:
+        return coefficients[0]
+    return CubeList(cube for cubes in coefficients for cube in cubes).merge()
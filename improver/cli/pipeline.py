@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Script to run a pipeline of improver commands."""
+
+from improver import cli
+
+
+@cli.clizefy
+def process(
+    pipeline: cli.inputjson,
+    *,
+    workers: int = 1,
+    verbose: bool = False,
+) -> None:
+    """Run a pipeline of improver commands defined as a graph of nodes.
+
+    Each node runs an improver command. Results are passed between nodes in
+    memory, rather than being written to disk and reloaded, and are released
+    once every node that uses them has started. Nodes that do not depend on
+    each other are run concurrently, although files are loaded and saved by
+    one node at a time. Only the results of nodes with an "output" are
+    written to disk, so every node must either have an "output" or be used by
+    another node.
+
+    The pipeline is a JSON dictionary with a "nodes" dictionary of node
+    definitions keyed by name. Each node has a "command", such as "threshold",
+    and optionally a list of "args", a dictionary of "options" keyed by
+    option name without the leading dashes, and an "output" path. See the
+    improver.pipeline module for an example.
+
+    Args:
+        pipeline (dict):
+            Definition of the pipeline, provided as a JSON file. Arguments and
+            option values of the form "@name" are replaced by the result of
+            the node of that name. Options with a value of true are passed as
+            flags.
+        workers (int):
+            Maximum number of nodes to run at the same time.
+        verbose (bool):
+            Print each command as it is run, with its run time.
+    """
+    from improver.pipeline import run_pipeline
+
+    run_pipeline(pipeline, workers=workers, verbose=verbose)
@@ -22,6 +22,8 @@ def process(
     regrid_for_clustering: bool = True,
     clustering_kwargs: cli.inputjson = None,
     regrid_kwargs: cli.inputjson = None,
+    distance_block_size: int = None,
+    cache_cluster_terms: bool = False,
 ):
     """Cluster primary input and match secondary inputs to clusters.
 
@@ -114,6 +116,19 @@ def process(
                 {"mdtol": 0.5}
 
             Default: None (no additional kwargs)
+        distance_block_size (int):
+            If provided, the distances between primary input realizations are
+            accumulated over blocks of this many points and the clustering
+            method is given the precomputed distances, bounding the memory
+            required for large ensembles and grids. Only supported for
+            clustering methods that accept metric="precomputed", e.g. KMedoids.
+            Default: None (the full fields are clustered)
+        cache_cluster_terms (bool):
+            If True, secondary inputs are matched one forecast period at a
+            time, reusing the terms calculated from the clusters for every
+            secondary input, bounding the memory required for matching large
+            ensembles and grids.
+            Default: False
 
     Returns:
         iris.cube.Cube:
@@ -144,6 +159,8 @@ def process(
         regrid_for_clustering=regrid_for_clustering,
         regrid_kwargs=regrid_kw,
         cycletime=cycletime,
+        distance_block_size=distance_block_size,
+        cache_cluster_terms=cache_cluster_terms,
         **clustering_kw,
     )
 
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Script to run a persistent server for improver commands."""
+
+from improver import cli
+
+
+@cli.clizefy
+def process(
+    *,
+    socket: str,
+    workers: int = 1,
+    preload: cli.comma_separated_list = None,
+    max_requests_per_worker: int = None,
+) -> None:
+    """Run a server that executes improver commands sent to a Unix socket.
+
+    The server keeps the modules used by improver commands imported, so that
+    each command avoids the cost of starting Python and importing iris,
+    numpy, scipy and numba. Commands are run by worker processes, each in the
+    working directory of the client, with the output of the command returned
+    to the client. The server runs until it is interrupted or terminated.
+
+    To send commands to the server, set the IMPROVER_SERVER_SOCKET environment
+    variable to the socket path and run improver commands as usual. If no
+    server is listening on the socket, commands are run locally.
+
+    Args:
+        socket (str):
+            Path of the Unix socket on which to listen for commands.
+        workers (int):
+            Number of worker processes, and so the number of commands that
+            may run at the same time.
+        preload (list of str):
+            Names of modules to import before the workers are started, e.g.
+            "numpy,iris,improver.ensemble_copula_coupling.numba_utilities".
+            Defaults to numpy, scipy, iris and the improver load and save
+            utilities.
+        max_requests_per_worker (int):
+            Number of commands after which a worker is replaced by a fresh
+            worker. By default workers are reused indefinitely, retaining any
+            numba kernels compiled by earlier commands.
+    """
+    from improver.server import serve
+
+    serve(
+        socket,
+        workers=workers,
+        preload=preload,
+        max_requests_per_worker=max_requests_per_worker,
+    )
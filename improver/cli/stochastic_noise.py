@@ -20,6 +20,7 @@ def process(
     num_workers: int = None,
     scale_non_positive_noise=False,
     allow_seeded_parallel_processing: bool = False,
+    backend: str = "threads",
 ):
     """
     Class to apply spatially-structured stochastic noise to non-positive regions of a
@@ -68,7 +69,7 @@ def process(
         db_threshold_units:
             Units of the db_threshold value. Default is "mm/hr".
         num_workers:
-            Number of worker threads for parallel FFT computation.
+            Number of worker threads or processes for parallel FFT computation.
             If not specified, uses the smaller of the plugin's default (number of
             available CPUs) or the number of realizations in the input cube.
         scale_non_positive_noise:
@@ -84,6 +85,10 @@ def process(
             but can introduce run-to-run variation because pySTEPS uses global RNG
             seeding. If False, seeded runs are forced to a single worker for
             reproducibility. Default is False.
+        backend:
+            Scheduler used to generate the noise for different realizations in
+            parallel, either "threads" or "processes". Seeded runs are reproducible
+            with several processes. Default is "threads".
 
     Returns:
         Cube with added stochastic noise.
@@ -111,6 +116,7 @@ def process(
         "db_threshold_units": db_threshold_units,
         "scale_non_positive_noise": scale_non_positive_noise,
         "allow_seeded_parallel_processing": allow_seeded_parallel_processing,
+        "backend": backend,
     }
     if num_workers is not None:
         plugin_kwargs["num_workers"] = num_workers
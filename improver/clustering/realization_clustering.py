@@ -42,18 +42,44 @@ class RealizationClustering(BasePlugin):
     the resultant clusters could represent different types of precipitation events.
     """
 
-    def __init__(self, clustering_method: str, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        clustering_method: str,
+        distance_block_size: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
         """Initialise the RealizationClustering class.
 
         Args:
             clustering_method: The clustering method to use. The clustering method
             to use (e.g. "KMedoids"). The method must be supported by the
             improver.clustering.FitClustering class.
+            distance_block_size: If provided, the Euclidean distances between each
+                pair of realizations are accumulated over blocks of this many
+                points and the clustering method is given the resulting
+                precomputed distance matrix, rather than a table of every point
+                for every realization. This bounds the memory required for large
+                inputs. The clustering method must support
+                metric="precomputed", e.g. KMedoids.
             **kwargs: Additional arguments for the clustering method.
+
+        Raises:
+            ValueError: If distance_block_size is provided alongside a metric
+                other than "euclidean".
         """
         self.clustering_method = clustering_method
+        self.distance_block_size = distance_block_size
         self.kwargs = kwargs
 
+        if distance_block_size is not None and kwargs.get("metric", "euclidean") != (
+            "euclidean"
+        ):
+            msg = (
+                "Only the euclidean metric is supported when distances are "
+                f"computed in blocks. The metric provided was {kwargs['metric']}."
+            )
+            raise ValueError(msg)
+
     @staticmethod
     def _convert_to_2d(array: np.ndarray) -> np.ndarray:
         """Convert an array with arbitrary dimensions to a 2D array by maintaining
@@ -78,6 +104,38 @@ class RealizationClustering(BasePlugin):
             target_shape = (array.shape[0], -1)
             return array.reshape(target_shape)
 
+    @staticmethod
+    def _pairwise_distances(array: np.ndarray, block_size: int) -> np.ndarray:
+        """Calculate the Euclidean distance between each pair of realizations,
+        accumulating the squared distances over blocks of points so that only
+        one block is held at double precision at a time.
+
+        The squared distances are summed from the differences between the
+        realizations, rather than expanded as |a_i|^2 + |a_j|^2 - 2 a_i.a_j,
+        which loses precision through cancellation when the realizations are
+        close together relative to their magnitude.
+
+        Args:
+            array: The input array with realizations on the leading dimension.
+            block_size: The number of points in each block.
+
+        Returns:
+            Symmetric array of distances with shape
+            (n_realizations, n_realizations).
+        """
+        n_realizations = array.shape[0]
+        array_2d = array.reshape(n_realizations, -1)
+        squared_distances = np.zeros((n_realizations, n_realizations))
+        for start in range(0, array_2d.shape[1], block_size):
+            block = array_2d[:, start : start + block_size].astype(np.float64)
+            for index in range(n_realizations - 1):
+                differences = block[index + 1 :] - block[index]
+                squared_distances[index, index + 1 :] += np.einsum(
+                    "ij,ij->i", differences, differences
+                )
+        squared_distances += squared_distances.T
+        return np.sqrt(squared_distances)
+
     def process(self, cube: Cube) -> Any:
         """Apply the clustering method to the cube.
 
@@ -85,6 +143,9 @@ class RealizationClustering(BasePlugin):
         clustering by flattening all dimensions except the leading dimension.
         The leading dimension is assumed to be the realization dimension.
 
+        If a distance_block_size was provided, the clustering method is instead
+        given the precomputed distances between each pair of realizations.
+
         Args:
             cube: The input cube to cluster with the realization dimension
                 as the leading dimension.
@@ -102,14 +163,20 @@ class RealizationClustering(BasePlugin):
                 "the 'realization' dimension."
             )
             raise ValueError(msg)
+        index = [f"realization_{p}" for p in cube.coord("realization").points]
+        if self.distance_block_size is not None:
+            # The rows and columns of the DataFrame both correspond to
+            # realizations, with values giving the distance between each pair.
+            distances = self._pairwise_distances(cube.data, self.distance_block_size)
+            df = pd.DataFrame(distances, index=index, columns=index)
+            kwargs = {**self.kwargs, "metric": "precomputed"}
+            return FitClustering(self.clustering_method, **kwargs)(df)
+
         array_2d = self._convert_to_2d(cube.data)
         # The rows of the DataFrame correspond to realizations. The columns correspond
         # to the flattened non-realization dimensions. These column values are the
         # features that the clustering algorithm will use to cluster the realizations.
-        df = pd.DataFrame(
-            array_2d,
-            index=[f"realization_{p}" for p in cube.coord("realization").points],
-        )
+        df = pd.DataFrame(array_2d, index=index)
         return FitClustering(self.clustering_method, **self.kwargs)(df)
 
 
@@ -129,9 +196,20 @@ class RealizationToClusterMatcher(BasePlugin):
     (realization, forecast_period, y, x) respectively only.
     """
 
-    def __init__(self) -> None:
-        """Initialise the plugin."""
-        pass
+    def __init__(self, cache_cluster_terms: bool = False) -> None:
+        """Initialise the plugin.
+
+        Args:
+            cache_cluster_terms: If True, the MSE is accumulated one forecast
+                period at a time, and the clustered data for each forecast
+                period is converted to double precision with its NaNs masked
+                once and reused by later calls. An instance with this enabled
+                must only be used to match candidates to a single clustered cube,
+                e.g. when matching several secondary inputs to one set of
+                clusters.
+        """
+        self.cache_cluster_terms = cache_cluster_terms
+        self._cluster_terms = {}
 
     def _mean_squared_error_per_realization(
         self,
@@ -174,6 +252,85 @@ class RealizationToClusterMatcher(BasePlugin):
             mse_list.append(mse)
         return np.array(mse_list)
 
+    @staticmethod
+    def _mse_terms(array: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Calculate the terms required to compute the MSE between realizations,
+        ignoring NaN values.
+
+        Args:
+            array: Array with realizations on the leading dimension.
+
+        Returns:
+            Tuple of 2D arrays with realizations as rows and points as columns:
+
+            - values: The values at double precision with NaNs replaced by zero.
+            - valid: True where the values are not NaN.
+        """
+        array_2d = array.reshape(array.shape[0], -1).astype(np.float64)
+        valid = np.isfinite(array_2d)
+        return np.where(valid, array_2d, 0.0), valid
+
+    def _mean_squared_error_from_cached_terms(
+        self, clusters_cube: Cube, candidate_cube: Cube
+    ) -> np.ndarray:
+        """Calculate MSE between clustered and candidate realizations, one forecast
+        period at a time, reusing the cached terms for the clustered cube. The
+        squared differences between each cluster and all candidates are summed
+        over the points where both are valid, which gives the same result as
+        _mean_squared_error_per_realization while holding the squared
+        differences for a single forecast period at a time.
+
+        Args:
+            clusters_cube: The clustered cube with shape (n_clusters, y, x) or
+                (n_clusters, forecast_period, y, x).
+            candidate_cube: The candidate cube with shape (n_realizations, y, x)
+                or (n_realizations, forecast_period, y, x).
+
+        Returns:
+            Array of MSE values with shape (n_realizations, n_clusters) with
+            element [i, j] containing the MSE between candidate realization i
+            and cluster j.
+        """
+        if clusters_cube.ndim == 3:
+            clustered_arrays = [clusters_cube.data]
+            candidate_arrays = [candidate_cube.data]
+        else:
+            clustered_arrays = [
+                clusters_cube.data[:, i] for i in range(clusters_cube.shape[1])
+            ]
+            candidate_arrays = [
+                candidate_cube.data[:, i] for i in range(candidate_cube.shape[1])
+            ]
+        if clusters_cube.coords("forecast_period"):
+            forecast_periods = clusters_cube.coord("forecast_period").points
+        else:
+            forecast_periods = [None]
+
+        mse_per_forecast_period = []
+        for fp, clustered_array, candidate_array in zip(
+            forecast_periods, clustered_arrays, candidate_arrays
+        ):
+            if fp not in self._cluster_terms:
+                self._cluster_terms[fp] = self._mse_terms(clustered_array)
+            cluster_values, cluster_valid = self._cluster_terms[fp]
+            candidate_values, candidate_valid = self._mse_terms(candidate_array)
+            n_clusters = cluster_values.shape[0]
+            squared_error = np.zeros((candidate_values.shape[0], n_clusters))
+            n_valid = np.zeros_like(squared_error)
+            for index in range(n_clusters):
+                both_valid = candidate_valid & cluster_valid[index]
+                differences = np.where(
+                    both_valid, candidate_values - cluster_values[index], 0.0
+                )
+                squared_error[:, index] = np.einsum(
+                    "ij,ij->i", differences, differences
+                )
+                n_valid[:, index] = both_valid.sum(axis=1)
+            mse = np.full(squared_error.shape, np.nan)
+            np.divide(squared_error, n_valid, out=mse, where=n_valid > 0)
+            mse_per_forecast_period.append(mse)
+        return np.nanmean(mse_per_forecast_period, axis=0)
+
     def _validate_cube_dimensions(
         self, clusters_cube: Cube, candidate_cube: Cube
     ) -> None:
@@ -359,11 +516,16 @@ class RealizationToClusterMatcher(BasePlugin):
         self._validate_cube_dimensions(clusters_cube, candidate_cube)
         self._validate_forecast_period_coords(clusters_cube, candidate_cube)
 
-        realization_cluster_mse = self._mean_squared_error_per_realization(
-            clusters_cube.data,
-            candidate_cube.data,
-            n_candidates,
-        )
+        if self.cache_cluster_terms:
+            realization_cluster_mse = self._mean_squared_error_from_cached_terms(
+                clusters_cube, candidate_cube
+            )
+        else:
+            realization_cluster_mse = self._mean_squared_error_per_realization(
+                clusters_cube.data,
+                candidate_cube.data,
+                n_candidates,
+            )
         cluster_indices, realization_indices = self.assign_clusters(
             realization_cluster_mse
         )
@@ -399,6 +561,8 @@ class RealizationClusterAndMatch(BasePlugin):
         regrid_for_clustering: bool = True,
         regrid_kwargs: dict[str, Any] | None = None,
         cycletime: str | None = None,
+        distance_block_size: int | None = None,
+        cache_cluster_terms: bool = False,
         **kwargs: Any,
     ) -> None:
         """Initialise the clustering and matching class.
@@ -454,6 +618,15 @@ class RealizationClusterAndMatch(BasePlugin):
                 the validity times kept fixed. cycletime should be provided in the
                 format YYYYMMDDTHHMMZ (e.g., 20240101T0000Z). If not provided, the
                 forecast_reference_time on the input cubes will be left unchanged.
+            distance_block_size: If provided, the distances between primary input
+                realizations are accumulated over blocks of this many points and
+                the clustering uses the precomputed distances. This bounds the
+                memory required for large ensembles and grids. If not provided,
+                the full field is passed to the clustering method.
+            cache_cluster_terms: If True, secondary inputs are matched one
+                forecast period at a time, reusing the terms calculated from the
+                clusters for every secondary input. This bounds the memory
+                required to match large ensembles and grids.
 
             **kwargs: Additional arguments for the clustering method.
 
@@ -470,6 +643,8 @@ class RealizationClusterAndMatch(BasePlugin):
         self.regrid_for_clustering = regrid_for_clustering
         self.regrid_kwargs = regrid_kwargs if regrid_kwargs is not None else {}
         self.cycletime = cycletime
+        self.distance_block_size = distance_block_size
+        self.cache_cluster_terms = cache_cluster_terms
         self.kwargs = kwargs
 
         if regrid_for_clustering and target_grid_name is None:
@@ -545,7 +720,9 @@ class RealizationClusterAndMatch(BasePlugin):
                 **self.regrid_kwargs,
             )(primary_cube, target_grid_cube)
         clustering_result = RealizationClustering(
-            self.clustering_method, **self.kwargs
+            self.clustering_method,
+            distance_block_size=self.distance_block_size,
+            **self.kwargs,
         )(regridded_cube if self.regrid_for_clustering else primary_cube)
         clustered_cube = self._select_realizations_for_kmedoid_clusters(
             primary_cube, clustering_result
@@ -1016,7 +1193,7 @@ class RealizationClusterAndMatch(BasePlugin):
                 candidate_cube, target_grid_cube
             )
 
-            cluster_indices, realization_indices = RealizationToClusterMatcher()(
+            cluster_indices, realization_indices = self._cluster_matcher(
                 regridded_clustered_primary_cube.extract(fp_constr),
                 regridded_candidate_cube,
             )
@@ -1120,7 +1297,7 @@ class RealizationClusterAndMatch(BasePlugin):
                 # Get the matching cluster indices from the matcher
                 clustered_fp_cube = regridded_clustered_primary_cube.extract(fp_constr)
 
-                cluster_indices, realization_indices = RealizationToClusterMatcher()(
+                cluster_indices, realization_indices = self._cluster_matcher(
                     clustered_fp_cube,
                     regridded_candidate_cube,
                 )
@@ -1259,6 +1436,12 @@ class RealizationClusterAndMatch(BasePlugin):
 
         n_clusters = len(clustered_primary_cube.coord("realization").points)
 
+        # A single matcher is used for all secondary inputs, such that terms
+        # calculated from the clusters can be reused if requested.
+        self._cluster_matcher = RealizationToClusterMatcher(
+            cache_cluster_terms=self.cache_cluster_terms
+        )
+
         # Categorise secondary inputs by whether they have full or partial realizations
         full_realization_inputs, partial_realization_inputs = (
             self._categorise_secondary_inputs(cubes, n_clusters, primary_cube)
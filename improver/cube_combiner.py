@@ -5,7 +5,7 @@
 """Module containing plugins for combining cubes"""
 
 from operator import eq
-from typing import Callable, List, Union
+from typing import Callable, List, Tuple, Union
 
 import iris
 import numpy as np
@@ -110,6 +110,13 @@ class Combine(BasePlugin):
             replace_masked_values_with=self.replace_masked_values_with,
         )
 
+    def chunkable_coords(self) -> Tuple[str, ...]:
+        """Combining is elementwise, so can be applied to blocks of points or,
+        unless broadcasting or filtering realizations, of realizations."""
+        if self.broadcast is None and self.minimum_realizations is None:
+            return ("x", "y", "realization")
+        return ("x", "y")
+
     def process(self, *cubes: Union[Cube, CubeList]) -> Cube:
         """
         Preprocesses the cubes, then passes them to the appropriate plugin
@@ -265,6 +272,13 @@ class CubeCombiner(BasePlugin):
         self.midpoint_bound = midpoint_bound
         self.replace_masked_values_with = replace_masked_values_with
 
+    def chunkable_coords(self) -> Tuple[str, ...]:
+        """Combining is elementwise, so can be applied to blocks of points or,
+        unless broadcasting, of realizations."""
+        if self.broadcast is None:
+            return ("x", "y", "realization")
+        return ("x", "y")
+
     @staticmethod
     def _check_dimensions_match(
         cube_list: Union[List[Cube], CubeList], comparators: List[Callable] = [eq]
@@ -15,7 +15,7 @@ import numpy as np
 from iris.cube import Cube, CubeList
 from iris.exceptions import CoordinateNotFoundError, InvalidCubeError
 from numpy import ndarray
-from scipy import stats
+from scipy import special, stats
 
 import improver.ensemble_copula_coupling._scipy_continuous_distns as scipy_cont_distns
 from improver import BasePlugin
@@ -27,7 +27,7 @@ from improver.ensemble_copula_coupling.utilities import (
     get_bounds_of_distribution,
     insert_lower_and_upper_endpoint_to_1d_array,
     interpolate_multiple_rows_same_x,
-    interpolate_multiple_rows_same_y,
+    interpolate_probabilities_to_percentiles,
     restore_non_percentile_dimensions,
 )
 from improver.metadata.probabilistic import (
@@ -511,33 +511,23 @@ class ConvertProbabilitiesToPercentiles(BasePlugin):
         self.mask_percentiles = mask_percentiles
         self.skip_ecc_bounds = skip_ecc_bounds
 
-    def _add_bounds_to_thresholds_and_probabilities(
-        self,
-        threshold_points: ndarray,
-        probabilities_for_cdf: ndarray,
-        bounds_pairing: Tuple[int, int],
-    ) -> Tuple[ndarray, ndarray]:
+    def _add_bounds_to_thresholds(
+        self, threshold_points: ndarray, bounds_pairing: Tuple[int, int]
+    ) -> ndarray:
         """
         Padding of the lower and upper bounds of the distribution for a
-        given phenomenon for the threshold_points, and padding of
-        probabilities of 0 and 1 to the forecast probabilities.
+        given phenomenon for the threshold_points.
 
         Args:
             threshold_points:
                 Array of threshold values used to calculate the probabilities.
-            probabilities_for_cdf:
-                Array containing the probabilities used for constructing an
-                cumulative distribution function i.e. probabilities
-                below threshold.
             bounds_pairing:
                 Lower and upper bound to be used as the ends of the
                 cumulative distribution function.
 
         Returns:
-            - Array of threshold values padded with the lower and upper
-              bound of the distribution.
-            - Array containing the probabilities padded with 0 and 1 at
-              each end.
+            Array of threshold values padded with the lower and upper
+            bound of the distribution.
 
         Raises:
             ValueError: If the thresholds exceed the ECC bounds for
@@ -551,9 +541,6 @@ class ConvertProbabilitiesToPercentiles(BasePlugin):
         threshold_points_with_endpoints = insert_lower_and_upper_endpoint_to_1d_array(
             threshold_points, lower_bound, upper_bound
         )
-        probabilities_for_cdf = concatenate_2d_array_with_2d_array_endpoints(
-            probabilities_for_cdf, 0, 1
-        )
 
         if np.any(np.diff(threshold_points_with_endpoints) < 0):
             msg = (
@@ -587,7 +574,7 @@ class ConvertProbabilitiesToPercentiles(BasePlugin):
                 )
             else:
                 raise ValueError(msg)
-        return threshold_points_with_endpoints, probabilities_for_cdf
+        return threshold_points_with_endpoints
 
     def _probabilities_to_percentiles(
         self, forecast_probabilities: Cube, percentiles: ndarray
@@ -627,25 +614,19 @@ class ConvertProbabilitiesToPercentiles(BasePlugin):
         if np.ma.is_masked(forecast_probabilities.data):
             original_mask = forecast_probabilities.data.mask[0]
 
-        # Ensure that the percentile dimension is first, so that the
-        # conversion to a 2d array produces data in the desired order.
+        # Ensure that the threshold dimension is first, so that the
+        # probabilities at each point are a column of a 2d view of the data.
+        # Masked probabilities are replaced by NaN.
         enforce_coordinate_ordering(forecast_probabilities, threshold_name)
-        prob_slices = convert_cube_data_to_2d(
-            forecast_probabilities, coord=threshold_name
-        )
-
-        # The requirement below for a monotonically changing probability
-        # across thresholds can be thwarted by precision errors of order 1E-10,
-        # as such, here we round to a precision of 9 decimal places.
-        prob_slices = np.around(prob_slices, 9)
+        probabilities = forecast_probabilities.data
+        if np.ma.is_masked(probabilities):
+            probabilities = np.ma.filled(probabilities, np.nan)
+        probabilities = np.ma.getdata(probabilities).reshape(len(threshold_points), -1)
 
-        # Invert probabilities for data thresholded above thresholds.
+        # Probabilities for data thresholded above thresholds are inverted
+        # as the cumulative distribution function is constructed.
         relation = probability_is_above_or_below(forecast_probabilities)
-        if relation == "above":
-            probabilities_for_cdf = 1 - prob_slices
-        elif relation == "below":
-            probabilities_for_cdf = prob_slices
-        else:
+        if relation not in ("above", "below"):
             msg = (
                 "Probabilities to percentiles only implemented for "
                 "thresholds above or below a given value."
@@ -659,57 +640,54 @@ class ConvertProbabilitiesToPercentiles(BasePlugin):
             )
             cube_units = forecast_probabilities.coord(threshold_coord.name()).units
             bounds_pairing = get_bounds_of_distribution(phenom_name, cube_units)
-            (
-                threshold_points,
-                probabilities_for_cdf,
-            ) = self._add_bounds_to_thresholds_and_probabilities(
-                threshold_points, probabilities_for_cdf, bounds_pairing
+            threshold_points = self._add_bounds_to_thresholds(
+                threshold_points, bounds_pairing
+            )
+
+        # Convert percentiles into fractions.
+        percentiles_as_fractions = np.array(
+            [x / 100.0 for x in percentiles], dtype=np.float32
+        )
+
+        # The probabilities are rounded to 9 decimal places, as the
+        # requirement for a monotonically changing probability across
+        # thresholds can be thwarted by precision errors of order 1E-10.
+        # Percentiles are masked, if required, where their fraction is not
+        # below the probability at the last threshold.
+        forecast_at_percentiles, percentile_mask, ascending = (
+            interpolate_probabilities_to_percentiles(
+                percentiles_as_fractions.astype(np.float64),
+                probabilities,
+                threshold_points.astype(np.float64),
+                relation == "above",
+                not self.skip_ecc_bounds,
+                self.mask_percentiles,
             )
+        )
 
-        if np.any(np.diff(probabilities_for_cdf) < 0):
+        if not ascending:
             msg = (
                 "The probability values used to construct the "
                 "Cumulative Distribution Function (CDF) "
                 "must be ascending i.e. in order to yield "
                 "a monotonically increasing CDF."
-                "The probabilities are {}".format(probabilities_for_cdf)
             )
             warnings.warn(msg)
 
-        # Convert percentiles into fractions.
-        percentiles_as_fractions = np.array(
-            [x / 100.0 for x in percentiles], dtype=np.float32
-        )
-
-        forecast_at_percentiles = interpolate_multiple_rows_same_y(
-            percentiles_as_fractions.astype(np.float64),
-            probabilities_for_cdf.astype(np.float64),
-            threshold_points.astype(np.float64),
-        )
-        forecast_at_percentiles = forecast_at_percentiles.transpose()
-
         # Reshape forecast_at_percentiles, so the percentiles dimension is
         # first, and any other dimension coordinates follow.
+        template_slice = next(forecast_probabilities.slices_over(threshold_coord))
         forecast_at_percentiles = restore_non_percentile_dimensions(
-            forecast_at_percentiles,
-            next(forecast_probabilities.slices_over(threshold_coord)),
-            len(percentiles),
+            forecast_at_percentiles, template_slice, len(percentiles)
         )
 
         if self.mask_percentiles:
-            forecast_at_percentiles = np.ma.asarray(forecast_at_percentiles)
-            coord_constraint = {threshold_name: threshold_coord.points[-1]}
-            mask_probability = forecast_probabilities.extract(
-                iris.Constraint(coord_values=coord_constraint)
-            ).data
-
-            if relation == "above":
-                mask_probability = 1 - mask_probability
-
-            for index, perc in enumerate(percentiles_as_fractions):
-                forecast_at_percentiles[index] = np.ma.masked_where(
-                    mask_probability <= perc, forecast_at_percentiles[index]
-                )
+            percentile_mask = restore_non_percentile_dimensions(
+                percentile_mask, template_slice, len(percentiles)
+            )
+            forecast_at_percentiles = np.ma.MaskedArray(
+                forecast_at_percentiles, mask=percentile_mask
+            )
 
         template_cube = next(forecast_probabilities.slices_over(threshold_name))
         template_cube.rename(
@@ -724,7 +702,7 @@ class ConvertProbabilitiesToPercentiles(BasePlugin):
             cube_unit=threshold_unit,
         )
         if original_mask is not None:
-            original_mask = np.broadcast_to(original_mask, percentile_cube.shape)
+            original_mask = np.broadcast_to(original_mask, percentile_cube.shape).copy()
             percentile_cube.data = np.ma.MaskedArray(
                 percentile_cube.data, mask=original_mask
             )
@@ -810,7 +788,11 @@ class ConvertProbabilitiesToPercentiles(BasePlugin):
             cubelist.append(
                 self._probabilities_to_percentiles(cube_realization, percentiles)
             )
-        forecast_at_percentiles = cubelist.merge_cube()
+        # A single cube is returned as it is, rather than copied by merging.
+        if len(cubelist) == 1:
+            forecast_at_percentiles = cubelist[0]
+        else:
+            forecast_at_percentiles = cubelist.merge_cube()
 
         # Update cell methods on final cube
         if forecast_at_percentiles.cell_methods:
@@ -929,6 +911,64 @@ class ConvertLocationAndScaleParametersToPercentiles(
         result = "<ConvertLocationAndScaleParametersToPercentiles: distribution: {}>"
         return result.format(self.distribution.name)
 
+    def _percent_point_function(
+        self,
+        shape_data: List[ndarray],
+        location_data: ndarray,
+        scale_data: ndarray,
+        fractions: ndarray,
+    ) -> ndarray:
+        """
+        Evaluate the percent point function (PPF) of the distribution at
+        each fraction for each point, in a single broadcast operation.
+
+        For the normal distribution, the standard normal PPF is evaluated once
+        per fraction. For the truncated normal distribution, it is evaluated
+        using the normal CDF at the truncation limits. The values are then
+        scaled by the scale parameter and shifted by the location parameter.
+        This follows the arithmetic of the corresponding scipy distributions,
+        without the overhead of their generic machinery. Other distributions
+        use the scipy distribution.
+
+        Args:
+            shape_data:
+                Shape parameters of the distribution for each point. For the
+                truncated normal distribution, these are the truncation limits
+                rescaled to the standard normal distribution.
+            location_data:
+                Location parameter for each point.
+            scale_data:
+                Scale parameter for each point.
+            fractions:
+                Fractions at which to evaluate the PPF.
+
+        Returns:
+            Values of the PPF, with the fractions along the first dimension
+            and the points along the second dimension. Values for invalid
+            parameters, such as a non-positive scale parameter, are NaN.
+        """
+        q = fractions[:, np.newaxis]
+        if self.distribution.name == "norm":
+            ppf = special.ndtri(q)
+        elif self.distribution.name == "truncnorm":
+            a, b = shape_data
+            ppf = np.where(
+                a > 0,
+                -special.ndtri(q * special.ndtr(-b) + special.ndtr(-a) * (1.0 - q)),
+                special.ndtri(q * special.ndtr(b) + special.ndtr(a) * (1.0 - q)),
+            )
+            # The support of the distribution is bounded by the truncation
+            # limits.
+            ppf = np.where(q == 0, a, np.where(q == 1, b, ppf))
+            ppf = np.where(a < b, ppf, np.nan)
+        else:
+            return self.distribution(
+                *shape_data, loc=location_data, scale=scale_data
+            ).ppf(q)
+        with np.errstate(invalid="ignore"):
+            result = ppf * scale_data + location_data
+        return np.where(scale_data > 0, result, np.nan)
+
     def _location_and_scale_parameters_to_percentiles(
         self,
         shape_parameter: CubeList,
@@ -968,9 +1008,7 @@ class ConvertLocationAndScaleParametersToPercentiles(
         """
         # Remove any mask that may be applied to location and scale parameters
         # and replace with ones
-        shape_data = []
-        for cube in shape_parameter:
-            shape_data.append(cube.data.flatten())
+        shape_data = [np.asarray(cube.data).flatten() for cube in shape_parameter]
         location_data = np.ma.filled(location_parameter.data, 1).flatten()
         scale_data = np.ma.filled(scale_parameter.data, 1).flatten()
 
@@ -979,35 +1017,25 @@ class ConvertLocationAndScaleParametersToPercentiles(
             [x / 100.0 for x in percentiles], dtype=np.float32
         )
 
-        result = np.zeros(
-            (len(percentiles_as_fractions), location_data.shape[0]), dtype=np.float32
-        )
-
-        percentile_method = self.distribution(
-            *shape_data, loc=location_data, scale=scale_data
-        )
-
-        # Loop over percentiles, and use the distribution as the
-        # "percentile_method" with the location and scale parameter to
-        # calculate the values at each percentile.
-        for index, percentile in enumerate(percentiles_as_fractions):
-            percentile_list = np.repeat(percentile, len(location_data))
-            result[index, :] = percentile_method.ppf(percentile_list)
-            # If percent point function (PPF) returns NaNs, fill in
-            # mean instead of NaN values. NaN will only be generated if the
-            # scale parameter (standard deviation) is zero or negative. Therefore, if
-            # the scale parameter (standard deviation) is zero or negative, the mean
-            # value is used for all gridpoints with a NaN.
-            if np.any(scale_data <= 0):
-                nan_index = np.argwhere(np.isnan(result[index, :]))
-                result[index, nan_index] = location_data[nan_index]
-            if np.any(np.isnan(result)):
-                msg = (
-                    "NaNs are present within the result for the {} "
-                    "percentile. Unable to calculate the percent point "
-                    "function."
-                )
-                raise ValueError(msg)
+        result = self._percent_point_function(
+            shape_data, location_data, scale_data, percentiles_as_fractions
+        ).astype(np.float32)
+
+        # If percent point function (PPF) returns NaNs, fill in
+        # mean instead of NaN values. NaN will only be generated if the
+        # scale parameter (standard deviation) is zero or negative. Therefore, if
+        # the scale parameter (standard deviation) is zero or negative, the mean
+        # value is used for all gridpoints with a NaN.
+        if np.any(scale_data <= 0):
+            result = np.where(np.isnan(result), location_data, result)
+        nan_percentiles = np.isnan(result).any(axis=1)
+        if np.any(nan_percentiles):
+            msg = (
+                "NaNs are present within the result for the {} "
+                "percentile. Unable to calculate the percent point "
+                "function."
+            ).format(percentiles[np.argmax(nan_percentiles)])
+            raise ValueError(msg)
 
         # Reshape forecast_at_percentiles, so the percentiles dimension is
         # first, and any other dimension coordinates follow.
@@ -114,3 +114,118 @@ def fast_interp_same_y(x: np.ndarray, xp: np.ndarray, fp: np.ndarray) -> np.ndar
                         slope = (fp[ind] - intercept) / h_diff
                 result[i, j] = intercept + (curr_x - x_lower) * slope
     return result
+
+
+@njit(parallel=True)
+def fast_probabilities_to_percentiles(
+    x: np.ndarray,
+    probabilities: np.ndarray,
+    thresholds: np.ndarray,
+    invert: bool,
+    add_bounds: bool,
+    mask_percentiles: bool,
+    tile_size: int = 1024,
+):
+    """For each column i of probabilities, construct the cumulative
+    distribution function cdf and do the equivalent of
+    np.interp(x, cdf[:, i], thresholds).
+
+    The probabilities are rounded to 9 decimal places, and subtracted from 1
+    if required, in their own precision. The probabilities of 0 and 1 at the
+    bounds are added as each column is read, so the input array is not
+    copied. Columns are processed in tiles, with one buffer for each tile.
+
+    Args:
+        x: 1-d array, the fractions to calculate values at
+        probabilities: t * n array, with the threshold dimension leading
+        thresholds: 1-d array with length t, or t + 2 if add_bounds is True
+        invert: whether the probabilities are above thresholds, so must be
+            subtracted from 1
+        add_bounds: whether to add probabilities of 0 and 1 at either end
+        mask_percentiles: whether to calculate a mask of the fractions that
+            are not below the probability at the last threshold
+        tile_size: number of columns in each tile
+    Returns:
+        - len(x) * n float32 array of the values at each fraction
+        - len(x) * n boolean mask, or a 0 * 0 array if mask_percentiles is
+          False
+        - whether the cdf is non-decreasing in every column
+    """
+    # check inputs
+    if len(x.shape) != 1:
+        raise ValueError("x must be 1-dimensional.")
+    if len(probabilities.shape) != 2:
+        raise ValueError("probabilities must be 2-dimensional.")
+    n_thresholds, n_columns = probabilities.shape
+    offset = 1 if add_bounds else 0
+    max_ind = n_thresholds + 2 * offset
+    if len(thresholds) != max_ind:
+        raise ValueError(
+            "Length of thresholds must be equal to dimension 0 of probabilities, "
+            "plus 2 if bounds are added."
+        )
+    # check whether x is non-decreasing
+    x_ordered = True
+    for i in range(1, len(x)):
+        if x[i] < x[i - 1]:
+            x_ordered = False
+            break
+    # round in the precision of the probabilities, as np.around does
+    factor = probabilities.dtype.type(1e9)
+    one = probabilities.dtype.type(1)
+    min_val = thresholds[0]
+    max_val = thresholds[-1]
+    result = np.empty((len(x), n_columns), dtype=np.float32)
+    if mask_percentiles:
+        mask = np.empty((len(x), n_columns), dtype=np.bool_)
+    else:
+        mask = np.empty((0, 0), dtype=np.bool_)
+    n_tiles = (n_columns + tile_size - 1) // tile_size
+    ascending = np.ones(n_tiles, dtype=np.bool_)
+    for tile in prange(n_tiles):
+        cdf = np.empty(max_ind, dtype=np.float64)
+        if add_bounds:
+            cdf[0] = 0.0
+            cdf[-1] = 1.0
+        for i in range(tile * tile_size, min((tile + 1) * tile_size, n_columns)):
+            for k in range(n_thresholds):
+                value = np.rint(probabilities[k, i] * factor) / factor
+                if invert:
+                    value = one - value
+                cdf[k + offset] = value
+            for k in range(1, max_ind):
+                if cdf[k] < cdf[k - 1]:
+                    ascending[tile] = False
+                    break
+            if mask_percentiles:
+                last = probabilities[n_thresholds - 1, i]
+                if invert:
+                    last = one - last
+                for j in range(len(x)):
+                    mask[j, i] = last <= x[j]
+            ind = 0
+            for j in range(len(x)):
+                curr_x = x[j]
+                # Find the smallest index ind of cdf for which
+                # cdf[ind] >= curr_x.
+                if x_ordered:
+                    while (ind < max_ind) and (cdf[ind] < curr_x):
+                        ind = ind + 1
+                else:
+                    ind = np.searchsorted(cdf, curr_x)
+                # linear interpolation
+                if ind == 0:
+                    result[j, i] = min_val
+                elif ind == max_ind:
+                    result[j, i] = max_val
+                else:
+                    intercept = thresholds[ind - 1]
+                    x_lower = cdf[ind - 1]
+                    h_diff = cdf[ind] - x_lower
+                    if h_diff < 1e-15:
+                        # avoid division by very small values for numerical stability
+                        slope = 0.0
+                    else:
+                        slope = (thresholds[ind] - intercept) / h_diff
+                    result[j, i] = intercept + (curr_x - x_lower) * slope
+    return result, mask, np.all(ascending)
@@ -9,9 +9,10 @@ plugins.
 """
 
 import warnings
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 import cf_units as unit
+import dask.array as da
 import iris
 import numpy as np
 from cf_units import Unit
@@ -142,7 +143,9 @@ def create_cube_with_percentiles(
         Cube containing a percentile coordinate as the leading dimension (or
         scalar percentile coordinate if single-valued)
     """
-    # create cube with new percentile dimension
+    # create cube with new percentile dimension, from copies of the template
+    # with lazy placeholder data as the data is replaced
+    template_cube = template_cube.copy(data=da.zeros_like(template_cube.core_data()))
     cubes = iris.cube.CubeList([])
     for point in percentiles:
         cube = template_cube.copy()
@@ -350,3 +353,94 @@ def interpolate_multiple_rows_same_y(*args):
             "Module numba unavailable. ConvertProbabilitiesToPercentiles will be slower."
         )
         return slow_interp_same_y(*args)
+
+
+def slow_probabilities_to_percentiles(
+    x: np.ndarray,
+    probabilities: np.ndarray,
+    thresholds: np.ndarray,
+    invert: bool,
+    add_bounds: bool,
+    mask_percentiles: bool,
+    tile_size: int = 1024,
+) -> Tuple[np.ndarray, np.ndarray, bool]:
+    """For each column i of probabilities, construct the cumulative
+    distribution function cdf and do the equivalent of
+    np.interp(x, cdf[:, i], thresholds), one tile of columns at a time.
+
+    Args:
+        x: 1-d array, the fractions to calculate values at
+        probabilities: t * n array, with the threshold dimension leading
+        thresholds: 1-d array with length t, or t + 2 if add_bounds is True
+        invert: whether the probabilities are above thresholds, so must be
+            subtracted from 1
+        add_bounds: whether to add probabilities of 0 and 1 at either end
+        mask_percentiles: whether to calculate a mask of the fractions that
+            are not below the probability at the last threshold
+        tile_size: number of columns in each tile
+    Returns:
+        - len(x) * n float32 array of the values at each fraction
+        - len(x) * n boolean mask, or a 0 * 0 array if mask_percentiles is
+          False
+        - whether the cdf is non-decreasing in every column
+    """
+    n_columns = probabilities.shape[1]
+    result = np.empty((len(x), n_columns), dtype=np.float32)
+    shape = (len(x), n_columns) if mask_percentiles else (0, 0)
+    mask = np.empty(shape, dtype=bool)
+    ascending = True
+    for start in range(0, n_columns, tile_size):
+        tile = slice(start, start + tile_size)
+        cdf = np.around(probabilities[:, tile], 9).T
+        if invert:
+            cdf = 1 - cdf
+        if add_bounds:
+            cdf = concatenate_2d_array_with_2d_array_endpoints(cdf, 0, 1)
+        ascending = ascending and not np.any(np.diff(cdf) < 0)
+        if mask_percentiles:
+            last = probabilities[-1, tile]
+            if invert:
+                last = 1 - last
+            mask[:, tile] = last <= x[:, np.newaxis]
+        result[:, tile] = slow_interp_same_y(x, cdf.astype(np.float64), thresholds).T
+    return result, mask, ascending
+
+
+def interpolate_probabilities_to_percentiles(*args):
+    """For each column i of probabilities, construct the cumulative
+    distribution function cdf and do the equivalent of
+    np.interp(x, cdf[:, i], thresholds).
+
+    Calls a fast numba implementation where numba is available (see
+    `improver.ensemble_copula_coupling.numba_utilities.fast_probabilities_to_percentiles`)
+    and the native python implementation otherwise (see
+    :func:`slow_probabilities_to_percentiles`).
+
+    Args:
+        x: 1-d array, the fractions to calculate values at
+        probabilities: t * n array, with the threshold dimension leading
+        thresholds: 1-d array with length t, or t + 2 if add_bounds is True
+        invert: whether the probabilities are above thresholds, so must be
+            subtracted from 1
+        add_bounds: whether to add probabilities of 0 and 1 at either end
+        mask_percentiles: whether to calculate a mask of the fractions that
+            are not below the probability at the last threshold
+    Returns:
+        - len(x) * n float32 array of the values at each fraction
+        - len(x) * n boolean mask, or a 0 * 0 array if mask_percentiles is
+          False
+        - whether the cdf is non-decreasing in every column
+    """
+    try:
+        import numba  # noqa: F401
+
+        from improver.ensemble_copula_coupling.numba_utilities import (
+            fast_probabilities_to_percentiles,
+        )
+
+        return fast_probabilities_to_percentiles(*args)
+    except ImportError:
+        warnings.warn(
+            "Module numba unavailable. ConvertProbabilitiesToPercentiles will be slower."
+        )
+        return slow_probabilities_to_percentiles(*args)
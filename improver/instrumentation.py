@@ -0,0 +1,250 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Module containing opt-in instrumentation of plugin calls.
+
+When enabled, each call to a plugin records its wall time, CPU time, the
+change in resident memory, the increase in the high-water mark of resident
+memory of the process, the shapes and data types of the cubes and
+arrays passed in and returned, and the plugin calls within which it was made.
+Tracing is enabled by setting the IMPROVER_PLUGIN_TRACE environment variable
+to a file path, by the improver --plugin-trace option or by calling
+plugin_trace_enable. Records are written to the file as JSON lines, or as a
+Chrome trace, which can be viewed in chrome://tracing or Perfetto, if the
+file name ends in ".json".
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from resource import RUSAGE_SELF, getrusage
+from typing import Any, Callable, Dict, List, Optional
+
+#: Environment variable giving the file to which plugin calls are traced.
+TRACE_ENV_VAR = "IMPROVER_PLUGIN_TRACE"
+
+_tracer = None
+
+#: Size of a memory page in kilobytes, for converting /proc/self/statm.
+_PAGE_KB = os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def _rss_kb() -> Optional[int]:
+    """Return the current resident memory of this process in kilobytes, or
+    None where /proc/self/statm is not available."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * _PAGE_KB
+    except OSError:
+        return None
+
+
+class _PluginTracer:
+    """Record plugin calls to a file, as JSON lines or as a Chrome trace."""
+
+    def __init__(self, filename: str) -> None:
+        """Initialise the tracer.
+
+        Args:
+            filename:
+                File to which records are written. Files ending in ".json"
+                are written as a Chrome trace when tracing is disabled,
+                otherwise each record is appended to the file as a JSON line
+                as soon as the call completes.
+        """
+        self.filename = os.path.abspath(filename)
+        self.chrome_trace = self.filename.endswith(".json")
+        self.events = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.next_id = 0
+
+    def stack(self) -> List[int]:
+        """Identifiers of the plugin calls in progress in this thread."""
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def new_id(self) -> int:
+        """Return a new identifier for a plugin call."""
+        with self.lock:
+            self.next_id += 1
+            return self.next_id
+
+    def write(self, record: Dict) -> None:
+        """Write a record of a plugin call, or store it for a Chrome trace.
+
+        Args:
+            record:
+                Record of the plugin call.
+        """
+        with self.lock:
+            if self.chrome_trace:
+                self.events.append(_chrome_trace_event(record))
+            else:
+                with open(self.filename, "a") as trace_file:
+                    trace_file.write(json.dumps(record) + "\n")
+
+    def close(self) -> None:
+        """Write the Chrome trace, if required."""
+        if self.chrome_trace:
+            with self.lock, open(self.filename, "w") as trace_file:
+                json.dump({"traceEvents": self.events}, trace_file)
+
+
+def _chrome_trace_event(record: Dict) -> Dict:
+    """Convert a record of a plugin call to a complete event in the Chrome
+    trace event format.
+
+    Args:
+        record:
+            Record of the plugin call.
+
+    Returns:
+        Trace event, with times in microseconds.
+    """
+    args = {
+        key: value
+        for key, value in record.items()
+        if key not in ("plugin", "start", "wall_time", "pid", "thread")
+    }
+    return {
+        "name": record["plugin"],
+        "cat": "plugin",
+        "ph": "X",
+        "ts": record["start"] * 1e6,
+        "dur": record["wall_time"] * 1e6,
+        "pid": record["pid"],
+        "tid": record["thread"],
+        "args": args,
+    }
+
+
+def _describe(value: Any) -> Any:
+    """Describe the shape and data type of cubes and arrays, including those
+    within lists and tuples, without realising lazy data.
+
+    Args:
+        value:
+            Argument to, or result of, a plugin call.
+
+    Returns:
+        Dictionary of the name, shape and data type of a cube or array, a
+        list of such descriptions, or None for other values.
+    """
+    if hasattr(value, "shape") and hasattr(value, "dtype"):
+        description = {"shape": list(value.shape), "dtype": str(value.dtype)}
+        if callable(getattr(value, "name", None)):
+            description["name"] = value.name()
+        return description
+    if isinstance(value, (list, tuple)):
+        descriptions = [_describe(item) for item in value]
+        if any(description is not None for description in descriptions):
+            return descriptions
+    return None
+
+
+def plugin_trace_enable(filename: str) -> None:
+    """Enable tracing of plugin calls, with the trace completed at exit.
+
+    Args:
+        filename:
+            File to which records are written. Files ending in ".json" are
+            written as a Chrome trace, otherwise as JSON lines.
+    """
+    global _tracer
+    plugin_trace_disable()
+    _tracer = _PluginTracer(filename)
+    atexit.register(plugin_trace_disable)
+
+
+def plugin_trace_disable() -> None:
+    """Disable tracing of plugin calls, writing any Chrome trace."""
+    global _tracer
+    if _tracer is not None:
+        _tracer.close()
+        _tracer = None
+        atexit.unregister(plugin_trace_disable)
+
+
+def plugin_trace_enabled() -> bool:
+    """Return whether tracing of plugin calls is enabled."""
+    return _tracer is not None
+
+
+def traced_call(plugin: Any, process: Callable, *args, **kwargs) -> Any:
+    """Call the process method of a plugin, recording the call.
+
+    Args:
+        plugin:
+            The plugin instance.
+        process:
+            The function processing the inputs, which is the process method
+            of the plugin or a function applying it to blocks of the inputs.
+        *args:
+            Positional arguments to the process method.
+        **kwargs:
+            Keyword arguments to the process method.
+
+    Returns:
+        Output of plugin.process().
+    """
+    tracer = _tracer
+    stack = tracer.stack()
+    record = {
+        "plugin": type(plugin).__name__,
+        "module": type(plugin).__module__,
+        "id": tracer.new_id(),
+        "parent": stack[-1] if stack else None,
+        "depth": len(stack),
+        "pid": os.getpid(),
+        "thread": threading.get_ident(),
+        "inputs": _describe(list(args) + list(kwargs.values())),
+    }
+    stack.append(record["id"])
+    max_rss = getrusage(RUSAGE_SELF).ru_maxrss
+    rss = _rss_kb()
+    cpu_start = time.process_time()
+    start = time.time()
+    wall_start = time.perf_counter()
+    error = None
+    result = None
+    try:
+        result = process(*args, **kwargs)
+        return result
+    except BaseException as err:
+        error = type(err).__name__
+        raise
+    finally:
+        record["start"] = start
+        record["wall_time"] = time.perf_counter() - wall_start
+        record["cpu_time"] = time.process_time() - cpu_start
+        # ru_maxrss is the high-water mark of the resident memory of the
+        # process, in kilobytes on Linux, so increases only if the call
+        # exceeds the peak reached before it, by this or other threads.
+        record["max_rss_increase_kb"] = getrusage(RUSAGE_SELF).ru_maxrss - max_rss
+        if rss is not None:
+            record["rss_change_kb"] = _rss_kb() - rss
+        record["outputs"] = _describe(result)
+        if error is not None:
+            record["error"] = error
+        stack.pop()
+        tracer.write(record)
+
+
+def _enable_from_environment(environ: Optional[Dict] = None) -> None:
+    """Enable tracing if the IMPROVER_PLUGIN_TRACE environment variable is set.
+
+    Args:
+        environ:
+            Environment variables. Defaults to os.environ.
+    """
+    filename = (os.environ if environ is None else environ).get(TRACE_ENV_VAR)
+    if filename:
+        plugin_trace_enable(filename)
+
+
+_enable_from_environment()
@@ -0,0 +1,242 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Module containing a runner for graphs of improver commands.
+
+A pipeline is defined as a dictionary of named nodes, each of which runs an
+improver command, for example:
+
+.. code-block:: json
+
+    {
+        "nodes": {
+            "probabilities": {
+                "command": "threshold",
+                "args": ["temperature.nc"],
+                "options": {"threshold-values": "273.15,278.15"}
+            },
+            "nbhood": {
+                "command": "nbhood",
+                "args": ["@probabilities"],
+                "options": {
+                    "neighbourhood-output": "probabilities",
+                    "neighbourhood-shape": "square",
+                    "radii": "20000"
+                },
+                "output": "nbhood.nc"
+            },
+            "spot": {
+                "command": "spot-extract",
+                "args": ["neighbours.nc", "@probabilities"],
+                "output": "spot.nc"
+            }
+        }
+    }
+
+Arguments and option values of the form "@name" are replaced by the result
+of the node of that name, which is held in memory rather than being written
+to disk. Options with a value of true are passed as flags. Only the results
+of nodes with an "output" are written to disk, so every node must either
+have an "output" or have its result used by another node.
+
+Independent nodes are run concurrently in threads, while the loading and
+saving of files is serialised, as the netCDF and HDF5 libraries do not
+support concurrent access from threads of one process.
+"""
+
+import copy
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List
+
+REFERENCE_PREFIX = "@"
+
+
+def _references(node: Dict) -> List[str]:
+    """Get the names of the nodes whose results are used by a node, once for
+    each use.
+
+    Args:
+        node:
+            Definition of the node.
+
+    Returns:
+        Names of the nodes referenced by the arguments and options.
+    """
+    values = list(node.get("args", [])) + list(node.get("options", {}).values())
+    return [
+        value[len(REFERENCE_PREFIX) :]
+        for value in values
+        if isinstance(value, str) and value.startswith(REFERENCE_PREFIX)
+    ]
+
+
+def _validate(nodes: Dict[str, Dict]) -> None:
+    """Check that every node has a command, that all references are to
+    nodes in the pipeline, that there are no cycles, and that the result of
+    every node is either written to disk or used by another node.
+
+    Args:
+        nodes:
+            Definitions of the nodes, keyed by name.
+
+    Raises:
+        ValueError: If the pipeline is not valid.
+    """
+    for name, node in nodes.items():
+        if "command" not in node:
+            raise ValueError(f"Node {name} does not specify a command.")
+        unknown = set(_references(node)) - set(nodes)
+        if unknown:
+            raise ValueError(
+                f"Node {name} references unknown nodes: {', '.join(sorted(unknown))}"
+            )
+
+    dependencies = {name: set(_references(node)) for name, node in nodes.items()}
+    resolved = set()
+    while len(resolved) < len(nodes):
+        ready = {
+            name
+            for name, deps in dependencies.items()
+            if name not in resolved and deps <= resolved
+        }
+        if not ready:
+            cyclic = sorted(set(nodes) - resolved)
+            raise ValueError(
+                f"The pipeline contains a cycle between nodes: {', '.join(cyclic)}"
+            )
+        resolved |= ready
+
+    used = {ref for node in nodes.values() for ref in _references(node)}
+    for name, node in nodes.items():
+        if name not in used and "output" not in node:
+            raise ValueError(
+                f"Node {name} has no output and its result is not used by any "
+                "other node."
+            )
+
+
+def _command_line(node: Dict, results: List[Any]) -> List[Any]:
+    """Build the arguments for an improver command from a node definition,
+    replacing references to other nodes with their results.
+
+    Args:
+        node:
+            Definition of the node.
+        results:
+            The results to use for each reference in the node, in the order
+            returned by _references.
+
+    Returns:
+        The command name followed by its arguments.
+    """
+    results = iter(results)
+
+    def resolve(value):
+        if isinstance(value, str) and value.startswith(REFERENCE_PREFIX):
+            return next(results)
+        return value if not isinstance(value, (int, float)) else str(value)
+
+    argv = [node["command"]]
+    argv.extend(resolve(arg) for arg in node.get("args", []))
+    for key, value in node.get("options", {}).items():
+        if value is False or value is None:
+            continue
+        argv.append(f"--{key}")
+        if value is not True:
+            argv.append(resolve(value))
+    return argv
+
+
+def _copy_result(result: Any) -> Any:
+    """Copy a result shared between nodes, so that a node modifying its inputs
+    does not affect other nodes.
+
+    Args:
+        result:
+            Result of a node, usually a Cube or CubeList.
+
+    Returns:
+        A copy of the result.
+    """
+    from iris.cube import Cube, CubeList
+
+    if isinstance(result, Cube):
+        return result.copy()
+    if isinstance(result, CubeList):
+        return CubeList(cube.copy() for cube in result)
+    return copy.deepcopy(result)
+
+
+def run_pipeline(pipeline: Dict, workers: int = 1, verbose: bool = False) -> None:
+    """Run a pipeline of improver commands, passing results between nodes in
+    memory. Nodes are run as soon as the nodes they depend upon are complete,
+    with independent nodes run concurrently. The result of a node is released
+    once it has been passed to every node that uses it. A node using a result
+    that is also used by other nodes is given a copy of it, such that only the
+    last node to start is given the original. The loading and saving of files
+    is serialised between the nodes running concurrently.
+
+    Args:
+        pipeline:
+            Definition of the pipeline, with a "nodes" dictionary of node
+            definitions keyed by name. Each node has a "command", and
+            optionally lists of "args", a dictionary of "options" and an
+            "output" path to which the result is written.
+        workers:
+            Maximum number of nodes to run at the same time.
+        verbose:
+            Print each command as it is run, with its run time.
+
+    Raises:
+        ValueError: If the pipeline is not valid.
+    """
+    from improver.cli import dispatch_subcommand, execute_command
+
+    nodes = pipeline["nodes"]
+    _validate(nodes)
+
+    references = {name: _references(node) for name, node in nodes.items()}
+    remaining_uses = {name: 0 for name in nodes}
+    for refs in references.values():
+        for ref in refs:
+            remaining_uses[ref] += 1
+    waiting_on = {name: set(refs) for name, refs in references.items()}
+    results = {}
+
+    def submit(executor, name):
+        node = nodes[name]
+        inputs = []
+        for ref in references[name]:
+            remaining_uses[ref] -= 1
+            if remaining_uses[ref]:
+                inputs.append(_copy_result(results[ref]))
+            else:
+                inputs.append(results.pop(ref))
+        argv = _command_line(node, inputs)
+        if "output" in node:
+            argv.extend(["--output", node["output"]])
+            if remaining_uses[name]:
+                argv.append("--pass-through-output")
+        return executor.submit(
+            execute_command, dispatch_subcommand, "improver", *argv, verbose=verbose
+        )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        running = {}
+        for name in nodes:
+            if not waiting_on[name]:
+                running[submit(executor, name)] = name
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                result = future.result()
+                result = getattr(result, "original_object", result)
+                if remaining_uses[name]:
+                    results[name] = result
+                for dependent, deps in waiting_on.items():
+                    if name in deps:
+                        deps.remove(name)
+                        if not deps:
+                            running[submit(executor, dependent)] = dependent
@@ -0,0 +1,235 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""
+This module defines the optional numba utilities for psychrometric calculations.
+"""
+
+import os
+
+import numpy as np
+from numba import config, njit, prange, set_num_threads
+
+from improver import constants as consts
+from improver.psychrometric_calculations.psychrometric_calculations import (
+    SVP_T_INCREMENT,
+    SVP_T_MAX,
+    SVP_T_MIN,
+)
+
+config.THREADING_LAYER = "omp"
+if "OMP_NUM_THREADS" in os.environ:
+    set_num_threads(int(os.environ["OMP_NUM_THREADS"]))
+
+
+@njit
+def _lookup_point(temperature: float, table: np.ndarray) -> float:
+    """Interpolate linearly through a lookup table of saturated vapour pressure
+    or its derivative at a single temperature, following
+    psychrometric_calculations._svp_from_lookup. Temperatures outside the
+    table range are clipped to within the available range.
+
+    Args:
+        temperature: Air temperature (K).
+        table: Lookup table defined on the SVP_T_MIN, SVP_T_MAX and
+            SVP_T_INCREMENT temperature grid.
+
+    Returns:
+        The interpolated table value.
+    """
+    t_clipped = min(max(temperature, SVP_T_MIN), SVP_T_MAX - SVP_T_INCREMENT)
+    table_position = (t_clipped - SVP_T_MIN) / SVP_T_INCREMENT
+    table_index = int(table_position)
+    interpolation_factor = table_position - table_index
+    return (1.0 - interpolation_factor) * table[
+        table_index
+    ] + interpolation_factor * table[table_index + 1]
+
+
+@njit
+def _svp_in_air_point(
+    temperature: float, pressure: float, svp_table: np.ndarray
+) -> float:
+    """Calculate the saturated vapour pressure in air at a single point,
+    following psychrometric_calculations.calculate_svp_in_air. NaN is returned
+    for non-finite inputs.
+
+    Args:
+        temperature: Air temperature (K).
+        pressure: Air pressure (Pa).
+        svp_table: Saturated vapour pressure lookup table (Pa).
+
+    Returns:
+        Saturated vapour pressure in air (Pa).
+    """
+    if not (np.isfinite(temperature) and np.isfinite(pressure)):
+        return np.nan
+    temp_C = temperature + consts.ABSOLUTE_ZERO
+    correction = 1.0 + 1.0e-8 * pressure * (4.5 + 6.0e-4 * temp_C * temp_C)
+    # The correction is applied at single precision, as in calculate_svp_in_air.
+    return _lookup_point(temperature, svp_table) * np.float32(correction)
+
+
+@njit
+def _saturated_humidity_point(
+    temperature: float, pressure: float, svp_table: np.ndarray
+) -> float:
+    """Calculate the saturated specific humidity mixing ratio at a single point,
+    following psychrometric_calculations.saturated_humidity. NaN is returned
+    for non-finite inputs.
+
+    Args:
+        temperature: Air temperature (K).
+        pressure: Air pressure (Pa).
+        svp_table: Saturated vapour pressure lookup table (Pa).
+
+    Returns:
+        Specific humidity (kg kg-1) of saturated air.
+    """
+    svp = _svp_in_air_point(temperature, pressure, svp_table)
+    numerator = consts.EARTH_REPSILON * svp
+    denominator = max(svp, pressure) - (1.0 - consts.EARTH_REPSILON) * svp
+    return numerator / denominator
+
+
+@njit(parallel=True)
+def fast_svp_in_air(
+    temperature: np.ndarray,
+    pressure: np.ndarray,
+    svp_table: np.ndarray,
+    result: np.ndarray,
+) -> np.ndarray:
+    """Calculate the saturated vapour pressure in air at each point, fusing the
+    table interpolation and the pressure correction so that no intermediate
+    arrays are allocated. Equivalent to
+    psychrometric_calculations.calculate_svp_in_air.
+
+    Args:
+        temperature: 1-D array of air temperatures (K).
+        pressure: 1-D array of air pressures (Pa), of the same length as
+            temperature.
+        svp_table: Saturated vapour pressure lookup table (Pa).
+        result: 1-D array into which the result is written.
+
+    Returns:
+        The result array of saturated vapour pressures in air (Pa).
+    """
+    for i in prange(temperature.size):
+        result[i] = _svp_in_air_point(
+            np.float64(temperature[i]), np.float64(pressure[i]), svp_table
+        )
+    return result
+
+
+@njit(parallel=True)
+def fast_svp_derivative_in_air(
+    temperature: np.ndarray,
+    pressure: np.ndarray,
+    svp_table: np.ndarray,
+    svp_derivative_table: np.ndarray,
+    result: np.ndarray,
+) -> np.ndarray:
+    """Calculate the saturated vapour pressure derivative in air at each point,
+    fusing the table interpolations and the pressure correction so that no
+    intermediate arrays are allocated. Equivalent to
+    psychrometric_calculations.calculate_svp_derivative_in_air.
+
+    Args:
+        temperature: 1-D array of air temperatures (K).
+        pressure: 1-D array of air pressures (Pa), of the same length as
+            temperature.
+        svp_table: Saturated vapour pressure lookup table (Pa).
+        svp_derivative_table: Saturated vapour pressure derivative lookup
+            table (Pa K-1).
+        result: 1-D array into which the result is written.
+
+    Returns:
+        The result array of saturated vapour pressure derivatives in air.
+    """
+    for i in prange(temperature.size):
+        air_temperature = np.float64(temperature[i])
+        air_pressure = np.float64(pressure[i])
+        if not (np.isfinite(air_temperature) and np.isfinite(air_pressure)):
+            result[i] = np.nan
+            continue
+        svp = _lookup_point(air_temperature, svp_table)
+        svp_derivative = _lookup_point(air_temperature, svp_derivative_table)
+        temp_C = air_temperature + consts.ABSOLUTE_ZERO
+        correction = 1.0 + 1.0e-8 * air_pressure * (4.5 + 6.0e-4 * temp_C * temp_C)
+        derivative_correction_term = (
+            correction * svp_derivative
+            + 2 * 1.0e-8 * 6.0e-4 * air_pressure * temp_C * svp
+        )
+        result[i] = svp_derivative * np.float32(derivative_correction_term)
+    return result
+
+
+@njit(parallel=True)
+def fast_wet_bulb_temperature(
+    temperature: np.ndarray,
+    relative_humidity: np.ndarray,
+    pressure: np.ndarray,
+    svp_table: np.ndarray,
+    precision: float,
+    maximum_iterations: int,
+) -> np.ndarray:
+    """Calculate wet bulb temperatures using a Newton iterator applied to each
+    point independently, equivalent to
+    WetBulbTemperature._calculate_wet_bulb_temperature. Each point is iterated
+    until the temperature increment is no greater than the precision, or the
+    maximum number of iterations is reached. Points are processed in parallel
+    and no intermediate arrays are allocated.
+
+    Args:
+        temperature: 1-D array of air temperatures (K).
+        relative_humidity: 1-D array of relative humidities (1).
+        pressure: 1-D array of air pressures (Pa).
+        svp_table: Saturated vapour pressure lookup table (Pa).
+        precision: The precision to which the iterator must converge.
+        maximum_iterations: The maximum number of iterations for each point.
+
+    Returns:
+        1-D array of wet bulb temperatures (K) with the dtype of temperature.
+    """
+    result = np.empty_like(temperature)
+    for i in prange(temperature.size):
+        air_temperature = np.float64(temperature[i])
+        air_pressure = np.float64(pressure[i])
+        latent_heat = (
+            -1.0
+            * consts.LATENT_HEAT_T_DEPENDENCE
+            * (air_temperature + consts.ABSOLUTE_ZERO)
+            + consts.LH_CONDENSATION_WATER
+        )
+        mixing_ratio = relative_humidity[i] * _saturated_humidity_point(
+            air_temperature, air_pressure, svp_table
+        )
+        specific_heat = (
+            -1.0 * mixing_ratio + 1.0
+        ) * consts.CP_DRY_AIR + mixing_ratio * consts.CP_WATER_VAPOUR
+        enthalpy = latent_heat * mixing_ratio + specific_heat * air_temperature
+
+        # Iterate to find the wet bulb temperature, using temperature as first
+        # guess
+        wbt = air_temperature
+        for _ in range(maximum_iterations):
+            saturation_mixing_ratio = _saturated_humidity_point(
+                wbt, air_pressure, svp_table
+            )
+            enthalpy_new = latent_heat * saturation_mixing_ratio + specific_heat * wbt
+            enthalpy_gradient = (
+                saturation_mixing_ratio
+                * latent_heat
+                * latent_heat
+                / (consts.R_WATER_VAPOUR * wbt * wbt)
+                + specific_heat
+            )
+            delta_wbt = (enthalpy - enthalpy_new) / enthalpy_gradient
+            # Written such that NaN increments are treated as converged,
+            # matching the array implementation.
+            if not abs(delta_wbt) > precision:
+                break
+            wbt += delta_wbt
+        result[i] = wbt
+    return result
@@ -5,6 +5,7 @@
 """Module to contain Psychrometric Calculations."""
 
 import functools
+import warnings
 from typing import List, Optional, Tuple, Union
 
 import iris._constraints
@@ -41,12 +42,13 @@ SVP_T_MAX = 338.25
 SVP_T_INCREMENT = 0.1
 
 
-@functools.lru_cache()
 def _svp_table(phase: Optional[str] = None) -> ndarray:
     """
-    Calculate a saturated vapour pressure (SVP) lookup table.
-    The lru_cache decorator caches this table on first call to this function,
-    so that the table does not need to be re-calculated if used multiple times.
+    Get a saturated vapour pressure (SVP) lookup table from the module-level
+    table store. The phase is normalised before the store is queried, so that
+    all callers within a process share a single table for each phase,
+    regardless of how the phase was specified. The table is calculated on
+    first use and is read-only.
 
     A value of SVP for any temperature between T_MIN and T_MAX (inclusive) can be
     obtained by interpolating through the table, as is done in the _svp_from_lookup
@@ -60,14 +62,32 @@ def _svp_table(phase: Optional[str] = None) -> ndarray:
     Returns:
         Array of saturated vapour pressures (Pa).
     """
-    if str(phase).lower() == "water":
+    phase = str(phase).lower()
+    return _stored_svp_table(phase if phase in ("water", "ice") else None)
+
+
+@functools.lru_cache()
+def _stored_svp_table(phase: Optional[str]) -> ndarray:
+    """
+    Calculate a saturated vapour pressure (SVP) lookup table.
+    The lru_cache decorator caches this table on first call to this function,
+    so that the table does not need to be re-calculated if used multiple times.
+
+    Args:
+        phase:
+            One of 'water', 'ice' or None, see _svp_table.
+
+    Returns:
+        Read-only array of saturated vapour pressures (Pa).
+    """
+    if phase == "water":
         svp = SaturatedVapourPressureTable(
             t_min=SVP_T_MIN,
             t_max=SVP_T_MAX,
             t_increment=SVP_T_INCREMENT,
             water_only=True,
         )
-    elif str(phase).lower() == "ice":
+    elif phase == "ice":
         svp = SaturatedVapourPressureTable(
             t_min=SVP_T_MIN, t_max=SVP_T_MAX, t_increment=SVP_T_INCREMENT, ice_only=True
         )
@@ -75,7 +95,9 @@ def _svp_table(phase: Optional[str] = None) -> ndarray:
         svp = SaturatedVapourPressureTable(
             t_min=SVP_T_MIN, t_max=SVP_T_MAX, t_increment=SVP_T_INCREMENT
         )
-    return svp.process().data
+    svp_table_data = svp.process().data
+    svp_table_data.flags.writeable = False
+    return svp_table_data
 
 
 @functools.lru_cache()
@@ -90,12 +112,54 @@ def _svp_derivative_table() -> ndarray:
     function.
 
     Returns:
-        Array of first derivative saturated vapour pressures (Pa).
+        Read-only array of first derivative saturated vapour pressures (Pa).
     """
     svp_derivative_data = SaturatedVapourPressureDerivativeTable(
         t_min=SVP_T_MIN, t_max=SVP_T_MAX, t_increment=SVP_T_INCREMENT
     ).process()
-    return svp_derivative_data.data
+    svp_derivative_table_data = svp_derivative_data.data
+    svp_derivative_table_data.flags.writeable = False
+    return svp_derivative_table_data
+
+
+def preload_svp_tables() -> None:
+    """
+    Populate the module-level store of saturated vapour pressure lookup tables
+    for every phase, and the derivative table, so that no table is calculated
+    during subsequent psychrometric calculations in this process. This is
+    intended for long-lived processes that run many plugins.
+    """
+    for phase in ("water", "ice", None):
+        _svp_table(phase)
+    _svp_derivative_table()
+
+
+def _fast_svp_kernels_available(*arrays: ndarray) -> bool:
+    """
+    Determine whether the compiled SVP kernels can be used for the given inputs.
+    The kernels are used where numba is available and none of the inputs are
+    masked.
+
+    Args:
+        arrays:
+            The input arrays.
+
+    Returns:
+        True if the compiled kernels can be used.
+    """
+    if any(np.ma.isMaskedArray(array) for array in arrays):
+        return False
+    try:
+        import numba  # noqa: F401
+
+        import improver.psychrometric_calculations.numba_utilities  # noqa: F401
+    except ImportError:
+        warnings.warn(
+            "Module numba unavailable. Saturated vapour pressure calculations "
+            "will be slower."
+        )
+        return False
+    return True
 
 
 def _svp_from_lookup(temperature: ndarray, phase: Optional[str] = None) -> ndarray:
@@ -163,6 +227,10 @@ def calculate_svp_in_air(
     vapour pressure (SVP) in a pure water vapour system, and pressure-corrects
     the result to obtain the saturation vapour pressure in air.
 
+    Where numba is available and the inputs are not masked, the lookup and
+    correction are performed by a single compiled kernel (see
+    :func:`improver.psychrometric_calculations.numba_utilities.fast_svp_in_air`).
+
     Args:
         temperature:
             Array of air temperatures (K).
@@ -179,6 +247,18 @@ def calculate_svp_in_air(
         Atmosphere-Ocean Dynamics, Adrian E. Gill, International Geophysics
         Series, Vol. 30; Equation A4.7.
     """
+    if _fast_svp_kernels_available(temperature, pressure):
+        from improver.psychrometric_calculations.numba_utilities import (
+            fast_svp_in_air,
+        )
+
+        temperature, pressure = np.broadcast_arrays(temperature, pressure)
+        result = np.empty(temperature.shape, dtype=np.float64)
+        fast_svp_in_air(
+            temperature.ravel(), pressure.ravel(), _svp_table(phase), result.ravel()
+        )
+        return result
+
     svp = _svp_from_lookup(temperature, phase)
     temp_C = temperature + consts.ABSOLUTE_ZERO
     correction = 1.0 + 1.0e-8 * pressure * (4.5 + 6.0e-4 * temp_C * temp_C)
@@ -191,6 +271,10 @@ def calculate_svp_derivative_in_air(temperature: ndarray, pressure: ndarray) ->
     vapour pressure derivative in a pure water vapour system, and pressure-corrects the
     result to obtain the saturation vapour pressure derivative in air.
 
+    Where numba is available and the inputs are not masked, the lookups and
+    correction are performed by a single compiled kernel (see
+    :func:`improver.psychrometric_calculations.numba_utilities.fast_svp_derivative_in_air`).
+
     Args:
         temperature:
             Array of air temperatures (K).
@@ -204,6 +288,22 @@ def calculate_svp_derivative_in_air(temperature: ndarray, pressure: ndarray) ->
         Atmosphere-Ocean Dynamics, Adrian E. Gill, International Geophysics
         Series, Vol. 30; Equation A4.7.
     """
+    if _fast_svp_kernels_available(temperature, pressure):
+        from improver.psychrometric_calculations.numba_utilities import (
+            fast_svp_derivative_in_air,
+        )
+
+        temperature, pressure = np.broadcast_arrays(temperature, pressure)
+        result = np.empty(temperature.shape, dtype=np.float64)
+        fast_svp_derivative_in_air(
+            temperature.ravel(),
+            pressure.ravel(),
+            _svp_table(),
+            _svp_derivative_table(),
+            result.ravel(),
+        )
+        return result
+
     svp = _svp_from_lookup(temperature)
     svp_derivative = _svp_derivative_from_lookup(temperature)
     temp_C = temperature + consts.ABSOLUTE_ZERO
@@ -477,6 +577,11 @@ class HumidityMixingRatio(BasePlugin):
         self.mandatory_attributes = None
         self.temperature, self.pressure, self.rel_humidity = None, None, None
 
+    def chunkable_coords(self) -> Tuple[str, ...]:
+        """The mixing ratio is calculated at each point independently, so can
+        be calculated for blocks of points or realizations."""
+        return ("x", "y", "realization")
+
     def _make_humidity_cube(self, data: np.ndarray) -> Cube:
         """Puts the data array into a CF-compliant cube"""
         attributes = {}
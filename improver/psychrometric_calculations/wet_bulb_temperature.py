@@ -4,7 +4,8 @@
 # See LICENSE in the root of the repository for full licensing details.
 """Module to contain wet-bulb temperature plugins."""
 
-from typing import List, Union
+import warnings
+from typing import List, Tuple, Union
 
 import iris
 import numpy as np
@@ -20,6 +21,7 @@ from improver.metadata.utilities import (
 )
 from improver.psychrometric_calculations.psychrometric_calculations import (
     _calculate_latent_heat,
+    _svp_table,
     saturated_humidity,
 )
 from improver.utilities.common_input_handle import as_cube, as_cubelist
@@ -60,6 +62,11 @@ class WetBulbTemperature(BasePlugin):
         self.maximum_iterations = 20
         self.model_id_attr = model_id_attr
 
+    def chunkable_coords(self) -> Tuple[str, ...]:
+        """The wet bulb temperature is calculated at each point independently,
+        so can be calculated for blocks of points or realizations."""
+        return ("x", "y", "realization")
+
     @staticmethod
     def _slice_inputs(temperature, relative_humidity, pressure):
         """Create iterable or iterator over cubes on which to calculate
@@ -186,6 +193,11 @@ class WetBulbTemperature(BasePlugin):
         against temperature. Assumes that the variation of latent heat with
         temperature can be ignored.
 
+        Where numba is available and the inputs are not masked, each point is
+        iterated to convergence independently by a compiled kernel (see
+        :func:`improver.psychrometric_calculations.numba_utilities.fast_wet_bulb_temperature`).
+        Otherwise the iteration is applied to the array of unconverged points.
+
         Args:
             pressure:
                 Array of air Pressure (Pa).
@@ -198,6 +210,31 @@ class WetBulbTemperature(BasePlugin):
             Array of wet bulb temperature (K).
 
         """
+        if not any(
+            np.ma.isMaskedArray(data)
+            for data in [pressure, relative_humidity, temperature]
+        ):
+            try:
+                import numba  # noqa: F401
+
+                from improver.psychrometric_calculations.numba_utilities import (
+                    fast_wet_bulb_temperature,
+                )
+            except ImportError:
+                warnings.warn(
+                    "Module numba unavailable. WetBulbTemperature will be slower."
+                )
+            else:
+                wbt_data = fast_wet_bulb_temperature(
+                    temperature.ravel(),
+                    relative_humidity.ravel(),
+                    pressure.ravel(),
+                    _svp_table(),
+                    self.precision,
+                    self.maximum_iterations,
+                )
+                return wbt_data.reshape(temperature.shape)
+
         # Initialise psychrometric variables
         wbt_data_upd = wbt_data = temperature.flatten()
         pressure = pressure.flatten()
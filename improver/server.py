@@ -0,0 +1,379 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Module containing a persistent server for running improver commands.
+
+The server keeps the modules used by improver commands imported, so that
+commands sent to it over a Unix socket do not pay the cost of starting Python
+and importing iris, numpy, scipy and numba for each command. Commands are run
+by a pool of worker processes forked from a fork server, which imports these
+modules once but does not share the threads or open files of the server.
+Each worker runs one command at a time in the working directory of the client
+and captures the output of the command for return to the client.
+
+The environment variables of the client that configure improver, listed in
+FORWARDED_ENV_VARS, are sent with each command and apply to that command
+only. Other environment variables are those of the server.
+"""
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import traceback
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Sequence
+
+#: Environment variable giving the socket of a server to which improver
+#: commands are sent, if the server is running.
+SOCKET_ENV_VAR = "IMPROVER_SERVER_SOCKET"
+
+#: Modules imported by the fork server from which the workers are started.
+DEFAULT_PRELOAD_MODULES = (
+    "numpy",
+    "scipy",
+    "iris",
+    "improver.utilities.load",
+    "improver.utilities.save",
+)
+
+#: Global options of the improver command that take a value, which precede
+#: the subcommand.
+GLOBAL_VALUE_OPTIONS = ("--profile", "--memprofile", "--plugin-trace")
+
+#: Environment variables sent by the client with each command and set in the
+#: worker while the command runs, in place of those of the server.
+FORWARDED_ENV_VARS = (
+    "IMPROVER_CHUNK_SIZE",
+    "IMPROVER_CHUNK_COORD",
+    "IMPROVER_CHUNK_WORKERS",
+    "IMPROVER_LOAD_THREADS",
+    "IMPROVER_LOAD_CACHE_MB",
+    "IMPROVER_LOAD_CACHE_CHECKSUM",
+    "IMPROVER_PLUGIN_TRACE",
+    "OMP_NUM_THREADS",
+)
+
+
+def _forwarded_environment(environ: Optional[Dict] = None) -> Dict[str, str]:
+    """Select the environment variables that are sent with a command.
+
+    Args:
+        environ:
+            Environment variables. Defaults to os.environ.
+
+    Returns:
+        The forwarded variables that are set in the environment.
+    """
+    environ = os.environ if environ is None else environ
+    return {name: environ[name] for name in FORWARDED_ENV_VARS if name in environ}
+
+
+def _set_environment(env: Dict[str, str]) -> None:
+    """Set the forwarded environment variables of this process to those given,
+    unsetting any that are not given, and update the improver settings that
+    are read from these variables when modules are imported. Settings are only
+    updated if their variables change, so that, for example, the load cache
+    is retained between commands with the same settings.
+
+    Args:
+        env:
+            The forwarded environment variables to set.
+    """
+    from improver import chunking, instrumentation
+    from improver.utilities import load
+
+    previous = _forwarded_environment()
+    for name in FORWARDED_ENV_VARS:
+        if name in env:
+            os.environ[name] = env[name]
+        else:
+            os.environ.pop(name, None)
+
+    def changed(*names: str) -> bool:
+        return any(previous.get(name) != env.get(name) for name in names)
+
+    if changed(
+        chunking.CHUNK_SIZE_ENV_VAR,
+        chunking.CHUNK_COORD_ENV_VAR,
+        chunking.CHUNK_WORKERS_ENV_VAR,
+    ):
+        chunking.chunked_execution_disable()
+        chunking._enable_from_environment(env)
+    if changed(load.LOAD_CACHE_ENV_VAR, load.LOAD_CACHE_CHECKSUM_ENV_VAR):
+        load.load_cache_disable()
+        load._enable_load_cache_from_environment(env)
+    if changed(instrumentation.TRACE_ENV_VAR):
+        instrumentation.plugin_trace_disable()
+        instrumentation._enable_from_environment(env)
+    if changed("OMP_NUM_THREADS") and "numba" in sys.modules:
+        import numba
+
+        num_threads = numba.config.NUMBA_NUM_THREADS
+        if "OMP_NUM_THREADS" in env:
+            num_threads = min(int(env["OMP_NUM_THREADS"]), num_threads)
+        numba.set_num_threads(num_threads)
+
+
+def run_command(
+    argv: Sequence[str], cwd: str, env: Optional[Dict[str, str]] = None
+) -> Dict:
+    """Run an improver command in this process, as it would be run from the
+    command line, from the given working directory and with the given
+    forwarded environment variables. The output written by the command is
+    captured and the working directory and environment restored afterwards.
+
+    Args:
+        argv:
+            The arguments to the improver command, excluding the program
+            name, e.g. ["threshold", "input.nc", "--output", "output.nc"].
+        cwd:
+            The working directory in which to run the command.
+        env:
+            The values of the variables in FORWARDED_ENV_VARS with which to
+            run the command. Variables that are not given are unset while the
+            command runs. If not provided, the environment of this process is
+            used unchanged.
+
+    Returns:
+        Dictionary containing the exit status of the command as
+        "returncode", and the text written to "stdout" and "stderr".
+    """
+    from improver.cli import run_main
+
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    returncode = 0
+    previous_cwd = os.getcwd()
+    previous_env = None if env is None else _forwarded_environment()
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                os.chdir(cwd)
+                if env is not None:
+                    _set_environment(env)
+                run_main(["improver", *argv])
+            except SystemExit as err:
+                if isinstance(err.code, str):
+                    print(err.code, file=stderr)
+                    returncode = 1
+                else:
+                    returncode = err.code or 0
+            except Exception:
+                traceback.print_exc()
+                returncode = 1
+    finally:
+        os.chdir(previous_cwd)
+        if previous_env is not None:
+            _set_environment(previous_env)
+    return {
+        "returncode": returncode,
+        "stdout": stdout.getvalue(),
+        "stderr": stderr.getvalue(),
+    }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handle a single command sent to the server, passing it to a worker
+    process and returning the result to the client."""
+
+    def handle(self) -> None:
+        """Read a JSON encoded request from the client, run the command and
+        write the JSON encoded result."""
+        try:
+            request = json.loads(self.rfile.readline())
+            result = self.server.pool.apply(
+                run_command, (request["argv"], request["cwd"], request.get("env"))
+            )
+        except Exception:
+            result = {"returncode": 1, "stdout": "", "stderr": traceback.format_exc()}
+        self.wfile.write(json.dumps(result).encode() + b"\n")
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server handling each client in a separate thread."""
+
+    daemon_threads = True
+
+
+def _socket_in_use(socket_path: str) -> bool:
+    """Determine whether a server is listening on the given socket.
+
+    Args:
+        socket_path:
+            Path to the Unix socket.
+
+    Returns:
+        True if a connection to the socket can be made.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def _initialise_worker() -> None:
+    """Restore the default handling of signals in a worker process, so that
+    workers are stopped by the server rather than by interrupts."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def serve(
+    socket_path: str,
+    workers: int = 1,
+    preload: Optional[Sequence[str]] = None,
+    max_requests_per_worker: Optional[int] = None,
+) -> None:
+    """Run a server that executes improver commands sent to a Unix socket,
+    until the server is interrupted or terminated.
+
+    Args:
+        socket_path:
+            Path of the Unix socket on which to listen for commands.
+        workers:
+            Number of worker processes, and so the number of commands that
+            may run at the same time. Further commands wait for a free worker.
+        preload:
+            Names of modules imported by the fork server from which the
+            workers are started. The workers share these imports, so they are
+            not repeated for each command. If not provided,
+            DEFAULT_PRELOAD_MODULES is used.
+        max_requests_per_worker:
+            Number of commands after which a worker is replaced with a fresh
+            worker, forked from the fork server. If not provided, workers are
+            reused indefinitely, retaining any numba kernels compiled by
+            earlier commands.
+
+    Raises:
+        FileExistsError: If another server is already listening on the socket.
+    """
+    if os.path.exists(socket_path):
+        if _socket_in_use(socket_path):
+            raise FileExistsError(f"A server is already listening on {socket_path}")
+        # Remove the socket left behind by a server that was not shut down.
+        os.unlink(socket_path)
+
+    # SIGTERM is handled as an interrupt, so that the socket is removed.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    # Workers are forked from a fork server rather than from the server, which
+    # runs a thread for each client.
+    context = get_context("forkserver")
+    context.set_forkserver_preload(
+        list(DEFAULT_PRELOAD_MODULES if preload is None else preload)
+    )
+    pool = context.Pool(
+        workers,
+        initializer=_initialise_worker,
+        maxtasksperchild=max_requests_per_worker,
+    )
+    # The socket is only accessible to the user running the server, as
+    # commands are run with the permissions of this user.
+    umask = os.umask(0o077)
+    try:
+        server = _Server(socket_path, _RequestHandler)
+    finally:
+        os.umask(umask)
+    server.pool = pool
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        os.unlink(socket_path)
+        server.server_close()
+        pool.terminate()
+        pool.join()
+
+
+def submit(
+    socket_path: str,
+    argv: Sequence[str],
+    cwd: Optional[str] = None,
+    env: Optional[Dict[str, str]] = None,
+) -> Dict:
+    """Send an improver command to a server and wait for the result.
+
+    Args:
+        socket_path:
+            Path of the Unix socket on which the server is listening.
+        argv:
+            The arguments to the improver command, excluding the program
+            name.
+        cwd:
+            The working directory in which to run the command. Defaults to
+            the current working directory.
+        env:
+            Environment variables with which to run the command, of which
+            those in FORWARDED_ENV_VARS are sent. Defaults to os.environ.
+
+    Returns:
+        Dictionary containing the exit status of the command as
+        "returncode", and the text written to "stdout" and "stderr".
+    """
+    request = {
+        "argv": list(argv),
+        "cwd": os.getcwd() if cwd is None else cwd,
+        "env": _forwarded_environment(env),
+    }
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        with sock.makefile("rwb") as stream:
+            stream.write(json.dumps(request).encode() + b"\n")
+            stream.flush()
+            return json.loads(stream.readline())
+
+
+def _subcommand(argv: Sequence[str]) -> Optional[str]:
+    """Find the subcommand in the arguments to the improver command, which is
+    the first argument that is neither a global option nor its value.
+
+    Args:
+        argv:
+            The arguments to the improver command, excluding the program
+            name.
+
+    Returns:
+        The name of the subcommand, or None if there is no subcommand.
+    """
+    args = iter(argv)
+    for arg in args:
+        if arg in GLOBAL_VALUE_OPTIONS:
+            next(args, None)
+        elif not arg.startswith("-"):
+            return arg
+    return None
+
+
+def run_on_server(argv: List[str]) -> Optional[int]:
+    """Run an improver command on the server given by the IMPROVER_SERVER_SOCKET
+    environment variable, if set and a server is listening, writing the output
+    of the command to stdout and stderr.
+
+    Args:
+        argv:
+            The arguments to the improver command, excluding the program
+            name.
+
+    Returns:
+        The exit status of the command, or None if the command could not be
+        sent to a server, in which case it should be run locally.
+    """
+    socket_path = os.environ.get(SOCKET_ENV_VAR)
+    if not socket_path or _subcommand(argv) == "serve":
+        return None
+    try:
+        result = submit(socket_path, argv)
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    sys.stdout.write(result["stdout"])
+    sys.stderr.write(result["stderr"])
+    return result["returncode"]
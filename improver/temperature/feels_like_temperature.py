@@ -4,13 +4,14 @@
 # See LICENSE in the root of the repository for full licensing details.
 """Module containing feels like temperature calculation plugins"""
 
-from typing import Optional
+from typing import Optional, Tuple
 
 import numpy as np
 from iris.cube import Cube
 from numpy import ndarray
 
 from improver import BasePlugin
+from improver.chunking import chunkable
 from improver.metadata.utilities import (
     create_new_diagnostic_cube,
     generate_mandatory_attributes,
@@ -30,6 +31,11 @@ class CalculateWindChill(BasePlugin):
         """Set up the plugin."""
         self.model_id_attr = model_id_attr
 
+    def chunkable_coords(self) -> Tuple[str, ...]:
+        """The wind chill is calculated at each point independently, so can be
+        calculated for blocks of points or realizations."""
+        return ("x", "y", "realization")
+
     def _calculate_wind_chill(
         self, temperature: ndarray, wind_speed: ndarray
     ) -> ndarray:
@@ -219,6 +225,7 @@ def _feels_like_temperature(
     return feels_like_temperature
 
 
+@chunkable("x", "y", "realization")
 def calculate_feels_like_temperature(
     temperature: Cube,
     wind_speed: Cube,
@@ -517,6 +517,18 @@ class Threshold(PostProcessingPlugin):
                 maxes = maximum_within_vicinity(truth_value, vicinity, landmask)
             thresholded_cube.data[ivic][index][unmasked] += maxes[unmasked]
 
+    def chunkable_coords(self) -> Tuple[str, ...]:
+        """Thresholding without vicinity processing is elementwise, so can be
+        applied to blocks of points or, unless collapsing realizations or
+        percentiles, of realizations."""
+        if self.vicinity is not None:
+            return ()
+        if self.collapse_coord and {"realization", "percentile"} & set(
+            self.collapse_coord
+        ):
+            return ("x", "y")
+        return ("x", "y", "realization")
+
     def _create_threshold_cube(self, cube: Cube) -> Cube:
         """
         Create a cube with suitable metadata and zeroed data array for
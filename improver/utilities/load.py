@@ -4,29 +4,393 @@
 # See LICENSE in the root of the repository for full licensing details.
 """Module for loading cubes."""
 
-from typing import List, Optional, Union
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 import iris
 import numpy as np
 from iris import Constraint
 from iris.cube import Cube, CubeList
+from iris.fileformats.netcdf._thread_safe_nc import DatasetWrapper
 
 from improver.utilities.cube_manipulation import (
     MergeCubes,
     enforce_coordinate_ordering,
     strip_var_names,
 )
+from improver.utilities.zarr_store import is_zarr_store, zarr_url
+
+#: Lock held while files are loaded or saved, which serialises these for
+#: threads of one process, as the netCDF and HDF5 libraries do not support
+#: concurrent access to files, e.g. when a pipeline runs nodes in threads.
+FILE_IO_LOCK = threading.RLock()
+
+#: Environment variable giving the maximum number of files read concurrently.
+LOAD_THREADS_ENV_VAR = "IMPROVER_LOAD_THREADS"
+
+#: Maximum number of files read concurrently if not set in the environment,
+#: such that files are not read ahead of being loaded unless requested.
+DEFAULT_LOAD_THREADS = 1
+
+#: Number of bytes read from the start of each file, which holds the file
+#: metadata of netCDF files written by IMPROVER.
+PREFETCH_BYTES = 2**20
+
+#: Environment variable giving the size limit, in megabytes, of the cache of
+#: static cubes such as ancillaries. The cache is disabled if this is not set.
+LOAD_CACHE_ENV_VAR = "IMPROVER_LOAD_CACHE_MB"
+
+#: Environment variable which, if set to 1, identifies cached files by a
+#: checksum of their contents rather than by their path, size and
+#: modification time.
+LOAD_CACHE_CHECKSUM_ENV_VAR = "IMPROVER_LOAD_CACHE_CHECKSUM"
+
+
+class LoadCacheInfo(NamedTuple):
+    """Statistics of the cache of static cubes. Misses count the loading of
+    files of static cubes that were not cached, excluding other files, which
+    are never cached."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+    max_bytes: int
+
+
+def _cube_nbytes(cube: Cube) -> int:
+    """Number of bytes of the data and coordinates of a cube with real data."""
+    nbytes = cube.data.nbytes
+    if np.ma.getmask(cube.data) is not np.ma.nomask:
+        nbytes += cube.data.mask.nbytes
+    for coord in cube.coords():
+        nbytes += coord.points.nbytes
+        if coord.has_bounds():
+            nbytes += coord.bounds.nbytes
+    return nbytes
+
+
+def _make_read_only(cube: Cube) -> None:
+    """Realise the data of a cube and make it read-only, so that it can be
+    shared between consumers.
+
+    Args:
+        cube:
+            Cube that is modified in place.
+    """
+    data = cube.data
+    data.flags.writeable = False
+    if np.ma.getmask(data) is not np.ma.nomask:
+        data.mask.flags.writeable = False
+
+
+def _shared_copy(cube: Cube) -> Cube:
+    """Copy a cached cube, sharing its read-only data, so that the metadata
+    of the copy can be modified without affecting the cached cube.
+
+    Args:
+        cube:
+            Cube with read-only data.
+
+    Returns:
+        Copy of the cube with the same data array.
+    """
+    return cube.copy(data=cube.data)
+
+
+def _checksum(path: str) -> str:
+    """Calculate the SHA-256 checksum of the contents of a file."""
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+class _LoadCache:
+    """Least recently used cache of the static cubes loaded from files, such
+    as ancillaries, limited by the number of bytes of the cached cubes.
+
+    Entries are found from the identity of the files loaded, given by their
+    path, size and modification time, so that a file that has been changed
+    is loaded again. With checksums, entries are keyed by the checksums of
+    the file contents, so that copies of a file at different paths share an
+    entry.
+    """
+
+    def __init__(self, max_bytes: int, checksum: bool = False) -> None:
+        """
+        Args:
+            max_bytes:
+                Maximum number of bytes of the cubes in the cache.
+            checksum:
+                If True, key entries by the checksums of the files.
+        """
+        self.max_bytes = max_bytes
+        self.checksum = checksum
+        self._entries: OrderedDict[Tuple, Tuple[CubeList, int]] = OrderedDict()
+        self._keys: Dict[Tuple, Tuple] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+
+    def lookup(self, identity: Tuple) -> Optional[CubeList]:
+        """Return the cached cubes loaded from the files with the given
+        identity, or None if they are not cached. As only files of static
+        cubes are cached, misses are counted when the loaded cubes are
+        stored, once they are known to be static."""
+        with self._lock:
+            key = self._keys.get(identity)
+            if key not in self._entries:
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key][0]
+
+    def store(self, identity: Tuple, paths: List[str], cubes: CubeList) -> CubeList:
+        """Add static cubes loaded from the files with the given identity,
+        which were not found in the cache, to the cache, making their data
+        read-only, and evict the least recently used entries that no longer
+        fit.
+
+        Args:
+            identity:
+                Identity of the loaded files and the constraints applied.
+            paths:
+                Paths of the loaded files.
+            cubes:
+                Cubes loaded from the files.
+
+        Returns:
+            The cached cubes, which are those from an existing entry if the
+            files have the same checksums.
+        """
+        with self._lock:
+            self.misses += 1
+        for cube in cubes:
+            _make_read_only(cube)
+        nbytes = sum(_cube_nbytes(cube) for cube in cubes)
+        if nbytes > self.max_bytes:
+            return cubes
+        key = identity
+        if self.checksum:
+            key = (tuple(_checksum(path) for path in paths), identity[-1])
+        with self._lock:
+            self._keys[identity] = key
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            self._entries[key] = (cubes, nbytes)
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                evicted_key, (_, evicted_nbytes) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_nbytes
+                self.evictions += 1
+                for stale in [k for k, v in self._keys.items() if v == evicted_key]:
+                    del self._keys[stale]
+        return cubes
+
+    def info(self) -> LoadCacheInfo:
+        """Return the statistics of the cache."""
+        with self._lock:
+            return LoadCacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                len(self._entries),
+                self.nbytes,
+                self.max_bytes,
+            )
+
+
+_load_cache: Optional[_LoadCache] = None
+
+
+def load_cache_enable(max_bytes: int, checksum: bool = False) -> None:
+    """Enable caching of static cubes, such as ancillaries, loaded by
+    load_cubelist and load_cube, for use by persistent processes that run
+    several commands. Any existing cache is discarded.
+
+    Args:
+        max_bytes:
+            Maximum number of bytes of the cubes in the cache.
+        checksum:
+            If True, identify files by the checksums of their contents, so
+            that copies of a file at different paths are only cached once.
+    """
+    global _load_cache
+    _load_cache = _LoadCache(max_bytes, checksum)
+
+
+def load_cache_disable() -> None:
+    """Disable caching of static cubes, discarding the cache."""
+    global _load_cache
+    _load_cache = None
+
+
+def load_cache_info() -> Optional[LoadCacheInfo]:
+    """Return the hit, miss and eviction counts, the number of entries and
+    the size of the cache of static cubes, or None if caching is disabled."""
+    return None if _load_cache is None else _load_cache.info()
+
+
+def _file_identity(
+    paths: List[List[str]], constraints: Optional[str]
+) -> Optional[Tuple[List[str], Tuple]]:
+    """Identify the files matched by the filepaths by their path, size and
+    modification time.
+
+    Args:
+        paths:
+            The paths matched by each filepath that will be loaded.
+        constraints:
+            Name constraint applied when loading.
+
+    Returns:
+        The matched paths and their identity, combined with the constraint,
+        or None if a filepath does not match any files or matches a Zarr
+        store, which are not cached.
+    """
+    real_paths = []
+    for item_paths in paths:
+        if not item_paths or any(is_zarr_store(path) for path in item_paths):
+            return None
+        real_paths.extend(os.path.realpath(path) for path in item_paths)
+    files = []
+    for path in real_paths:
+        status = os.stat(path)
+        files.append((path, status.st_size, status.st_mtime_ns))
+    return real_paths, (tuple(files), constraints)
+
+
+def _enable_load_cache_from_environment(environ: Optional[Dict] = None) -> None:
+    """Enable caching of static cubes if the IMPROVER_LOAD_CACHE_MB
+    environment variable is set to a positive size.
+
+    Args:
+        environ:
+            Environment variables. Defaults to os.environ.
+    """
+    environ = os.environ if environ is None else environ
+    size = int(environ.get(LOAD_CACHE_ENV_VAR, 0))
+    if size > 0:
+        load_cache_enable(
+            size * 2**20, checksum=environ.get(LOAD_CACHE_CHECKSUM_ENV_VAR) == "1"
+        )
+
+
+def _read_start(path: str) -> None:
+    """Read the start of a file, so that its metadata is in the page cache
+    when the file is loaded. Errors are ignored, leaving them to be raised
+    when the file is loaded.
+
+    Args:
+        path:
+            Path of the file.
+    """
+    try:
+        with open(path, "rb") as file:
+            file.read(PREFETCH_BYTES)
+    except OSError:
+        pass
+
+
+def _prefetched(paths: List[List[str]], max_workers: int) -> Iterator[List[str]]:
+    """Read the start of the files matched by each filepath concurrently,
+    yielding the paths matched by each filepath, in order, once its files
+    have been read.
+
+    Args:
+        paths:
+            The paths matched by each filepath that will be loaded.
+        max_workers:
+            Maximum number of files to read concurrently.
+
+    Yields:
+        The paths matched by each filepath.
+    """
+    max_workers = min(max_workers, sum(len(item_paths) for item_paths in paths))
+    if max_workers <= 1:
+        yield from paths
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            [executor.submit(_read_start, path) for path in item_paths]
+            for item_paths in paths
+        ]
+        for item_paths, item_futures in zip(paths, futures):
+            for future in item_futures:
+                future.result()
+            yield item_paths
+
+
+def _load(filepath: str, paths: List[str], constraints: Constraint) -> CubeList:
+    """Load cubes from a filepath, which may be wildcarded, opening any Zarr
+    stores it matches with the netCDF library.
+
+    Args:
+        filepath:
+            Filepath that will be loaded.
+        paths:
+            The paths matched by the filepath.
+        constraints:
+            Constraint to be applied when loading.
+
+    Returns:
+        Cubes loaded from the filepath.
+    """
+    if not any(is_zarr_store(path) for path in paths):
+        # Filepaths matching no files are passed to Iris, which reports them.
+        return iris.load(paths or filepath, constraints=constraints)
+    cubes = CubeList()
+    for path in paths:
+        if not is_zarr_store(path):
+            cubes.extend(iris.load_raw(path, constraints=constraints))
+            continue
+        dataset = DatasetWrapper(zarr_url(path))
+        try:
+            cubes.extend(iris.load_raw(dataset, constraints=constraints))
+        finally:
+            dataset.close()
+    return cubes.merge(unique=False)
 
 
 def load_cubelist(
     filepath: Union[str, List[str]],
     constraints: Optional[Union[Constraint, str]] = None,
     no_lazy_load: bool = False,
+    max_workers: Optional[int] = None,
 ) -> CubeList:
     """Load cubes from filepath(s) into a cubelist. Strips off all
     var names except for "threshold"-type coordinates, where this is different
     from the standard or long name.
 
+    Where several files are given, they are opened and the blocks holding
+    their metadata read concurrently in a pool of threads, which hides the
+    latency of reading many files from shared filesystems. The metadata is
+    then parsed by Iris one file at a time, as the netCDF library does not
+    support concurrent access. Constraints are applied to the cubes built
+    from the metadata, so the data of cubes that do not match the constraints
+    is never read, and the data of the returned cubes is loaded lazily unless
+    no_lazy_load is set.
+
+    Filepaths may also be Zarr stores, identified by the extension ".zarr" or
+    by their Zarr metadata, from which only the chunks holding the data that
+    is used are read.
+
+    If caching is enabled with load_cache_enable or the IMPROVER_LOAD_CACHE_MB
+    environment variable, files containing only static cubes, i.e. cubes
+    without a time coordinate such as land-sea masks, orography and neighbour
+    cubes, are cached after they are first loaded, unless they are loaded
+    with a constraint other than a name. Cached cubes are returned as copies
+    that share read-only data, so the metadata of the returned cubes can be
+    modified, but their data must be replaced rather than modified in place.
+
     Args:
         filepath:
             Filepath(s) that will be loaded.
@@ -39,11 +403,27 @@ def load_cubelist(
             If True, bypass cube deferred (lazy) loading and load the whole
             cube into memory. This can increase performance at the cost of
             memory. If False (default) then lazy load.
+        max_workers:
+            Maximum number of files to read concurrently. Defaults to the
+            value of the IMPROVER_LOAD_THREADS environment variable, or 1 if
+            this is not set. If 1, files are not read ahead of being loaded.
 
     Returns:
         CubeList that has been created from the input filepath given the
         constraints provided.
     """
+    filepaths = [filepath] if isinstance(filepath, str) else filepath
+    paths = [sorted(glob(item)) for item in filepaths]
+    cache = _load_cache
+    identity = None
+    if cache is not None and (constraints is None or isinstance(constraints, str)):
+        identified = _file_identity(paths, constraints)
+        if identified is not None:
+            real_paths, identity = identified
+            cached = cache.lookup(identity)
+            if cached is not None:
+                return CubeList(_shared_copy(cube) for cube in cached)
+
     # Remove legacy metadata prefix cube if present
     constraints = (
         iris.Constraint(cube_func=lambda cube: cube.long_name != "prefixes")
@@ -52,12 +432,12 @@ def load_cubelist(
 
     # Load each file individually to avoid partial merging (not used
     # iris.load_raw() due to issues with time representation)
-    if isinstance(filepath, str):
-        cubes = iris.load(filepath, constraints=constraints)
-    else:
-        cubes = iris.cube.CubeList([])
-        for item in filepath:
-            cubes.extend(iris.load(item, constraints=constraints))
+    if max_workers is None:
+        max_workers = int(os.environ.get(LOAD_THREADS_ENV_VAR, DEFAULT_LOAD_THREADS))
+    cubes = iris.cube.CubeList([])
+    with FILE_IO_LOCK:
+        for item, item_paths in zip(filepaths, _prefetched(paths, max_workers)):
+            cubes.extend(_load(item, item_paths, constraints))
 
     if not cubes:
         message = "No cubes found using constraints {}".format(constraints)
@@ -82,6 +462,9 @@ def load_cubelist(
             # Force cube's data into memory by touching the .data attribute.
             cube.data
 
+    if identity is not None and not any(cube.coords("time") for cube in cubes):
+        cached = cache.store(identity, real_paths, cubes)
+        return CubeList(_shared_copy(cube) for cube in cached)
     return cubes
 
 
@@ -144,3 +527,6 @@ def load_baseline_cube(
     cube.units = units
 
     return cube
+
+
+_enable_load_cache_from_environment()
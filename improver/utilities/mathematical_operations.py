@@ -212,6 +212,48 @@ class Integration(BasePlugin):
         enforce_coordinate_ordering(integrated_cube, ordered_dimensions)
         return integrated_cube
 
+    def _levels_to_skip(self, upper_bounds: ndarray, lower_bounds: ndarray) -> ndarray:
+        """Identify the levels that should not be included in the integrated
+        total, as they lie outside of the start and end points.
+
+        Args:
+            upper_bounds:
+                Upper bound of the integrated coordinate for each level.
+            lower_bounds:
+                Lower bound of the integrated coordinate for each level.
+
+        Returns:
+            Boolean array that is True for levels that should be skipped.
+        """
+        skip = np.zeros(upper_bounds.shape, dtype=bool)
+        if self.start_point:
+            if self.positive_integration:
+                skip |= lower_bounds < self.start_point
+            else:
+                skip |= upper_bounds > self.start_point
+        if self.end_point:
+            if self.positive_integration:
+                skip |= upper_bounds > self.end_point
+            else:
+                skip |= lower_bounds < self.end_point
+        return skip
+
+    def _data_with_leading_integration_axis(self, cube: Cube) -> ndarray:
+        """Get the data from a cube with the integrated coordinate as the
+        leading dimension, adding this dimension if the coordinate is scalar.
+
+        Args:
+            cube:
+                Cube containing the coordinate to be integrated.
+
+        Returns:
+            Array with the integrated coordinate as the leading dimension.
+        """
+        dims = cube.coord_dims(self.coord_name_to_integrate)
+        if not dims:
+            return cube.data[np.newaxis]
+        return np.moveaxis(cube.data, dims[0], 0)
+
     def perform_integration(
         self, upper_bounds_cube: Cube, lower_bounds_cube: Cube
     ) -> Cube:
@@ -226,6 +268,11 @@ class Integration(BasePlugin):
         uppermost half of the stride and the bottom half of the stride is
         summed.
 
+        The contributions from all levels are calculated at once and
+        accumulated along the integrated coordinate, with levels outside of
+        the start and end points excluded, so that the output cube is only
+        constructed once.
+
         Integration is performed ONLY over positive values.
 
         Args:
@@ -239,65 +286,15 @@ class Integration(BasePlugin):
         Returns:
             Cube containing the output from the integration.
         """
-
-        def skip_slice(upper_bound, lower_bound, direction, start_point, end_point):
-            """Conditions under which a slice should not be included in
-            the integrated total.  All inputs (except the string "direction")
-            are floats."""
-            if start_point:
-                if direction and lower_bound < start_point:
-                    return True
-                if not direction and upper_bound > start_point:
-                    return True
-            if end_point:
-                if direction and upper_bound > end_point:
-                    return True
-                if not direction and lower_bound < end_point:
-                    return True
-            return False
-
-        data = []
-        coord_points = []
-        coord_bounds = []
-        integral = 0
-        levels_tuple = zip(
-            upper_bounds_cube.slices_over(self.coord_name_to_integrate),
-            lower_bounds_cube.slices_over(self.coord_name_to_integrate),
+        upper_bounds = np.atleast_1d(
+            upper_bounds_cube.coord(self.coord_name_to_integrate).points
         )
+        lower_bounds = np.atleast_1d(
+            lower_bounds_cube.coord(self.coord_name_to_integrate).points
+        )
+        keep = ~self._levels_to_skip(upper_bounds, lower_bounds)
 
-        for upper_bounds_slice, lower_bounds_slice in levels_tuple:
-            (upper_bound,) = upper_bounds_slice.coord(
-                self.coord_name_to_integrate
-            ).points
-            (lower_bound,) = lower_bounds_slice.coord(
-                self.coord_name_to_integrate
-            ).points
-
-            if skip_slice(
-                upper_bound,
-                lower_bound,
-                self.positive_integration,
-                self.start_point,
-                self.end_point,
-            ):
-                continue
-
-            stride = np.abs(upper_bound - lower_bound)
-            upper_half_data = np.where(
-                upper_bounds_slice.data > 0, upper_bounds_slice.data * 0.5 * stride, 0.0
-            )
-            lower_half_data = np.where(
-                lower_bounds_slice.data > 0, lower_bounds_slice.data * 0.5 * stride, 0.0
-            )
-            integral += upper_half_data + lower_half_data
-
-            data.append(integral.copy())
-            coord_points.append(
-                upper_bound if self.positive_integration else lower_bound
-            )
-            coord_bounds.append([lower_bound, upper_bound])
-
-        if len(data) == 0:
+        if not keep.any():
             msg = (
                 "No integration could be performed for "
                 "coord_to_integrate: {}, start_point: {}, end_point: {}, "
@@ -311,6 +308,22 @@ class Integration(BasePlugin):
             )
             raise ValueError(msg)
 
+        upper_data = self._data_with_leading_integration_axis(upper_bounds_cube)[keep]
+        lower_data = self._data_with_leading_integration_axis(lower_bounds_cube)[keep]
+        upper_bounds = upper_bounds[keep]
+        lower_bounds = lower_bounds[keep]
+
+        # Broadcast the stride of each level against the data of that level.
+        stride = np.abs(upper_bounds - lower_bounds).reshape(
+            (-1,) + (1,) * (upper_data.ndim - 1)
+        )
+        upper_half_data = np.where(upper_data > 0, upper_data * 0.5 * stride, 0.0)
+        lower_half_data = np.where(lower_data > 0, lower_data * 0.5 * stride, 0.0)
+        data = np.cumsum(upper_half_data + lower_half_data, axis=0)
+
+        coord_points = list(upper_bounds if self.positive_integration else lower_bounds)
+        coord_bounds = np.stack([lower_bounds, upper_bounds], axis=-1)
+
         template = upper_bounds_cube if self.positive_integration else lower_bounds_cube
         integrated_cube = self._create_output_cube(
             template.copy(), data, coord_points, coord_bounds
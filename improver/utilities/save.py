@@ -5,15 +5,24 @@
 """Module for saving netcdf cubes with desired attribute types."""
 
 import os
+import shutil
 import warnings
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 
 import cf_units
 import iris
 import iris.fileformats
 from iris.cube import Cube, CubeAttrsDict, CubeList
+from iris.fileformats.netcdf._thread_safe_nc import DatasetWrapper
 
 from improver.metadata.check_datatypes import check_mandatory_standards
+from improver.utilities.load import FILE_IO_LOCK
+from improver.utilities.zarr_store import (
+    float_attributes,
+    is_zarr_store,
+    restore_float_attributes,
+    zarr_url,
+)
 
 
 def _order_cell_methods(cube: Cube) -> None:
@@ -53,12 +62,143 @@ def _check_metadata(cube: Cube) -> None:
         raise ValueError("{} has unknown units".format(cube.name()))
 
 
+#: Compression codecs that can be used for the data variables. Codecs other
+#: than zlib require the corresponding HDF5 filter plugins to be available to
+#: the netCDF library, both when writing and when reading the file.
+COMPRESSION_CODECS = (
+    "zlib",
+    "zstd",
+    "bzip2",
+    "blosc_lz",
+    "blosc_lz4",
+    "blosc_lz4hc",
+    "blosc_zlib",
+    "blosc_zstd",
+)
+
+#: Chunking strategies for the data variables, see _chunksizes.
+CHUNKING_STRATEGIES = ("slices", "blocks", "tiles")
+
+#: Default edge length of the square spatial tiles of the "tiles" strategy.
+DEFAULT_TILE_SIZE = 256
+
+
+def _parse_chunking(chunking: str) -> Tuple[str, Optional[int]]:
+    """Split a chunking strategy such as "tiles:128" into the name of the
+    strategy and its size.
+
+    Args:
+        chunking:
+            Name of a strategy in CHUNKING_STRATEGIES, optionally followed by
+            a colon and a positive integer size.
+
+    Returns:
+        The name of the strategy and the size, or None if no size is given.
+
+    Raises:
+        ValueError: If the strategy is unknown or the size is not a positive
+            integer.
+    """
+    strategy, _, size = chunking.partition(":")
+    if strategy not in CHUNKING_STRATEGIES:
+        raise ValueError(
+            f"Chunking strategy {strategy} not recognised. "
+            f"Choose from {', '.join(CHUNKING_STRATEGIES)}."
+        )
+    if not size:
+        return strategy, None
+    if not size.isdigit() or int(size) < 1:
+        raise ValueError(
+            f"Chunk size in {chunking} must be a positive integer, e.g. {strategy}:2"
+        )
+    return strategy, int(size)
+
+
+def _chunksizes(shape: Tuple[int, ...], chunking: str) -> Optional[Tuple[int, ...]]:
+    """Calculate the chunk sizes of a data variable for a chunking strategy.
+    The last two dimensions are treated as the spatial dimensions.
+
+    - "slices": one chunk per spatial slice, e.g. (1, 1, ny, nx), which suits
+      reading whole fields one threshold, percentile or realization at a time.
+    - "blocks[:N]": N elements of the first dimension per chunk, with whole
+      spatial slices, e.g. (N, 1, ny, nx), which suits reading a block of
+      thresholds together. By default all of the first dimension is included.
+    - "tiles[:N]": N by N spatial tiles containing all of the leading
+      dimensions, e.g. (nthresholds, ntimes, N, N), which suits reading
+      every threshold at a few sites.
+
+    Args:
+        shape:
+            Shape of the data variable.
+        chunking:
+            Chunking strategy.
+
+    Returns:
+        Chunk sizes, or None for variables with fewer than two dimensions,
+        for which the netCDF library default is used.
+    """
+    strategy, size = _parse_chunking(chunking)
+    if len(shape) < 2:
+        return None
+    leading, spatial = list(shape[:-2]), list(shape[-2:])
+    if strategy == "slices":
+        return tuple([1] * len(leading) + spatial)
+    if strategy == "blocks":
+        if not leading:
+            return tuple(spatial)
+        first = leading[0] if size is None else min(size, leading[0])
+        return tuple([first] + [1] * (len(leading) - 1) + spatial)
+    size = DEFAULT_TILE_SIZE if size is None else size
+    return tuple(leading + [min(size, length) for length in spatial])
+
+
+class _EncodedDataset:
+    """Wrapper around a netCDF4 Dataset opened by Iris, which creates the data
+    variables written by the Iris saver with the requested compression codec
+    and chunking strategy. All other attributes and calls are passed through
+    to the dataset unchanged, so coordinate variables are written as usual.
+    """
+
+    def __init__(self, dataset: DatasetWrapper, compression: str, chunking: str):
+        """
+        Args:
+            dataset:
+                Dataset open for writing.
+            compression:
+                Compression codec for the data variables.
+            chunking:
+                Chunking strategy for the data variables, or None to use the
+                chunk sizes given to the saver.
+        """
+        self._dataset = dataset
+        self._compression = compression
+        self._chunking = chunking
+
+    def __getattr__(self, name):
+        return getattr(self._dataset, name)
+
+    def createVariable(self, varname, datatype, dimensions=(), **kwargs):
+        """Create a variable, setting the codec and chunk sizes if it is a
+        data variable, which are the only variables the Iris saver creates
+        with compression arguments."""
+        if "zlib" in kwargs:
+            if kwargs.pop("zlib"):
+                kwargs["compression"] = self._compression
+            if self._chunking is not None:
+                shape = tuple(self._dataset.dimensions[dim].size for dim in dimensions)
+                kwargs["chunksizes"] = _chunksizes(shape, self._chunking)
+        return self._dataset.createVariable(varname, datatype, dimensions, **kwargs)
+
+
 def save_netcdf(
     cubelist: Union[Cube, CubeList],
     filename: str,
     compression_level: int = 1,
     least_significant_digit: Optional[int] = None,
     fill_value: Optional[float] = None,
+    compression: str = "zlib",
+    chunking: Optional[str] = None,
+    zarr: bool = False,
 ) -> None:
     """Save the input Cube or CubeList as a NetCDF file and check metadata
     where required for integrity.
@@ -67,6 +207,11 @@ def save_netcdf(
     local_keys to record non-global attributes as data attributes rather than
     global attributes.
 
+    The cubes can instead be saved as a Zarr store, a directory in which each
+    chunk of the data is a separate file, with the same metadata, compression
+    and chunking as the netCDF file. This suits intermediate outputs of which
+    later steps only read part, e.g. a single threshold or a few tiles.
+
     Args:
         cubelist:
             Cube or list of cubes to be saved
@@ -87,10 +232,30 @@ def save_netcdf(
             the default fill value for the data type will be used. If the data is not masked then
             the numpy array's fill value will retain the default value while the _FillValue attribute
             in the NetCDF file will be updated.
+        compression:
+            Compression codec for the data variables, one of
+            COMPRESSION_CODECS. zstd and the blosc codecs are considerably
+            faster than zlib for similar file sizes, but the files can only
+            be read where the netCDF library has the corresponding filter
+            plugins. The blosc filters of some netCDF builds fail on chunks
+            that cannot be compressed, such as random noise.
+        chunking:
+            Chunking strategy for the data variables: "slices", "blocks" or
+            "blocks:N" for N thresholds (or other leading coordinate points)
+            per chunk, or "tiles" or "tiles:N" for N by N spatial tiles
+            containing all leading coordinate points. Chunk sizes are
+            calculated for each variable. If not specified, every cube is
+            chunked into spatial slices when all cubes have the same leading
+            dimensions.
+        zarr:
+            If True, save as a Zarr store. Filenames with the extension ".zarr"
+            are always saved as Zarr stores.
 
     Raises:
         ValueError:
             If compression_level is not between 0 and 9.
+        ValueError:
+            If the compression codec or chunking strategy is not recognised.
 
     Warns:
         If cubelist contains cubes of varying dimensions.
@@ -113,7 +278,9 @@ def save_netcdf(
     # If all xy slices are the same shape, use this to determine
     # the chunksize for the netCDF (eg. 1, 1, 970, 1042)
     chunksizes = None
-    if len({cube.shape[:2] for cube in cubelist}) == 1:
+    if chunking is not None:
+        _parse_chunking(chunking)
+    elif len({cube.shape[:2] for cube in cubelist}) == 1:
         cube = cubelist[0]
         if cube.ndim >= 2:
             xy_chunksizes = [cube.shape[-2], cube.shape[-1]]
@@ -126,21 +293,51 @@ def save_netcdf(
         raise ValueError(
             "Compression level must be an integer value between 0 and 9 (0 to disable compression)"
         )
+    if compression not in COMPRESSION_CODECS:
+        raise ValueError(
+            f"Compression codec {compression} not recognised. "
+            f"Choose from {', '.join(COMPRESSION_CODECS)}."
+        )
+
+    zarr = zarr or is_zarr_store(filename)
 
     # save atomically by writing to a temporary file and then renaming
     ftmp = str(filename) + ".tmp"
-    with iris.FUTURE.context(save_split_attrs=True):
-        iris.fileformats.netcdf.save(
-            cubelist,
-            ftmp,
-            complevel=compression_level,
-            shuffle=True,
-            zlib=compression_level > 0,
-            chunksizes=chunksizes,
-            least_significant_digit=least_significant_digit,
-            fill_value=fill_value,
-        )
-    os.rename(ftmp, filename)
+    save_kwargs = dict(
+        complevel=compression_level,
+        shuffle=True,
+        zlib=compression_level > 0,
+        chunksizes=chunksizes,
+        least_significant_digit=least_significant_digit,
+        fill_value=fill_value,
+    )
+    with FILE_IO_LOCK:
+        with iris.FUTURE.context(save_split_attrs=True):
+            if compression == "zlib" and chunking is None and not zarr:
+                iris.fileformats.netcdf.save(cubelist, ftmp, **save_kwargs)
+            else:
+                # Iris does not pass a codec or per-variable chunk sizes to
+                # netCDF4, nor open Zarr stores, so save into a dataset that sets
+                # them as the data variables are created. The data are written
+                # once the dataset has been closed.
+                dataset = DatasetWrapper(
+                    zarr_url(ftmp) if zarr else ftmp, mode="w", format="NETCDF4"
+                )
+                try:
+                    delayed_write = iris.fileformats.netcdf.save(
+                        cubelist,
+                        _EncodedDataset(dataset, compression, chunking),
+                        compute=False,
+                        **save_kwargs,
+                    )
+                    zarr_float_attributes = float_attributes(dataset) if zarr else {}
+                finally:
+                    dataset.close()
+                delayed_write.compute()
+                restore_float_attributes(ftmp, zarr_float_attributes)
+        if zarr and os.path.isdir(filename):
+            shutil.rmtree(filename)
+        os.rename(ftmp, filename)
 
 
 def _cube_attributes_for_save(cube: Cube):
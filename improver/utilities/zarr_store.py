@@ -0,0 +1,107 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Utilities for reading and writing cubes as Zarr stores.
+
+Zarr stores are read and written by the NCZarr support of the netCDF library,
+so the netCDF data model, the IMPROVER metadata conventions and the
+compression and chunking of the data variables are the same as for netCDF
+files. Each chunk of a data variable is stored in a separate file within the
+store, so that only the chunks covering the data that is used are read.
+
+The NCZarr writer of some versions of the netCDF library rounds floating
+point attributes, such as the parameters of the grid mapping, to six
+significant figures. Writers therefore record the floating point attributes
+of the dataset with float_attributes before closing it, and write the exact
+values back into the store with restore_float_attributes.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Union
+
+import numpy as np
+
+#: File extension identifying a Zarr store.
+ZARR_EXTENSION = ".zarr"
+
+
+def is_zarr_store(path: Union[str, Path]) -> bool:
+    """Check whether a path is a Zarr store, either because it has the Zarr
+    file extension or because it is a directory containing Zarr group
+    metadata.
+
+    Args:
+        path:
+            Path to check.
+
+    Returns:
+        True if the path is a Zarr store.
+    """
+    path = str(path)
+    return path.endswith(ZARR_EXTENSION) or os.path.isfile(
+        os.path.join(path, ".zgroup")
+    )
+
+
+def zarr_url(path: Union[str, Path]) -> str:
+    """Construct the URL with which the netCDF library opens a path as a
+    Zarr store in the local filesystem.
+
+    Args:
+        path:
+            Path to the Zarr store.
+
+    Returns:
+        URL of the Zarr store.
+    """
+    return f"file://{os.path.abspath(path)}#mode=nczarr,file"
+
+
+def float_attributes(dataset) -> Dict[str, Dict[str, Union[float, list]]]:
+    """Record the floating point attributes of a netCDF dataset that is open
+    for writing to a Zarr store, as they are held exactly until the dataset
+    is closed.
+
+    Args:
+        dataset:
+            Dataset open for writing.
+
+    Returns:
+        Floating point attribute values, by attribute name, for the dataset
+        (with the key "") and each of its variables (keyed by variable name).
+    """
+    records = {}
+    for key, item in [("", dataset), *dataset.variables.items()]:
+        values = {}
+        for name in item.ncattrs():
+            value = np.asarray(item.getncattr(name))
+            if np.issubdtype(value.dtype, np.floating):
+                values[name] = value.tolist()
+        if values:
+            records[key] = values
+    return records
+
+
+def restore_float_attributes(
+    path: Union[str, Path], records: Dict[str, Dict[str, Union[float, list]]]
+) -> None:
+    """Write the exact values of floating point attributes recorded with
+    float_attributes into the metadata of a Zarr store.
+
+    Args:
+        path:
+            Path to the Zarr store.
+        records:
+            Floating point attribute values, by attribute name, for the store
+            and each of its variables.
+    """
+    for key, values in records.items():
+        attributes_path = os.path.join(path, key, ".zattrs")
+        with open(attributes_path) as attributes_file:
+            attributes = json.load(attributes_file)
+        attributes.update(values)
+        with open(attributes_path, "w") as attributes_file:
+            json.dump(attributes, attributes_file)
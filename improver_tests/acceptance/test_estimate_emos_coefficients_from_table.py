@@ -176,6 +176,7 @@ def test_return_none(tmp_path):
         "--output",
         output_path,
     ]
-    run_cli(args)
+    with pytest.warns(UserWarning, match="forecast periods without training data"):
+        run_cli(args)
     # Check no file has been written to disk.
     assert not output_path.exists()
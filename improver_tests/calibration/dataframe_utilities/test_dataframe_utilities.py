@@ -391,6 +391,42 @@ class Test_forecast_dataframe_to_cube(SetupConstructedForecastCubes):
         )
         self.assertCubeEqual(result, self.expected_period_forecast[:, 1:])
 
+    def test_missing_entry(self):
+        """Test that an entry that is absent from the DataFrame is set to NaN
+        in the cube."""
+        forecast_df = self.forecast_df.drop(index=self.forecast_df.index[-1])
+        expected = self.expected_period_forecast.copy()
+        expected.data[-1, -1, -1] = np.nan
+        result = forecast_dataframe_to_cube(
+            forecast_df, self.date_range, self.forecast_period
+        )
+        self.assertCubeEqual(result, expected)
+
+    def test_coord_types(self):
+        """Test that the coordinates that do not describe the sites are
+        DimCoords, for one or more training days, as on the cubes previously
+        merged from cubes for each day and percentile."""
+        for date_range in [self.date_range[-1:], self.date_range]:
+            result = forecast_dataframe_to_cube(
+                self.forecast_df, date_range, self.forecast_period
+            )
+            for coord in result.aux_coords:
+                on_site_dim = result.coord_dims(coord) == (result.ndim - 1,)
+                expected = iris.coords.AuxCoord if on_site_dim else iris.coords.DimCoord
+                self.assertIs(type(coord), expected, coord.name())
+
+    def test_duplicate_rows(self):
+        """Test that an exception is raised if there is more than one
+        forecast for a site at the same time and percentile."""
+        forecast_df = pd.concat(
+            [self.forecast_df, self.forecast_df.iloc[[0]]], ignore_index=True
+        )
+        msg = "more than one forecast value for the same site"
+        with self.assertRaisesRegex(ValueError, msg):
+            forecast_dataframe_to_cube(
+                forecast_df, self.date_range, self.forecast_period
+            )
+
     def test_empty_dataframe(self):
         """Test if none of the required data is available in the dataframe."""
         forecast_period = 7 * 3600
@@ -436,6 +472,16 @@ class Test_truth_dataframe_to_cube(SetupConstructedTruthCubes):
         result = truth_dataframe_to_cube(self.truth_df, self.date_range_two_days)
         self.assertCubeEqual(result, self.expected_period_truth[1:, :])
 
+    def test_duplicate_rows(self):
+        """Test that an exception is raised if there is more than one truth
+        for a site at the same time."""
+        truth_df = pd.concat(
+            [self.truth_df, self.truth_df.iloc[[0]]], ignore_index=True
+        )
+        msg = "more than one ob_value value for the same site"
+        with self.assertRaisesRegex(ValueError, msg):
+            truth_dataframe_to_cube(truth_df, self.date_range)
+
     def test_empty_dataframe(self):
         """Test if none of the required data is available in the dataframe."""
         validity_time = np.datetime64("2017-07-22T19:00:00")
@@ -1345,6 +1391,9 @@ class Test_forecast_and_truth_dataframes_to_cubes(
                 count += 1
 
         assert count == 3
+        # The repeated forecast reference times are not a DimCoord.
+        frt_coord = forecast_cube.coord("forecast_reference_time")
+        assert type(frt_coord) is iris.coords.AuxCoord
 
 
 @pytest.mark.parametrize(
@@ -409,6 +409,48 @@ class Test_process(unittest.TestCase):
         np.testing.assert_array_almost_equal(result.data, expected_data)
         self.assertNotAlmostEqual(np.mean(result.data), expected_mean)
 
+    def _coefficients_for_several_forecast_periods(self):
+        """Merge the null coefficients with coefficients that correct a bias
+        at a forecast period an hour later."""
+        template = self.realizations.copy()
+        template.coord("forecast_period").points = (
+            template.coord("forecast_period").points + 3600
+        )
+        later = build_coefficients_cubelist(
+            template, [1, 1, 0, 1], CubeList([template])
+        )
+        return CubeList([*self.coefficients, *later]).merge()
+
+    def test_coefficients_for_several_forecast_periods(self):
+        """Test that the coefficients for the forecast period of the forecast
+        are used when coefficients for several forecast periods are provided."""
+        coefficients = self._coefficients_for_several_forecast_periods()
+        self.assertEqual(coefficients[0].coord_dims("forecast_period"), (0,))
+        result = ApplyEMOS()(self.percentiles, coefficients, realizations_count=3)
+        np.testing.assert_array_almost_equal(
+            result.data, self.null_percentiles_expected
+        )
+        percentiles = self.percentiles.copy()
+        percentiles.coord("forecast_period").points = (
+            percentiles.coord("forecast_period").points + 3600
+        )
+        result = ApplyEMOS()(percentiles, coefficients, realizations_count=3)
+        np.testing.assert_array_almost_equal(
+            result.data, self.null_percentiles_expected + 1
+        )
+
+    def test_coefficients_for_missing_forecast_period(self):
+        """Test that an error is raised if coefficients for several forecast
+        periods do not include the forecast period of the forecast."""
+        coefficients = self._coefficients_for_several_forecast_periods()
+        percentiles = self.percentiles.copy()
+        percentiles.coord("forecast_period").points = (
+            percentiles.coord("forecast_period").points + 7200
+        )
+        msg = "The coefficients do not include the forecast period of the forecast"
+        with self.assertRaisesRegex(ValueError, msg):
+            ApplyEMOS()(percentiles, coefficients, realizations_count=3)
+
     def test_null_percentiles_frt_fp_mismatch(self):
         """Test effect of "neutral" emos coefficients in percentile space
         where the forecast is 15 minutes ahead of the coefficients in terms
@@ -329,6 +329,29 @@ def test_prepare_and_apply_qrf(
         assert result.coord("realization").units == "1"
         assert np.allclose(result.coord("realization").points, range(len(quantiles)))
 
+@pytest.mark.parametrize("target_feature", [True, False])
+def test_prepare_and_apply_qrf_input_order(target_feature):
+    """Test that the calibrated forecast is at the sites of the target forecast
+    if the other input cubes, including a static feature without forecast
+    reference time or forecast period coordinates, are provided first."""
+    feature_config = {
+        "air_temperature": ["mean", "std"],
+        "distance_to_water": ["static"],
+    }
+    if target_feature:
+        feature_config["wind_speed_at_10m"] = ["mean", "std", "latitude", "longitude"]
+    qrf_model, cube_inputs = set_up_for_expected(
+        feature_config, 2, 5, 55, None, 0, {}, True, True, False, False, False,
+        ["wmo_id"], [0.5],
+    )
+    plugin = PrepareAndApplyQRF(feature_config, "wind_speed_at_10m")
+    expected = plugin(cube_inputs.copy(), (qrf_model, None, 0))
+
+    result = plugin(CubeList(cube_inputs[::-1]), (qrf_model, None, 0))
+
+    assert result == expected
+
+
 @pytest.mark.parametrize("forecast_period", [None, 13])
 @pytest.mark.parametrize(
     "n_estimators,max_depth,random_state,cycletime,include_dynamic,include_static,add_fp_bounds,expected",
@@ -12,10 +12,11 @@ import joblib
 import numpy as np
 import pandas as pd
 import pytest
-from iris.cube import Cube
+from iris.cube import Cube, CubeList
 from iris.pandas import as_data_frame
 from pandas.testing import assert_frame_equal
 
+from improver.calibration import add_static_feature_from_cube_to_df
 from improver.calibration.quantile_regression_random_forest import (
     ApplyQuantileRegressionRandomForests,
     TrainQuantileRegressionRandomForests,
@@ -23,6 +24,7 @@ from improver.calibration.quantile_regression_random_forest import (
     apply_transformation,
     prep_feature,
     prep_features_from_config,
+    prep_features_from_cubes,
     quantile_forest_package_available,
     sanitise_forecast_dataframe,
 )
@@ -604,6 +606,121 @@ def test_prep_features_from_config(feature_config):
         assert result_names == expected
 
 
+@pytest.mark.parametrize("representation", ["percentile", "realization"])
+@pytest.mark.parametrize(
+    "feature_config",
+    [
+        {
+            "wind_speed_at_10m": [
+                "mean",
+                "std",
+                "min",
+                "max",
+                "percentile_40",
+                "members_below_7",
+                "members_above_7",
+            ]
+        },
+        {
+            "wind_speed_at_10m": [
+                "mean",
+                "latitude",
+                "longitude",
+                "altitude",
+                "day_of_year",
+                "day_of_year_sin",
+                "hour_of_day_cos",
+            ],
+            "distance_to_water": ["static"],
+        },
+    ],
+)
+def test_prep_features_from_cubes(representation, feature_config):
+    """Test that the features constructed from cubes match those constructed
+    from the equivalent DataFrame."""
+    frt = "20170103T0000Z"
+    vt = "20170103T1200Z"
+    data = np.array([5, 6.5, 8.25], dtype=np.float32)
+    forecast_cube = _create_forecasts(frt, vt, data, representation, return_cube=True)
+    forecast_df = _create_forecasts(frt, vt, data, representation)
+    ancil_cube = _create_ancil_file(return_cube=True)
+    ancil_df = _create_ancil_file()
+    forecast_df = forecast_df.merge(
+        ancil_df[["wmo_id", "distance_to_water"]], on=["wmo_id"], how="left"
+    )
+
+    expected_df, expected_names = prep_features_from_config(forecast_df, feature_config)
+    expected_df = sanitise_forecast_dataframe(expected_df, feature_config)
+    result, result_names = prep_features_from_cubes(
+        CubeList([forecast_cube, ancil_cube]), feature_config
+    )
+
+    assert result_names == expected_names
+    assert result.dtype == np.float32
+    np.testing.assert_array_equal(
+        result, expected_df[expected_names].to_numpy(dtype=np.float32)
+    )
+
+
+@pytest.mark.parametrize(
+    "ancil_slice,expected",
+    [
+        (slice(None), [2, 3]),
+        (slice(None, None, -1), [2, 3]),
+        (slice(None, 1), [2, np.nan]),
+        (slice(1, None), [np.nan, 3]),
+    ],
+)
+def test_prep_features_from_cubes_site_order(ancil_slice, expected):
+    """Test that static features are matched to the forecast sites by WMO ID,
+    if the ancillary cube has its sites in a different order or contains a
+    subset of the sites, with NaN at sites that are missing, as when merging
+    the DataFrames."""
+    feature_config = {
+        "wind_speed_at_10m": ["mean"],
+        "distance_to_water": ["static"],
+    }
+    frt = "20170103T0000Z"
+    vt = "20170103T1200Z"
+    data = np.array([5, 6], dtype=np.float32)
+    forecast_cube = _create_forecasts(frt, vt, data, return_cube=True)
+    ancil_cube = _create_ancil_file(return_cube=True)[ancil_slice]
+    forecast_df = add_static_feature_from_cube_to_df(
+        _create_forecasts(frt, vt, data),
+        ancil_cube,
+        "distance_to_water",
+        ["wmo_id"],
+    )
+    expected_df, expected_names = prep_features_from_config(forecast_df, feature_config)
+    expected_df = sanitise_forecast_dataframe(expected_df, feature_config)
+
+    result, result_names = prep_features_from_cubes(
+        CubeList([forecast_cube, ancil_cube]), feature_config
+    )
+
+    assert result_names == expected_names
+    np.testing.assert_array_equal(result[:, 1], np.array(expected, np.float32))
+    np.testing.assert_array_equal(
+        result, expected_df[expected_names].to_numpy(dtype=np.float32)
+    )
+
+
+def test_prep_features_from_cubes_duplicate_sites():
+    """Test that an error is raised if the sites of a cube are not uniquely
+    identified by their WMO IDs."""
+    feature_config = {
+        "wind_speed_at_10m": ["mean"],
+        "distance_to_water": ["static"],
+    }
+    forecast_cube = _create_forecasts(
+        "20170103T0000Z", "20170103T1200Z", np.array([5, 6]), return_cube=True
+    )
+    ancil_cube = _create_ancil_file(return_cube=True)
+    ancil_cube.coord("wmo_id").points = [WMO_ID[0], WMO_ID[0]]
+    with pytest.raises(ValueError, match="not uniquely identified"):
+        prep_features_from_cubes(CubeList([forecast_cube, ancil_cube]), feature_config)
+
+
 @pytest.mark.parametrize(
     "transformation", ["log", "log10", "sqrt", "cbrt", None, "yeojohnson"]
 )
@@ -1033,3 +1150,38 @@ def test_apply_qrf_alternative_configs(
     assert result.shape == (2,)
     assert result.dtype == np.float32
     np.testing.assert_almost_equal(result, expected, decimal=2)
+
+
+@pytest.mark.parametrize("chunk_size,n_workers", [(None, 1), (1, 1), (1, 2), (None, 2)])
+def test_apply_qrf_cubes(chunk_size, n_workers):
+    """Test that the ApplyQuantileRegressionRandomForests plugin gives the same
+    result when applied to cubes, with the points predicted in chunks by
+    several threads, as when applied to a DataFrame."""
+    feature_config = {"wind_speed_at_10m": ["mean", "std", "latitude", "longitude"]}
+    quantiles = [0.1, 0.5, 0.9]
+    qrf_model = _run_train_qrf(feature_config, 2, 2, 55, "log", 10, {}, False)
+
+    frt = "20170103T0000Z"
+    vt = "20170103T1200Z"
+    data = np.array([6, 12, 18], dtype=np.float32)
+    forecast_cube = _create_forecasts(frt, vt, data, return_cube=True)
+    forecast_df = _create_forecasts(frt, vt, data)
+
+    plugin = ApplyQuantileRegressionRandomForests(
+        "wind_speed_at_10m", feature_config, quantiles, "log", 10
+    )
+    expected = plugin.process(qrf_model, forecast_df)
+
+    plugin = ApplyQuantileRegressionRandomForests(
+        "wind_speed_at_10m",
+        feature_config,
+        quantiles,
+        "log",
+        10,
+        chunk_size=chunk_size,
+        n_workers=n_workers,
+    )
+    result = plugin.process(qrf_model, CubeList([forecast_cube]))
+
+    assert result.dtype == np.float32
+    np.testing.assert_array_equal(result, expected)
@@ -17,6 +17,7 @@ from iris.cube import CubeList
 from improver.calibration.rainforest_calibration import (
     ApplyRainForestsCalibrationLightGBM,
     ApplyRainForestsCalibrationTreelite,
+    tree_model_registry_clear,
 )
 from improver.metadata.utilities import (
     create_new_diagnostic_cube,
@@ -35,6 +36,14 @@ ATTRIBUTES = {
 }
 
 
+@pytest.fixture(autouse=True)
+def clear_tree_model_registry():
+    """Ensure that models loaded by one test are not used by another."""
+    tree_model_registry_clear()
+    yield
+    tree_model_registry_clear()
+
+
 @pytest.fixture
 def thresholds():
     return np.array([0.0000, 0.0001, 0.0010, 0.0100], dtype=np.float32)
@@ -447,6 +447,39 @@ def test_process_with_bin_data(
     np.testing.assert_equal(result.data, result_bin.data)
 
 
+@pytest.mark.parametrize("bin_data", (False, True))
+def test_process_with_threshold_workers(
+    ensemble_forecast,
+    ensemble_features,
+    plugin_and_dummy_models,
+    model_config,
+    lightgbm_model_files,
+    bin_data,
+):
+    """Test that evaluating the models for different thresholds concurrently
+    gives the same results as evaluating them in turn.
+
+    Note: The lightgbm_model_files parameter is not used explicitly, but it is
+    required in order to make the files available.
+    """
+    plugin_cls, dummy_models = plugin_and_dummy_models
+    output_thresholds = [0.0, 0.0005, 0.001]
+    results = []
+    for threshold_workers in (1, 3):
+        plugin = plugin_cls(
+            model_config_dict={},
+            bin_data=bin_data,
+            threshold_workers=threshold_workers,
+        )
+        plugin.tree_models, plugin.lead_times, plugin.model_thresholds = dummy_models
+        if bin_data:
+            plugin.combined_feature_splits = plugin._get_feature_splits(model_config)
+        results.append(
+            plugin.process(ensemble_forecast, ensemble_features, output_thresholds)
+        )
+    np.testing.assert_equal(results[1].data, results[0].data)
+
+
 def test_process_deterministic(
     deterministic_forecast,
     deterministic_features,
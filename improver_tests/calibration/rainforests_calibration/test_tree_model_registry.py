@@ -0,0 +1,128 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Unit tests for the registry of RainForests tree models."""
+
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from improver.calibration.rainforest_calibration import (
+    ApplyRainForestsCalibrationLightGBM,
+    TreeModelRegistryInfo,
+    _tree_model_registry,
+    compile_treelite_models,
+    preload_tree_models,
+    tree_model_registry_info,
+)
+
+lightgbm = pytest.importorskip("lightgbm")
+
+
+@pytest.fixture
+def n_models(lead_times, thresholds):
+    return len(lead_times) * len(thresholds)
+
+
+def test_models_loaded_once(lightgbm_model_files, model_config, n_models):
+    """Test that plugins initialised with the same configuration share the
+    models, which are only loaded once."""
+    first = ApplyRainForestsCalibrationLightGBM(model_config)
+    second = ApplyRainForestsCalibrationLightGBM(model_config)
+    assert tree_model_registry_info() == TreeModelRegistryInfo(
+        n_models, n_models, n_models
+    )
+    for key, model in first.tree_models.items():
+        assert second.tree_models[key] is model
+
+
+def test_changed_model_reloaded(lightgbm_model_files, model_config, n_models):
+    """Test that a model is loaded again if its file has been modified,
+    replacing the model loaded from the earlier version of the file."""
+    first = ApplyRainForestsCalibrationLightGBM(model_config)
+    model_path = model_config["24"]["0.0010"]["lightgbm_model"]
+    mtime_ns = os.stat(model_path).st_mtime_ns + 10**9
+    os.utime(model_path, ns=(mtime_ns, mtime_ns))
+    second = ApplyRainForestsCalibrationLightGBM(model_config)
+    assert tree_model_registry_info() == TreeModelRegistryInfo(
+        n_models - 1, n_models + 1, n_models
+    )
+    key = (np.float32(24), np.float32(0.001))
+    assert second.tree_models[key] is not first.tree_models[key]
+
+
+def test_preload(lightgbm_model_files, model_config, n_models):
+    """Test that preloading a configuration loads the models and feature
+    splits used by subsequently initialised plugins."""
+    for lead_time_dict in model_config.values():
+        for model_paths in lead_time_dict.values():
+            model_paths.pop("treelite_model")
+    preload_tree_models(model_config, bin_data=True)
+    assert tree_model_registry_info().misses == 2 * n_models
+    ApplyRainForestsCalibrationLightGBM(model_config, bin_data=True)
+    assert tree_model_registry_info().misses == 2 * n_models
+
+
+def test_feature_splits(lightgbm_model_files, model_config):
+    """Test that the feature splits read through the registry are the same
+    when they are read from the files and from the registry."""
+    first = ApplyRainForestsCalibrationLightGBM(model_config, bin_data=True)
+    second = ApplyRainForestsCalibrationLightGBM(model_config, bin_data=True)
+    for lead_time, splits in first.combined_feature_splits.items():
+        for expected, result in zip(splits, second.combined_feature_splits[lead_time]):
+            np.testing.assert_array_equal(result, expected)
+
+
+def test_concurrent_loading(tmp_path):
+    """Test that a model requested by several threads at once is only loaded
+    once."""
+    path = tmp_path / "model.txt"
+    path.write_text("model")
+    calls = []
+
+    def loader(model_path):
+        calls.append(model_path)
+        return object()
+
+    barrier = threading.Barrier(4)
+
+    def get():
+        barrier.wait()
+        return _tree_model_registry.get("test", path, loader)
+
+    threads = [threading.Thread(target=get) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert calls == [str(path)]
+
+
+def test_missing_file_not_registered(tmp_path):
+    """Test that the loader is left to report missing model files."""
+    with pytest.raises(FileNotFoundError):
+        _tree_model_registry.get("test", tmp_path / "missing.txt", open)
+    assert tree_model_registry_info().entries == 0
+
+
+def test_compile_treelite_models(lightgbm_model_files, model_config, tmp_path):
+    """Test that the LightGBM models are compiled into shared libraries in the
+    cache directory once, and the configuration refers to the libraries."""
+    pytest.importorskip("treelite")
+    pytest.importorskip("tl2cgen")
+    cache_dir = tmp_path / "compiled"
+    result = compile_treelite_models(model_config, cache_dir)
+    libpaths = [
+        paths["treelite_model"]
+        for lead_time_dict in result.values()
+        for paths in lead_time_dict.values()
+    ]
+    assert all(os.path.dirname(path) == str(cache_dir) for path in libpaths)
+    mtimes = {path: os.stat(path).st_mtime_ns for path in set(libpaths)}
+    assert compile_treelite_models(model_config, cache_dir) == result
+    assert {path: os.stat(path).st_mtime_ns for path in mtimes} == mtimes
+    assert model_config["24"]["0.0000"]["treelite_model"].endswith(".so")
+    assert model_config["24"]["0.0000"]["treelite_model"] not in libpaths
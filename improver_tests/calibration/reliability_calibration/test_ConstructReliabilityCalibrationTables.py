@@ -233,7 +233,7 @@ def test_valid_inputs(create_rel_table_inputs, expected_attributes):
     assert result.attributes == expected_attributes
 
 
-def test_prb_table_values(create_rel_table_inputs, expected_table):
+def test_arb_table_values(create_rel_table_inputs, expected_table):
     """Test the reliability table returned has the expected values for the
     given inputs. Parameterized using `create_rel_table_inputs` fixture."""
     forecast_1 = create_rel_table_inputs.forecast[0]
@@ -242,14 +242,20 @@ def test_prb_table_values(create_rel_table_inputs, expected_table):
     truth_slice = next(truth_1.slices_over("air_temperature"))
     result = Plugin(
         single_value_lower_limit=True, single_value_upper_limit=True
-    )._populate_reliability_bins(forecast_slice.data, truth_slice.data)
+    )._accumulate_reliability_bins(
+        forecast_slice.data.reshape(1, 1, -1), truth_slice.data.reshape(1, 1, -1), False
+    )
 
     expected_table_shape = create_rel_table_inputs.expected_shape
-    assert result.shape == expected_table_shape
-    assert_array_equal(result, expected_table.reshape(expected_table_shape))
+    assert result.shape == (1,) + expected_table_shape[:2] + (9,)
+    assert result.dtype == np.float32
+    assert_array_equal(
+        result[0].reshape(expected_table_shape),
+        expected_table.reshape(expected_table_shape),
+    )
 
 
-def test_pmrb_table_values_masked_truth(
+def test_arb_table_values_masked_truth(
     forecast_grid, masked_truths, expected_table_for_mask, expected_table_shape_grid
 ):
     """Test the reliability table returned has the expected values when a
@@ -258,11 +264,16 @@ def test_pmrb_table_values_masked_truth(
     masked_truth_1 = masked_truths[0]
     forecast_slice = next(forecast_1.slices_over("air_temperature"))
     truth_slice = next(masked_truth_1.slices_over("air_temperature"))
-    result = Plugin(
-        single_value_lower_limit=True, single_value_upper_limit=True
-    )._populate_masked_reliability_bins(forecast_slice.data, truth_slice.data)
+    result = (
+        Plugin(single_value_lower_limit=True, single_value_upper_limit=True)
+        ._accumulate_reliability_bins(
+            forecast_slice.data.reshape(1, 1, -1),
+            truth_slice.data.reshape(1, 1, -1),
+            True,
+        )[0]
+        .reshape(expected_table_shape_grid)
+    )
 
-    assert result.shape == expected_table_shape_grid
     assert np.ma.is_masked(result)
     assert_array_equal(result.data, expected_table_for_mask)
     expected_mask = np.zeros(expected_table_for_mask.shape, dtype=bool)
@@ -270,6 +281,34 @@ def test_pmrb_table_values_masked_truth(
     assert_array_equal(result.mask, expected_mask)
 
 
+def test_arb_multiple_thresholds_and_times(create_rel_table_inputs):
+    """Test that the tables of all thresholds and times accumulated together
+    match the sum of the tables accumulated separately for each threshold
+    and time."""
+    forecast = create_rel_table_inputs.forecast
+    truth = create_rel_table_inputs.truth
+    plugin = Plugin(single_value_lower_limit=True, single_value_upper_limit=True)
+    n_times, n_thresholds = forecast.shape[:2]
+    result = plugin._accumulate_reliability_bins(
+        np.moveaxis(forecast.data, 1, 0).reshape(n_thresholds, n_times, -1),
+        np.moveaxis(truth.data, 1, 0).reshape(n_thresholds, n_times, -1),
+        False,
+    )
+    for threshold in range(n_thresholds):
+        expected = np.sum(
+            [
+                plugin._accumulate_reliability_bins(
+                    forecast.data[time, threshold].reshape(1, 1, -1),
+                    truth.data[time, threshold].reshape(1, 1, -1),
+                    False,
+                )[0]
+                for time in range(n_times)
+            ],
+            axis=0,
+        )
+        assert_array_equal(result[threshold], expected)
+
+
 def test_process_return_type(forecast_grid, truth_grid):
     """Test the process method returns a reliability table cube."""
     result = Plugin().process(forecast_grid, truth_grid)
@@ -389,6 +428,68 @@ def test_table_values_masked_truth(
     assert_array_equal(result[0].data.mask, result[1].data.mask)
 
 
+@pytest.mark.parametrize("aggregate", [False, True])
+def test_process_update_reliability_table(create_rel_table_inputs, aggregate):
+    """Test that updating the reliability tables constructed from the first
+    forecast with the second forecast gives the same tables as constructing
+    them from both forecasts at once, with or without aggregation."""
+    forecast = create_rel_table_inputs.forecast
+    truth = create_rel_table_inputs.truth
+    aggregate_coords = None
+    if aggregate:
+        aggregate_coords = (
+            ["spot_index"]
+            if forecast.coords("spot_index")
+            else ["latitude", "longitude"]
+        )
+    plugin = Plugin(single_value_lower_limit=True, single_value_upper_limit=True)
+    expected = plugin.process(forecast, truth, aggregate_coords)
+    reliability_table = plugin.process(forecast[0], truth[0], aggregate_coords)
+    result = plugin.process(
+        forecast[1], truth[1], aggregate_coords, reliability_table=reliability_table
+    )
+    assert result == expected
+
+
+def test_process_update_reliability_table_masked_truth(forecast_grid, masked_truths):
+    """Test that updating the reliability tables with a masked truth gives the
+    same table values and mask as constructing them from both forecasts at
+    once."""
+    plugin = Plugin(single_value_lower_limit=True, single_value_upper_limit=True)
+    expected = plugin.process(forecast_grid, masked_truths)
+    reliability_table = plugin.process(forecast_grid[0], masked_truths[0])
+    result = plugin.process(
+        forecast_grid[1], masked_truths[1], reliability_table=reliability_table
+    )
+    assert result == expected
+    assert_array_equal(result.data.mask, expected.data.mask)
+
+
+def test_process_update_reliability_table_overlapping_frt(forecast_grid, truth_grid):
+    """Test that an exception is raised if the reliability tables to update
+    were constructed from the same forecasts."""
+    plugin = Plugin()
+    reliability_table = plugin.process(forecast_grid[0], truth_grid[0])
+    with pytest.raises(ValueError, match="overlapping forecast reference time"):
+        plugin.process(
+            forecast_grid[0], truth_grid[0], reliability_table=reliability_table
+        )
+
+
+def test_process_update_reliability_table_mismatching_thresholds(
+    forecast_grid, truth_grid
+):
+    """Test that an exception is raised if the reliability tables to update
+    have different thresholds to the forecasts."""
+    plugin = Plugin()
+    reliability_table = plugin.process(forecast_grid[0, :1], truth_grid[0, :1])
+    msg = "Threshold coordinates differ between the reliability tables"
+    with pytest.raises(ValueError, match=msg):
+        plugin.process(
+            forecast_grid[1], truth_grid[1], reliability_table=reliability_table
+        )
+
+
 def test_process_mismatching_threshold_coordinates(truth_grid, forecast_grid):
     """Test that an exception is raised if the forecast and truth cubes
     have differing threshold coordinates."""
@@ -0,0 +1,143 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Unit tests for the RollingAggregateReliabilityCalibrationTables plugin."""
+
+import iris
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose, assert_array_equal
+
+from improver.calibration.reliability_calibration import (
+    AggregateReliabilityCalibrationTables,
+)
+from improver.calibration.reliability_calibration import (
+    RollingAggregateReliabilityCalibrationTables as Plugin,
+)
+from improver.utilities.save import save_netcdf
+
+
+@pytest.fixture
+def daily_tables(reliability_cube):
+    """Reliability tables for five consecutive days, with different values
+    each day and with some points masked on alternate days."""
+    rng = np.random.default_rng(0)
+    tables = []
+    for day in range(5):
+        table = reliability_cube.copy()
+        frt = table.coord("forecast_reference_time")
+        frt.points = frt.points + day * 24 * 3600
+        frt.bounds = [[frt.points[0], frt.points[0]]]
+        data = table.data * rng.uniform(0.5, 1.5, table.shape).astype(np.float32)
+        if day % 2:
+            mask = np.zeros(table.shape, dtype=bool)
+            mask[:, :, 0, day % 3] = True
+            data = np.ma.array(data, mask=mask)
+        table.data = data
+        tables.append(table)
+    return tables
+
+
+def _expired_tables(plugin, tables, table, state):
+    """Select the tables that leave the window when the table is added."""
+    expired_points = plugin.expired_forecast_reference_times(table, state)
+    return [
+        expired
+        for expired in tables
+        if expired.coord("forecast_reference_time").points[0] in expired_points
+    ]
+
+
+def _assert_tables_match(result, expected):
+    """Assert that the values, mask and metadata of two tables match."""
+    assert_allclose(result.data, expected.data, rtol=1e-6)
+    assert_array_equal(
+        np.ma.getmaskarray(result.data), np.ma.getmaskarray(expected.data)
+    )
+    assert result.copy(data=expected.data) == expected
+
+
+def test_init_invalid_window_length():
+    """Test that an exception is raised if the window length is not
+    positive."""
+    with pytest.raises(ValueError, match="must be a positive number of days"):
+        Plugin(0)
+
+
+def test_process_new_state(reliability_cube):
+    """Test that the table is returned unchanged, alongside a new state, if no
+    state is provided."""
+    result, state = Plugin(3).process(reliability_cube)
+    assert result == reliability_cube
+    assert len(state) == 4
+    window_frt = state.extract_cube(Plugin.window_name).coord("forecast_reference_time")
+    frt = reliability_cube.coord("forecast_reference_time")
+    assert_array_equal(window_frt.points, frt.points)
+    assert_array_equal(window_frt.bounds, frt.bounds)
+    assert_array_equal(
+        state.extract_cube(Plugin.unmasked_count_name).data,
+        np.ones(reliability_cube.shape),
+    )
+
+
+@pytest.mark.parametrize("window_length", [1, 2, 3, 6])
+def test_process_matches_aggregation(daily_tables, window_length):
+    """Test that the rolling aggregation gives the same table as aggregating
+    the tables within the window from scratch each day, including the
+    forecast reference time coordinate and the mask."""
+    plugin = Plugin(window_length)
+    state = None
+    for day, table in enumerate(daily_tables):
+        expired = _expired_tables(plugin, daily_tables, table, state)
+        assert len(expired) == (day >= window_length)
+        result, state = plugin.process(table, state, expired)
+        window = daily_tables[max(0, day - window_length + 1) : day + 1]
+        expected = AggregateReliabilityCalibrationTables().process(window)
+        _assert_tables_match(result, expected)
+        window_frt = state.extract_cube(Plugin.window_name).coord(
+            "forecast_reference_time"
+        )
+        assert len(window_frt.points) == len(window)
+
+
+def test_process_saved_state(daily_tables, tmp_path):
+    """Test that the rolling aggregation continues from a state that has been
+    saved and loaded."""
+    path = str(tmp_path / "state.nc")
+    plugin = Plugin(2)
+    for day, table in enumerate(daily_tables):
+        state = iris.load(path) if day else None
+        expired = _expired_tables(plugin, daily_tables, table, state)
+        result, state = plugin.process(table, state, expired)
+        save_netcdf(state, path)
+    expected = AggregateReliabilityCalibrationTables().process(daily_tables[-2:])
+    _assert_tables_match(result, expected)
+
+
+def test_process_overlapping_frt(reliability_cube, overlapping_frt):
+    """Test that an exception is raised if the forecast reference time bounds
+    of the new table overlap those of the tables in the state."""
+    plugin = Plugin(3)
+    _, state = plugin.process(reliability_cube.copy())
+    msg = "Reliability calibration tables have overlapping"
+    with pytest.raises(ValueError, match=msg):
+        plugin.process(overlapping_frt, state)
+
+
+def test_process_mismatching_shape(reliability_cube, different_frt):
+    """Test that an exception is raised if the new table has a different shape
+    to the tables in the state."""
+    plugin = Plugin(3)
+    _, state = plugin.process(reliability_cube)
+    with pytest.raises(ValueError, match="has a different shape"):
+        plugin.process(different_frt[..., :2], state)
+
+
+def test_process_missing_expired_tables(daily_tables):
+    """Test that an exception is raised if the tables that leave the window
+    are not provided."""
+    plugin = Plugin(1)
+    _, state = plugin.process(daily_tables[0])
+    with pytest.raises(ValueError, match="must be provided"):
+        plugin.process(daily_tables[1], state)
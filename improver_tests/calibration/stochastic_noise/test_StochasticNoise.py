@@ -8,7 +8,7 @@ import numpy as np
 import pytest
 from iris.cube import Cube
 
-from improver.calibration.stochastic_noise import StochasticNoise
+from improver.calibration.stochastic_noise import StochasticNoise, _fft_method
 from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
 
 pytest.importorskip("pysteps")
@@ -211,3 +211,69 @@ def test_allow_seeded_parallel_processing_warning():
         match="Using multiple workers with a fixed seed may introduce run-to-run",
     ):
         plugin.process(cube)
+
+
+@pytest.fixture
+def zero_cube():
+    """Create a cube with zero values in which the first and last of three
+    realizations are identical."""
+    rng = np.random.default_rng(0)
+    data = np.maximum(rng.normal(0, 1, (3, 12, 12)), 0).astype(np.float32)
+    data[2] = data[0]
+    return set_up_variable_cube(data=data, name="precipitation_rate", units="mm/hr")
+
+
+def test_identical_realizations_share_filter(zero_cube, monkeypatch):
+    """Test that the SSFT filter is initialised once for realizations with
+    identical data, and the output is the same as initialising it for each
+    realization."""
+    from pysteps.noise import fftgenerators
+
+    kwargs = {
+        "ssft_init_params": {"win_size": (6, 6)},
+        "ssft_generate_params": {"seed": 0},
+    }
+    expected = StochasticNoise(**kwargs).process(zero_cube.copy())
+
+    calls = []
+    initialize = fftgenerators.initialize_nonparam_2d_ssft_filter
+
+    def counting_initialize(*args, **kwargs):
+        calls.append(args)
+        return initialize(*args, **kwargs)
+
+    monkeypatch.setattr(
+        fftgenerators, "initialize_nonparam_2d_ssft_filter", counting_initialize
+    )
+    result = StochasticNoise(**kwargs).process(zero_cube.copy())
+    assert len(calls) == 2
+    np.testing.assert_array_equal(result.data, expected.data)
+
+
+def test_processes_backend(zero_cube):
+    """Test that generating the noise in several processes gives the same
+    output as generating it in a single thread."""
+    kwargs = {
+        "ssft_init_params": {"win_size": (6, 6)},
+        "ssft_generate_params": {"seed": 0},
+    }
+    expected = StochasticNoise(**kwargs).process(zero_cube.copy())
+    result = StochasticNoise(backend="processes", num_workers=2, **kwargs).process(
+        zero_cube.copy()
+    )
+    np.testing.assert_array_equal(result.data, expected.data)
+
+
+def test_invalid_backend():
+    """Test that ValueError is raised for an unknown backend."""
+    with pytest.raises(ValueError, match="backend must be one of"):
+        StochasticNoise(backend="distributed")
+
+
+def test_fft_method_reused():
+    """Test that the FFT method for a grid is created once and reused, and
+    FFT methods that have already been created are used unchanged."""
+    method = _fft_method("numpy", (4, 6))
+    assert _fft_method("numpy", (4, 6)) is method
+    assert _fft_method("numpy", (6, 4)) is not method
+    assert _fft_method(method, (6, 4)) is method
@@ -30,6 +30,7 @@ from improver.calibration.utilities import (
     check_predictor,
     convert_cube_data_to_2d,
     convert_parquet_to_cube,
+    convert_parquet_to_cubes,
     create_unified_frt_coord,
     filter_non_matching_cubes,
     flatten_ignoring_masked_data,
@@ -37,6 +38,7 @@ from improver.calibration.utilities import (
     get_frt_hours,
     merge_land_and_sea,
     prepare_cube_no_calibration,
+    read_parquet_for_forecast_periods,
 )
 from improver.metadata.constants.time_types import TIME_COORDS
 from improver.synthetic_data.set_up_test_cubes import (
@@ -1298,5 +1300,102 @@ def test_convert_parquet_to_cube_exception(tmp_path):
         )
 
 
+@pytest.mark.skipif(not pyarrow_installed, reason="pyarrow not installed")
+@pytest.mark.parametrize("adjacent_range", [0, 6])
+@pytest.mark.parametrize("cycletime", ["20170103T0000Z", "20170104T0000Z"])
+def test_convert_parquet_to_cubes(tmp_path, cycletime, adjacent_range):
+    """Test that the cubes for each forecast period are the same as those
+    returned by convert_parquet_to_cube for that forecast period."""
+    _, fcs_path = create_multi_forecast_period_forecast_parquet_file(tmp_path)
+    _, truth_path = create_multi_forecast_period_truth_parquet_file(tmp_path)
+    kwargs = {
+        "cycletime": cycletime,
+        "training_length": 1,
+        "diagnostic": "temperature_at_screen_level",
+        "percentiles": [50],
+        "experiment": "latestblend",
+        "adjacent_range": adjacent_range,
+    }
+    forecast_periods = [6 * 3600, 12 * 3600, 18 * 3600]
+
+    result = convert_parquet_to_cubes(
+        Path(fcs_path), Path(truth_path), forecast_periods, **kwargs
+    )
+
+    assert list(result) == forecast_periods
+    for forecast_period in forecast_periods:
+        expected = convert_parquet_to_cube(
+            Path(fcs_path), Path(truth_path), forecast_period, **kwargs
+        )
+        for cube, expected_cube in zip(result[forecast_period], expected):
+            assert cube == expected_cube
+    if cycletime == "20170103T0000Z":
+        assert result[6 * 3600][0].coord("forecast_period").points == 6 * 3600
+    if adjacent_range == 0:
+        # There are no forecasts within the table for this forecast period.
+        assert result[18 * 3600] == [None, None]
+
+
+@pytest.mark.skipif(not pyarrow_installed, reason="pyarrow not installed")
+def test_read_parquet_for_forecast_periods(tmp_path):
+    """Test that the tables are read with only the columns used for
+    calibration and the rows for the diagnostic and training periods."""
+    fcs_df, fcs_path = create_multi_forecast_period_forecast_parquet_file(tmp_path)
+    _, truth_path = create_multi_forecast_period_truth_parquet_file(tmp_path)
+    later_truth = pd.DataFrame(
+        {
+            "diagnostic": ["temperature_at_screen_level"],
+            "latitude": [60.1],
+            "longitude": [1],
+            "altitude": [10],
+            "time": [pd.Timestamp("2017-01-03 06:00:00", tz="utc")],
+            "wmo_id": ["03001"],
+            "ob_value": [281],
+        }
+    )
+    later_truth.to_parquet(truth_path / "later_truth.parquet", index=False)
+
+    forecast_df, truth_df = read_parquet_for_forecast_periods(
+        Path(fcs_path),
+        Path(truth_path),
+        [6 * 3600, 12 * 3600],
+        cycletime="20170103T0000Z",
+        training_length=1,
+        diagnostic="temperature_at_screen_level",
+    )
+
+    assert len(forecast_df) == len(fcs_df)
+    assert set(forecast_df.columns) == set(fcs_df.columns)
+    assert list(truth_df.columns) == [
+        "altitude",
+        "diagnostic",
+        "latitude",
+        "longitude",
+        "ob_value",
+        "time",
+        "wmo_id",
+    ]
+    assert len(truth_df) == 4
+    assert (truth_df["diagnostic"] == "temperature_at_screen_level").all()
+
+
+@pytest.mark.skipif(not pyarrow_installed, reason="pyarrow not installed")
+def test_read_parquet_for_forecast_periods_exception(tmp_path):
+    """Test that an exception is raised if there are no truths for the
+    diagnostic."""
+    _, fcs_path = create_multi_forecast_period_forecast_parquet_file(tmp_path)
+    _, truth_path = create_multi_forecast_period_truth_parquet_file(tmp_path)
+
+    with pytest.raises(IOError, match="does not contain the requested contents"):
+        read_parquet_for_forecast_periods(
+            Path(fcs_path),
+            Path(truth_path),
+            [6 * 3600],
+            cycletime="20170103T0000Z",
+            training_length=1,
+            diagnostic="lwe_precipitation_rate",
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -18,12 +18,14 @@ from iris.exceptions import CoordinateNotFoundError
 from improver.categorical.utilities import (
     categorical_attributes,
     check_tree,
+    counts_per_category,
     day_night_map,
     dry_map,
     expand_nested_lists,
     get_parameter_names,
     interrogate_decision_tree,
     is_decision_node,
+    most_common_category,
     update_daynight,
     update_tree_thresholds,
 )
@@ -784,5 +786,32 @@ def test_dry_map():
     assert expected == result
 
 
+@pytest.mark.parametrize("masked", (False, True))
+def test_counts_per_category(masked):
+    """Test that the occurrences of each category are counted along the leading
+    dimension at each point, and that masked values are not counted."""
+    data = np.array(
+        [[[0, 1], [2, 2]], [[0, 2], [2, 1]], [[1, 2], [0, 1]]], dtype=np.int32
+    )
+    expected = np.array([[[2, 1, 0], [0, 1, 2]], [[1, 0, 2], [0, 2, 1]]])
+    if masked:
+        data = np.ma.masked_where(data == 2, data)
+        expected[..., 2] = 0
+
+    result = counts_per_category(data, 3)
+
+    assert result.shape == (2, 2, 3)
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_most_common_category():
+    """Test that the most common category is returned, with ties resolved in
+    favour of the highest category."""
+    counts = np.array([[2, 1, 0], [0, 1, 2], [1, 1, 1], [0, 2, 2]])
+    expected = np.array([0, 2, 2, 2])
+    result = most_common_category(counts)
+    np.testing.assert_array_equal(result, expected)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -9,6 +9,7 @@ from unittest.mock import patch
 
 import dask.array as da
 import numpy as np
+import pytest
 from iris.cube import Cube, CubeList
 from iris.exceptions import ConstraintMismatchError
 
@@ -194,7 +195,9 @@ class Test_with_output(unittest.TestCase):
         compression_level=1 and default least_significant_digit=None"""
         save_object = Cube([0])
         result = wrapped_with_output.cli("argv[0]", [save_object], "--output=foo")
-        m.assert_called_with(save_object, "foo", 1, None)
+        m.assert_called_with(
+            save_object, "foo", 1, None, compression="zlib", chunking=None, zarr=False
+        )
         self.assertEqual(result, None)
 
     @patch("os.rename")
@@ -214,7 +217,9 @@ class Test_with_output(unittest.TestCase):
         result = wrapped_with_output.cli(
             "argv[0]", [save_object], "--output=foo", "--compression-level=9"
         )
-        m.assert_called_with(save_object, "foo", 9, None)
+        m.assert_called_with(
+            save_object, "foo", 9, None, compression="zlib", chunking=None, zarr=False
+        )
         self.assertEqual(result, None)
 
     @patch("improver.utilities.save.save_netcdf")
@@ -224,7 +229,9 @@ class Test_with_output(unittest.TestCase):
         result = wrapped_with_output.cli(
             "argv[0]", [save_object], "--output=foo", "--compression-level=0"
         )
-        m.assert_called_with(save_object, "foo", 0, None)
+        m.assert_called_with(
+            save_object, "foo", 0, None, compression="zlib", chunking=None, zarr=False
+        )
         self.assertEqual(result, None)
 
     @patch("improver.utilities.save.save_netcdf")
@@ -238,7 +245,43 @@ class Test_with_output(unittest.TestCase):
             "--compression-level=0",
             "--least-significant-digit=2",
         )
-        m.assert_called_with(save_object, "foo", 0, 2)
+        m.assert_called_with(
+            save_object, "foo", 0, 2, compression="zlib", chunking=None, zarr=False
+        )
+        self.assertEqual(result, None)
+
+    @patch("improver.utilities.save.save_netcdf")
+    def test_with_output_compression_and_chunking(self, m):
+        """Tests save_netcdf, compression=zstd and chunking=tiles:64"""
+        save_object = Cube([0])
+        result = wrapped_with_output.cli(
+            "argv[0]",
+            [save_object],
+            "--output=foo",
+            "--compression=zstd",
+            "--chunking=tiles:64",
+        )
+        m.assert_called_with(
+            save_object,
+            "foo",
+            1,
+            None,
+            compression="zstd",
+            chunking="tiles:64",
+            zarr=False,
+        )
+        self.assertEqual(result, None)
+
+    @patch("improver.utilities.save.save_netcdf")
+    def test_with_output_zarr(self, m):
+        """Tests save_netcdf, zarr=True"""
+        save_object = Cube([0])
+        result = wrapped_with_output.cli(
+            "argv[0]", [save_object], "--output=foo", "--zarr"
+        )
+        m.assert_called_with(
+            save_object, "foo", 1, None, compression="zlib", chunking=None, zarr=True
+        )
         self.assertEqual(result, None)
 
 
@@ -408,6 +451,65 @@ def test_import_cli():
     subprocess.run([sys.executable, "-c", script], check=True)  # noqa: S603
 
 
+def test_import_cli_no_subcommands():
+    """Test that `import improver.cli` does not import any CLI modules, which
+    are only imported when the corresponding subcommand is run."""
+    import subprocess  # nosec
+    import sys
+
+    script = (
+        "import improver.cli, sys; "
+        'assert not [m for m in sys.modules if m.startswith("improver.cli.")], '
+        '"CLI modules imported via improver.cli"'
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)  # noqa: S603
+
+
+def test_dispatch_subcommand_imports_only_subcommand():
+    """Test that dispatching a subcommand imports only the CLI module for that
+    subcommand."""
+    import subprocess  # nosec
+    import sys
+
+    script = "\n".join(
+        [
+            "import sys",
+            "from clize.errors import ArgumentError",
+            "import improver.cli",
+            "try:",
+            "    improver.cli.dispatch_subcommand('improver', 'threshold', '--bad')",
+            "except ArgumentError:",
+            "    pass",
+            "modules = [m for m in sys.modules if m.startswith('improver.cli.')]",
+            "assert modules == ['improver.cli.threshold'], modules",
+        ]
+    )
+    subprocess.run([sys.executable, "-c", script], check=True)  # noqa: S603
+
+
+def test_dispatch_subcommand_unknown():
+    """Test that an unknown subcommand is reported with a suggestion from the
+    full table of subcommands."""
+    from clize.errors import ArgumentError
+
+    from improver.cli import dispatch_subcommand
+
+    with pytest.raises(ArgumentError, match='Did you mean "threshold"'):
+        dispatch_subcommand("improver", "thresold")
+
+
+def test_lazy_module_attributes():
+    """Test that the CLI modules and the subcommand table are available as
+    attributes of improver.cli."""
+    import improver.cli
+
+    assert improver.cli.threshold.__name__ == "improver.cli.threshold"
+    assert "threshold" in improver.cli.SUBCOMMANDS_TABLE
+    assert "help" in improver.cli.SUBCOMMANDS_TABLE
+    with pytest.raises(AttributeError, match="has no attribute 'not_a_cli'"):
+        improver.cli.not_a_cli
+
+
 def test_help_no_stderr():
     """Test if help writes to sys.stderr."""
     import contextlib
@@ -541,6 +541,62 @@ def test_convert_to_2d_returns_copy_for_2d():
     result = RealizationClustering._convert_to_2d(arr)
     assert np.array_equal(result, arr)
 
+
+@pytest.mark.parametrize("block_size", [1, 7, 100, 1000])
+def test_pairwise_distances(block_size):
+    """Test that the blocked pairwise distances match the Euclidean distances
+    calculated directly, including where the block size does not divide the
+    number of points."""
+    cube = _create_realization_cube(shape=(6, 10, 10))
+    data = cube.data.reshape(6, -1).astype(np.float64)
+    expected = np.sqrt(
+        ((data[:, np.newaxis, :] - data[np.newaxis, :, :]) ** 2).sum(axis=-1)
+    )
+    result = RealizationClustering._pairwise_distances(cube.data, block_size)
+    assert result.shape == (6, 6)
+    np.testing.assert_allclose(result, expected, rtol=1e-12)
+    np.testing.assert_array_equal(np.diag(result), 0)
+    np.testing.assert_array_equal(result, result.T)
+
+
+def test_pairwise_distances_close_realizations():
+    """Test that the blocked pairwise distances remain accurate for
+    realizations that are close together relative to their magnitude."""
+    rng = np.random.default_rng(0)
+    data = (280 + 1e-3 * rng.standard_normal((6, 10, 10))).astype(np.float32)
+    flattened = data.reshape(6, -1).astype(np.float64)
+    expected = np.sqrt(
+        ((flattened[:, np.newaxis, :] - flattened[np.newaxis, :, :]) ** 2).sum(
+            axis=-1
+        )
+    )
+    result = RealizationClustering._pairwise_distances(data, 7)
+    np.testing.assert_allclose(result, expected, rtol=1e-12)
+
+
+def test_clustering_distance_block_size():
+    """Test that clustering using blocked, precomputed distances gives the same
+    clusters as clustering the full fields."""
+    pytest.importorskip("kmedoids")
+    cube = _create_realization_cube(shape=(12, 10, 10))
+    kwargs = {"n_clusters": 3, "random_state": 42}
+
+    expected = RealizationClustering("KMedoids", **kwargs)(cube)
+    result = RealizationClustering("KMedoids", distance_block_size=17, **kwargs)(
+        cube
+    )
+    np.testing.assert_array_equal(result.medoid_indices_, expected.medoid_indices_)
+    np.testing.assert_array_equal(result.labels_, expected.labels_)
+
+
+def test_clustering_distance_block_size_invalid_metric():
+    """Test that an error is raised if a distance_block_size is provided with a
+    metric other than euclidean."""
+    with pytest.raises(ValueError, match="Only the euclidean metric is supported"):
+        RealizationClustering(
+            "KMedoids", distance_block_size=10, metric="manhattan"
+        )
+
 # Tests for RealizationToClusterMatcher
 
 
@@ -999,6 +1055,123 @@ def test_matcher_process_4d_metadata_preservation():
     np.testing.assert_array_equal(cluster_indices, [0, 1])
 
 
+@pytest.mark.parametrize(
+    "clustered_data,candidate_data",
+    [
+        (
+            np.random.default_rng(0).normal(size=(3, 4, 4)).astype(np.float32),
+            np.random.default_rng(1).normal(size=(5, 4, 4)).astype(np.float32),
+        ),
+        (
+            np.array(
+                [[[1.0, np.nan], [np.nan, 4.0]], [[10.0, 20.0], [30.0, np.nan]]],
+                dtype=np.float32,
+            ),
+            np.array(
+                [[[1.1, 2.1], [3.1, np.nan]], [[10.1, np.nan], [30.1, 40.1]]],
+                dtype=np.float32,
+            ),
+        ),
+        (
+            np.array(
+                [[[np.nan, np.nan], [np.nan, np.nan]], [[10.0, 20.0], [30.0, 40.0]]],
+                dtype=np.float32,
+            ),
+            np.array(
+                [[[1.0, 2.0], [3.0, 4.0]], [[10.1, 20.1], [30.1, 40.1]]],
+                dtype=np.float32,
+            ),
+        ),
+    ],
+)
+def test_matcher_cache_cluster_terms(clustered_data, candidate_data):
+    """Test that calculating the MSE from cached cluster terms gives the same
+    MSE and matches as the direct calculation, including where NaNs are
+    present."""
+    clustered_cube = set_up_variable_cube(
+        clustered_data,
+        spatial_grid="equalarea",
+        realizations=np.arange(clustered_data.shape[0]),
+    )
+    candidate_cube = set_up_variable_cube(
+        candidate_data,
+        spatial_grid="equalarea",
+        realizations=np.arange(candidate_data.shape[0]),
+    )
+    plugin = RealizationToClusterMatcher()
+    cached_plugin = RealizationToClusterMatcher(cache_cluster_terms=True)
+
+    expected_mse = plugin._mean_squared_error_per_realization(
+        clustered_cube.data, candidate_cube.data, candidate_data.shape[0]
+    )
+    result_mse = cached_plugin._mean_squared_error_from_cached_terms(
+        clustered_cube, candidate_cube
+    )
+    np.testing.assert_allclose(result_mse, expected_mse, rtol=1e-6)
+
+    expected = plugin(clustered_cube, candidate_cube)
+    result = cached_plugin(clustered_cube, candidate_cube)
+    for result_indices, expected_indices in zip(result, expected):
+        np.testing.assert_array_equal(result_indices, expected_indices)
+
+
+def test_matcher_cache_cluster_terms_close_realizations():
+    """Test that the MSE from cached cluster terms remains accurate for
+    realizations that are close together relative to their magnitude."""
+    rng = np.random.default_rng(0)
+    data = (280 + 1e-3 * rng.standard_normal((9, 10, 10))).astype(np.float32)
+    data[0, 0, 0] = np.nan
+    clustered_cube = set_up_variable_cube(
+        data[:3], spatial_grid="equalarea", realizations=np.arange(3)
+    )
+    candidate_cube = set_up_variable_cube(
+        data[3:], spatial_grid="equalarea", realizations=np.arange(6)
+    )
+    flattened = data.reshape(9, -1).astype(np.float64)
+    expected_mse = np.nanmean(
+        (flattened[3:, np.newaxis, :] - flattened[np.newaxis, :3, :]) ** 2, axis=-1
+    )
+    result_mse = RealizationToClusterMatcher(
+        cache_cluster_terms=True
+    )._mean_squared_error_from_cached_terms(clustered_cube, candidate_cube)
+    np.testing.assert_allclose(result_mse, expected_mse, rtol=1e-12)
+
+
+def test_matcher_cache_cluster_terms_4d_reused():
+    """Test that the cluster terms are cached per forecast period for 4D cubes
+    and reused when matching further candidates."""
+    clustered_cube = _create_4d_realization_cube(
+        n_realizations=3, forecast_periods=[0, 6], seed=0
+    )
+    plugin = RealizationToClusterMatcher()
+    cached_plugin = RealizationToClusterMatcher(cache_cluster_terms=True)
+
+    for seed in [1, 2]:
+        candidate_cube = _create_4d_realization_cube(
+            n_realizations=5, forecast_periods=[0, 6], seed=seed
+        )
+        expected_mse = plugin._mean_squared_error_per_realization(
+            clustered_cube.data, candidate_cube.data, 5
+        )
+        result_mse = cached_plugin._mean_squared_error_from_cached_terms(
+            clustered_cube, candidate_cube
+        )
+        np.testing.assert_allclose(result_mse, expected_mse, rtol=1e-6)
+        expected = plugin(clustered_cube, candidate_cube)
+        result = cached_plugin(clustered_cube, candidate_cube)
+        for result_indices, expected_indices in zip(result, expected):
+            np.testing.assert_array_equal(result_indices, expected_indices)
+        cached_terms = dict(cached_plugin._cluster_terms)
+
+    assert sorted(cached_terms) == sorted(
+        clustered_cube.coord("forecast_period").points
+    )
+    # The cached terms are not recalculated for later candidates.
+    cached_plugin(clustered_cube, candidate_cube)
+    for fp, terms in cached_plugin._cluster_terms.items():
+        assert terms is cached_terms[fp]
+
+
 # Tests for RealizationClusterAndMatch
 
 
@@ -2850,3 +3023,69 @@ def test_realizationselection_mismatched_validity_time_raises():
     plugin = RealizationSelection(forecast_period=3600)
     with pytest.raises(ValueError, match="Forecast cubes must share a common validity time"):
         plugin.process(cubes)
+
+
+def test_clusterandmatch_distance_block_size():
+    """Test that clustering with blocked distances and matching with cached
+    cluster terms gives the same result as the default calculation."""
+    pytest.importorskip("kmedoids")
+
+    cubes = CubeList()
+    cubes.extend(
+        _create_4d_realization_cube(
+            n_realizations=8,
+            forecast_periods=[0, 6, 12],
+            y_dim=5,
+            x_dim=5,
+            model_id="primary_model",
+            realization_values=[100, 101, 103.5, 112, 117, 131, 138.5, 158],
+            merge=False,
+        )
+    )
+    cubes.extend(
+        _create_4d_realization_cube(
+            n_realizations=6,
+            forecast_periods=[0, 6],
+            y_dim=5,
+            x_dim=5,
+            model_id="secondary_model_1",
+            realization_values=[102, 108, 112, 119, 125, 131],
+            merge=False,
+        )
+    )
+    cubes.extend(
+        _create_4d_realization_cube(
+            n_realizations=5,
+            forecast_periods=[12],
+            y_dim=5,
+            x_dim=5,
+            model_id="secondary_model_2",
+            realization_values=[99, 104, 118, 122, 129],
+            merge=False,
+        )
+    )
+    hierarchy = {
+        "primary_input": "primary_model",
+        "secondary_inputs": {
+            "secondary_model_1": [0, 6],
+            "secondary_model_2": [12],
+        },
+    }
+    kwargs = {
+        "hierarchy": hierarchy,
+        "model_id_attr": "model_id",
+        "clustering_method": "KMedoids",
+        "regrid_for_clustering": False,
+        "n_clusters": 3,
+        "random_state": 42,
+    }
+
+    expected = RealizationClusterAndMatch(**kwargs)(cubes.copy())
+    plugin = RealizationClusterAndMatch(
+        distance_block_size=20, cache_cluster_terms=True, **kwargs
+    )
+    result = plugin(cubes.copy())
+
+    assert plugin._cluster_matcher.cache_cluster_terms
+    assert result == expected
+    assert result.attributes == expected.attributes
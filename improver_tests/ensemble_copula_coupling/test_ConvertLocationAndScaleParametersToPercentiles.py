@@ -12,6 +12,7 @@ import unittest
 import iris
 import numpy as np
 from iris.cube import Cube
+from scipy import stats
 
 from improver.ensemble_copula_coupling.ensemble_copula_coupling import (
     ConvertLocationAndScaleParametersToPercentiles as Plugin,
@@ -33,6 +34,43 @@ class Test__repr__(unittest.TestCase):
         self.assertEqual(result, expected_string)
 
 
+class Test__percent_point_function(unittest.TestCase):
+    """Test the _percent_point_function method."""
+
+    def setUp(self):
+        """Set up parameters, including a zero scale parameter and truncation
+        limits on either side of zero."""
+        self.location = np.array([1.0, -2.0, 3.0, 0.5], dtype=np.float32)
+        self.scale = np.array([2.0, 0.5, 0.0, 1.0], dtype=np.float32)
+        self.lower = np.array([-1.0, 0.5, -np.inf, -2.0], dtype=np.float32)
+        self.upper = np.array([np.inf, 3.0, np.inf, -2.0], dtype=np.float32)
+        self.fractions = np.array([0.0, 0.1, 0.5, 0.9, 1.0], dtype=np.float32)
+
+    def test_norm(self):
+        """Test that the values match the scipy normal distribution."""
+        result = Plugin("norm")._percent_point_function(
+            [], self.location, self.scale, self.fractions
+        )
+        expected = stats.norm(loc=self.location, scale=self.scale).ppf(
+            self.fractions[:, np.newaxis]
+        )
+        np.testing.assert_array_equal(result, expected)
+
+    def test_truncnorm(self):
+        """Test that the values match the truncated normal distribution,
+        including at the truncation limits, and are NaN where the truncation
+        limits are not in ascending order."""
+        plugin = Plugin("truncnorm")
+        result = plugin._percent_point_function(
+            [self.lower, self.upper], self.location, self.scale, self.fractions
+        )
+        expected = plugin.distribution(
+            self.lower, self.upper, loc=self.location, scale=self.scale
+        ).ppf(self.fractions[:, np.newaxis])
+        np.testing.assert_array_equal(result, expected)
+        self.assertTrue(np.isnan(result[:, 2:]).all())
+
+
 class Test__location_and_scale_parameters_to_percentiles(unittest.TestCase):
     """Test the _location_and_scale_parameters_to_percentiles plugin."""
 
@@ -33,25 +33,23 @@ from .ecc_test_data import (
 )
 
 
-class Test__add_bounds_to_thresholds_and_probabilities(unittest.TestCase):
+class Test__add_bounds_to_thresholds(unittest.TestCase):
     """
-    Test the _add_bounds_to_thresholds_and_probabilities method of the
+    Test the _add_bounds_to_thresholds method of the
     ConvertProbabilitiesToPercentiles.
     """
 
     def setUp(self):
         """Set up data for testing."""
-        self.probabilities_for_cdf = ECC_TEMPERATURE_PROBABILITIES.reshape(3, 9)
         self.threshold_points = ECC_TEMPERATURE_THRESHOLDS
         self.bounds_pairing = (-40, 50)
 
     def test_basic(self):
-        """Test that the plugin returns two numpy arrays."""
-        result = Plugin()._add_bounds_to_thresholds_and_probabilities(
-            self.threshold_points, self.probabilities_for_cdf, self.bounds_pairing
+        """Test that the plugin returns a numpy array."""
+        result = Plugin()._add_bounds_to_thresholds(
+            self.threshold_points, self.bounds_pairing
         )
-        self.assertIsInstance(result[0], np.ndarray)
-        self.assertIsInstance(result[1], np.ndarray)
+        self.assertIsInstance(result, np.ndarray)
 
     def test_bounds_of_threshold_points(self):
         """
@@ -59,25 +57,11 @@ class Test__add_bounds_to_thresholds_and_probabilities(unittest.TestCase):
         threshold_points, where they've been padded with the values from
         the bounds_pairing.
         """
-        result = Plugin()._add_bounds_to_thresholds_and_probabilities(
-            self.threshold_points, self.probabilities_for_cdf, self.bounds_pairing
+        result = Plugin()._add_bounds_to_thresholds(
+            self.threshold_points, self.bounds_pairing
         )
-        np.testing.assert_array_almost_equal(result[0][0], self.bounds_pairing[0])
-        np.testing.assert_array_almost_equal(result[0][-1], self.bounds_pairing[1])
-
-    def test_probability_data(self):
-        """
-        Test that the plugin returns the expected results for the
-        probabilities, where they've been padded with zeros and ones to
-        represent the extreme ends of the Cumulative Distribution Function.
-        """
-        zero_array = np.zeros(self.probabilities_for_cdf[:, 0].shape)
-        one_array = np.ones(self.probabilities_for_cdf[:, 0].shape)
-        result = Plugin()._add_bounds_to_thresholds_and_probabilities(
-            self.threshold_points, self.probabilities_for_cdf, self.bounds_pairing
-        )
-        np.testing.assert_array_almost_equal(result[1][:, 0], zero_array)
-        np.testing.assert_array_almost_equal(result[1][:, -1], one_array)
+        np.testing.assert_array_almost_equal(result[0], self.bounds_pairing[0])
+        np.testing.assert_array_almost_equal(result[-1], self.bounds_pairing[1])
 
     def test_endpoints_of_distribution_exceeded(self):
         """
@@ -85,7 +69,6 @@ class Test__add_bounds_to_thresholds_and_probabilities(unittest.TestCase):
         end points of the distribution are exceeded by a threshold value
         used in the forecast.
         """
-        probabilities_for_cdf = np.array([[0.05, 0.7, 0.95]])
         threshold_points = np.array([8, 10, 60])
         msg = (
             "The calculated threshold values \\[-40   8  10  60  50\\] are "
@@ -94,9 +77,7 @@ class Test__add_bounds_to_thresholds_and_probabilities(unittest.TestCase):
             "the range given by the ECC bounds \\(-40, 50\\)."
         )
         with self.assertRaisesRegex(ValueError, msg):
-            Plugin()._add_bounds_to_thresholds_and_probabilities(
-                threshold_points, probabilities_for_cdf, self.bounds_pairing
-            )
+            Plugin()._add_bounds_to_thresholds(threshold_points, self.bounds_pairing)
 
     def test_endpoints_of_distribution_exceeded_warning(self):
         """
@@ -105,7 +86,6 @@ class Test__add_bounds_to_thresholds_and_probabilities(unittest.TestCase):
         used in the forecast and the ecc_bounds_warning keyword argument
         has been specified.
         """
-        probabilities_for_cdf = np.array([[0.05, 0.7, 0.95]])
         threshold_points = np.array([8, 10, 60])
         plugin = Plugin(ecc_bounds_warning=True)
         warning_msg = (
@@ -117,22 +97,17 @@ class Test__add_bounds_to_thresholds_and_probabilities(unittest.TestCase):
             "new bounds."
         )
         with pytest.warns(UserWarning, match=warning_msg):
-            plugin._add_bounds_to_thresholds_and_probabilities(
-                threshold_points, probabilities_for_cdf, self.bounds_pairing
-            )
+            plugin._add_bounds_to_thresholds(threshold_points, self.bounds_pairing)
 
     def test_new_endpoints_generation(self):
         """Test that the plugin re-applies the threshold bounds using the
         maximum and minimum threshold points values when the original bounds
         have been exceeded and ecc_bounds_warning has been set."""
-        probabilities_for_cdf = np.array([[0.05, 0.7, 0.95]])
         threshold_points = np.array([-50, 10, 60])
         plugin = Plugin(ecc_bounds_warning=True)
-        result = plugin._add_bounds_to_thresholds_and_probabilities(
-            threshold_points, probabilities_for_cdf, self.bounds_pairing
-        )
-        self.assertEqual(max(result[0]), max(threshold_points))
-        self.assertEqual(min(result[0]), min(threshold_points))
+        result = plugin._add_bounds_to_thresholds(threshold_points, self.bounds_pairing)
+        self.assertEqual(max(result), max(threshold_points))
+        self.assertEqual(min(result), min(threshold_points))
 
 
 class Test__probabilities_to_percentiles(unittest.TestCase):
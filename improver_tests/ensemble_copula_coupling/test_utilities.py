@@ -28,9 +28,11 @@ from improver.ensemble_copula_coupling.utilities import (
     insert_lower_and_upper_endpoint_to_1d_array,
     interpolate_multiple_rows_same_x,
     interpolate_multiple_rows_same_y,
+    interpolate_probabilities_to_percentiles,
     restore_non_percentile_dimensions,
     slow_interp_same_x,
     slow_interp_same_y,
+    slow_probabilities_to_percentiles,
 )
 from improver.synthetic_data.set_up_test_cubes import (
     set_up_percentile_cube,
@@ -383,6 +385,7 @@ try:
     from improver.ensemble_copula_coupling.numba_utilities import (
         fast_interp_same_x,
         fast_interp_same_y,
+        fast_probabilities_to_percentiles,
     )
 except ImportError:
     numba_installed = False
@@ -475,6 +478,149 @@ class Test_interpolate_multiple_rows_same_y(unittest.TestCase):
         np.testing.assert_allclose(result_slow, result_multiple)
 
 
+class Test_interpolate_probabilities_to_percentiles(unittest.TestCase):
+    """Test interpolate_probabilities_to_percentiles"""
+
+    def setUp(self):
+        """Set up arrays."""
+        self.x = np.array([0.1, 0.5, 0.9])
+        self.probabilities = np.array(
+            [[0.2, 0], [0.5, 0.5], [0.8, 1]], dtype=np.float32
+        )
+        self.thresholds = np.array([0, 10, 20, 30, 40], dtype=np.float64)
+        self.expected = np.array([[5, 12], [20, 20], [35, 28]], dtype=np.float32)
+        self.expected_mask = np.array([[False, False], [False, False], [True, False]])
+        np.random.seed(0)
+        self.random_probabilities = np.sort(
+            np.random.random_sample((8, 1000)), axis=0
+        ).astype(np.float32)
+        self.random_probabilities[:, :100] = 0
+        self.random_thresholds = np.linspace(-10, 10, 10)
+
+    def test_slow(self):
+        """Test slow version against known result, with probabilities below
+        thresholds."""
+        result, mask, ascending = slow_probabilities_to_percentiles(
+            self.x, self.probabilities, self.thresholds, False, True, True
+        )
+        np.testing.assert_array_equal(result, self.expected)
+        np.testing.assert_array_equal(mask, self.expected_mask)
+        self.assertEqual(result.dtype, np.float32)
+        self.assertTrue(ascending)
+
+    def test_slow_inverted(self):
+        """Test slow version against known result, with probabilities above
+        thresholds which are subtracted from 1 in the same tile."""
+        result, mask, ascending = slow_probabilities_to_percentiles(
+            self.x, 1 - self.probabilities, self.thresholds, True, True, True, 1
+        )
+        np.testing.assert_allclose(result, self.expected, rtol=1e-6)
+        np.testing.assert_array_equal(mask, self.expected_mask)
+        self.assertTrue(ascending)
+
+    def test_slow_without_bounds_or_mask(self):
+        """Test slow version without bounds added, when no mask is
+        calculated."""
+        result, mask, _ = slow_probabilities_to_percentiles(
+            self.x, self.probabilities, self.thresholds[1:-1], False, False, False
+        )
+        np.testing.assert_allclose(result, [[10, 12], [20, 20], [30, 28]])
+        self.assertEqual(mask.shape, (0, 0))
+
+    def test_slow_not_ascending(self):
+        """Test slow version reports probabilities that do not give a
+        monotonically increasing cumulative distribution function."""
+        probabilities = self.probabilities.copy()
+        probabilities[1, 0] = 0.9
+        _, _, ascending = slow_probabilities_to_percentiles(
+            self.x, probabilities, self.thresholds, False, True, False
+        )
+        self.assertFalse(ascending)
+
+    @patch.dict("sys.modules", numba=None)
+    @patch(
+        "improver.ensemble_copula_coupling.utilities.slow_probabilities_to_percentiles"
+    )
+    def test_slow_probabilities_to_percentiles_called(self, interp_imp):
+        """Test that slow_probabilities_to_percentiles is called if numba is
+        not installed."""
+        interpolate_probabilities_to_percentiles(
+            mock.sentinel.x, mock.sentinel.probabilities, mock.sentinel.thresholds
+        )
+        interp_imp.assert_called_once_with(
+            mock.sentinel.x, mock.sentinel.probabilities, mock.sentinel.thresholds
+        )
+
+    @skipIf(not (numba_installed), "numba not installed")
+    @patch(
+        "improver.ensemble_copula_coupling.numba_utilities."
+        "fast_probabilities_to_percentiles"
+    )
+    def test_fast_probabilities_to_percentiles_called(self, interp_imp):
+        """Test that fast_probabilities_to_percentiles is called if numba is
+        installed."""
+        interpolate_probabilities_to_percentiles(
+            mock.sentinel.x, mock.sentinel.probabilities, mock.sentinel.thresholds
+        )
+        interp_imp.assert_called_once_with(
+            mock.sentinel.x, mock.sentinel.probabilities, mock.sentinel.thresholds
+        )
+
+    @skipIf(not (numba_installed), "numba not installed")
+    def test_fast(self):
+        """Test fast version against known result."""
+        result, mask, ascending = fast_probabilities_to_percentiles(
+            self.x, self.probabilities, self.thresholds, False, True, True
+        )
+        np.testing.assert_array_equal(result, self.expected)
+        np.testing.assert_array_equal(mask, self.expected_mask)
+        self.assertEqual(result.dtype, np.float32)
+        self.assertTrue(ascending)
+
+    @skipIf(not (numba_installed), "numba not installed")
+    def test_fast_not_ascending(self):
+        """Test fast version reports probabilities that do not give a
+        monotonically increasing cumulative distribution function."""
+        probabilities = self.probabilities.copy()
+        probabilities[1, 0] = 0.9
+        _, _, ascending = fast_probabilities_to_percentiles(
+            self.x, probabilities, self.thresholds, False, True, False
+        )
+        self.assertFalse(ascending)
+
+    @skipIf(not (numba_installed), "numba not installed")
+    def test_fast_matches_interpolate_multiple_rows_same_y(self):
+        """Test that the fast version gives the same result as constructing
+        the cumulative distribution function and calling
+        interpolate_multiple_rows_same_y, for columns split into tiles and
+        probabilities that are not contiguous."""
+        probabilities = np.asfortranarray(self.random_probabilities[::-1])
+        cdf = concatenate_2d_array_with_2d_array_endpoints(
+            1 - np.around(probabilities.T, 9), 0, 1
+        )
+        expected = interpolate_multiple_rows_same_y(
+            self.x, cdf.astype(np.float64), self.random_thresholds
+        ).T
+        expected_mask = 1 - probabilities[-1] <= self.x[:, np.newaxis]
+        result, mask, ascending = fast_probabilities_to_percentiles(
+            self.x, probabilities, self.random_thresholds, True, True, True, 64
+        )
+        np.testing.assert_array_equal(result, expected)
+        np.testing.assert_array_equal(mask, expected_mask)
+        self.assertTrue(ascending)
+
+    @skipIf(not (numba_installed), "numba not installed")
+    def test_slow_vs_fast_unordered(self):
+        """Test that slow and fast versions give same result when x is not
+        sorted."""
+        x = np.array([0.9, 0.05, 0.5, 0.3])
+        args = (self.random_probabilities, self.random_thresholds, False, True, True)
+        result_slow, mask_slow, _ = slow_probabilities_to_percentiles(x, *args)
+        result_fast, mask_fast, _ = fast_probabilities_to_percentiles(x, *args)
+        np.testing.assert_allclose(result_slow, result_fast, rtol=1e-6)
+        np.testing.assert_array_equal(mask_slow, mask_fast)
+
+
 class TestInterpolateMultipleRowsSameX(unittest.TestCase):
     """Test interpolate_multiple_rows"""
 
@@ -4,7 +4,9 @@
 # See LICENSE in the root of the repository for full licensing details.
 """Unit tests for psychrometric_calculations calculate_svp_derivative_in_air"""
 
+import importlib
 import unittest
+from unittest import skipIf
 
 import numpy as np
 
@@ -13,6 +15,15 @@ from improver.psychrometric_calculations.psychrometric_calculations import (
     calculate_svp_derivative_in_air,
 )
 
+numba_installed = True
+try:
+    importlib.util.find_spec("numba")
+    from improver.psychrometric_calculations.numba_utilities import (  # noqa: F401
+        fast_svp_derivative_in_air,
+    )
+except ImportError:
+    numba_installed = False
+
 
 class Test_calculate_svp_derivative_in_air(unittest.TestCase):
     """Test the calculate_svp_derivative_in_air function"""
@@ -44,6 +55,19 @@ class Test_calculate_svp_derivative_in_air(unittest.TestCase):
         result = _svp_derivative_from_lookup(self.temperature)
         np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-5)
 
+    @skipIf(not (numba_installed), "numba not installed")
+    def test_fast_matches_lookup(self):
+        """Test the compiled kernel, used for unmasked inputs, matches the
+        array lookup, used for masked inputs."""
+        temperature = np.linspace(180.0, 340.0, 24, dtype=np.float32).reshape(2, 3, 4)
+        pressure = np.array([5.0e4, 1.0e5], dtype=np.float32).reshape(2, 1, 1)
+        result = calculate_svp_derivative_in_air(temperature, pressure)
+        expected = calculate_svp_derivative_in_air(
+            np.ma.masked_array(temperature), pressure
+        )
+        self.assertEqual(result.shape, temperature.shape)
+        np.testing.assert_allclose(result, expected, rtol=1e-5)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,15 +4,29 @@
 # See LICENSE in the root of the repository for full licensing details.
 """Unit tests for psychrometric_calculations calculate_svp_in_air"""
 
+import importlib
 import unittest
+from unittest import skipIf
 
 import numpy as np
 
 from improver.psychrometric_calculations.psychrometric_calculations import (
+    _svp_derivative_table,
     _svp_from_lookup,
+    _svp_table,
     calculate_svp_in_air,
+    preload_svp_tables,
 )
 
+numba_installed = True
+try:
+    importlib.util.find_spec("numba")
+    from improver.psychrometric_calculations.numba_utilities import (  # noqa: F401
+        fast_svp_in_air,
+    )
+except ImportError:
+    numba_installed = False
+
 
 class Test_calculate_svp_in_air(unittest.TestCase):
     """Test the calculate_svp_in_air function"""
@@ -56,6 +70,41 @@ class Test_calculate_svp_in_air(unittest.TestCase):
         result = _svp_from_lookup(self.temperature)
         np.testing.assert_allclose(result, expected, rtol=1e-5, atol=1e-5)
 
+    @skipIf(not (numba_installed), "numba not installed")
+    def test_fast_matches_lookup(self):
+        """Test the compiled kernel, used for unmasked inputs, matches the
+        array lookup, used for masked inputs, for each phase and with
+        pressure broadcast against temperature."""
+        temperature = np.linspace(180.0, 340.0, 24, dtype=np.float32).reshape(2, 3, 4)
+        pressure = np.array([5.0e4, 1.0e5], dtype=np.float32).reshape(2, 1, 1)
+        for phase in [None, "water", "ice"]:
+            result = calculate_svp_in_air(temperature, pressure, phase=phase)
+            expected = calculate_svp_in_air(
+                np.ma.masked_array(temperature), pressure, phase=phase
+            )
+            self.assertEqual(result.shape, temperature.shape)
+            self.assertEqual(result.dtype, np.float64)
+            np.testing.assert_allclose(result, expected, rtol=1e-5)
+
+
+class Test_svp_table(unittest.TestCase):
+    """Test the module-level store of SVP lookup tables"""
+
+    def test_shared_between_phase_specifications(self):
+        """Test that a single table is returned for each phase however the
+        phase is specified."""
+        self.assertIs(_svp_table(), _svp_table(None))
+        self.assertIs(_svp_table(), _svp_table(phase="mixed"))
+        self.assertIs(_svp_table("water"), _svp_table(phase="WATER"))
+        self.assertIsNot(_svp_table("water"), _svp_table("ice"))
+
+    def test_read_only(self):
+        """Test that the shared tables cannot be modified."""
+        preload_svp_tables()
+        for table in [_svp_table(), _svp_table("ice"), _svp_derivative_table()]:
+            with self.assertRaises(ValueError):
+                table[0] = 0.0
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,7 +4,9 @@
 # See LICENSE in the root of the repository for full licensing details.
 """Unit tests for psychrometric_calculations WetBulbTemperature"""
 
+import importlib
 import unittest
+from unittest import skipIf
 from unittest.mock import patch, sentinel
 
 import iris
@@ -15,6 +17,15 @@ from iris.cube import Cube, CubeList
 from improver.psychrometric_calculations.wet_bulb_temperature import WetBulbTemperature
 from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
 
+numba_installed = True
+try:
+    importlib.util.find_spec("numba")
+    from improver.psychrometric_calculations.numba_utilities import (  # noqa: F401
+        fast_wet_bulb_temperature,
+    )
+except ImportError:
+    numba_installed = False
+
 
 class HaltExecution(Exception):
     pass
@@ -254,5 +265,48 @@ class Test_process(Test_WetBulbTemperature):
             WetBulbTemperature().process(CubeList([self.temperature]))
 
 
+class Test__calculate_wet_bulb_temperature(unittest.TestCase):
+    """Test the compiled and array implementations of the Newton iterator
+    agree on multi-level data spanning the SVP table range."""
+
+    def setUp(self):
+        """Set up arrays of inputs including a non-finite value."""
+        rng = np.random.default_rng(0)
+        shape = (3, 10, 12)
+        self.temperature = rng.uniform(180.0, 340.0, shape).astype(np.float32)
+        self.relative_humidity = rng.uniform(0.05, 1.0, shape).astype(np.float32)
+        self.pressure = rng.uniform(2.0e4, 1.05e5, shape).astype(np.float32)
+        self.temperature[0, 0, 0] = np.nan
+        self.precision = 0.005
+
+    @skipIf(not (numba_installed), "numba not installed")
+    def test_fast_matches_array_iteration(self):
+        """Test the compiled kernel returns values within the precision of the
+        array iteration, which is used for masked inputs."""
+        plugin = WetBulbTemperature(precision=self.precision)
+        result = plugin._calculate_wet_bulb_temperature(
+            self.pressure, self.relative_humidity, self.temperature
+        )
+        expected = plugin._calculate_wet_bulb_temperature(
+            np.ma.masked_array(self.pressure),
+            self.relative_humidity,
+            self.temperature,
+        )
+        self.assertEqual(result.dtype, np.float32)
+        self.assertEqual(result.shape, self.temperature.shape)
+        np.testing.assert_allclose(result, expected, atol=self.precision, rtol=0)
+
+    @patch.dict("sys.modules", numba=None)
+    def test_without_numba(self):
+        """Test the array iteration is used if numba is not installed."""
+        plugin = WetBulbTemperature(precision=self.precision)
+        with self.assertWarnsRegex(UserWarning, "Module numba unavailable"):
+            result = plugin._calculate_wet_bulb_temperature(
+                self.pressure, self.relative_humidity, self.temperature
+            )
+        self.assertEqual(result.shape, self.temperature.shape)
+        self.assertTrue(np.isnan(result[0, 0, 0]))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,254 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Unit tests for the improver.chunking module"""
+
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from iris.cube import CubeList
+
+from improver import BasePlugin, chunking
+from improver.cube_combiner import Combine
+from improver.psychrometric_calculations.psychrometric_calculations import (
+    HumidityMixingRatio,
+)
+from improver.psychrometric_calculations.wet_bulb_temperature import (
+    WetBulbTemperature,
+)
+from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
+from improver.temperature.feels_like_temperature import (
+    calculate_feels_like_temperature,
+)
+from improver.threshold import Threshold
+
+SHAPE = (4, 9, 7)
+
+
+class ShapePlugin(BasePlugin):
+    """Plugin recording the shapes of the cubes it processes."""
+
+    def __init__(self):
+        self.shapes = []
+
+    def __deepcopy__(self, memo):
+        # Share the record of shapes with the copies processing each block.
+        return self
+
+    def chunkable_coords(self):
+        return ("x", "y", "realization")
+
+    def process(self, cube):
+        """Record the shape of the cube and return a copy of it."""
+        self.shapes.append(cube.shape)
+        return cube.copy()
+
+
+class NestedPlugin(ShapePlugin):
+    """Plugin calling another chunkable plugin."""
+
+    def process(self, cube):
+        """Record the shape of the cube and the cubes processed by an inner
+        plugin."""
+        inner = ShapePlugin()
+        result = inner(cube)
+        self.shapes.append((cube.shape, inner.shapes))
+        return result
+
+
+def _cube(name, units, low, high, seed):
+    """Set up a cube of random values."""
+    data = np.random.default_rng(seed).uniform(low, high, SHAPE)
+    return set_up_variable_cube(data.astype(np.float32), name=name, units=units)
+
+
+@pytest.fixture(name="inputs")
+def inputs_fixture():
+    """Set up temperature, relative humidity, pressure and wind speed cubes."""
+    return {
+        "temperature": _cube("air_temperature", "K", 260, 300, 0),
+        "humidity": _cube("relative_humidity", "1", 0.1, 1, 1),
+        "pressure": _cube("surface_air_pressure", "Pa", 90000, 103000, 2),
+        "wind_speed": _cube("wind_speed", "m s-1", 0, 20, 3),
+    }
+
+
+@pytest.fixture(autouse=True)
+def disable_chunking():
+    """Ensure chunked execution is disabled after each test."""
+    chunking.chunked_execution_disable()
+    yield
+    chunking.chunked_execution_disable()
+
+
+def _threshold(inputs):
+    return Threshold([270.0, 280.0, 290.0], fuzzy_factor=0.9)(inputs["temperature"])
+
+
+def _threshold_masked_collapse(inputs):
+    cube = inputs["temperature"].copy()
+    cube.data = np.ma.masked_greater(cube.data, 295)
+    return Threshold([270.0, 280.0], collapse_coord="realization")(cube)
+
+
+def _combine(inputs):
+    other = inputs["temperature"].copy(inputs["temperature"].data + 1)
+    return Combine("mean")(CubeList([inputs["temperature"], other]))
+
+
+def _wet_bulb_temperature(inputs):
+    pressure = inputs["pressure"].copy()
+    pressure.rename("air_pressure")
+    return WetBulbTemperature()(
+        CubeList([inputs["temperature"], inputs["humidity"], pressure])
+    )
+
+
+def _humidity_mixing_ratio(inputs):
+    return HumidityMixingRatio()(
+        CubeList([inputs["temperature"], inputs["humidity"], inputs["pressure"]])
+    )
+
+
+def _feels_like_temperature(inputs):
+    return calculate_feels_like_temperature(
+        inputs["temperature"],
+        inputs["wind_speed"],
+        inputs["humidity"],
+        inputs["pressure"],
+    )
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@pytest.mark.parametrize(
+    "coord, chunk_size, max_workers",
+    (("y", 4, 1), ("y", 2, 3), ("x", 3, 2), ("realization", 2, 2)),
+)
+@pytest.mark.parametrize(
+    "function",
+    (
+        _threshold,
+        _threshold_masked_collapse,
+        _combine,
+        _wet_bulb_temperature,
+        _humidity_mixing_ratio,
+        _feels_like_temperature,
+    ),
+)
+def test_matches_unchunked(inputs, function, coord, chunk_size, max_workers):
+    """Test that chunked execution gives the same output as processing the
+    whole inputs, including the mask, data type and metadata."""
+    expected = function(inputs)
+    chunking.chunked_execution_enable(chunk_size, coord, max_workers)
+    result = function(inputs)
+    assert result == expected
+    assert result.dtype == expected.dtype
+    np.testing.assert_array_equal(
+        np.ma.getmaskarray(result.data), np.ma.getmaskarray(expected.data)
+    )
+
+
+@pytest.mark.parametrize(
+    "coord, chunk_size, expected",
+    (
+        ("y", 4, [(4, 4, 7), (4, 5, 7)]),
+        ("y", 3, [(4, 3, 7), (4, 3, 7), (4, 3, 7)]),
+        ("y", 2, [(4, 2, 7)] * 3 + [(4, 3, 7)]),
+        ("realization", 3, [(4, 9, 7)]),
+        ("x", 2, [(4, 9, 2), (4, 9, 2), (4, 9, 3)]),
+    ),
+)
+def test_blocks(inputs, coord, chunk_size, expected):
+    """Test the blocks processed, with a final point added to the previous
+    block rather than left in a block alone, and that the whole inputs are processed if they are not longer than one block."""
+    chunking.chunked_execution_enable(chunk_size, coord)
+    plugin = ShapePlugin()
+    result = plugin(inputs["temperature"])
+    assert plugin.shapes == expected
+    assert result == inputs["temperature"]
+
+
+def test_disabled(inputs):
+    """Test that plugins are applied to the whole inputs by default."""
+    assert not chunking.chunked_execution_enabled()
+    plugin = ShapePlugin()
+    plugin(inputs["temperature"])
+    assert plugin.shapes == [SHAPE]
+
+
+def test_not_chunkable(inputs):
+    """Test that plugins are applied to the whole inputs if they do not
+    support chunking along the chunking coordinate."""
+    chunking.chunked_execution_enable(2, "realization")
+    with patch.object(Threshold, "process", autospec=True) as mock_process:
+        Threshold([280.0], vicinity=[2000.0])(inputs["temperature"])
+    assert mock_process.call_args[0][1].shape == SHAPE
+
+
+def test_unequal_lengths(inputs):
+    """Test that plugins are applied to the whole inputs if the inputs differ
+    in length along the chunking coordinate."""
+    chunking.chunked_execution_enable(2, "realization")
+    with patch.object(HumidityMixingRatio, "process", autospec=True) as mock_process:
+        HumidityMixingRatio()(CubeList([inputs["temperature"], inputs["humidity"][:3]]))
+    assert mock_process.call_count == 1
+
+
+def test_not_nested(inputs):
+    """Test that plugins called within a block are applied to the whole
+    block rather than chunked again."""
+    chunking.chunked_execution_enable(3, "y")
+    plugin = NestedPlugin()
+    plugin(inputs["temperature"])
+    assert plugin.shapes == [((4, 3, 7), [(4, 3, 7)])] * 3
+    assert chunking.chunked_execution_enabled()
+
+
+@pytest.mark.parametrize(
+    "chunk_size, max_workers, message",
+    (
+        (0, 1, "chunk_size must be at least 2, not 0"),
+        (1, 1, "chunk_size must be at least 2, not 1"),
+        (2, 0, "max_workers must be a positive integer, not 0"),
+    ),
+)
+def test_invalid_settings(chunk_size, max_workers, message):
+    """Test that an error is raised for chunk sizes of less than two, which
+    could give blocks of one point, or numbers of workers that are not
+    positive."""
+    with pytest.raises(ValueError, match=message):
+        chunking.chunked_execution_enable(chunk_size, max_workers=max_workers)
+
+
+def test_enable_from_environment():
+    """Test that chunked execution is enabled by the environment variables."""
+    chunking._enable_from_environment({})
+    assert not chunking.chunked_execution_enabled()
+    chunking._enable_from_environment(
+        {
+            chunking.CHUNK_SIZE_ENV_VAR: "64",
+            chunking.CHUNK_COORD_ENV_VAR: "realization",
+            chunking.CHUNK_WORKERS_ENV_VAR: "4",
+        }
+    )
+    assert chunking._settings == chunking._ChunkSettings(64, "realization", 4)
+
+
+@pytest.mark.parametrize(
+    "environ, message",
+    (
+        ({chunking.CHUNK_SIZE_ENV_VAR: "1"}, "IMPROVER_CHUNK_SIZE must be at least 2"),
+        (
+            {chunking.CHUNK_SIZE_ENV_VAR: "2", chunking.CHUNK_WORKERS_ENV_VAR: "0"},
+            "IMPROVER_CHUNK_WORKERS must be a positive integer",
+        ),
+    ),
+)
+def test_invalid_environment(environ, message):
+    """Test that an error naming the environment variable is raised for
+    invalid settings."""
+    with pytest.raises(ValueError, match=message):
+        chunking._enable_from_environment(environ)
+    assert not chunking.chunked_execution_enabled()
@@ -0,0 +1,151 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Unit tests for the improver.instrumentation module"""
+
+import json
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from improver import BasePlugin, instrumentation
+from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
+
+
+class InnerPlugin(BasePlugin):
+    """Plugin that doubles the data in a cube."""
+
+    def process(self, cube):
+        """Double the data in a cube."""
+        result = cube.copy()
+        result.data = result.data * 2
+        return result
+
+
+class OuterPlugin(BasePlugin):
+    """Plugin that calls another plugin."""
+
+    def process(self, cube, factor=None):
+        """Call InnerPlugin, failing if the factor is negative."""
+        if factor is not None and factor < 0:
+            raise ValueError("Negative factor")
+        return InnerPlugin()(cube)
+
+
+class AllocatingPlugin(BasePlugin):
+    """Plugin that returns a new array."""
+
+    def process(self, nbytes):
+        """Return an array of ones of the given number of bytes."""
+        return np.ones(nbytes, dtype=np.uint8)
+
+
+@pytest.fixture(name="cube")
+def cube_fixture():
+    """Set up a temperature cube."""
+    return set_up_variable_cube(np.ones((3, 4), dtype=np.float32))
+
+
+@pytest.fixture(autouse=True)
+def disable_tracing():
+    """Ensure tracing is disabled after each test."""
+    yield
+    instrumentation.plugin_trace_disable()
+
+
+def _read_json_lines(path):
+    """Read the records from a JSON lines file."""
+    with open(path) as trace_file:
+        return [json.loads(line) for line in trace_file]
+
+
+def test_disabled(cube):
+    """Test that plugin calls are not traced unless tracing is enabled."""
+    assert not instrumentation.plugin_trace_enabled()
+    with patch("improver.instrumentation.traced_call") as mock_traced_call:
+        OuterPlugin()(cube)
+    mock_traced_call.assert_not_called()
+
+
+def test_json_lines(cube, tmp_path):
+    """Test that nested plugin calls are recorded as JSON lines, with the
+    shapes and data types of the inputs and outputs."""
+    path = tmp_path / "trace.jsonl"
+    instrumentation.plugin_trace_enable(str(path))
+    result = OuterPlugin()(cube, factor=1)
+    np.testing.assert_array_equal(result.data, 2)
+
+    inner, outer = _read_json_lines(path)
+    assert outer["plugin"] == "OuterPlugin"
+    assert outer["parent"] is None
+    assert outer["depth"] == 0
+    assert inner["plugin"] == "InnerPlugin"
+    assert inner["parent"] == outer["id"]
+    assert inner["depth"] == 1
+    expected_cube = {"shape": [3, 4], "dtype": "float32", "name": "air_temperature"}
+    assert outer["inputs"] == [expected_cube, None]
+    assert outer["outputs"] == expected_cube
+    for record in (inner, outer):
+        assert record["wall_time"] >= 0
+        assert record["cpu_time"] >= 0
+        assert record["max_rss_increase_kb"] >= 0
+        assert isinstance(record["rss_change_kb"], int)
+        assert "error" not in record
+
+
+def test_rss_change(tmp_path):
+    """Test that the change in resident memory is recorded for a call that
+    returns a large array, even where the high-water mark is not exceeded."""
+    path = tmp_path / "trace.jsonl"
+    instrumentation.plugin_trace_enable(str(path))
+    nbytes = 64 * 2**20
+    # Raise the high-water mark above the memory used by the call.
+    np.ones(2 * nbytes, dtype=np.uint8)
+    result = AllocatingPlugin()(nbytes)
+    (record,) = _read_json_lines(path)
+    assert record["max_rss_increase_kb"] == 0
+    assert record["rss_change_kb"] >= 0.9 * nbytes / 1024
+    del result
+
+
+def test_error_recorded(cube, tmp_path):
+    """Test that a plugin call that raises an exception is recorded, and the
+    exception raised."""
+    path = tmp_path / "trace.jsonl"
+    instrumentation.plugin_trace_enable(str(path))
+    with pytest.raises(ValueError, match="Negative factor"):
+        OuterPlugin()(cube, factor=-1)
+    (record,) = _read_json_lines(path)
+    assert record["error"] == "ValueError"
+    assert record["outputs"] is None
+
+
+def test_chrome_trace(cube, tmp_path):
+    """Test that a Chrome trace is written when tracing is disabled."""
+    path = tmp_path / "trace.json"
+    instrumentation.plugin_trace_enable(str(path))
+    OuterPlugin()(cube)
+    assert not path.exists()
+    instrumentation.plugin_trace_disable()
+
+    with open(path) as trace_file:
+        events = json.load(trace_file)["traceEvents"]
+    assert [event["name"] for event in events] == ["InnerPlugin", "OuterPlugin"]
+    for event in events:
+        assert event["ph"] == "X"
+        assert event["dur"] >= 0
+    # The inner call is contained within the outer call.
+    inner, outer = events
+    assert outer["ts"] <= inner["ts"]
+    assert inner["args"]["parent"] == outer["args"]["id"]
+
+
+def test_enable_from_environment(tmp_path):
+    """Test that tracing is enabled by the environment variable."""
+    instrumentation._enable_from_environment({})
+    assert not instrumentation.plugin_trace_enabled()
+    path = str(tmp_path / "trace.jsonl")
+    instrumentation._enable_from_environment({instrumentation.TRACE_ENV_VAR: path})
+    assert instrumentation.plugin_trace_enabled()
@@ -0,0 +1,195 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Unit tests for the improver.pipeline module."""
+
+import threading
+
+import numpy as np
+import pytest
+from iris.cube import Cube, CubeList
+
+from improver.pipeline import _command_line, _copy_result, run_pipeline
+from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
+from improver.utilities.load import load_cube
+from improver.utilities.save import save_netcdf
+
+
+@pytest.fixture(name="input_path")
+def input_path_fixture(tmp_path):
+    """Save a temperature cube to a file in a temporary directory."""
+    cube = set_up_variable_cube(np.full((3, 3), 281, dtype=np.float32))
+    path = tmp_path / "input.nc"
+    save_netcdf(cube, str(path))
+    return str(path)
+
+
+def test_run_pipeline(input_path, tmp_path):
+    """Test a pipeline in which results are shared between several nodes,
+    including a node that uses the same result twice."""
+    pipeline = {
+        "nodes": {
+            "double": {"command": "combine", "args": [input_path, input_path]},
+            "sum": {
+                "command": "combine",
+                "args": ["@double", input_path],
+                "output": str(tmp_path / "sum.nc"),
+            },
+            "max": {
+                "command": "combine",
+                "args": ["@double", "@double"],
+                "options": {"operation": "max", "expand-bound": False},
+                "output": str(tmp_path / "max.nc"),
+            },
+            "probabilities": {
+                "command": "threshold",
+                "args": ["@double"],
+                "options": {"threshold-values": 500},
+                "output": str(tmp_path / "probabilities.nc"),
+            },
+        }
+    }
+    run_pipeline(pipeline, workers=2)
+
+    np.testing.assert_array_equal(load_cube(str(tmp_path / "probabilities.nc")).data, 1)
+    np.testing.assert_array_equal(load_cube(str(tmp_path / "sum.nc")).data, 843)
+    np.testing.assert_array_equal(load_cube(str(tmp_path / "max.nc")).data, 562)
+
+
+def test_run_pipeline_output_used_by_other_nodes(input_path, tmp_path):
+    """Test that the result of a node written to disk is also passed to the
+    nodes that use it."""
+    pipeline = {
+        "nodes": {
+            "double": {
+                "command": "combine",
+                "args": [input_path, input_path],
+                "output": str(tmp_path / "double.nc"),
+            },
+            "triple": {
+                "command": "combine",
+                "args": ["@double", input_path],
+                "output": str(tmp_path / "triple.nc"),
+            },
+        }
+    }
+    run_pipeline(pipeline)
+    np.testing.assert_array_equal(load_cube(str(tmp_path / "double.nc")).data, 562)
+    np.testing.assert_array_equal(load_cube(str(tmp_path / "triple.nc")).data, 843)
+
+
+def test_run_pipeline_serialises_file_io(input_path, tmp_path, monkeypatch):
+    """Test that nodes run concurrently do not load or save files at the
+    same time."""
+    import improver.utilities.load as load_module
+
+    active = []
+    overlapping = []
+
+    class RecordingLock:
+        def __init__(self):
+            self.lock = threading.RLock()
+
+        def __enter__(self):
+            self.lock.acquire()
+            overlapping.append(bool(active))
+            active.append(True)
+
+        def __exit__(self, *args):
+            active.pop()
+            self.lock.release()
+
+    lock = RecordingLock()
+    monkeypatch.setattr(load_module, "FILE_IO_LOCK", lock)
+    monkeypatch.setattr("improver.utilities.save.FILE_IO_LOCK", lock)
+    pipeline = {
+        "nodes": {
+            f"node{index}": {
+                "command": "combine",
+                "args": [input_path, input_path],
+                "output": str(tmp_path / f"output{index}.nc"),
+            }
+            for index in range(4)
+        }
+    }
+    run_pipeline(pipeline, workers=4)
+    # Two loads and one save for each node.
+    assert len(overlapping) == 12
+    assert not any(overlapping)
+
+
+@pytest.mark.parametrize(
+    "nodes,message",
+    [
+        ({"a": {"args": ["input.nc"]}}, "Node a does not specify a command"),
+        (
+            {"a": {"command": "combine", "args": ["@b"]}},
+            "Node a references unknown nodes: b",
+        ),
+        (
+            {
+                "a": {"command": "combine", "args": ["@b"]},
+                "b": {"command": "combine", "args": ["@a"]},
+                "c": {"command": "combine", "args": ["input.nc"]},
+            },
+            "cycle between nodes: a, b",
+        ),
+        (
+            {
+                "a": {"command": "combine", "args": ["input.nc"]},
+                "b": {"command": "combine", "args": ["@a"], "output": "b.nc"},
+                "c": {"command": "combine", "args": ["@a"]},
+            },
+            "Node c has no output and its result is not used by any other node",
+        ),
+    ],
+)
+def test_run_pipeline_invalid(nodes, message):
+    """Test that invalid pipelines are rejected before any node is run."""
+    with pytest.raises(ValueError, match=message):
+        run_pipeline({"nodes": nodes})
+
+
+def test_command_line():
+    """Test that references are replaced by results in order, and that flags
+    and numeric values are converted."""
+    node = {
+        "command": "combine",
+        "args": ["@a", "input.nc", "@b"],
+        "options": {
+            "operation": "max",
+            "broadcast": "@c",
+            "minimum-realizations": 3,
+            "use-latest-frt": True,
+            "expand-bound": False,
+        },
+    }
+    result = _command_line(node, ["A", "B", "C"])
+    assert result == [
+        "combine",
+        "A",
+        "input.nc",
+        "B",
+        "--operation",
+        "max",
+        "--broadcast",
+        "C",
+        "--minimum-realizations",
+        "3",
+        "--use-latest-frt",
+    ]
+
+
+def test_copy_result():
+    """Test that shared cubes and cubelists are copied."""
+    cube = set_up_variable_cube(np.ones((3, 3), dtype=np.float32))
+    result = _copy_result(cube)
+    assert isinstance(result, Cube)
+    assert result == cube
+    assert result is not cube
+    assert not np.shares_memory(result.data, cube.data)
+
+    result = _copy_result(CubeList([cube]))
+    assert isinstance(result, CubeList)
+    assert result[0] is not cube
@@ -0,0 +1,159 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Unit tests for the improver.server module."""
+
+import os
+import stat
+import subprocess  # nosec
+import sys
+import time
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from improver.instrumentation import TRACE_ENV_VAR, plugin_trace_enabled
+from improver.server import SOCKET_ENV_VAR, run_command, run_on_server, submit
+from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
+from improver.utilities.load import load_cube
+from improver.utilities.save import save_netcdf
+
+
+@pytest.fixture(name="input_path")
+def input_path_fixture(tmp_path):
+    """Save a temperature cube to a file in a temporary directory."""
+    cube = set_up_variable_cube(np.full((3, 3), 281, dtype=np.float32))
+    path = tmp_path / "input.nc"
+    save_netcdf(cube, str(path))
+    return path
+
+
+@pytest.fixture(name="server_socket")
+def server_socket_fixture(tmp_path):
+    """Run a server in a separate process, yielding the path of its socket."""
+    socket_path = str(tmp_path / "improver.sock")
+    script = f"from improver.server import serve; serve({socket_path!r}, workers=2)"
+    server = subprocess.Popen([sys.executable, "-c", script])  # noqa: S603
+    for _ in range(300):
+        if os.path.exists(socket_path):
+            break
+        time.sleep(0.1)
+    yield socket_path
+    server.terminate()
+    server.wait(timeout=30)
+    assert not os.path.exists(socket_path)
+
+
+def test_run_command(input_path):
+    """Test that a command is run in the given working directory, which is
+    then restored, returning the exit status of the command."""
+    cwd = os.getcwd()
+    result = run_command(
+        ["threshold", "input.nc", "--threshold-values", "280", "--output", "out.nc"],
+        str(input_path.parent),
+    )
+    assert result["returncode"] == 0
+    assert os.getcwd() == cwd
+    output = load_cube(str(input_path.parent / "out.nc"))
+    np.testing.assert_array_equal(output.data, 1)
+
+
+def test_run_command_errors(tmp_path):
+    """Test that the exit status and error output of failing commands are
+    captured."""
+    result = run_command(["thresold"], str(tmp_path))
+    assert result["returncode"] == 2
+    assert 'Did you mean "threshold"' in result["stderr"]
+
+    result = run_command(["threshold", "missing.nc"], str(tmp_path))
+    assert result["returncode"] == 1
+    assert "did not exist" in result["stderr"]
+
+
+def test_run_command_environment(input_path, monkeypatch):
+    """Test that a command is run with the forwarded environment variables
+    given, and that the environment and the settings read from it are
+    restored afterwards."""
+    monkeypatch.delenv(TRACE_ENV_VAR, raising=False)
+    trace_path = input_path.parent / "trace.jsonl"
+    result = run_command(
+        ["threshold", "input.nc", "--threshold-values", "280", "--output", "out.nc"],
+        str(input_path.parent),
+        env={TRACE_ENV_VAR: str(trace_path)},
+    )
+    assert result["returncode"] == 0, result["stderr"]
+    assert "Threshold" in trace_path.read_text()
+    assert TRACE_ENV_VAR not in os.environ
+    assert not plugin_trace_enabled()
+
+
+def test_submit(input_path, server_socket):
+    """Test that commands submitted to a server are run in the working
+    directory of the client."""
+    for output in ["out_1.nc", "out_2.nc"]:
+        result = submit(
+            server_socket,
+            ["threshold", "input.nc", "--threshold-values", "280", "--output", output],
+            cwd=str(input_path.parent),
+        )
+        assert result["returncode"] == 0, result["stderr"]
+        assert (input_path.parent / output).exists()
+
+    result = submit(server_socket, ["thresold"], cwd=str(input_path.parent))
+    assert result["returncode"] == 2
+
+
+def test_submit_environment(input_path, server_socket):
+    """Test that the forwarded environment variables of the client apply to
+    the command run by the server, and only to that command."""
+    trace_path = input_path.parent / "trace.jsonl"
+    args = ["threshold", "input.nc", "--threshold-values", "280", "--output"]
+    env = {TRACE_ENV_VAR: str(trace_path), "PATH": os.environ["PATH"]}
+    result = submit(server_socket, [*args, "out_1.nc"], str(input_path.parent), env)
+    assert result["returncode"] == 0, result["stderr"]
+    trace = trace_path.read_text()
+    assert "Threshold" in trace
+
+    result = submit(server_socket, [*args, "out_2.nc"], str(input_path.parent), {})
+    assert result["returncode"] == 0, result["stderr"]
+    assert trace_path.read_text() == trace
+
+
+def test_socket_permissions(server_socket):
+    """Test that the socket is only accessible to the user running the
+    server."""
+    assert stat.S_IMODE(os.stat(server_socket).st_mode) & 0o077 == 0
+
+
+def test_run_on_server_unavailable(monkeypatch, tmp_path):
+    """Test that commands are not sent to a server if the environment variable
+    is not set or no server is listening on the socket."""
+    monkeypatch.delenv(SOCKET_ENV_VAR, raising=False)
+    assert run_on_server(["threshold"]) is None
+    monkeypatch.setenv(SOCKET_ENV_VAR, str(tmp_path / "missing.sock"))
+    assert run_on_server(["threshold"]) is None
+
+
+@pytest.mark.parametrize(
+    "argv,sent",
+    [
+        (["serve", "improver.sock"], False),
+        (["--verbose", "serve", "improver.sock"], False),
+        (["--profile", "serve.prof", "serve", "improver.sock"], False),
+        (["--plugin-trace=trace.json", "serve", "improver.sock"], False),
+        (["--verbose", "threshold", "input.nc"], True),
+        (["--profile", "serve", "threshold", "input.nc"], True),
+    ],
+)
+def test_run_on_server_serve(monkeypatch, argv, sent):
+    """Test that the serve command is not sent to a server, including when
+    it follows global options, while other commands are sent."""
+    monkeypatch.setenv(SOCKET_ENV_VAR, "improver.sock")
+    result = {"returncode": 0, "stdout": "", "stderr": ""}
+    mock_submit = Mock(return_value=result)
+    monkeypatch.setattr("improver.server.submit", mock_submit)
+    returncode = run_on_server(argv)
+    assert mock_submit.called is sent
+    assert returncode == (0 if sent else None)
@@ -5,9 +5,13 @@
 """Unit tests for loading functionality."""
 
 import os
+import shutil
 import unittest
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from glob import glob
 from tempfile import mkdtemp
+from unittest.mock import patch
 
 import iris
 import numpy as np
@@ -20,7 +24,19 @@ from improver.synthetic_data.set_up_test_cubes import (
     set_up_probability_cube,
     set_up_variable_cube,
 )
-from improver.utilities.load import load_baseline_cube, load_cube, load_cubelist
+from improver.utilities.load import (
+    LOAD_CACHE_CHECKSUM_ENV_VAR,
+    LOAD_CACHE_ENV_VAR,
+    LOAD_THREADS_ENV_VAR,
+    LoadCacheInfo,
+    _enable_load_cache_from_environment,
+    load_baseline_cube,
+    load_cache_disable,
+    load_cache_enable,
+    load_cache_info,
+    load_cube,
+    load_cubelist,
+)
 from improver.utilities.save import save_netcdf
 
 
@@ -467,5 +483,249 @@ def test_load_baseline_cube_with_nans(reference_cube):
     assert np.isnan(baseline_cube.data).all()
 
 
+@pytest.fixture
+def cycle_filepaths(tmp_path):
+    """Save air temperature forecasts from 12 cycles to separate files, with
+    a relative humidity forecast in the same file as the first."""
+    filepaths = []
+    time = datetime(2017, 11, 10, 12)
+    for hours in range(12):
+        cube = set_up_variable_cube(
+            np.full((3, 3, 3), hours, dtype=np.float32),
+            time=time,
+            frt=time - timedelta(hours=hours + 1),
+        )
+        filepath = str(tmp_path / f"temperature_{hours:02d}.nc")
+        if hours:
+            save_netcdf(cube, filepath)
+        else:
+            humidity = set_up_variable_cube(
+                np.full((3, 3, 3), 0.5, dtype=np.float32),
+                name="relative_humidity",
+                units="1",
+            )
+            save_netcdf(iris.cube.CubeList([cube, humidity]), filepath)
+        filepaths.append(filepath)
+    return filepaths
+
+
+@pytest.mark.parametrize("max_workers", [None, 1, 4])
+def test_load_cubelist_concurrent_order(cycle_filepaths, max_workers):
+    """Test that cubes are returned in the order of the filepaths when files
+    are read ahead concurrently, without partial merging, with lazy data and
+    with standardised metadata."""
+    from iris.fileformats.netcdf import loader
+
+    with patch.object(loader, "_LAZYVAR_MIN_BYTES", 0):
+        result = load_cubelist(cycle_filepaths, max_workers=max_workers)
+    assert len(result) == 13
+    temperatures = result.extract("air_temperature")
+    assert len(temperatures) == 12
+    assert all(cube.has_lazy_data() for cube in result)
+    assert all(cube.var_name is None for cube in result)
+    for hours, cube in enumerate(temperatures):
+        assert cube.dim_coords[0].name() == "realization"
+        assert cube.coord("forecast_period").points[0] == (hours + 1) * 3600
+        assert cube.data[0, 0, 0] == hours
+
+
+def test_load_cubelist_concurrent_constraint(cycle_filepaths):
+    """Test that constraints are applied to each file when files are read
+    ahead concurrently, and that errors are raised if no cubes match or a
+    file does not exist."""
+    with patch("improver.utilities.load.iris.load", wraps=iris.load) as mock_load:
+        result = load_cubelist(
+            cycle_filepaths, constraints="relative_humidity", no_lazy_load=True
+        )
+    assert mock_load.call_count == 12
+    assert len(result) == 1
+    assert result[0].name() == "relative_humidity"
+    assert not result[0].has_lazy_data()
+
+    with pytest.raises(ValueError, match="No cubes found"):
+        load_cubelist(cycle_filepaths, constraints="wind_speed")
+    with pytest.raises(OSError, match="missing.nc"):
+        load_cubelist([*cycle_filepaths, "missing.nc"])
+
+
+@pytest.mark.parametrize(
+    "environment, max_workers, expected",
+    [
+        ({}, None, None),
+        ({LOAD_THREADS_ENV_VAR: "3"}, None, 3),
+        ({}, 2, 2),
+        ({LOAD_THREADS_ENV_VAR: "3"}, 1, None),
+    ],
+)
+def test_load_cubelist_max_workers(
+    cycle_filepaths, monkeypatch, environment, max_workers, expected
+):
+    """Test the number of threads used to read files ahead of loading, which
+    is set by the environment variable or argument, and that no threads are
+    used by default or if only one file is loaded."""
+    monkeypatch.delenv(LOAD_THREADS_ENV_VAR, raising=False)
+    for key, value in environment.items():
+        monkeypatch.setenv(key, value)
+    with patch(
+        "improver.utilities.load.ThreadPoolExecutor",
+        wraps=ThreadPoolExecutor,
+    ) as mock_executor:
+        load_cubelist(cycle_filepaths, max_workers=max_workers)
+        load_cubelist(cycle_filepaths[0], max_workers=max_workers)
+    if expected is None:
+        mock_executor.assert_not_called()
+    else:
+        mock_executor.assert_called_once_with(max_workers=expected)
+
+
+def test_load_cubelist_expands_filepaths_once(load_cache, cycle_filepaths):
+    """Test that each filepath is expanded once, with the matched paths shared
+    by the cache, the reading ahead of files and the loading of cubes."""
+    filepaths = [*cycle_filepaths[:6], cycle_filepaths[6].replace("06", "0[6-9]")]
+    with patch("improver.utilities.load.glob", wraps=glob) as mock_glob:
+        result = load_cubelist(filepaths, max_workers=4)
+    assert mock_glob.call_count == len(filepaths)
+    assert len(result) == 8
+    assert result[-1].coord("forecast_reference_time").shape == (4,)
+
+
+def test_load_zarr_stores(cycle_filepaths, tmp_path):
+    """Test that Zarr stores, identified by extension or by their metadata,
+    are loaded lazily alongside netCDF files, matching the cubes loaded from
+    the netCDF files, and that only the chunks needed are read."""
+    from iris.fileformats.netcdf import loader
+
+    zarr_paths = [str(tmp_path / "cycle.zarr"), str(tmp_path / "cycle_store")]
+    for filepath, zarr_path in zip(cycle_filepaths[:2], zarr_paths):
+        save_netcdf(load_cubelist(filepath, no_lazy_load=True), zarr_path, zarr=True)
+
+    with patch.object(loader, "_LAZYVAR_MIN_BYTES", 0):
+        result = load_cubelist(
+            [zarr_paths[0], str(tmp_path / "cycle_*"), *cycle_filepaths[2:]]
+        )
+    expected = load_cubelist(cycle_filepaths)
+    assert len(result) == len(expected)
+    assert all(cube.has_lazy_data() for cube in result)
+    for cube, expected_cube in zip(result, expected):
+        assert cube == expected_cube
+    assert load_cube(zarr_paths[1], "air_temperature")[1].data[0, 0] == 1
+
+
+def _save_ancillary(filepath, value=1):
+    """Save a land-sea mask, which has no time coordinates, to a file."""
+    cube = set_up_variable_cube(
+        np.full((10, 10), value, dtype=np.int8), name="land_binary_mask", units="1"
+    )
+    for coord in ["time", "forecast_reference_time", "forecast_period"]:
+        cube.remove_coord(coord)
+    save_netcdf(cube, filepath)
+    return filepath
+
+
+@pytest.fixture
+def load_cache():
+    """Enable the load cache with space for two land-sea masks."""
+    load_cache_enable(800)
+    yield
+    load_cache_disable()
+
+
+def test_load_cache_hit(load_cache, tmp_path):
+    """Test a static cube is loaded from the cache the second time, as a copy
+    that shares read-only data with the cached cube and whose metadata can
+    be changed without affecting the cache."""
+    filepath = _save_ancillary(str(tmp_path / "mask.nc"))
+    first = load_cube(filepath)
+    first.rename("modified")
+    with patch("improver.utilities.load.iris.load_raw") as mock_load:
+        with patch("improver.utilities.load.iris.load") as mock_load_files:
+            second = load_cube(filepath)
+    mock_load.assert_not_called()
+    mock_load_files.assert_not_called()
+    assert second.name() == "land_binary_mask"
+    assert not second.has_lazy_data()
+    assert np.shares_memory(first.data, second.data)
+    with pytest.raises(ValueError, match="read-only"):
+        second.data[0, 0] = 0
+    second.data = second.data + 1
+    assert load_cube(filepath).data[0, 0] == 1
+    assert load_cache_info() == LoadCacheInfo(2, 1, 0, 1, 340, 800)
+
+
+def test_load_cache_invalidation(load_cache, tmp_path):
+    """Test a file is loaded again if it has been modified, or if a different
+    name constraint is applied, and that other constraints bypass the cache."""
+    filepath = _save_ancillary(str(tmp_path / "mask.nc"))
+    assert load_cube(filepath).data[0, 0] == 1
+    status = os.stat(filepath)
+    _save_ancillary(filepath, value=0)
+    os.utime(filepath, ns=(status.st_atime_ns, status.st_mtime_ns + 10**9))
+    assert load_cube(filepath).data[0, 0] == 0
+    assert load_cube(filepath, "land_binary_mask").data[0, 0] == 0
+    assert load_cube(filepath, iris.Constraint("land_binary_mask")).data.flags.writeable
+    assert load_cache_info()[:4] == (0, 3, 1, 2)
+
+
+def test_load_cache_forecasts_not_cached(load_cache, cycle_filepaths):
+    """Test files containing cubes with a time coordinate are not cached, and
+    are not counted as misses."""
+    load_cubelist(cycle_filepaths[1])
+    result = load_cubelist(cycle_filepaths[1])
+    assert result[0].data.flags.writeable
+    assert load_cache_info()[:4] == (0, 0, 0, 0)
+
+
+def test_load_cache_eviction(load_cache, tmp_path):
+    """Test the least recently used entry is evicted when the cache is full."""
+    filepaths = [_save_ancillary(str(tmp_path / f"mask_{i}.nc")) for i in range(3)]
+    load_cube(filepaths[0])
+    load_cube(filepaths[1])
+    load_cube(filepaths[0])
+    load_cube(filepaths[2])
+    load_cube(filepaths[0])
+    load_cube(filepaths[1])
+    assert load_cache_info()[:4] == (2, 4, 2, 2)
+
+
+def test_load_cache_checksum(tmp_path):
+    """Test that with checksums, copies of a file share a cache entry."""
+    load_cache_enable(2**20, checksum=True)
+    try:
+        filepath = _save_ancillary(str(tmp_path / "mask.nc"))
+        shutil.copy(filepath, tmp_path / "copy.nc")
+        first = load_cube(filepath)
+        second = load_cube(str(tmp_path / "copy.nc"))
+        third = load_cube(str(tmp_path / "copy.nc"))
+        assert np.shares_memory(first.data, second.data)
+        assert np.shares_memory(first.data, third.data)
+        assert load_cache_info()[:4] == (1, 2, 0, 1)
+    finally:
+        load_cache_disable()
+
+
+@pytest.mark.parametrize(
+    "environ, expected",
+    (
+        ({}, None),
+        ({LOAD_CACHE_ENV_VAR: "0"}, None),
+        ({LOAD_CACHE_ENV_VAR: "2"}, False),
+        ({LOAD_CACHE_ENV_VAR: "2", LOAD_CACHE_CHECKSUM_ENV_VAR: "1"}, True),
+    ),
+)
+def test_load_cache_environment(environ, expected):
+    """Test the load cache is enabled by the environment variables."""
+    from improver.utilities import load
+
+    try:
+        _enable_load_cache_from_environment(environ)
+        if expected is None:
+            assert load_cache_info() is None
+        else:
+            assert load_cache_info().max_bytes == 2 * 2**20
+            assert load._load_cache.checksum is expected
+    finally:
+        load_cache_disable()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -487,6 +487,69 @@ class Test_process(ImproverTest):
         result_coord_order = [coord.name() for coord in result.coords(dim_coords=True)]
         self.assertListEqual(result_coord_order, expected_coord_order)
 
+    def test_data_dimension_preservation(self):
+        """Test the integrated data is unchanged when the coordinate to
+        integrate is not the first dimension."""
+        cube = add_coordinate(
+            self.cube, np.array([0, 1]), "realization", coord_units="1"
+        )
+        cube.data[1] *= 2
+        expected = self.plugin.process(cube.copy())
+        cube.transpose([1, 0, 2, 3])
+        result = self.plugin.process(cube)
+        self.assertEqual(result.coord_dims("height"), (0,))
+        np.testing.assert_array_equal(
+            result.data, np.transpose(expected.data, [1, 0, 2, 3])
+        )
+
+    def test_two_levels(self):
+        """Test integration of a cube with only two levels, such that the
+        upper and lower bounds cubes have a scalar integrated coordinate."""
+        expected = np.array(
+            [[[25.00, 25.00, 25.00], [25.00, 25.00, 25.00], [25.00, 25.00, 25.00]]]
+        )
+        result = self.plugin.process(self.cube[1:])
+        np.testing.assert_array_almost_equal(
+            result.coord("height").points, np.array([10.0])
+        )
+        np.testing.assert_array_almost_equal(
+            result.coord("height").bounds, np.array([[10.0, 20.0]])
+        )
+        np.testing.assert_array_almost_equal(result.data, expected)
+
+    def test_many_levels(self):
+        """Test the cumulative integral over many levels with a start and end
+        point, against a trapezoidal integral calculated one level at a time."""
+        heights = np.linspace(0.0, 3000.0, 31, dtype=np.float32)
+        data = np.random.default_rng(0).uniform(-2, 10, (31, 3, 3))
+        cube = set_up_variable_cube(data[0].astype(np.float32))
+        cube = add_coordinate(cube, heights, "height", coord_units="m")
+        cube.data = data.astype(np.float32)
+
+        plugin = Integration(
+            "height", start_point=2500.0, end_point=500.0, positive_integration=False
+        )
+        result = plugin.process(cube)
+
+        positive_data = np.where(cube.data > 0, cube.data, 0)[::-1]
+        descending_heights = heights[::-1]
+        expected = []
+        integral = 0
+        for upper, lower, upper_data, lower_data in zip(
+            descending_heights[:-1],
+            descending_heights[1:],
+            positive_data[:-1],
+            positive_data[1:],
+        ):
+            if upper > 2500.0 or lower < 500.0:
+                continue
+            integral += 0.5 * (upper - lower) * (upper_data + lower_data)
+            expected.append(integral.copy())
+
+        self.assertEqual(result.coord("height").points.min(), 500.0)
+        self.assertEqual(result.coord("height").bounds.max(), 2500.0)
+        np.testing.assert_allclose(result.data, expected, rtol=1e-6)
+
 
 class Test_fast_linear_fit(unittest.TestCase):
     """Test the fast_linear_fit method"""
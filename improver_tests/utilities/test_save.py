@@ -15,7 +15,10 @@ import pytest
 from iris.coords import CellMethod
 from netCDF4 import Dataset
 
-from improver.synthetic_data.set_up_test_cubes import set_up_variable_cube
+from improver.synthetic_data.set_up_test_cubes import (
+    set_up_probability_cube,
+    set_up_variable_cube,
+)
 from improver.utilities.load import load_cube
 from improver.utilities.save import _order_cell_methods, save_netcdf
 
@@ -305,6 +308,111 @@ def test_least_significant_digit(bitshaving_cube, tmp_path, lsd, compress):
     assert np.max(abs_diff) < 10 ** (-1.0 * lsd)
 
 
+@pytest.fixture(name="probability_cube")
+def probability_cube_fixture():
+    """Sets up a cube of probabilities at three thresholds on a 10 by 12 grid."""
+    data = np.linspace(0.0, 1.0, 360, dtype=np.float32).reshape((3, 10, 12))
+    return set_up_probability_cube(
+        data[::-1].copy(),
+        np.array([273.15, 278.15, 283.15], dtype=np.float32),
+        attributes={"title": "IMPROVER Forecast", "mosg__grid_type": "standard"},
+    )
+
+
+@pytest.mark.parametrize(
+    "chunking, expected",
+    (
+        (None, [1, 10, 12]),
+        ("slices", [1, 10, 12]),
+        ("blocks", [3, 10, 12]),
+        ("blocks:2", [2, 10, 12]),
+        ("tiles", [3, 10, 12]),
+        ("tiles:4", [3, 4, 4]),
+    ),
+)
+@pytest.mark.parametrize("compression", ("zlib", "zstd"))
+def test_compression_and_chunking(
+    probability_cube, tmp_path, compression, chunking, expected
+):
+    """Test the data variable is written with the requested codec and chunk
+    sizes, with the same data and attributes as the default save."""
+    filepath = tmp_path / "temp.nc"
+    save_netcdf(
+        probability_cube.copy(),
+        filepath,
+        compression=compression,
+        chunking=chunking,
+    )
+
+    with Dataset(filepath, mode="r") as dataset:
+        variable = dataset.variables[probability_cube.name()]
+        assert variable.chunking() == expected
+        assert variable.filters()[compression]
+        assert dataset.title == "IMPROVER Forecast"
+        assert "title" not in variable.ncattrs()
+    default_filepath = tmp_path / "default.nc"
+    save_netcdf(probability_cube.copy(), default_filepath)
+    assert load_cube(str(filepath)) == load_cube(str(default_filepath))
+
+
+def test_no_compression_with_codec(probability_cube, tmp_path):
+    """Test no codec is applied if the compression level is zero."""
+    filepath = tmp_path / "temp.nc"
+    save_netcdf(probability_cube, filepath, compression_level=0, compression="zstd")
+    with Dataset(filepath, mode="r") as dataset:
+        filters = dataset.variables[probability_cube.name()].filters()
+    assert not filters["zstd"] and not filters["zlib"]
+
+
+@pytest.mark.parametrize(
+    "kwargs, message",
+    (
+        ({"compression": "gzip"}, "Compression codec gzip not recognised"),
+        ({"chunking": "rows"}, "Chunking strategy rows not recognised"),
+        ({"chunking": "tiles:0"}, "must be a positive integer"),
+        ({"chunking": "blocks:two"}, "must be a positive integer"),
+    ),
+)
+def test_invalid_compression_or_chunking(probability_cube, tmp_path, kwargs, message):
+    """Test an error is raised for an unknown codec or chunking strategy, and
+    that no file is written."""
+    filepath = tmp_path / "temp.nc"
+    with pytest.raises(ValueError, match=message):
+        save_netcdf(probability_cube, filepath, **kwargs)
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.parametrize("filename, zarr", (("temp.zarr", False), ("temp", True)))
+def test_zarr(tmp_path, filename, zarr):
+    """Test a Zarr store is saved if requested or if the filename has the
+    extension .zarr, replacing any existing store, with each chunk in a
+    separate file and the same metadata, including the exact grid mapping
+    parameters, as a netCDF file."""
+    cube = set_up_variable_cube(
+        np.arange(2 * 3 * 4, dtype=np.float32).reshape((2, 3, 4)),
+        spatial_grid="equalarea",
+        standard_grid_metadata="uk_ens",
+    )
+    filepath = tmp_path / filename
+    save_netcdf(cube.copy(), filepath, zarr=zarr, chunking="tiles:2")
+    save_netcdf(cube.copy(), filepath, zarr=zarr, chunking="tiles:2")
+    save_netcdf(cube.copy(), tmp_path / "temp.nc")
+
+    assert os.path.isfile(filepath / ".zgroup")
+    assert sorted(os.listdir(filepath / "air_temperature")) == [
+        ".zarray",
+        ".zattrs",
+        "0.0.0",
+        "0.0.1",
+        "0.1.0",
+        "0.1.1",
+    ]
+    result = load_cube(str(filepath))
+    assert result == load_cube(str(tmp_path / "temp.nc"))
+    assert result.attributes["mosg__grid_type"] == "standard"
+    assert result.coord_system() == cube.coord_system()
+
+
 class Test__order_cell_methods(unittest.TestCase):
     """Test function that sorts cube cell_methods before saving."""
 
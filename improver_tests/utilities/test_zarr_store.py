@@ -0,0 +1,77 @@
+# (C) Crown Copyright, Met Office. All rights reserved.
+#
+# This file is part of 'IMPROVER' and is released under the BSD 3-Clause license.
+# See LICENSE in the root of the repository for full licensing details.
+"""Unit tests for the Zarr store utilities."""
+
+import json
+
+import numpy as np
+import pytest
+from netCDF4 import Dataset
+
+from improver.utilities.zarr_store import (
+    float_attributes,
+    is_zarr_store,
+    restore_float_attributes,
+    zarr_url,
+)
+
+
+@pytest.mark.parametrize(
+    "name, make_store, expected",
+    (
+        ("output.zarr", False, True),
+        ("output.nc", False, False),
+        ("output", True, True),
+        ("output", False, False),
+    ),
+)
+def test_is_zarr_store(tmp_path, name, make_store, expected):
+    """Test Zarr stores are identified by extension or by their metadata."""
+    path = tmp_path / name
+    if make_store:
+        path.mkdir()
+        (path / ".zgroup").write_text('{"zarr_format": 2}')
+    assert is_zarr_store(path) is expected
+    assert is_zarr_store(str(path)) is expected
+
+
+def test_zarr_url(tmp_path, monkeypatch):
+    """Test the URL of a store given by a relative path."""
+    monkeypatch.chdir(tmp_path)
+    assert zarr_url("output.zarr") == f"file://{tmp_path}/output.zarr#mode=nczarr,file"
+
+
+def test_float_attributes_restored(tmp_path):
+    """Test floating point attributes recorded before a store is closed are
+    read back exactly after being restored, and other attributes are kept."""
+    path = tmp_path / "output.zarr"
+    dataset = Dataset(zarr_url(path), mode="w")
+    variable = dataset.createVariable("grid", "i4")
+    variable.earth_radius = 6371229.0
+    variable.parallels = np.array([0.123456789, 1.0], dtype=np.float32)
+    variable.grid_mapping_name = "latitude_longitude"
+    dataset.history = "created"
+    records = float_attributes(dataset)
+    dataset.close()
+    assert records == {
+        "grid": {
+            "earth_radius": 6371229.0,
+            "parallels": np.array([0.123456789, 1.0], dtype=np.float32).tolist(),
+        }
+    }
+
+    restore_float_attributes(path, records)
+
+    with Dataset(zarr_url(path)) as dataset:
+        variable = dataset.variables["grid"]
+        assert variable.earth_radius == 6371229.0
+        np.testing.assert_array_equal(
+            variable.parallels, np.array([0.123456789, 1.0], dtype=np.float32)
+        )
+        assert variable.parallels.dtype == np.float32
+        assert variable.grid_mapping_name == "latitude_longitude"
+        assert dataset.history == "created"
+    attributes = json.loads((path / "grid" / ".zattrs").read_text())
+    assert attributes["earth_radius"] == 6371229.0